@@ -0,0 +1,168 @@
+"""Tests for the aiorequest module."""
+
+import asyncio
+import time
+
+import pytest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from workknow import aiorequest
+from workknow import budget
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import endpoint
+from workknow import produce
+from workknow import retry
+from workknow import standin
+
+WORKFLOW_RUNS_PATH = "/repos/org/repo/actions/runs"
+
+
+@pytest.fixture(autouse=True)
+def disable_retry_jitter():
+    """Disable the random jitter and forget the budget left by any other test."""
+    retry.configure_policy(0)
+    budget.reset_budget()
+    yield
+    retry.configure_policy()
+    budget.reset_budget()
+
+
+def create_application(last_page, rate_limited_pages):
+    """Create a stand-in for the GitHub API that rate limits the first request of some pages."""
+    requested_pages = []
+
+    async def workflow_runs_handler(web_request):
+        """Return one workflow run for the requested page."""
+        page = int(web_request.query.get(constants.github.Page, 1))
+        requested_pages.append(page)
+        headers = {
+            constants.rate.Header_Limit: "5000",
+            constants.rate.Header_Remaining: "4000",
+            constants.rate.Header_Reset: "0",
+        }
+        if page in rate_limited_pages and requested_pages.count(page) == 1:
+            headers[constants.retry.Retry_After] = "0"
+            return web.json_response({}, status=429, headers=headers)
+        if page < last_page:
+            url = web_request.url.with_query({})
+            headers["Link"] = (
+                f'<{url}?page={page + 1}>; rel="next", '
+                f'<{url}?page={last_page}>; rel="last"'
+            )
+        body = {"total_count": last_page, "workflow_runs": [{"id": page}]}
+        return web.json_response(body, headers=headers)
+
+    application = web.Application()
+    application.router.add_get(WORKFLOW_RUNS_PATH, workflow_runs_handler)
+    return (application, requested_pages)
+
+
+async def download_from_stand_in_server(last_page, rate_limited_pages, **kwargs):
+    """Download all of the pages from a stand-in server running on the local host."""
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    application, requested_pages = create_application(last_page, rate_limited_pages)
+    async with TestServer(application) as server:
+        result = await aiorequest.request_json_from_github_async(
+            str(server.make_url(WORKFLOW_RUNS_PATH)), console, **kwargs
+        )
+    return (result, requested_pages)
+
+
+def test_async_download_returns_pages_in_order_with_retries():
+    """Check that pages requested together are in order and rate limited pages are retried."""
+    (
+        (valid, retry_count, sleep_time, json_responses),
+        requested_pages,
+    ) = asyncio.run(
+        download_from_stand_in_server(9, {3, 7}, maximum_retries=2, page_concurrency=4)
+    )
+    assert valid is True
+    assert retry_count == 2
+    assert sleep_time == 0
+    assert json_responses == [[{"id": page}] for page in range(1, 10)]
+    assert sorted(requested_pages) == [1, 2, 3, 3, 4, 5, 6, 7, 7, 8, 9]
+
+
+def test_async_download_resumes_after_stored_pages():
+    """Check that the stored pages are not requested again and new pages are recorded."""
+    recorded_pages = []
+    (valid, _, _, json_responses), requested_pages = asyncio.run(
+        download_from_stand_in_server(
+            4,
+            set(),
+            maximum_retries=1,
+            stored_pages=[[{"id": 1}], [{"id": 2}]],
+            page_callback=lambda page, workflow_runs: recorded_pages.append(page),
+        )
+    )
+    assert valid is True
+    assert json_responses == [[{"id": page}] for page in range(1, 5)]
+    assert sorted(requested_pages) == [3, 4]
+    assert sorted(recorded_pages) == [3, 4]
+
+
+def test_async_pages_are_yielded_before_the_later_pages_are_requested():
+    """Check that each page is yielded in order with only a window of pages requested ahead of it."""
+
+    async def iterate_from_stand_in_server():
+        """Record the pages that were requested when each page was yielded."""
+        console, _ = configure.setup(debug.DebugLevel.ERROR)
+        application, requested_pages = create_application(9, set())
+        yielded_pages = []
+        async with TestServer(application) as server:
+            async for (
+                valid,
+                _,
+                _,
+                workflow_runs,
+            ) in aiorequest.iterate_pages_json_from_github_async(
+                str(server.make_url(WORKFLOW_RUNS_PATH)),
+                console,
+                maximum_retries=1,
+                page_concurrency=1,
+            ):
+                assert valid is True
+                yielded_pages.append((workflow_runs, sorted(requested_pages)))
+        return yielded_pages
+
+    yielded_pages = asyncio.run(iterate_from_stand_in_server())
+    assert [workflow_runs for workflow_runs, _ in yielded_pages] == [
+        [{"id": page}] for page in range(1, 10)
+    ]
+    # the first page is yielded before any other page is requested and a later
+    # page is yielded with at most the window of pages after it requested
+    window_size = constants.github.Page_Window_Factor
+    assert yielded_pages[0][1] == [1]
+    for page, (_, requested_pages) in enumerate(yielded_pages[1:], start=2):
+        assert max(requested_pages) <= min(page + window_size - 1, 9)
+
+
+def test_async_pages_are_downloaded_while_the_caller_transforms_a_page(monkeypatch):
+    """Check that the pages after a yielded page keep downloading before the caller asks for them."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    options = standin.create_default_options()._replace(run_count=250)
+    try:
+        with standin.StandInServer(options) as stand_in_server:
+            endpoint.configure_api_url(stand_in_server.api_url)
+            workflow_run_pages = aiorequest.WorkflowRunPages(
+                produce.create_github_api_url("gkapfham", "meSMSage"), console, 1, 1
+            )
+            pages_iterator = iter(workflow_run_pages)
+            next(pages_iterator)
+            # the caller holds the first page while the later pages are downloaded
+            deadline = time.monotonic() + 5
+            while (
+                stand_in_server.get_statistics()[constants.standin.Pages] < 3
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+            assert stand_in_server.get_statistics()[constants.standin.Pages] == 3
+            assert len(list(pages_iterator)) == 2
+    finally:
+        endpoint.configure_api_url(constants.github.Api_Url)
+    assert workflow_run_pages.valid is True
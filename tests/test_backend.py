@@ -0,0 +1,39 @@
+"""Tests for the backend module."""
+
+import importlib.util
+
+import pytest
+import typer
+
+from typer.testing import CliRunner
+
+from workknow import backend
+
+runner = CliRunner()
+
+
+def test_check_backend_reports_missing_aiohttp(monkeypatch):
+    """Check that choosing the async backend without aiohttp fails with a clear message."""
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    assert backend.check_backend(backend.Backend.SYNC) == backend.Backend.SYNC
+    with pytest.raises(typer.BadParameter, match="aiohttp"):
+        backend.check_backend(backend.Backend.ASYNC)
+
+
+def test_check_backend_passes_the_backend_to_the_command():
+    """Check that the command receives the backend that was checked when the option was parsed."""
+    backend_cli = typer.Typer()
+    chosen_backends = []
+
+    @backend_cli.command()
+    def choose(
+        request_backend: backend.Backend = typer.Option(
+            backend.Backend.SYNC, "--backend", callback=backend.check_backend
+        )
+    ):
+        """Record the chosen backend."""
+        chosen_backends.append(request_backend)
+
+    assert runner.invoke(backend_cli, ["--backend", "async"]).exit_code == 0
+    assert runner.invoke(backend_cli, []).exit_code == 0
+    assert chosen_backends == [backend.Backend.ASYNC, backend.Backend.SYNC]
@@ -0,0 +1,51 @@
+"""Tests for the benchmark module."""
+
+import json
+
+from typer.testing import CliRunner
+
+from workknow import benchmark
+from workknow import constants
+
+
+def test_synthetic_repositories_split_runs_into_pages():
+    """Check that the synthesized runs are split into repositories and pages like the GitHub API."""
+    repositories = list(benchmark.create_synthetic_repositories(250, 200))
+    assert [repo for (_, repo, _) in repositories] == ["repository-0", "repository-1"]
+    assert [len(page) for page in repositories[0][2]] == [100, 100]
+    assert [len(page) for page in repositories[1][2]] == [50]
+    assert repositories[0][2][0][0][constants.workflow.Id] == 200
+
+
+def test_suite_writes_measurements_of_each_stage(tmp_path):
+    """Check that the suite writes the time and peak memory of every stage as JSON."""
+    output = tmp_path / "benchmark.json"
+    result = CliRunner().invoke(
+        benchmark.cli,
+        [
+            "suite",
+            "--runs",
+            "250",
+            "--runs-per-repository",
+            "100",
+            "--output",
+            str(output),
+        ],
+    )
+    assert result.exit_code == 0
+    benchmark_results = json.loads(output.read_text())
+    measurements = benchmark_results[constants.benchmark.Measurements]
+    assert [measurement[constants.benchmark.Stage] for measurement in measurements] == [
+        constants.benchmark.Create_Workflows_Dataframe,
+        constants.benchmark.Create_Commits_Dataframe,
+        constants.benchmark.Create_Dataframes_From_Pages,
+        constants.benchmark.Combine_Files_In_Directory,
+        constants.benchmark.Save_Dataframe_All,
+        constants.benchmark.Create_Results_Zip_File,
+    ]
+    for measurement in measurements:
+        assert measurement[constants.benchmark.Runs] == 250
+        assert measurement[constants.benchmark.Repositories] == 3
+        assert measurement[constants.benchmark.Seconds] >= 0
+        assert measurement[constants.benchmark.Peak_Memory_Bytes] > 0
+    assert measurements[2][constants.benchmark.Speedup] > 0
@@ -0,0 +1,62 @@
+"""Tests for the budget module."""
+
+import datetime
+
+from workknow import budget
+from workknow import constants
+
+
+def create_headers(remaining, reset):
+    """Create the rate limit headers that the GitHub API attaches to a response."""
+    return {
+        constants.rate.Header_Limit: "5000",
+        constants.rate.Header_Remaining: str(remaining),
+        constants.rate.Header_Reset: str(reset),
+        constants.rate.Header_Used: str(5000 - remaining),
+    }
+
+
+def test_budget_is_unknown_without_headers():
+    """Check that a response without rate limit headers does not update the budget."""
+    rate_limit_budget = budget.RateLimitBudget()
+    assert rate_limit_budget.update_from_headers({}) is False
+    assert rate_limit_budget.is_known() is False
+
+
+def test_budget_keeps_smallest_remaining_in_same_window():
+    """Check that out-of-order responses in the same window keep the smallest remaining count."""
+    # note that the reset time is far in the future so the budget is not restored
+    reset = 4102444800
+    rate_limit_budget = budget.RateLimitBudget()
+    assert rate_limit_budget.update_from_headers(create_headers(100, reset)) is True
+    assert rate_limit_budget.update_from_headers(create_headers(120, reset)) is True
+    rate_limit_dict = rate_limit_budget.to_dict()
+    assert rate_limit_dict[constants.rate.Remaining] == 100
+    assert rate_limit_dict[constants.rate.Used] == 4900
+    # a later reset time means that a new window has started
+    rate_limit_budget.update_from_headers(create_headers(4999, reset + 3600))
+    assert rate_limit_budget.to_dict()[constants.rate.Remaining] == 4999
+
+
+def test_budget_is_restored_after_reset_time():
+    """Check that the whole budget is available once the reset time has passed."""
+    rate_limit_budget = budget.RateLimitBudget()
+    rate_limit_budget.update_from_dict(
+        {
+            constants.rate.Limit: 5000,
+            constants.rate.Remaining: 0,
+            constants.rate.Reset: 0,
+        }
+    )
+    assert rate_limit_budget.is_known() is True
+    assert rate_limit_budget.to_dict()[constants.rate.Remaining] == 5000
+
+
+def test_reset_sleep_time_is_never_negative():
+    """Check that the sleep until a reset adds the extra seconds and is not negative once the reset passed."""
+    reset = int(datetime.datetime.now(datetime.timezone.utc).timestamp()) + 100
+    sleep_time = budget.calculate_reset_sleep_time(reset)
+    assert 99 < sleep_time <= 100 + constants.rate.Extra_Seconds
+    assert budget.calculate_reset_sleep_time(reset - 1000) == (
+        constants.rate.Extra_Seconds
+    )
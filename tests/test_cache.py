@@ -0,0 +1,164 @@
+"""Tests for the cache module."""
+
+import requests
+import responses
+
+from rich.progress import Progress
+
+from workknow import cache
+from workknow import constants
+from workknow import request
+
+GITHUB_API_URL = "https://api.github.com/repos/home-assistant/core/actions/runs"
+
+GITHUB_PARAMS = {constants.github.Per_Page: constants.github.Per_Page_Maximum}
+
+
+@responses.activate
+def test_not_modified_response_is_served_from_cache(tmp_path):
+    """Check that a 304 response is replaced by the body and links of the cached response."""
+    response_cache = cache.configure_cache(tmp_path)
+    # the first response has an ETag and a link to the next page
+    responses.add(
+        responses.GET,
+        GITHUB_API_URL,
+        json={"total_count": 1, "workflow_runs": [{"id": 1}]},
+        status=200,
+        headers={
+            constants.cache.Etag: '"abc"',
+            constants.cache.Link: f'<{GITHUB_API_URL}?page=2>; rel="next"',
+        },
+    )
+    # the second response says that nothing changed and does not have a body
+    responses.add(responses.GET, GITHUB_API_URL, status=304)
+    with Progress() as progress:
+        valid, _, _, first_response = request.request_with_caution(
+            GITHUB_API_URL, GITHUB_PARAMS, None, progress, 1
+        )
+        valid, _, _, second_response = request.request_with_caution(
+            GITHUB_API_URL, GITHUB_PARAMS, None, progress, 1
+        )
+    assert valid is True
+    # the second request was conditional on the ETag of the first response
+    assert responses.calls[1].request.headers[constants.cache.If_None_Match] == '"abc"'
+    assert second_response.status_code == 200  # type: ignore
+    assert second_response.json() == first_response.json()  # type: ignore
+    assert constants.github.Next in second_response.links  # type: ignore
+    statistics = response_cache.get_statistics()  # type: ignore
+    assert statistics[constants.cache.Hits] == 1
+    assert statistics[constants.cache.Misses] == 1
+    # the cache can be opened again from the index on the disk, once it is saved
+    response_cache.flush()  # type: ignore
+    reopened_cache = cache.ResponseCache(tmp_path, 1024)
+    assert reopened_cache.get_conditional_headers(GITHUB_API_URL, GITHUB_PARAMS)
+    cache.configure_cache(None)
+
+
+@responses.activate
+def test_least_recently_used_response_is_evicted(tmp_path):
+    """Check that the cache evicts the least recently used responses to stay under its size."""
+    response_cache = cache.ResponseCache(tmp_path, 25)
+    for page in range(1, 4):
+        page_url = f"{GITHUB_API_URL}?page={page}"
+        responses.add(
+            responses.GET,
+            page_url,
+            body="0123456789",
+            status=200,
+            headers={constants.cache.Etag: f'"{page}"'},
+        )
+    for page in range(1, 4):
+        page_url = f"{GITHUB_API_URL}?page={page}"
+        response_cache.resolve_response(page_url, {}, requests.get(page_url))
+    # only two bodies of ten bytes fit in twenty-five bytes
+    assert not response_cache.get_conditional_headers(f"{GITHUB_API_URL}?page=1", {})
+    assert response_cache.get_conditional_headers(f"{GITHUB_API_URL}?page=3", {})
+    statistics = response_cache.get_statistics()
+    assert statistics[constants.cache.Evictions] == 1
+    assert statistics[constants.cache.Size] == 20
+
+
+@responses.activate
+def test_size_is_kept_when_responses_are_replaced_and_reopened(tmp_path):
+    """Check that the size of the cache counts a replaced body once and is restored with the index."""
+    response_cache = cache.ResponseCache(tmp_path, 1024)
+    page_url = f"{GITHUB_API_URL}?page=1"
+    responses.add(
+        responses.GET,
+        page_url,
+        body="0123456789",
+        status=200,
+        headers={constants.cache.Etag: '"1"'},
+    )
+    responses.add(
+        responses.GET,
+        page_url,
+        body="0123",
+        status=200,
+        headers={constants.cache.Etag: '"2"'},
+    )
+    response_cache.resolve_response(page_url, {}, requests.get(page_url))
+    response_cache.resolve_response(page_url, {}, requests.get(page_url))
+    assert response_cache.get_statistics()[constants.cache.Size] == 4
+    response_cache.flush()
+    reopened_cache = cache.ResponseCache(tmp_path, 1024)
+    assert reopened_cache.get_statistics()[constants.cache.Size] == 4
+
+
+@responses.activate
+def test_index_is_saved_in_batches(tmp_path):
+    """Check that the index is only saved after a batch of stored responses or when flushed."""
+    response_cache = cache.ResponseCache(tmp_path, 1024, 2)
+    index_file = tmp_path / constants.cache.Index_File
+    for page in range(1, 4):
+        page_url = f"{GITHUB_API_URL}?page={page}"
+        responses.add(
+            responses.GET,
+            page_url,
+            body="0123456789",
+            status=200,
+            headers={constants.cache.Etag: f'"{page}"'},
+        )
+    first_url = f"{GITHUB_API_URL}?page=1"
+    response_cache.resolve_response(first_url, {}, requests.get(first_url))
+    assert not index_file.is_file()
+    second_url = f"{GITHUB_API_URL}?page=2"
+    response_cache.resolve_response(second_url, {}, requests.get(second_url))
+    assert len(cache.ResponseCache(tmp_path, 1024).index) == 2
+    third_url = f"{GITHUB_API_URL}?page=3"
+    response_cache.resolve_response(third_url, {}, requests.get(third_url))
+    assert len(cache.ResponseCache(tmp_path, 1024).index) == 2
+    response_cache.flush()
+    assert len(cache.ResponseCache(tmp_path, 1024).index) == 3
+    # only the temporary file of the last save was replaced by the index
+    assert sorted(path.name for path in tmp_path.glob("index.*")) == [
+        constants.cache.Index_File
+    ]
+
+
+@responses.activate
+def test_responses_of_each_token_are_cached_separately(tmp_path):
+    """Check that a response is only revalidated for the token that requested it, without storing the token."""
+    response_cache = cache.ResponseCache(tmp_path, 1024)
+    responses.add(
+        responses.GET,
+        GITHUB_API_URL,
+        body="0123456789",
+        status=200,
+        headers={constants.cache.Etag: '"abc"'},
+    )
+    first_authentication = (constants.github.User, "first-token")
+    second_authentication = (constants.github.User, "second-token")
+    response_cache.resolve_response(
+        GITHUB_API_URL, {}, requests.get(GITHUB_API_URL), first_authentication
+    )
+    assert response_cache.get_conditional_headers(
+        GITHUB_API_URL, {}, first_authentication
+    )
+    assert not response_cache.get_conditional_headers(
+        GITHUB_API_URL, {}, second_authentication
+    )
+    assert not response_cache.get_conditional_headers(GITHUB_API_URL, {})
+    response_cache.flush()
+    index_text = (tmp_path / constants.cache.Index_File).read_text()
+    assert "first-token" not in index_text
@@ -0,0 +1,68 @@
+"""Tests for the checkpoint module."""
+
+from workknow import checkpoint
+
+GITHUB_API_URL = "https://api.github.com/repos/org/repo/actions/runs"
+
+
+def test_get_stored_pages_only_returns_consecutive_pages(tmp_path):
+    """Check that a missing page stops the pages that can be used to resume."""
+    journal = checkpoint.CheckpointJournal(tmp_path)
+    journal.record_page(GITHUB_API_URL, 2, [{"id": 2}])
+    journal.record_page(GITHUB_API_URL, 1, [{"id": 1}])
+    journal.record_page(GITHUB_API_URL, 4, [{"id": 4}])
+    # simulate a crash that only wrote part of the last line
+    with open(journal.create_pages_file(GITHUB_API_URL), "a") as pages_file:
+        pages_file.write('{"page": 3, "workflow_r')
+    resumed_journal = checkpoint.CheckpointJournal(tmp_path, resume=True)
+    assert resumed_journal.get_stored_pages(GITHUB_API_URL) == [
+        [{"id": 1}],
+        [{"id": 2}],
+    ]
+
+
+def test_record_repository_removes_pages_and_survives_resume(tmp_path):
+    """Check that a completed repository is remembered only when resuming."""
+    journal = checkpoint.CheckpointJournal(tmp_path)
+    journal.record_page(GITHUB_API_URL, 1, [{"id": 1}])
+    journal.record_repository("https://github.com/org/repo", GITHUB_API_URL, {"c": 1})
+    assert not journal.create_pages_file(GITHUB_API_URL).exists()
+    resumed_journal = checkpoint.CheckpointJournal(tmp_path, resume=True)
+    assert resumed_journal.get_completed_repositories() == {
+        "https://github.com/org/repo": {"c": 1}
+    }
+    restarted_journal = checkpoint.CheckpointJournal(tmp_path)
+    assert restarted_journal.get_completed_repositories() == {}
+
+
+def test_stored_pages_are_only_used_with_the_same_filter(tmp_path):
+    """Check that the pages downloaded with one filter are not used to resume a download with another one."""
+    journal = checkpoint.CheckpointJournal(tmp_path)
+    created_filter = {"created": ">=2021-08-01T00:00:00Z"}
+    journal.record_page(GITHUB_API_URL, 1, [{"id": 1}], created_filter)
+    resumed_journal = checkpoint.CheckpointJournal(tmp_path, resume=True)
+    assert resumed_journal.get_stored_pages(GITHUB_API_URL) == []
+    assert resumed_journal.get_stored_pages(GITHUB_API_URL, created_filter) == [
+        [{"id": 1}]
+    ]
+    resumed_journal.record_repository(
+        "https://github.com/org/repo", GITHUB_API_URL, {"c": 1}
+    )
+    assert not resumed_journal.create_pages_file(
+        GITHUB_API_URL, created_filter
+    ).exists()
+
+
+def test_record_repository_removes_the_pages_of_every_listing(tmp_path):
+    """Check that the pages of the workflows and date ranges of a repository are removed, but not those of others."""
+    journal = checkpoint.CheckpointJournal(tmp_path)
+    workflow_runs_url = (
+        "https://api.github.com/repos/org/repo/actions/workflows/10/runs"
+    )
+    other_runs_url = "https://api.github.com/repos/org/other/actions/runs"
+    created_filter = {"created": "2021-08-01..2021-08-02"}
+    journal.record_page(workflow_runs_url, 1, [{"id": 1}], created_filter)
+    journal.record_page(other_runs_url, 1, [{"id": 2}])
+    journal.record_repository("https://github.com/org/repo", GITHUB_API_URL, {"c": 1})
+    assert not journal.create_pages_file(workflow_runs_url, created_filter).exists()
+    assert journal.create_pages_file(other_runs_url).exists()
@@ -0,0 +1,209 @@
+"""Tests for the fileformat module."""
+
+import importlib.util
+
+import pandas
+import pytest
+import typer
+
+from typer.testing import CliRunner
+
+from workknow import concatenate
+from workknow import configure
+from workknow import debug
+from workknow import fileformat
+from workknow import files
+from workknow import main
+from workknow import produce
+from workknow import schema
+
+runner = CliRunner()
+
+
+def create_dataframes(repo):
+    """Create the typed workflows and commits DataFrames of a repository."""
+    workflow_runs = [
+        {
+            "id": identifier,
+            "name": "build",
+            "created_at": f"2021-03-0{identifier}T12:00:00Z",
+            "conclusion": None if identifier == 1 else "success",
+            "head_commit": {"message": f"commit {identifier}", "timestamp": None},
+        }
+        for identifier in range(1, 4)
+    ]
+    _, workflows_dataframe, commits_dataframe = produce.create_dataframes_from_pages(
+        "gkapfham",
+        repo,
+        f"https://github.com/gkapfham/{repo}",
+        f"https://api.github.com/repos/gkapfham/{repo}/actions/runs",
+        [workflow_runs],
+    )
+    return workflows_dataframe, commits_dataframe
+
+
+@pytest.mark.parametrize(
+    "file_format", [fileformat.FileFormat.PARQUET, fileformat.FileFormat.FEATHER]
+)
+def test_columnar_formats_keep_the_types_of_the_columns(tmp_path, file_format):
+    """Check that a DataFrame saved in a columnar format is read with the same types."""
+    fileformat.configure_format(file_format)
+    try:
+        workflows_dataframe, _ = create_dataframes("meSMSage")
+        files.save_dataframe(
+            tmp_path, "gkapfham", "meSMSage", "Workflows", workflows_dataframe
+        )
+        saved_file = tmp_path / f"gkapfham-meSMSage-Workflows.{file_format.value}"
+        assert saved_file.is_file()
+        assert fileformat.find_format(saved_file) == file_format
+        assert fileformat.detect_format(tmp_path) == file_format
+        read_dataframe = files.read_dataframe(
+            tmp_path, "gkapfham", "meSMSage", "Workflows"
+        )
+        pandas.testing.assert_frame_equal(read_dataframe, workflows_dataframe)
+    finally:
+        fileformat.configure_format(fileformat.FileFormat.CSV)
+
+
+def test_combine_detects_the_format_of_the_files(tmp_path):
+    """Check that the files of the repositories are combined in the format that they were saved in."""
+    configure.setup(debug.DebugLevel.ERROR)
+    fileformat.configure_format(fileformat.FileFormat.PARQUET)
+    try:
+        for repo in ["first", "second"]:
+            workflows_dataframe, commits_dataframe = create_dataframes(repo)
+            files.save_dataframe(
+                tmp_path, "gkapfham", repo, "Workflows", workflows_dataframe
+            )
+            files.save_dataframe(
+                tmp_path, "gkapfham", repo, "Commits", commits_dataframe
+            )
+    finally:
+        fileformat.configure_format(fileformat.FileFormat.CSV)
+    # there are no CSV files and thus the Parquet files must be detected
+    assert not list(tmp_path.glob("*.csv"))
+    (
+        counts_dataframe,
+        commits_dataframe,
+        workflows_dataframe,
+    ) = concatenate.combine_files_in_directory(tmp_path)
+    assert counts_dataframe["repo"].tolist() == ["first", "second"]
+    assert len(commits_dataframe) == 6
+    assert len(workflows_dataframe) == 6
+    assert workflows_dataframe["created_at"].dtype == "datetime64[ns, UTC]"
+
+
+def test_appending_to_csv_file_matches_saving_concatenated_dataframe(tmp_path):
+    """Check that appending the DataFrames of each repository saves the same CSV file as concatenating them."""
+    column_types = schema.create_workflows_column_types()
+    dataframes = [create_dataframes(repo)[0] for repo in ["first", "second"]]
+    # the second repository does not have one of the columns of the first
+    dataframes[1] = dataframes[1].drop(columns=["name"])
+    appender = fileformat.DataFrameAppender(
+        tmp_path / "appended.csv", column_types, fileformat.FileFormat.CSV
+    )
+    appender.append(pandas.DataFrame())
+    for dataframe in dataframes:
+        appender.append(dataframe)
+    appender.close()
+    fileformat.write_dataframe(
+        pandas.concat(
+            [
+                schema.conform_dataframe(dataframe, column_types)
+                for dataframe in dataframes
+            ]
+        ),
+        tmp_path / "saved.csv",
+        fileformat.FileFormat.CSV,
+    )
+    assert (tmp_path / "appended.csv").read_text() == (
+        tmp_path / "saved.csv"
+    ).read_text()
+
+
+@pytest.mark.parametrize(
+    "file_format", [fileformat.FileFormat.PARQUET, fileformat.FileFormat.FEATHER]
+)
+def test_appending_to_columnar_file_keeps_rows_of_each_dataframe(tmp_path, file_format):
+    """Check that typed DataFrames and DataFrames read from CSV files can be appended to a columnar file."""
+    first_dataframe, _ = create_dataframes("first")
+    # a column that is not in the schema and that only has missing values is left out
+    first_dataframe["head_commit"] = None
+    second_dataframe, _ = create_dataframes("second")
+    # the DataFrame of a repository that was saved before a download resumed is read
+    # from its CSV file and thus none of its columns have the types of the schema
+    files.save_dataframe(tmp_path, "gkapfham", "second", "Workflows", second_dataframe)
+    saved_dataframe = files.read_dataframe(tmp_path, "gkapfham", "second", "Workflows")
+    assert saved_dataframe["created_at"].dtype != "datetime64[ns, UTC]"
+    file_path = tmp_path / f"appended.{file_format.value}"
+    appender = fileformat.DataFrameAppender(
+        file_path, schema.create_workflows_column_types(), file_format
+    )
+    appender.append(first_dataframe)
+    appender.append(saved_dataframe)
+    appender.close()
+    appended_dataframe = fileformat.read_dataframe(file_path)
+    assert list(appended_dataframe.columns) == list(
+        schema.create_workflows_column_types()
+    )
+    assert appended_dataframe["repo"].tolist() == ["first"] * 3 + ["second"] * 3
+    assert appended_dataframe["id"].tolist() == [1, 2, 3] * 2
+    assert appended_dataframe["created_at"].dtype == "datetime64[ns, UTC]"
+    assert appended_dataframe["created_at"].notna().all()
+
+
+def test_appending_column_that_is_not_in_the_schema_fails(tmp_path):
+    """Check that a column with values that is not in the schema is not dropped without notice."""
+    workflows_dataframe, _ = create_dataframes("first")
+    workflows_dataframe["unknown"] = "value"
+    appender = fileformat.DataFrameAppender(
+        tmp_path / "appended.csv",
+        schema.create_workflows_column_types(),
+        fileformat.FileFormat.CSV,
+    )
+    with pytest.raises(ValueError, match="unknown"):
+        appender.append(workflows_dataframe)
+
+
+def test_closing_appender_without_dataframes_saves_empty_file(tmp_path):
+    """Check that the file exists, with the columns of the schema, even when no repository had any data."""
+    file_path = tmp_path / "empty.csv"
+    appender = fileformat.DataFrameAppender(
+        file_path, schema.create_commits_column_types(), fileformat.FileFormat.CSV
+    )
+    appender.append(pandas.DataFrame())
+    appender.close()
+    assert file_path.is_file()
+    assert list(pandas.read_csv(file_path, index_col=0).columns) == list(
+        schema.create_commits_column_types()
+    )
+
+
+def test_columnar_formats_need_pyarrow(monkeypatch, tmp_path):
+    """Check that a columnar format without pyarrow fails when the option is parsed, before any download."""
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name: None if name == "pyarrow" else find_spec(name),
+    )
+    assert (
+        fileformat.check_format(fileformat.FileFormat.CSV) == fileformat.FileFormat.CSV
+    )
+    with pytest.raises(typer.BadParameter, match="workknow\\[parquet\\]"):
+        fileformat.check_format(fileformat.FileFormat.FEATHER)
+    result = runner.invoke(
+        main.cli,
+        [
+            "download",
+            "--repo-urls",
+            "https://github.com/gkapfham/meSMSage",
+            "--results-dir",
+            str(tmp_path),
+            "--format",
+            "parquet",
+        ],
+    )
+    assert result.exit_code != 0
+    assert "pyarrow" in result.output
+    assert not any(tmp_path.iterdir())
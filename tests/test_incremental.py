@@ -0,0 +1,115 @@
+"""Tests for the incremental module."""
+
+import pandas
+
+from workknow import constants
+from workknow import fileformat
+from workknow import files
+from workknow import incremental
+from workknow import schema
+
+
+def create_workflows_and_commits(run_ids):
+    """Create workflows and commits DataFrames with one row for each run identifier."""
+    workflows_dataframe = pandas.DataFrame(
+        {
+            constants.workflow.Id: run_ids,
+            constants.workflow.Created_At: [
+                f"2021-08-{run_id:02d}T00:00:00Z" for run_id in run_ids
+            ],
+        }
+    )
+    commits_dataframe = pandas.DataFrame(
+        {"head_commit_message": [f"commit {run_id}" for run_id in run_ids]}
+    )
+    return (workflows_dataframe, commits_dataframe)
+
+
+def test_find_newest_created_at_without_saved_data(tmp_path):
+    """Check that there is no filter when nothing was saved for the repository."""
+    newest_created_at = incremental.find_newest_created_at(tmp_path, "org", "repo")
+    assert newest_created_at is None
+    assert incremental.create_created_filter(newest_created_at) == {}
+
+
+def test_merge_with_saved_dataframes_removes_duplicate_runs(tmp_path):
+    """Check that new runs are merged before the saved runs without any duplicates."""
+    saved_workflows, saved_commits = create_workflows_and_commits([3, 2, 1])
+    files.save_dataframe(
+        tmp_path, "org", "repo", constants.filesystem.Workflows, saved_workflows
+    )
+    files.save_dataframe(
+        tmp_path, "org", "repo", constants.filesystem.Commits, saved_commits
+    )
+    # the newest saved run is found in the workflows file
+    newest_created_at = incremental.find_newest_created_at(tmp_path, "org", "repo")
+    assert newest_created_at == "2021-08-03T00:00:00Z"
+    assert incremental.create_created_filter(newest_created_at) == {
+        "created": ">=2021-08-03T00:00:00Z"
+    }
+    # the run with identifier 3 was created in the same second and is downloaded again
+    new_workflows, new_commits = create_workflows_and_commits([5, 4, 3])
+    merged_workflows, merged_commits = incremental.merge_with_saved_dataframes(
+        tmp_path, "org", "repo", new_workflows, new_commits
+    )
+    assert merged_workflows[constants.workflow.Id].tolist() == [5, 4, 3, 2, 1]
+    assert merged_commits["head_commit_message"].tolist() == [
+        "commit 5",
+        "commit 4",
+        "commit 3",
+        "commit 2",
+        "commit 1",
+    ]
+    # the state file now records the newest run
+    incremental.update_state(tmp_path, "org", "repo", merged_workflows)
+    assert (
+        incremental.find_newest_created_at(tmp_path, "org", "repo")
+        == "2021-08-05T00:00:00Z"
+    )
+
+
+def test_merge_with_saved_dataframes_keeps_the_new_row_of_a_run(tmp_path):
+    """Check that a run downloaded again replaces the saved row, which may be out of date."""
+    saved_workflows, saved_commits = create_workflows_and_commits([3, 2, 1])
+    saved_workflows[constants.workflow.Status] = "in_progress"
+    files.save_dataframe(
+        tmp_path, "org", "repo", constants.filesystem.Workflows, saved_workflows
+    )
+    files.save_dataframe(
+        tmp_path, "org", "repo", constants.filesystem.Commits, saved_commits
+    )
+    new_workflows, new_commits = create_workflows_and_commits([4, 3])
+    new_workflows[constants.workflow.Status] = "completed"
+    new_commits["head_commit_message"] = ["commit 4", "amended commit 3"]
+    merged_workflows, merged_commits = incremental.merge_with_saved_dataframes(
+        tmp_path, "org", "repo", new_workflows, new_commits
+    )
+    assert merged_workflows[constants.workflow.Id].tolist() == [4, 3, 2, 1]
+    assert merged_workflows[constants.workflow.Status].tolist() == [
+        "completed",
+        "completed",
+        "in_progress",
+        "in_progress",
+    ]
+    assert merged_commits["head_commit_message"].tolist()[:2] == [
+        "commit 4",
+        "amended commit 3",
+    ]
+
+
+def test_find_newest_created_at_in_columnar_file(tmp_path):
+    """Check that the newest run saved in a columnar file has the format of the GitHub API."""
+    saved_workflows, _ = create_workflows_and_commits([3, 2, 1])
+    fileformat.configure_format(fileformat.FileFormat.PARQUET)
+    try:
+        files.save_dataframe(
+            tmp_path,
+            "org",
+            "repo",
+            constants.filesystem.Workflows,
+            schema.apply_workflows_schema(saved_workflows),
+        )
+        newest_created_at = incremental.find_newest_created_at(tmp_path, "org", "repo")
+    finally:
+        fileformat.configure_format(fileformat.FileFormat.CSV)
+    assert newest_created_at == "2021-08-03T00:00:00Z"
@@ -0,0 +1,123 @@
+"""Tests for the jobs module."""
+
+import json
+
+import pandas
+import responses
+
+from rich.progress import Progress
+
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import files
+from workknow import jobs
+
+# the rate limit headers of each response make requests to /rate_limit unnecessary
+RATE_LIMIT_HEADERS = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}
+
+
+def create_jobs_url(run_id):
+    """Create the URL that lists the jobs of a workflow run."""
+    return f"https://api.github.com/repos/gkapfham/meSMSage/actions/runs/{run_id}/jobs"
+
+
+def create_job(run_id):
+    """Create a job with two steps like the ones from the GitHub API."""
+    return {
+        constants.workflow.Id: run_id * 10,
+        constants.jobs.Run_Id: run_id,
+        constants.workflow.Name: "build",
+        constants.workflow.Status: "completed",
+        constants.workflow.Conclusion: "success",
+        constants.jobs.Started_At: "2021-08-01T00:00:00Z",
+        constants.jobs.Completed_At: "2021-08-01T00:05:00Z",
+        constants.jobs.Runner_Name: "GitHub Actions 2",
+        "html_url": "https://github.com/gkapfham/meSMSage/runs/1",
+        constants.jobs.Steps: [
+            {constants.workflow.Name: "Checkout", constants.jobs.Number: 1},
+            {constants.workflow.Name: "Test", constants.jobs.Number: 2},
+        ],
+    }
+
+
+@responses.activate
+def test_download_jobs_skips_saved_and_unfinished_runs(tmp_path, monkeypatch):
+    """Check that only the jobs of completed runs that were not saved before are requested."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    workflows_dataframe = pandas.DataFrame(
+        {
+            constants.workflow.Id: [3, 2, 1],
+            constants.workflow.Status: ["in_progress", "completed", "completed"],
+            constants.workflow.Jobs_Url: [
+                create_jobs_url(run_id) for run_id in [3, 2, 1]
+            ],
+        }
+    )
+    # the jobs of the first run were saved by an earlier download
+    first_jobs_rows, first_steps_rows = jobs.create_jobs_and_steps_lists(
+        "gkapfham", "meSMSage", [create_job(1)]
+    )
+    files.save_dataframe(
+        tmp_path,
+        "gkapfham",
+        "meSMSage",
+        constants.filesystem.Jobs,
+        pandas.DataFrame(first_jobs_rows),
+    )
+    files.save_dataframe(
+        tmp_path,
+        "gkapfham",
+        "meSMSage",
+        constants.filesystem.Steps,
+        pandas.DataFrame(first_steps_rows),
+    )
+    responses.add(
+        responses.GET,
+        create_jobs_url(2),
+        json={"total_count": 1, "jobs": [create_job(2)]},
+        status=200,
+        headers=RATE_LIMIT_HEADERS,
+    )
+    valid, jobs_dataframe, steps_dataframe = jobs.download_jobs(
+        console, tmp_path, "gkapfham", "meSMSage", workflows_dataframe, 2
+    )
+    assert valid is True
+    assert [call.request.url.split("?")[0] for call in responses.calls] == [
+        create_jobs_url(2)
+    ]
+    assert sorted(jobs_dataframe[constants.jobs.Run_Id]) == [1, 2]
+    assert "html_url" not in jobs_dataframe.columns
+    assert len(steps_dataframe) == 4
+    assert sorted(set(steps_dataframe[constants.jobs.Job_Id])) == [10, 20]
+
+
+@responses.activate
+def test_request_jobs_follows_the_pages_of_the_listing(monkeypatch):
+    """Check that the jobs of a workflow run with more than one page of jobs are all requested."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    configure.setup(debug_level)
+    jobs_url = create_jobs_url(1)
+
+    def jobs_callback(prepared_request):
+        """Respond with the page of jobs in the request, linking to the second page."""
+        headers = dict(RATE_LIMIT_HEADERS)
+        if "page=2" in prepared_request.url:
+            return (200, headers, json.dumps({"jobs": [create_job(2)]}))
+        headers["Link"] = f'<{jobs_url}?per_page=100&page=2>; rel="next"'
+        return (200, headers, json.dumps({"jobs": [create_job(1)]}))
+
+    responses.add_callback(responses.GET, jobs_url, callback=jobs_callback)
+    with Progress() as progress:
+        valid, retry_count, _, jobs_list = jobs.request_jobs(
+            jobs_url, None, progress, 1
+        )
+    assert valid is True
+    assert retry_count == 0
+    assert len(responses.calls) == 2
+    assert [job[constants.workflow.Id] for job in jobs_list] == [10, 20]
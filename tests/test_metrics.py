@@ -0,0 +1,114 @@
+"""Tests for the metrics module."""
+
+import json
+
+import pandas
+import responses
+
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import files
+from workknow import metrics
+from workknow import request
+
+# the rate limit headers of each response make requests to /rate_limit unnecessary
+RATE_LIMIT_HEADERS = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}
+
+WORKFLOW_RUNS_URL = "https://api.github.com/repos/gkapfham/meSMSage/actions/runs"
+
+
+def test_find_repository_from_github_api_url():
+    """Check that the repository of a URL is found or that the URL counts for all repositories."""
+    assert metrics.find_repository(WORKFLOW_RUNS_URL) == "gkapfham/meSMSage"
+    assert (
+        metrics.find_repository(metrics.create_repository_url("gkapfham", "meSMSage"))
+        == "gkapfham/meSMSage"
+    )
+    assert (
+        metrics.find_repository("https://api.github.com/rate_limit")
+        == constants.metrics.All
+    )
+    assert metrics.find_repository(None) == constants.metrics.All
+
+
+def test_record_request_fills_cumulative_latency_histogram():
+    """Check that the latency buckets are cumulative and end with the count of all requests."""
+    registry = metrics.reset_metrics()
+    metrics.record_request(WORKFLOW_RUNS_URL, 0.01, 100)
+    metrics.record_request(WORKFLOW_RUNS_URL, 0.3, 50)
+    metrics.record_request(WORKFLOW_RUNS_URL, 60, 10)
+    repository_metrics = registry.to_dict()["gkapfham/meSMSage"]
+    assert repository_metrics[constants.metrics.Requests] == 3
+    assert repository_metrics[constants.metrics.Bytes] == 160
+    latency_dict = repository_metrics[constants.metrics.Latency_Seconds]
+    assert latency_dict[constants.metrics.Count] == 3
+    assert latency_dict[constants.metrics.Buckets]["0.05"] == 1
+    assert latency_dict[constants.metrics.Buckets]["0.25"] == 1
+    assert latency_dict[constants.metrics.Buckets]["0.5"] == 2
+    assert latency_dict[constants.metrics.Buckets]["10.0"] == 2
+    assert latency_dict[constants.metrics.Buckets][constants.metrics.Infinity] == 3
+
+
+@responses.activate
+def test_request_records_requests_bytes_and_decode_time(monkeypatch):
+    """Check that a request to the GitHub API is recorded for its repository."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    registry = metrics.reset_metrics()
+    responses.add(
+        responses.GET,
+        WORKFLOW_RUNS_URL,
+        json={"total_count": 0, "workflow_runs": []},
+        headers=RATE_LIMIT_HEADERS,
+    )
+    valid, _, _, json_responses = request.request_json_from_github(
+        WORKFLOW_RUNS_URL, console
+    )
+    assert valid
+    assert json_responses == [[]]
+    repository_metrics = registry.to_dict()["gkapfham/meSMSage"]
+    assert repository_metrics[constants.metrics.Requests] == 1
+    assert repository_metrics[constants.metrics.Bytes] == len(
+        responses.calls[0].response.content
+    )
+    assert repository_metrics[constants.metrics.Decode_Seconds] >= 0
+    assert repository_metrics[constants.metrics.Retries] == 0
+
+
+def test_write_metrics_saves_json_and_prometheus_textfile(tmp_path):
+    """Check that the metrics of a command are saved as JSON and as a Prometheus textfile."""
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    metrics.reset_metrics()
+    files.save_dataframe(
+        tmp_path, "gkapfham", "meSMSage", "Workflows", pandas.DataFrame({"id": [1]})
+    )
+    metrics.record_retry(WORKFLOW_RUNS_URL, 2)
+    metrics.record_request(WORKFLOW_RUNS_URL, 0.2, 10)
+    metrics_dir = tmp_path / "metrics"
+    json_file = metrics.write_metrics(console, metrics_dir, constants.metrics.Download)
+    metrics_dict = json.loads(json_file.read_text())
+    assert metrics_dict[constants.metrics.Command] == constants.metrics.Download
+    repository_metrics = metrics_dict[constants.metrics.Repositories][
+        "gkapfham/meSMSage"
+    ]
+    assert repository_metrics[constants.metrics.Retries] == 1
+    assert repository_metrics[constants.metrics.Sleep_Seconds] == 2
+    assert repository_metrics[constants.metrics.Write_Seconds] > 0
+    prometheus_text = (metrics_dir / "workknow-metrics-download.prom").read_text()
+    assert 'workknow_retries_total{repository="gkapfham/meSMSage"} 1' in prometheus_text
+    assert (
+        'workknow_request_latency_seconds_bucket{repository="gkapfham/meSMSage",le="0.25"} 1'
+        in prometheus_text
+    )
+    assert "# TYPE workknow_request_latency_seconds histogram" in prometheus_text
+    # the temporary textfile was renamed so that no partial file is ever read
+    assert not list(metrics_dir.glob("*" + constants.metrics.Temporary_Extension))
+
+
+def test_write_metrics_without_directory_does_nothing():
+    """Check that no metrics are written when a directory was not specified."""
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    assert metrics.write_metrics(console, None, constants.metrics.Combine) is None
@@ -0,0 +1,183 @@
+"""Tests for the pipeline module."""
+
+import json
+import re
+
+import responses
+
+from workknow import backend
+from workknow import checkpoint
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import pipeline
+
+REPO_URLS = [f"https://github.com/org/repo{number}" for number in range(4)]
+
+
+def workflow_runs_callback(prepared_request):
+    """Return two pages of workflow runs for every repository."""
+    repo = prepared_request.url.split("/")[5]
+    page = int(prepared_request.params.get(constants.github.Page, 1))
+    github_api_url = f"https://api.github.com/repos/org/{repo}/actions/runs"
+    headers = {
+        constants.rate.Header_Remaining: "4000",
+        constants.rate.Header_Reset: "0",
+    }
+    if page == 1:
+        headers["Link"] = (
+            f'<{github_api_url}?page=2>; rel="next", '
+            f'<{github_api_url}?page=2>; rel="last"'
+        )
+    workflow_runs = [
+        {
+            constants.workflow.Id: page * 10 + run,
+            constants.workflow.Name: f"{repo} build",
+            constants.workflow.Created_At: f"2021-08-0{page}T00:00:0{run}Z",
+            constants.workflow.Head_Commit: {"message": f"{repo} commit {run}"},
+        }
+        for run in range(3)
+    ]
+    body = {"total_count": 6, "workflow_runs": workflow_runs}
+    return (200, headers, json.dumps(body))
+
+
+def download_and_save(results_dir, repository_concurrency):
+    """Download and save all of the repositories with the provided concurrency."""
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    download_options = pipeline.DownloadOptions(
+        results_dir=results_dir,
+        save=True,
+        peek=False,
+        page_concurrency=1,
+        incremental=False,
+        checkpoint_journal=None,
+        backend=backend.Backend.SYNC,
+        shards=1,
+        per_workflow=False,
+        workflow_names=[],
+        jobs=False,
+        job_concurrency=1,
+    )
+    return pipeline.download_repositories(
+        console,
+        pipeline.find_repositories_to_download(REPO_URLS, {}),
+        download_options,
+        repository_concurrency,
+    )
+
+
+@responses.activate
+def test_concurrent_download_saves_same_files_as_sequential(tmp_path, monkeypatch):
+    """Check that downloading repositories at the same time saves identical files."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    responses.add_callback(
+        responses.GET,
+        re.compile(r"https://api\.github\.com/repos/org/repo\d/actions/runs.*"),
+        callback=workflow_runs_callback,
+    )
+    sequential_dir = tmp_path / "sequential"
+    concurrent_dir = tmp_path / "concurrent"
+    sequential_dir.mkdir()
+    concurrent_dir.mkdir()
+    sequential_results = download_and_save(sequential_dir, 1)
+    concurrent_results = download_and_save(concurrent_dir, 3)
+    assert set(concurrent_results.keys()) == set(REPO_URLS)
+    for repo_url in REPO_URLS:
+        assert concurrent_results[repo_url][1] == sequential_results[repo_url][1]
+    # note that the incremental state file is saved along with the CSV files
+    sequential_files = sorted(path.name for path in sequential_dir.iterdir())
+    assert len(sequential_files) == 2 * len(REPO_URLS) + 1
+    assert sorted(path.name for path in concurrent_dir.iterdir()) == sequential_files
+    for file_name in sequential_files:
+        assert (sequential_dir / file_name).read_bytes() == (
+            concurrent_dir / file_name
+        ).read_bytes()
+
+
+@responses.activate
+def test_download_results_are_yielded_in_order_of_repositories(tmp_path, monkeypatch):
+    """Check that the result of each repository is yielded in order while later ones are downloaded."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    responses.add_callback(
+        responses.GET,
+        re.compile(r"https://api\.github\.com/repos/org/repo\d/actions/runs.*"),
+        callback=workflow_runs_callback,
+    )
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    download_options = pipeline.DownloadOptions(
+        results_dir=tmp_path,
+        save=False,
+        peek=False,
+        page_concurrency=1,
+        incremental=False,
+        checkpoint_journal=None,
+        backend=backend.Backend.SYNC,
+        shards=1,
+        per_workflow=False,
+        workflow_names=[],
+        jobs=False,
+        job_concurrency=1,
+    )
+    download_results = pipeline.iterate_download_results(
+        console,
+        pipeline.find_repositories_to_download(REPO_URLS, {}),
+        download_options,
+        2,
+    )
+    yielded_urls = []
+    for repo_url, (valid, _, workflows_dataframe, _) in download_results:
+        assert valid
+        assert workflows_dataframe["repo"].unique().tolist() == [
+            repo_url.split("/")[-1]
+        ]
+        yielded_urls.append(repo_url)
+    assert yielded_urls == REPO_URLS
+
+
+@responses.activate
+def test_resumed_download_skips_runs_already_in_stored_pages(tmp_path, monkeypatch):
+    """Check that the runs that moved to a later page since the interruption are only counted once."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    responses.add_callback(
+        responses.GET,
+        re.compile(r"https://api\.github\.com/repos/org/repo\d/actions/runs.*"),
+        callback=workflow_runs_callback,
+    )
+    github_api_url = "https://api.github.com/repos/org/repo0/actions/runs"
+    checkpoint_journal = checkpoint.CheckpointJournal(tmp_path)
+    # the stored first page was downloaded before a newer run moved one of the runs
+    # (i.e., the run with the identifier 20) from the second page to the first page
+    checkpoint_journal.record_page(
+        github_api_url,
+        1,
+        [
+            {
+                constants.workflow.Id: identifier,
+                constants.workflow.Name: "repo0 build",
+                constants.workflow.Created_At: "2021-08-01T00:00:00Z",
+                constants.workflow.Head_Commit: {"message": "repo0 commit"},
+            }
+            for identifier in [11, 12, 20]
+        ],
+    )
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    download_options = pipeline.DownloadOptions(
+        results_dir=tmp_path,
+        save=False,
+        peek=False,
+        page_concurrency=1,
+        incremental=False,
+        checkpoint_journal=checkpoint.CheckpointJournal(tmp_path, resume=True),
+        backend=backend.Backend.SYNC,
+        shards=1,
+        per_workflow=False,
+        workflow_names=[],
+        jobs=False,
+        job_concurrency=1,
+    )
+    valid, _, workflows_dataframe, _ = pipeline.download_repository(
+        console, REPO_URLS[0], "org", "repo0", download_options
+    )
+    assert valid
+    assert workflows_dataframe["id"].tolist() == [11, 12, 20, 21, 22]
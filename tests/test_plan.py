@@ -0,0 +1,71 @@
+"""Tests for the plan module."""
+
+import pandas
+
+from workknow import configure
+from workknow import debug
+from workknow import metrics
+from workknow import plan
+from workknow import produce
+
+REPO_URLS = [
+    "https://github.com/gkapfham/meSMSage",
+    "https://github.com/gkapfham/meSMSage.git",
+    "https://github.com/gkapfham/meSMSage/",
+    "https://github.com/GKapfham/MeSMSage",
+    "https://github.com/gkapfham/other",
+    "not a url",
+    "http://github.com/gkapfham/meSMSage/",
+]
+
+
+def test_create_download_plan_removes_duplicate_repositories():
+    """Check that each repository is only planned once, no matter how its URL is written."""
+    download_plan = plan.create_download_plan(REPO_URLS)
+    assert download_plan.repo_urls == [REPO_URLS[0], REPO_URLS[4]]
+    assert download_plan.duplicate_urls == REPO_URLS[1:4]
+    # the URLs that are not valid (e.g., those with http://, which giturlparse
+    # does not accept) are neither planned nor counted as duplicates
+    assert download_plan.url_mapping == {
+        REPO_URLS[0]: REPO_URLS[0],
+        REPO_URLS[1]: REPO_URLS[0],
+        REPO_URLS[2]: REPO_URLS[0],
+        REPO_URLS[3]: REPO_URLS[0],
+        REPO_URLS[4]: REPO_URLS[4],
+    }
+
+
+def test_count_saved_requests_uses_requests_of_planned_repository():
+    """Check that each duplicate URL saved the requests made for its repository."""
+    configure.setup(debug.DebugLevel.ERROR)
+    metrics.reset_metrics()
+    github_api_url = produce.create_github_api_url("gkapfham", "meSMSage")
+    for _ in range(2):
+        metrics.record_request(github_api_url, 0.1, 10)
+    download_plan = plan.create_download_plan(REPO_URLS)
+    assert plan.count_saved_requests(download_plan) == 6
+
+
+def test_merge_joins_counts_to_every_row_of_duplicate_urls():
+    """Check that the rows of the CSV file with duplicate URLs get the counts of their repository."""
+    download_plan = plan.create_download_plan(REPO_URLS)
+    repos_dataframe = pandas.DataFrame({"url": REPO_URLS[:5], "stars": [1, 2, 3, 4, 5]})
+    count_dataframe = pandas.DataFrame(
+        {
+            "workflow_build_count": [10, 20],
+            "repo_url": download_plan.repo_urls,
+        }
+    )
+    merged_dataframe = produce.merge_repo_urls_with_count_data(
+        repos_dataframe, count_dataframe, download_plan.url_mapping
+    )
+    assert len(merged_dataframe) == 5
+    assert dict(
+        zip(merged_dataframe["repo_url"], merged_dataframe["workflow_build_count"])
+    ) == {
+        REPO_URLS[0]: 10,
+        REPO_URLS[1]: 10,
+        REPO_URLS[2]: 10,
+        REPO_URLS[3]: 10,
+        REPO_URLS[4]: 20,
+    }
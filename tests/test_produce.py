@@ -0,0 +1,193 @@
+"""Tests for the produce module."""
+
+from giturlparse import parse  # type: ignore
+
+from workknow import constants
+from workknow import metrics
+from workknow import produce
+
+ORGANIZATION = "org"
+REPO = "repo"
+REPO_URL = "https://github.com/org/repo"
+GITHUB_API_URL = "https://api.github.com/repos/org/repo/actions/runs"
+
+
+def create_json_responses():
+    """Create two pages of workflow runs that include keys that are not kept."""
+    return [
+        [
+            {
+                constants.workflow.Id: page * 10 + run,
+                constants.workflow.Name: "build",
+                constants.workflow.Created_At: f"2021-08-0{page}T00:00:0{run}Z",
+                constants.workflow.Head_Commit: {
+                    "message": f"commit {run}",
+                    "author": {"name": "Author"},
+                },
+                "repository": {"id": 1, "name": REPO},
+            }
+            for run in range(3)
+        ]
+        for page in range(1, 3)
+    ]
+
+
+def test_create_dataframes_from_pages_matches_separate_functions():
+    """Check that consuming a generator of pages creates the same outputs as the lists."""
+    json_responses = create_json_responses()
+    (
+        count_dictionary,
+        workflows_dataframe,
+        commits_dataframe,
+    ) = produce.create_dataframes_from_pages(
+        ORGANIZATION,
+        REPO,
+        REPO_URL,
+        GITHUB_API_URL,
+        (workflow_runs for workflow_runs in create_json_responses()),
+    )
+    assert count_dictionary == produce.create_workflow_record_count_dictionary(
+        ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, json_responses
+    )
+    assert workflows_dataframe.equals(
+        produce.create_workflows_dataframe(
+            ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, json_responses
+        )
+    )
+    assert commits_dataframe.equals(
+        produce.create_commits_dataframe(
+            ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, json_responses
+        )
+    )
+    assert "repository" not in workflows_dataframe.columns
+
+
+def test_create_dataframes_from_pages_records_the_memory_of_the_schema():
+    """Check that the memory of the DataFrames before and after the schema is in the metrics of the repository."""
+    registry = metrics.reset_metrics()
+    (
+        _,
+        workflows_dataframe,
+        commits_dataframe,
+    ) = produce.create_dataframes_from_pages(
+        ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, create_json_responses()
+    )
+    repository_metrics = registry.to_dict()[f"{ORGANIZATION}/{REPO}"]
+    assert repository_metrics[constants.metrics.Typed_Memory_Bytes] == int(
+        workflows_dataframe.memory_usage(deep=True).sum()
+        + commits_dataframe.memory_usage(deep=True).sum()
+    )
+    assert repository_metrics[constants.metrics.Untyped_Memory_Bytes] > 0
+    assert (
+        registry.get_total(constants.metrics.Typed_Memory_Bytes)
+        == repository_metrics[constants.metrics.Typed_Memory_Bytes]
+    )
+
+
+def test_create_dataframes_from_pages_matches_separate_functions_for_irregular_runs():
+    """Check that the single pass keeps the missing, null, and nested fields like the separate functions."""
+    json_responses = create_json_responses()
+    # a run without a name, a run without a commit, and a run with a null commit
+    del json_responses[0][0][constants.workflow.Name]
+    del json_responses[0][1][constants.workflow.Head_Commit]
+    json_responses[1][0][constants.workflow.Head_Commit] = None
+    # a commit with a more deeply nested field that only appears in a later page
+    json_responses[1][1][constants.workflow.Head_Commit]["author"]["address"] = {
+        "city": "Meadville"
+    }
+    json_responses[1][2][constants.workflow.Status] = None
+    (
+        count_dictionary,
+        workflows_dataframe,
+        commits_dataframe,
+    ) = produce.create_dataframes_from_pages(
+        ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, json_responses
+    )
+    assert count_dictionary[constants.workflow.Workflow_Build_Count] == 6
+    expected_workflows_dataframe = produce.create_workflows_dataframe(
+        ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, json_responses
+    )
+    expected_commits_dataframe = produce.create_commits_dataframe(
+        ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, json_responses
+    )
+    assert list(workflows_dataframe.columns) == list(
+        expected_workflows_dataframe.columns
+    )
+    assert list(commits_dataframe.columns) == list(expected_commits_dataframe.columns)
+    assert workflows_dataframe.equals(expected_workflows_dataframe)
+    assert commits_dataframe.equals(expected_commits_dataframe)
+    assert "head_commit_author_address_city" in commits_dataframe.columns
+
+
+def test_create_dataframes_from_pages_without_runs():
+    """Check that a repository without any workflow runs has empty DataFrames."""
+    (
+        count_dictionary,
+        workflows_dataframe,
+        commits_dataframe,
+    ) = produce.create_dataframes_from_pages(
+        ORGANIZATION, REPO, REPO_URL, GITHUB_API_URL, [[]]
+    )
+    assert count_dictionary[constants.workflow.Workflow_Build_Count] == 0
+    assert workflows_dataframe.empty
+    assert commits_dataframe.empty
+
+
+def test_parse_github_urls_matches_giturlparse_for_every_form():
+    """Check that the fast path and giturlparse give the same names for each form of URL."""
+    github_urls = [
+        "https://github.com/gkapfham/meSMSage",
+        "https://github.com/gkapfham/meSMSage.git",
+        "https://github.com/gkapfham/meSMSage/",
+        "https://github.com/gkapfham/gkapfham.github.io",
+        "git@github.com:gkapfham/meSMSage.git",
+        "https://github.com/gkapfham/meSMSage/tree/main",
+        "https://github.com/gkapfham/meSMSage",
+        "not a url",
+    ]
+    assert produce.parse_github_urls(github_urls) == [
+        ("gkapfham", "meSMSage"),
+        ("gkapfham", "meSMSage"),
+        ("gkapfham", "meSMSage"),
+        ("gkapfham", "gkapfham.github.io"),
+        ("gkapfham", "meSMSage"),
+        ("gkapfham", "meSMSage"),
+        ("gkapfham", "meSMSage"),
+        (None, None),
+    ]
+    # only the URLs that do not match the fast path are parsed by giturlparse
+    assert produce.GITHUB_URL_PATTERN.match(github_urls[4]) is None
+    assert produce.parse_github_url(github_urls[0]) == ("gkapfham", "meSMSage")
+
+
+def test_fast_path_gives_the_same_result_as_giturlparse():
+    """Check that the pattern of the fast path only matches URLs that giturlparse parses to the same names."""
+    github_urls = [
+        "https://github.com/gkapfham/meSMSage",
+        "https://github.com/gkapfham/meSMSage/",
+        "https://github.com/gkapfham/meSMSage.git",
+        "https://github.com/gkapfham/meSMSage.git/",
+        "https://github.com/GKapfham/MeSMSage",
+        "https://github.com/gkapfham/repo.name.git",
+        "https://github.com/gkapfham/repo.git.git",
+        "https://github.com/gkapfham-org/re_po-",
+        "https://github.com/gkapfham/.github",
+        "http://github.com/gkapfham/meSMSage",
+        "http://github.com/gkapfham/meSMSage/",
+        "https://github.com/gkapfham/meSMSage//",
+        "https://github.com/gkapfham",
+        "https://GitHub.com/gkapfham/meSMSage",
+        "https://github.com/gkapfham/meSMSage/tree/main",
+        "ftp://github.com/gkapfham/meSMSage",
+    ]
+    for github_url in github_urls:
+        github_url_parse = parse(github_url)
+        expected_names = (
+            (github_url_parse.owner, github_url_parse.repo)
+            if github_url_parse.valid
+            else (None, None)
+        )
+        url_match = produce.GITHUB_URL_PATTERN.match(github_url)
+        if url_match is not None:
+            assert url_match.groups() == expected_names, github_url
+        assert produce.parse_github_url(github_url) == expected_names, github_url
@@ -0,0 +1,175 @@
+"""Tests for the profiler module."""
+
+import pstats
+import threading
+import tracemalloc
+
+import pandas
+
+from typer.testing import CliRunner
+
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import files
+from workknow import main
+from workknow import profiler
+
+runner = CliRunner()
+
+
+@profiler.profile_stage(constants.profile.Produce)
+def create_rows(count):
+    """Create a list of rows, as a stand-in for a stage of the pipeline."""
+    return [{"id": identifier} for identifier in range(count)]
+
+
+@profiler.profile_stage(constants.profile.Request)
+def request_and_create_rows(count):
+    """Create rows inside of another stage so that the stages are nested."""
+    return create_rows(count)
+
+
+def test_profile_stage_does_nothing_when_profiling_is_not_enabled():
+    """Check that a decorated function runs as usual without a profiler."""
+    profiler.configure_profiler(False)
+    assert len(create_rows(3)) == 3
+    assert profiler.get_profiler() is None
+
+
+def test_nested_stages_are_profiled_separately(tmp_path):
+    """Check that each stage only has the functions that ran while it was the innermost stage."""
+    stage_profiler = profiler.configure_profiler(True)
+    assert len(request_and_create_rows(1000)) == 1000
+    assert stage_profiler.stage_calls == {
+        constants.profile.Request: 1,
+        constants.profile.Produce: 1,
+    }
+    produce_functions = [
+        function
+        for function, _, _ in stage_profiler.find_top_functions(
+            constants.profile.Produce
+        )
+    ]
+    request_functions = [
+        function
+        for function, _, _ in stage_profiler.find_top_functions(
+            constants.profile.Request
+        )
+    ]
+    assert any("create_rows" in function for function in produce_functions)
+    assert not any(
+        "<listcomp>" in function or "<dictcomp>" in function
+        for function in request_functions
+    )
+    assert stage_profiler.stage_peaks[constants.profile.Produce] > 0
+    # the profile and the snapshot of each stage are saved and can be read again
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    profiler.finish_profiler(console, tmp_path)
+    assert profiler.get_profiler() is None
+    stats_file = tmp_path / (
+        constants.profile.File_Prefix
+        + constants.profile.Produce
+        + constants.profile.Stats_Extension
+    )
+    assert pstats.Stats(str(stats_file)).total_calls > 0
+    assert (
+        tmp_path
+        / (
+            constants.profile.File_Prefix
+            + constants.profile.Request
+            + constants.profile.Snapshot_Extension
+        )
+    ).exists()
+
+
+def allocate_in_stage_while_another_thread_starts_a_stage():
+    """Allocate and free memory in a stage before a stage in another thread starts and return the peak."""
+    stage_profiler = profiler.configure_profiler(True)
+    with profiler.stage(constants.profile.Produce):
+        rows = [{"id": identifier} for identifier in range(100000)]
+        del rows
+        thread = threading.Thread(target=create_rows, args=(1,))
+        thread.start()
+        thread.join()
+    console, _ = configure.setup(debug.DebugLevel.ERROR)
+    profiler.finish_profiler(console, None)
+    return stage_profiler.stage_peaks[constants.profile.Produce]
+
+
+def test_stage_in_another_thread_does_not_clear_the_peak(tmp_path, monkeypatch):
+    """Check that the peak of a stage is kept when a stage in another thread resets the traced peak."""
+    monkeypatch.chdir(tmp_path)
+    assert (
+        allocate_in_stage_while_another_thread_starts_a_stage()
+        > constants.profile.Bytes_Per_Megabyte
+    )
+
+
+def test_peak_is_measured_without_resetting_the_traced_peak(tmp_path, monkeypatch):
+    """Check that the peak of a stage is measured when tracemalloc cannot reset its peak."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    assert (
+        allocate_in_stage_while_another_thread_starts_a_stage()
+        > constants.profile.Bytes_Per_Megabyte
+    )
+
+
+def test_combine_with_profile_saves_profiles_next_to_results(tmp_path):
+    """Check that the combine command saves the profiles of its stages in the results directory."""
+    csv_dir = tmp_path / "csv"
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    for repo in ["first", "second"]:
+        files.save_dataframe(
+            csv_dir, "gkapfham", repo, "Workflows", pandas.DataFrame({"id": [1, 2]})
+        )
+        files.save_dataframe(
+            csv_dir, "gkapfham", repo, "Commits", pandas.DataFrame({"id": [1, 2]})
+        )
+    result = runner.invoke(
+        main.cli,
+        [
+            "combine",
+            "--csv-dir",
+            str(csv_dir),
+            "--results-dir",
+            str(results_dir),
+            "--save",
+            "--profile",
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Stage concatenate" in result.output
+    for stage in [constants.profile.Concatenate, constants.profile.Files]:
+        assert (
+            results_dir
+            / (
+                constants.profile.File_Prefix
+                + stage
+                + constants.profile.Stats_Extension
+            )
+        ).exists()
+
+
+def test_snapshot_is_only_taken_when_the_peak_grows_by_a_margin():
+    """Check that a stage keeps its snapshot until its peak grows by a margin above the peak of that snapshot."""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    stage_profiler = profiler.StageProfiler(started_tracing, 1.5)
+    snapshots = []
+    for peak_bytes in [1000, 1400, 1600]:
+        stage_frame = profiler.StageFrame(constants.profile.Produce)
+        stage_frame.stage_profile = None
+        stage_frame.start_memory = 0
+        stage_frame.peak_memory = peak_bytes
+        stage_profiler.record(stage_frame)
+        snapshots.append(stage_profiler.stage_snapshots[constants.profile.Produce])
+    if started_tracing:
+        tracemalloc.stop()
+    # the peak is always the highest one, even when it did not grow by the margin
+    assert stage_profiler.stage_peaks[constants.profile.Produce] == 1600
+    assert snapshots[1] is snapshots[0]
+    assert snapshots[2] is not snapshots[1]
@@ -0,0 +1,53 @@
+"""Tests for the projection module."""
+
+import pytest
+
+from workknow import constants
+from workknow import produce
+from workknow import projection
+
+
+@pytest.fixture(autouse=True)
+def reset_schema():
+    """Make sure that the extra fields of a test are not used by any other test."""
+    yield
+    projection.configure_schema([])
+
+
+def create_workflow_run():
+    """Create a workflow run with nested objects like the ones from the GitHub API."""
+    return {
+        constants.workflow.Id: 1,
+        constants.workflow.Event: "push",
+        constants.workflow.Head_Commit: {"message": "commit"},
+        "run_attempt": 2,
+        "repository": {"id": 7, "owner": {"login": "org"}},
+        "head_repository": {"full_name": "org/repo"},
+    }
+
+
+def test_project_workflow_runs_drops_unused_fields():
+    """Check that only the fields needed by the DataFrames are kept."""
+    assert projection.project_workflow_runs([create_workflow_run()]) == [
+        {
+            constants.workflow.Id: 1,
+            constants.workflow.Event: "push",
+            constants.workflow.Head_Commit: {"message": "commit"},
+        }
+    ]
+
+
+def test_extra_fields_are_kept_and_become_workflow_columns():
+    """Check that top-level and nested extra fields are kept as workflows columns."""
+    projection.configure_schema(
+        ["run_attempt", "head_repository.full_name", "repository.owner.missing"]
+    )
+    projected_workflow_runs = projection.project_workflow_runs([create_workflow_run()])
+    assert "repository" not in projected_workflow_runs[0]
+    assert projected_workflow_runs[0]["head_repository_full_name"] == "org/repo"
+    assert projected_workflow_runs[0]["repository_owner_missing"] is None
+    workflows_dataframe = produce.create_workflows_dataframe(
+        "org", "repo", "url", "api", [projected_workflow_runs]
+    )
+    assert workflows_dataframe["run_attempt"].tolist() == [2]
+    assert workflows_dataframe["head_repository_full_name"].tolist() == ["org/repo"]
@@ -1,5 +1,8 @@
 """Tests for the request module."""
 
+import json
+
+import pytest
 import requests
 import responses
 
@@ -12,6 +15,15 @@ from workknow import configure
 from workknow import constants
 from workknow import debug
 from workknow import request
+from workknow import retry
+
+
+@pytest.fixture(autouse=True)
+def disable_retry_jitter():
+    """Disable the random jitter so that the exponential back-off is deterministic."""
+    retry.configure_policy(0)
+    yield
+    retry.configure_policy()
 
 
 @responses.activate
@@ -273,3 +285,195 @@ def test_failure_backoff_three_retries_mocked():
     assert json_responses_list == []
     assert total_retry_count == 3
     assert total_retry_time == (1 + 2 + 4)
+
+
+def create_paginated_callback(github_api_url, last_page):
+    """Create a callback for responses that returns one workflow run for each page."""
+
+    def paginated_callback(prepared_request):
+        """Return the requested page along with links to the next and the last page."""
+        page = int(prepared_request.params.get(constants.github.Page, 1))
+        headers = {
+            constants.rate.Header_Limit: "5000",
+            constants.rate.Header_Remaining: str(5000 - page),
+            constants.rate.Header_Reset: "0",
+        }
+        if page < last_page:
+            headers["Link"] = (
+                f'<{github_api_url}?page={page + 1}>; rel="next", '
+                f'<{github_api_url}?page={last_page}>; rel="last"'
+            )
+        body = {"total_count": last_page, "workflow_runs": [{"id": page}]}
+        return (200, headers, json.dumps(body))
+
+    return paginated_callback
+
+
+@responses.activate
+def test_workflow_run_pages_are_requested_only_when_needed(monkeypatch):
+    """Check that iterating through the pages requests each page only when it is needed."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    github_api_url = "https://api.github.com/repos/home-assistant/core/actions/runs"
+    responses.add_callback(
+        responses.GET,
+        github_api_url,
+        callback=create_paginated_callback(github_api_url, 5),
+    )
+    workflow_run_pages = request.WorkflowRunPages(github_api_url, console, 1)
+    workflow_run_pages_iterator = iter(workflow_run_pages)
+    assert next(workflow_run_pages_iterator) == [{"id": 1}]
+    assert next(workflow_run_pages_iterator) == [{"id": 2}]
+    assert len(responses.calls) == 2
+    assert list(workflow_run_pages_iterator) == [[{"id": 3}], [{"id": 4}], [{"id": 5}]]
+    assert workflow_run_pages.valid is True
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_request_json_from_github_concurrent_pages_in_order(monkeypatch):
+    """Check that pages requested concurrently are reassembled in page order."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    github_api_url = "https://api.github.com/repos/home-assistant/core/actions/runs"
+    # define the responses for the paginated workflow runs and the rate limit details;
+    # since there are many requests remaining the program will never sleep
+    responses.add_callback(
+        responses.GET,
+        github_api_url,
+        callback=create_paginated_callback(github_api_url, 7),
+    )
+    responses.add(
+        responses.GET,
+        constants.rate.Rate_Limit_Url,
+        json={"resources": {"core": {"remaining": 5000, "reset": 0}}},
+        status=200,
+    )
+    (
+        valid,
+        total_retry_count,
+        total_retry_time,
+        json_responses_list,
+    ) = request.request_json_from_github(github_api_url, console, 1, 3)
+    assert valid is True
+    assert total_retry_count == 0
+    assert total_retry_time == 0
+    assert [page[0]["id"] for page in json_responses_list] == [1, 2, 3, 4, 5, 6, 7]
+    # the rate limit headers of each page made requests to /rate_limit unnecessary
+    rate_limit_calls = [
+        call
+        for call in responses.calls
+        if call.request.url == constants.rate.Rate_Limit_Url
+    ]
+    assert len(rate_limit_calls) == 0
+
+
+@responses.activate
+def test_failure_permanent_fails_fast_mocked():
+    """Check that a mocked request for a missing repository is not retried."""
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    github_api_url = "https://api.github.com/repos/home-assistant/missing/actions/runs"
+    # define the response that the mocked API will return for all interactions;
+    # a deleted or renamed repository results in a 404 response code
+    responses.add(
+        responses.GET,
+        github_api_url,
+        json={"message": "Not Found"},
+        status=404,
+    )
+    retry.reset_retry_counters()
+    (
+        valid,
+        total_retry_count,
+        total_retry_time,
+        json_responses_list,
+    ) = request.request_json_from_github(github_api_url, console, 3)
+    assert valid is False
+    assert json_responses_list == []
+    assert total_retry_count == 0
+    assert total_retry_time == 0
+    assert len(responses.calls) == 1
+    assert retry.get_retry_counters()[constants.retry.Permanent] == 1
+
+
+@responses.activate
+def test_failure_rate_limited_honors_retry_after_mocked(monkeypatch):
+    """Check that a mocked secondary rate limit response waits for the Retry-After time."""
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    github_api_url = "https://api.github.com/repos/home-assistant/core/actions/runs"
+    # record the sleeps instead of actually sleeping
+    sleep_times = []
+    monkeypatch.setattr(request.time, "sleep", sleep_times.append)
+    responses.add(
+        responses.GET,
+        github_api_url,
+        json={"message": "You have exceeded a secondary rate limit"},
+        status=403,
+        headers={constants.retry.Retry_After: "30"},
+    )
+    (
+        valid,
+        total_retry_count,
+        total_retry_time,
+        _,
+    ) = request.request_json_from_github(github_api_url, console, 2)
+    assert valid is False
+    assert total_retry_count == 2
+    assert sleep_times == [30, 30]
+    assert total_retry_time == 60
+
+
+def test_stream_pages_concurrently_keeps_order_and_bounds_the_pages_ahead():
+    """Check that the pages of each listing are in order and only a window of pages is downloaded ahead."""
+    produced_pages = {"first": 0, "second": 0}
+
+    def create_listing(name, page_count):
+        """Create a listing whose pages record that they were produced."""
+        for page in range(page_count):
+            produced_pages[name] = produced_pages[name] + 1
+            yield [{"id": f"{name}-{page}"}]
+
+    with request.stream_pages_concurrently(
+        [create_listing("first", 3), create_listing("second", 20)], 2
+    ) as pages_iterators:
+        first_pages = list(pages_iterators[0])
+        assert first_pages == [[{"id": f"first-{page}"}] for page in range(3)]
+        # the second listing is not consumed yet and thus it only fills its queue
+        assert produced_pages["second"] <= constants.github.Page_Window_Factor + 1
+        assert next(pages_iterators[1]) == [{"id": "second-0"}]
+    # the pages after the ones that were consumed are never produced
+    assert produced_pages["second"] < 20
+
+
+def test_stream_pages_concurrently_raises_the_error_of_a_listing():
+    """Check that an error while downloading a listing is raised in the thread of the caller."""
+
+    def create_failing_listing():
+        """Create a listing that fails after its first page."""
+        yield [{"id": 1}]
+        raise ValueError("not downloaded")
+
+    with request.stream_pages_concurrently([create_failing_listing()], 1) as (
+        pages_iterator,
+    ):
+        assert next(pages_iterator) == [{"id": 1}]
+        with pytest.raises(ValueError, match="not downloaded"):
+            next(pages_iterator)
+
+
+def test_use_progress_shares_a_display_or_creates_one():
+    """Check that a shared progress display is used as it is and that a new one is created otherwise."""
+    shared_progress = Progress()
+    with request.use_progress(shared_progress) as progress:
+        assert progress is shared_progress
+    with request.use_progress(None) as progress:
+        assert isinstance(progress, Progress)
+        assert progress is not shared_progress
@@ -0,0 +1,77 @@
+"""Tests for the retry module."""
+
+import time
+
+import pytest
+
+from workknow import constants
+from workknow import retry
+from workknow import tokens
+
+
+@pytest.mark.parametrize(
+    "status_code,headers,expected_class",
+    [
+        (200, {}, constants.retry.Success),
+        (304, {}, constants.retry.Success),
+        (401, {}, constants.retry.Permanent),
+        (403, {}, constants.retry.Permanent),
+        (404, {}, constants.retry.Permanent),
+        (410, {}, constants.retry.Permanent),
+        (422, {}, constants.retry.Permanent),
+        (403, {constants.retry.Retry_After: "60"}, constants.retry.Rate_Limited),
+        (403, {constants.rate.Header_Remaining: "0"}, constants.retry.Rate_Limited),
+        (429, {}, constants.retry.Rate_Limited),
+        (500, {}, constants.retry.Transient),
+        (502, {}, constants.retry.Transient),
+    ],
+)
+def test_classify_response(status_code, headers, expected_class):
+    """Check that responses are classified by their status code and headers."""
+    assert retry.classify_response(status_code, headers) == expected_class
+
+
+def test_calculate_retry_sleep_time_honors_retry_after():
+    """Check that the Retry-After header takes precedence over the back-off."""
+    headers = {constants.retry.Retry_After: "17"}
+    assert (
+        retry.calculate_retry_sleep_time(constants.retry.Rate_Limited, headers, 4) == 17
+    )
+
+
+def test_calculate_retry_sleep_time_adds_bounded_jitter():
+    """Check that the jitter added to the back-off stays within its fraction."""
+    retry.configure_policy(0.5)
+    for _ in range(100):
+        sleep_time = retry.calculate_retry_sleep_time(constants.retry.Transient, {}, 8)
+        assert 8 <= sleep_time <= 12
+    retry.configure_policy(0)
+    assert retry.calculate_retry_sleep_time(constants.retry.Transient, {}, 8) == 8
+    retry.configure_policy()
+
+
+def test_calculate_retry_sleep_time_rotates_or_waits_for_the_reset():
+    """Check that a spent token waits for its reset unless another token in the pool has a budget."""
+    reset = int(time.time()) + 60
+    headers = {
+        constants.rate.Header_Remaining: "0",
+        constants.rate.Header_Reset: str(reset),
+    }
+    sleep_time = retry.calculate_retry_sleep_time(
+        constants.retry.Rate_Limited, headers, 4
+    )
+    assert 60 < sleep_time <= 60 + constants.rate.Extra_Seconds
+    tokens.configure_token_pool(["first", "second"])
+    try:
+        assert (
+            retry.calculate_retry_sleep_time(constants.retry.Rate_Limited, headers, 4)
+            == 0
+        )
+        # a secondary rate limit is honored even when another token has a budget
+        headers[constants.retry.Retry_After] = "17"
+        assert (
+            retry.calculate_retry_sleep_time(constants.retry.Rate_Limited, headers, 4)
+            == 17
+        )
+    finally:
+        tokens.configure_token_pool([])
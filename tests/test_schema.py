@@ -0,0 +1,137 @@
+"""Tests for the schema module."""
+
+import pandas
+
+from workknow import configure
+from workknow import concatenate
+from workknow import debug
+from workknow import files
+from workknow import produce
+from workknow import schema
+
+
+def create_workflow_runs(count):
+    """Create workflow runs like those returned by the GitHub API."""
+    return [
+        {
+            "id": identifier,
+            "name": "build",
+            "created_at": "2021-03-0{}T12:00:00Z".format(identifier % 9 + 1),
+            "updated_at": "2021-03-0{}T12:05:00Z".format(identifier % 9 + 1),
+            "event": "push",
+            "status": "completed",
+            "conclusion": "success" if identifier % 2 else "failure",
+            "head_commit": {
+                "timestamp": "2021-03-01T11:59:00Z",
+                "author": {"name": "Author", "email": "author@example.com"},
+                "committer": {"name": "Committer", "email": "committer@example.com"},
+            },
+        }
+        for identifier in range(1, count + 1)
+    ]
+
+
+def test_workflows_and_commits_dataframes_have_the_types_of_the_schema():
+    """Check that the DataFrames built from the workflow runs have the types of the schema."""
+    workflow_runs = create_workflow_runs(5)
+    _, workflows_dataframe, commits_dataframe = produce.create_dataframes_from_pages(
+        "gkapfham",
+        "meSMSage",
+        "https://github.com/gkapfham/meSMSage",
+        "https://api.github.com/repos/gkapfham/meSMSage/actions/runs",
+        [workflow_runs],
+    )
+    assert workflows_dataframe["id"].dtype == "int64"
+    assert workflows_dataframe["created_at"].dtype == "datetime64[ns, UTC]"
+    assert workflows_dataframe["updated_at"].dtype == "datetime64[ns, UTC]"
+    # each of the timestamps in the format of the GitHub API is parsed
+    assert not workflows_dataframe["created_at"].isna().any()
+    assert workflows_dataframe["created_at"].iloc[0] == pandas.Timestamp(
+        "2021-03-02T12:00:00Z"
+    )
+    assert not commits_dataframe["head_commit_timestamp"].isna().any()
+    for name in ["name", "event", "status", "conclusion", "organization", "repo"]:
+        assert isinstance(workflows_dataframe[name].dtype, pandas.CategoricalDtype)
+    assert commits_dataframe["head_commit_timestamp"].dtype == "datetime64[ns, UTC]"
+    assert isinstance(
+        commits_dataframe["head_commit_author_email"].dtype, pandas.CategoricalDtype
+    )
+    # the schema is only applied once and thus applying it again changes nothing
+    assert schema.apply_workflows_schema(workflows_dataframe) is workflows_dataframe
+
+
+def test_concatenate_dataframes_keeps_categories_with_different_values():
+    """Check that DataFrames with different categories are concatenated into categories."""
+    first_dataframe = schema.apply_workflows_schema(
+        pandas.DataFrame({"id": [1, 2], "repo": ["first", "first"]})
+    )
+    second_dataframe = schema.apply_workflows_schema(
+        pandas.DataFrame({"id": [3], "repo": ["second"]})
+    )
+    combined_dataframe = schema.concatenate_dataframes(
+        [first_dataframe, second_dataframe], ignore_index=True
+    )
+    assert isinstance(combined_dataframe["repo"].dtype, pandas.CategoricalDtype)
+    assert combined_dataframe["repo"].tolist() == ["first", "first", "second"]
+    assert combined_dataframe["id"].tolist() == [1, 2, 3]
+
+
+def test_saved_timestamps_keep_the_format_of_the_github_api(tmp_path):
+    """Check that typed timestamps are saved and formatted like those from the GitHub API."""
+    workflows_dataframe = schema.apply_workflows_schema(
+        pandas.DataFrame({"id": [1], "created_at": ["2021-03-01T12:00:00Z"]})
+    )
+    assert (
+        schema.format_datetime(workflows_dataframe["created_at"].iloc[0])
+        == "2021-03-01T12:00:00Z"
+    )
+    assert schema.format_datetime("not a timestamp") == "not a timestamp"
+    files.save_dataframe(
+        tmp_path, "gkapfham", "meSMSage", "Workflows", workflows_dataframe
+    )
+    saved_dataframe = files.read_dataframe(
+        tmp_path, "gkapfham", "meSMSage", "Workflows"
+    )
+    assert saved_dataframe["created_at"].tolist() == ["2021-03-01T12:00:00Z"]
+
+
+def test_combine_files_applies_schema_and_uses_less_memory(tmp_path):
+    """Check that the combined DataFrames have the types of the schema and use less memory."""
+    configure.setup(debug.DebugLevel.ERROR)
+    for repo in ["first", "second"]:
+        (
+            _,
+            workflows_dataframe,
+            commits_dataframe,
+        ) = produce.create_dataframes_from_pages(
+            "gkapfham",
+            repo,
+            f"https://github.com/gkapfham/{repo}",
+            f"https://api.github.com/repos/gkapfham/{repo}/actions/runs",
+            [create_workflow_runs(200)],
+        )
+        files.save_dataframe(
+            tmp_path, "gkapfham", repo, "Workflows", workflows_dataframe
+        )
+        files.save_dataframe(tmp_path, "gkapfham", repo, "Commits", commits_dataframe)
+    (
+        counts_dataframe,
+        commits_dataframe,
+        workflows_dataframe,
+    ) = concatenate.combine_files_in_directory(tmp_path)
+    assert len(workflows_dataframe) == 400
+    assert len(commits_dataframe) == 400
+    assert counts_dataframe["repo"].tolist() == ["first", "second"]
+    assert isinstance(workflows_dataframe["repo"].dtype, pandas.CategoricalDtype)
+    assert workflows_dataframe["created_at"].dtype == "datetime64[ns, UTC]"
+    untyped_dataframe = pandas.read_csv(
+        str(
+            files.create_repository_file_path(
+                tmp_path, "gkapfham", "first", "Workflows"
+            )
+        )
+    )
+    typed_dataframe = schema.apply_workflows_schema(untyped_dataframe)
+    assert schema.calculate_memory(typed_dataframe) < schema.calculate_memory(
+        untyped_dataframe
+    )
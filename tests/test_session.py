@@ -0,0 +1,59 @@
+"""Tests for the session module."""
+
+import responses
+
+from workknow import constants
+from workknow import session
+
+
+def test_create_session_configures_pool_and_headers():
+    """Check that a created session has a pooled adapter and the default headers."""
+    github_authentication = (constants.github.User, "token")
+    created_session, adapter = session.create_session(4, 8, github_authentication)
+    # the same adapter is mounted for secure and insecure connections
+    assert created_session.get_adapter(constants.rate.Rate_Limit_Url) is adapter
+    assert adapter._pool_connections == 4  # pylint: disable=protected-access
+    assert adapter._pool_maxsize == 8  # pylint: disable=protected-access
+    # the default headers and authentication are used for every request
+    assert created_session.headers[constants.github.User_Agent] == "WorkKnow"
+    assert (
+        created_session.headers[constants.session.Connection]
+        == constants.session.Keep_Alive
+    )
+    assert created_session.auth == github_authentication
+    created_session.close()
+
+
+def test_get_session_returns_shared_session():
+    """Check that the same shared session is returned until it is configured again."""
+    session.close_session()
+    first_session = session.get_session()
+    assert session.get_session() is first_session
+    configured_session = session.configure_session(2)
+    assert configured_session is not first_session
+    assert session.get_session() is configured_session
+    session.close_session()
+
+
+@responses.activate
+def test_connection_reuse_details_count_sent_requests():
+    """Check that the requests sent through the shared session are counted."""
+    session.configure_session(2)
+    # define a URL that can be interacted with in a mocked fashion; importantly,
+    # this test case is using responses and thus there is no actual interaction
+    # with the GitHub API and no network transmission at all
+    github_api_url = "https://api.github.com/repos/home-assistant/core/actions/runs"
+    responses.add(
+        responses.GET,
+        github_api_url,
+        json={"message": "server success"},
+        status=200,
+    )
+    session.get_session().get(github_api_url)
+    session.get_session().get(github_api_url)
+    connection_reuse_details = session.get_connection_reuse_details()
+    assert connection_reuse_details[constants.session.Requests] == 2
+    # since the responses are mocked no connections are ever opened or reused
+    assert connection_reuse_details[constants.session.Connections] == 0
+    assert connection_reuse_details[constants.session.Reused] == 0
+    session.close_session()
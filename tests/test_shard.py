@@ -0,0 +1,106 @@
+"""Tests for the shard module."""
+
+import datetime
+import json
+
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import responses
+
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import shard
+
+
+def create_filtered_callback(github_api_url, workflow_runs):
+    """Create a callback that lists the workflow runs like the GitHub API, including a filter by date range."""
+
+    def filtered_callback(request):
+        query = parse_qs(urlparse(request.url).query)
+        listed_workflow_runs = workflow_runs
+        if constants.incremental.Created in query:
+            start, end = query[constants.incremental.Created][0].split(
+                constants.shard.Range_Separator
+            )
+            listed_workflow_runs = [
+                workflow_run
+                for workflow_run in workflow_runs
+                if start <= workflow_run[constants.workflow.Created_At] <= end
+            ]
+        per_page = int(query.get(constants.github.Per_Page, ["30"])[0])
+        page = int(query.get(constants.github.Page, ["1"])[0])
+        last_page = max((len(listed_workflow_runs) + per_page - 1) // per_page, 1)
+        headers = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}
+        if page < last_page:
+            headers["Link"] = (
+                f'<{github_api_url}?page={page + 1}>; rel="next", '
+                f'<{github_api_url}?page={last_page}>; rel="last"'
+            )
+        body = {
+            "total_count": len(listed_workflow_runs),
+            "workflow_runs": listed_workflow_runs[
+                (page - 1) * per_page : page * per_page
+            ],
+        }
+        return (200, headers, json.dumps(body))
+
+    return filtered_callback
+
+
+def test_split_date_range_covers_every_second_once():
+    """Check that the split date ranges are next to each other without overlapping."""
+    start = datetime.datetime(2021, 8, 1, tzinfo=datetime.timezone.utc)
+    end = datetime.datetime(2021, 8, 1, 0, 0, 9, tzinfo=datetime.timezone.utc)
+    date_ranges = shard.split_date_range(start, end, 4)
+    assert len(date_ranges) == 4
+    assert date_ranges[0][0] == start
+    assert date_ranges[-1][1] == end
+    for (_, previous_end), (next_start, _) in zip(date_ranges, date_ranges[1:]):
+        assert next_start - previous_end == datetime.timedelta(seconds=1)
+    # a range of two seconds cannot be split into more than two ranges
+    assert (
+        len(shard.split_date_range(start, start + datetime.timedelta(seconds=1), 4))
+        == 2
+    )
+
+
+@responses.activate
+def test_sharded_workflow_run_pages_match_the_unfiltered_listing(monkeypatch):
+    """Check that the date ranges yield every run once in the order of the unfiltered listing."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    github_api_url = "https://api.github.com/repos/home-assistant/core/actions/runs"
+    # the listing starts with the newest run, which is created an hour after the one before it
+    oldest_created_at = datetime.datetime(2021, 8, 1, tzinfo=datetime.timezone.utc)
+    workflow_runs = [
+        {
+            constants.workflow.Id: run_id,
+            constants.workflow.Created_At: shard.format_created_at(
+                oldest_created_at + datetime.timedelta(hours=run_id)
+            ),
+        }
+        for run_id in reversed(range(250))
+    ]
+    responses.add_callback(
+        responses.GET,
+        github_api_url,
+        callback=create_filtered_callback(github_api_url, workflow_runs),
+    )
+    sharded_workflow_run_pages = shard.ShardedWorkflowRunPages(
+        github_api_url, console, 3, 1, 2
+    )
+    sharded_workflow_runs = [
+        workflow_run
+        for workflow_runs_page in sharded_workflow_run_pages
+        for workflow_run in workflow_runs_page
+    ]
+    assert sharded_workflow_run_pages.valid is True
+    assert sharded_workflow_run_pages.total_count == 250
+    assert sharded_workflow_run_pages.unique_count == 250
+    assert [
+        workflow_run[constants.workflow.Id] for workflow_run in sharded_workflow_runs
+    ] == [workflow_run[constants.workflow.Id] for workflow_run in workflow_runs]
@@ -0,0 +1,92 @@
+"""Tests for the standin module."""
+
+import pytest
+import requests
+
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import endpoint
+from workknow import produce
+from workknow import request
+from workknow import standin
+
+
+@pytest.fixture(autouse=True)
+def reset_api_url():
+    """Make sure that the stand-in server of a test is not the GitHub API of any other test."""
+    yield
+    endpoint.configure_api_url(constants.github.Api_Url)
+
+
+def test_configure_api_url_changes_every_url():
+    """Check that the configured base URL is used for the repositories and the rate limit."""
+    endpoint.configure_api_url("http://127.0.0.1:8080/")
+    assert (
+        produce.create_github_api_url("gkapfham", "meSMSage")
+        == "http://127.0.0.1:8080/repos/gkapfham/meSMSage/actions/runs"
+    )
+    assert endpoint.create_rate_limit_url() == "http://127.0.0.1:8080/rate_limit"
+    endpoint.configure_api_url(constants.github.Api_Url)
+    assert endpoint.create_rate_limit_url() == constants.rate.Rate_Limit_Url
+
+
+def test_workflow_run_pages_from_stand_in_server(monkeypatch):
+    """Check that every synthesized workflow run is downloaded, newest first, from the stand-in server."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    options = standin.create_default_options()._replace(run_count=250)
+    with standin.StandInServer(options) as stand_in_server:
+        endpoint.configure_api_url(stand_in_server.api_url)
+        workflow_run_pages = request.WorkflowRunPages(
+            produce.create_github_api_url("gkapfham", "meSMSage"), console, 1, 2
+        )
+        workflow_runs = [
+            workflow_run[constants.workflow.Id]
+            for workflow_runs_page in workflow_run_pages
+            for workflow_run in workflow_runs_page
+        ]
+        statistics = stand_in_server.get_statistics()
+    assert workflow_run_pages.valid is True
+    assert workflow_runs == list(range(250, 0, -1))
+    assert statistics[constants.standin.Pages] == 3
+
+
+def test_stand_in_server_injects_failures():
+    """Check that the stand-in server fails with server errors and rate limited responses."""
+    options = standin.create_default_options()._replace(server_error_rate=1.0)
+    with standin.StandInServer(options) as stand_in_server:
+        response = requests.get(stand_in_server.api_url + "/rate_limit")
+        assert response.status_code == constants.standin.Server_Error_Response
+        assert constants.rate.Header_Remaining in response.headers
+    options = standin.create_default_options()._replace(rate_limit_error_rate=1.0)
+    with standin.StandInServer(options) as stand_in_server:
+        response = requests.get(stand_in_server.api_url + "/rate_limit")
+        assert response.status_code == constants.retry.Forbidden_Response
+        assert response.headers[constants.retry.Retry_After] == "1"
+        assert (
+            stand_in_server.get_statistics()[constants.standin.Rate_Limit_Errors] == 1
+        )
+
+
+@pytest.mark.parametrize(
+    "created_filter,expected_run_numbers",
+    [
+        (None, list(range(120, 0, -1))),
+        ("2021-01-01T00:10:00Z..2021-01-01T00:20:00Z", list(range(20, 9, -1))),
+        (">=2021-01-01T01:00:00Z", list(range(120, 59, -1))),
+        (">2021-01-01T01:00:00Z", list(range(120, 60, -1))),
+        ("<=2021-01-01T00:05:00Z", [5, 4, 3, 2, 1]),
+        ("<2021-01-01T00:05:00Z", [4, 3, 2, 1]),
+        ("2021-01-01T01", list(range(119, 59, -1))),
+        ("2021-01-02", []),
+    ],
+)
+def test_created_filter_selects_consecutive_runs(created_filter, expected_run_numbers):
+    """Check that the runs matching a filter of their creation times are found without listing every run."""
+    assert (
+        list(standin.find_created_run_numbers(120, created_filter))
+        == expected_run_numbers
+    )
@@ -0,0 +1,119 @@
+"""Tests for the tokens module."""
+
+import base64
+
+import pytest
+import responses
+
+from rich.progress import Progress
+
+from workknow import constants
+from workknow import request
+from workknow import tokens
+
+# note that the reset time is far in the future so the budgets are not restored
+RESET = 4102444800
+
+
+@pytest.fixture(autouse=True)
+def disable_token_pool():
+    """Make sure that a pool configured in a test is not used by any other test."""
+    yield
+    tokens.configure_token_pool([])
+
+
+def create_rate_limit_dict(remaining, reset=RESET):
+    """Create a core resource dictionary like the one of the /rate_limit endpoint."""
+    return {
+        constants.rate.Limit: 5000,
+        constants.rate.Remaining: remaining,
+        constants.rate.Reset: reset,
+    }
+
+
+def test_select_token_prefers_most_remaining_budget():
+    """Check that the token with the most remaining requests is selected."""
+    token_pool = tokens.TokenPool(["first", "second"])
+    token_pool.get_budget("first").update_from_dict(create_rate_limit_dict(100))
+    token_pool.get_budget("second").update_from_dict(create_rate_limit_dict(4000))
+    assert token_pool.select_token() == "second"
+    assert token_pool.get_statistics()[1][constants.tokens.Requests] == 1
+
+
+def test_select_token_spreads_requests_in_flight_across_tokens():
+    """Check that the requests selected before any response arrives do not all use the same token."""
+    token_pool = tokens.TokenPool(["first", "second"])
+    token_pool.get_budget("first").update_from_dict(create_rate_limit_dict(4001))
+    token_pool.get_budget("second").update_from_dict(create_rate_limit_dict(4000))
+    selected_tokens = [token_pool.select_token() for _ in range(5)]
+    assert selected_tokens == ["first", "second", "first", "second", "first"]
+    assert token_pool.get_available("first") == 3998
+    # once the responses updated the budgets the reserved requests are released
+    for selected_token in selected_tokens:
+        token_pool.release_token(selected_token)
+    assert token_pool.get_available("first") == 4001
+    assert token_pool.get_available("second") == 4000
+
+
+def test_select_token_waits_for_earliest_reset_when_all_spent():
+    """Check that the token that resets first is selected when every token is spent."""
+    token_pool = tokens.TokenPool(["first", "second"])
+    token_pool.get_budget("first").update_from_dict(create_rate_limit_dict(0))
+    token_pool.get_budget("second").update_from_dict(
+        create_rate_limit_dict(0, RESET - 60)
+    )
+    assert token_pool.has_available_token() is False
+    assert token_pool.select_token() == "second"
+
+
+def test_read_tokens_from_environment_without_duplicates(monkeypatch):
+    """Check that the list of tokens and the single token are combined without duplicates."""
+    monkeypatch.setenv(constants.environment.Github_Access_Tokens, "first, second,")
+    monkeypatch.setenv(constants.environment.Github_Access_Token, "first")
+    assert tokens.read_tokens_from_environment() == ["first", "second"]
+    assert tokens.mask_token("abcdefgh") == "...efgh"
+
+
+@responses.activate
+def test_rate_limited_token_is_rotated_without_sleeping():
+    """Check that a retry after an exhausted token uses another token without waiting."""
+    github_api_url = "https://api.github.com/repos/home-assistant/core/actions/runs"
+    exhausted_authorization = "Basic " + base64.b64encode(b"User:first").decode()
+
+    def token_callback(prepared_request):
+        """Reject the requests that use the exhausted token."""
+        if prepared_request.headers["Authorization"] == exhausted_authorization:
+            headers = {
+                constants.rate.Header_Remaining: "0",
+                constants.rate.Header_Reset: str(RESET),
+            }
+            return (403, headers, "{}")
+        headers = {
+            constants.rate.Header_Remaining: "4000",
+            constants.rate.Header_Reset: str(RESET),
+        }
+        return (200, headers, "{}")
+
+    responses.add_callback(responses.GET, github_api_url, callback=token_callback)
+    token_pool = tokens.configure_token_pool(["first", "second"])
+    # the exhausted token looks like the best one until its first response arrives
+    token_pool.get_budget("first").update_from_dict(create_rate_limit_dict(4500))
+    token_pool.get_budget("second").update_from_dict(create_rate_limit_dict(4000))
+    with Progress() as progress:
+        (
+            valid,
+            retry_count,
+            sleep_time,
+            _,
+        ) = request.request_json_from_github_with_caution(
+            github_api_url, {}, None, progress, 2
+        )
+    assert valid is True
+    assert retry_count == 1
+    assert sleep_time == 0
+    assert [
+        statistic[constants.tokens.Requests]
+        for statistic in token_pool.get_statistics()
+    ] == [1, 1]
+    # every request released the budget that it reserved
+    assert not any(token_pool.reserved_counts.values())
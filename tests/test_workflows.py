@@ -0,0 +1,220 @@
+"""Tests for the workflows module."""
+
+import json
+
+import responses
+
+from rich.progress import Progress
+
+from workknow import checkpoint
+from workknow import configure
+from workknow import constants
+from workknow import debug
+from workknow import produce
+from workknow import request
+from workknow import workflows
+
+
+# the rate limit headers of each response make requests to /rate_limit unnecessary
+RATE_LIMIT_HEADERS = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}
+
+
+def create_workflow_run(run_id, created_at):
+    """Create a workflow run with only the fields that order the runs."""
+    return {constants.workflow.Id: run_id, constants.workflow.Created_At: created_at}
+
+
+def test_select_workflows_by_name_or_file_name():
+    """Check that the workflows are selected by their names or the names of their files."""
+    workflows_list = [
+        {
+            constants.workflow.Name: "Build",
+            constants.workflows.Path: ".github/workflows/build.yml",
+        },
+        {
+            constants.workflow.Name: "Lint",
+            constants.workflows.Path: ".github/workflows/lint.yml",
+        },
+        {
+            constants.workflow.Name: "Docs",
+            constants.workflows.Path: ".github/workflows/docs.yml",
+        },
+    ]
+    assert workflows.select_workflows(workflows_list, []) == workflows_list
+    assert (
+        workflows.select_workflows(workflows_list, ["Build", "lint.yml"])
+        == workflows_list[:2]
+    )
+
+
+@responses.activate
+def test_workflow_run_pages_by_workflow_are_merged_newest_first(monkeypatch):
+    """Check that the runs of the selected workflows are merged in the order of the repository listing."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    responses.add(
+        responses.GET,
+        produce.create_github_workflows_url("gkapfham", "meSMSage"),
+        json={
+            "total_count": 3,
+            "workflows": [
+                {constants.workflow.Id: 10, constants.workflow.Name: "Build"},
+                {constants.workflow.Id: 20, constants.workflow.Name: "Lint"},
+                {constants.workflow.Id: 30, constants.workflow.Name: "Docs"},
+            ],
+        },
+        status=200,
+        headers=RATE_LIMIT_HEADERS,
+    )
+    workflow_runs_by_id = {
+        10: [
+            create_workflow_run(5, "2021-08-05T00:00:00Z"),
+            create_workflow_run(2, "2021-08-02T00:00:00Z"),
+        ],
+        20: [
+            create_workflow_run(4, "2021-08-04T00:00:00Z"),
+            create_workflow_run(1, "2021-08-01T00:00:00Z"),
+        ],
+        30: [create_workflow_run(3, "2021-08-03T00:00:00Z")],
+    }
+    for workflow_id, workflow_runs in workflow_runs_by_id.items():
+        responses.add(
+            responses.GET,
+            produce.create_github_workflow_runs_url(
+                "gkapfham", "meSMSage", workflow_id
+            ),
+            json={"total_count": len(workflow_runs), "workflow_runs": workflow_runs},
+            status=200,
+            headers=RATE_LIMIT_HEADERS,
+        )
+    workflow_run_pages = workflows.WorkflowRunPagesByWorkflow(
+        "gkapfham", "meSMSage", console, ["Build", "Lint"], 1
+    )
+    merged_workflow_runs = [
+        workflow_run
+        for workflow_runs in workflow_run_pages
+        for workflow_run in workflow_runs
+    ]
+    assert workflow_run_pages.valid is True
+    assert workflow_run_pages.workflow_count == 2
+    assert [
+        workflow_run[constants.workflow.Id] for workflow_run in merged_workflow_runs
+    ] == [5, 4, 2, 1]
+    # the runs of the workflow that was not selected are never requested
+    assert not any("/30/runs" in call.request.url for call in responses.calls)
+
+
+@responses.activate
+def test_list_workflows_follows_the_pages_of_the_listing(monkeypatch):
+    """Check that the workflows of a repository with more than one page of workflows are all listed."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    configure.setup(debug_level)
+    workflows_url = produce.create_github_workflows_url("gkapfham", "meSMSage")
+
+    def workflows_callback(prepared_request):
+        """Respond with the page of workflows in the request, linking to the second page."""
+        headers = dict(RATE_LIMIT_HEADERS)
+        if "page=2" in prepared_request.url:
+            return (200, headers, json.dumps({"workflows": [{"id": 20}]}))
+        headers["Link"] = f'<{workflows_url}?per_page=100&page=2>; rel="next"'
+        return (200, headers, json.dumps({"workflows": [{"id": 10}]}))
+
+    responses.add_callback(responses.GET, workflows_url, callback=workflows_callback)
+    with Progress() as progress:
+        valid, workflows_list = workflows.list_workflows(
+            workflows_url, None, progress, 1
+        )
+    assert valid is True
+    assert len(responses.calls) == 2
+    assert [workflow[constants.workflow.Id] for workflow in workflows_list] == [
+        10,
+        20,
+    ]
+
+
+@responses.activate
+def test_workflow_run_pages_by_workflow_use_the_backend_and_the_journal(
+    tmp_path, monkeypatch
+):
+    """Check that each workflow is downloaded with the pages of the backend and resumes after its stored pages."""
+    monkeypatch.setenv(constants.environment.Timezone, "UTC")
+    # configure the system so that it does not produce debugging output
+    debug_level = debug.DebugLevel.ERROR
+    console, _ = configure.setup(debug_level)
+    responses.add(
+        responses.GET,
+        produce.create_github_workflows_url("gkapfham", "meSMSage"),
+        json={
+            "total_count": 2,
+            "workflows": [
+                {constants.workflow.Id: 10, constants.workflow.Name: "Build"},
+                {constants.workflow.Id: 20, constants.workflow.Name: "Lint"},
+            ],
+        },
+        status=200,
+        headers=RATE_LIMIT_HEADERS,
+    )
+    build_runs_url = produce.create_github_workflow_runs_url("gkapfham", "meSMSage", 10)
+    lint_runs_url = produce.create_github_workflow_runs_url("gkapfham", "meSMSage", 20)
+    build_runs = [create_workflow_run(2, "2021-08-02T00:00:00Z")]
+    lint_runs = [create_workflow_run(1, "2021-08-01T00:00:00Z")]
+
+    def runs_callback(prepared_request):
+        """Respond with the runs of the workflow, with no runs after the first page."""
+        workflow_runs = (
+            lint_runs if prepared_request.url.startswith(lint_runs_url) else build_runs
+        )
+        if "page=2" in prepared_request.url:
+            workflow_runs = []
+        return (
+            200,
+            RATE_LIMIT_HEADERS,
+            json.dumps({"total_count": 1, "workflow_runs": workflow_runs}),
+        )
+
+    for runs_url in (build_runs_url, lint_runs_url):
+        responses.add_callback(responses.GET, runs_url, callback=runs_callback)
+    # the first page of the build workflow was stored before an interruption
+    checkpoint.CheckpointJournal(tmp_path).record_page(build_runs_url, 1, build_runs)
+    checkpoint_journal = checkpoint.CheckpointJournal(tmp_path, resume=True)
+    backend_urls = []
+
+    class BackendWorkflowRunPages(request.WorkflowRunPages):
+        """The pages of a backend that remember the listings they download."""
+
+        def __init__(self, github_api_url, *args, **kwargs):
+            """Remember the URL of the listing."""
+            backend_urls.append(github_api_url)
+            super().__init__(github_api_url, *args, **kwargs)
+
+    workflow_run_pages = workflows.WorkflowRunPagesByWorkflow(
+        "gkapfham",
+        "meSMSage",
+        console,
+        maximum_retries=1,
+        workflow_run_pages_class=BackendWorkflowRunPages,
+        checkpoint_journal=checkpoint_journal,
+    )
+    merged_workflow_runs = [
+        workflow_run
+        for workflow_runs in workflow_run_pages
+        for workflow_run in workflow_runs
+    ]
+    assert workflow_run_pages.valid is True
+    assert [
+        workflow_run[constants.workflow.Id] for workflow_run in merged_workflow_runs
+    ] == [2, 1]
+    assert backend_urls == [build_runs_url, lint_runs_url]
+    # the stored page of the build workflow is never requested again
+    build_calls = [
+        call.request.url
+        for call in responses.calls
+        if call.request.url.startswith(build_runs_url)
+    ]
+    assert build_calls and all("page=2" in url for url in build_calls)
+    # the downloaded page of the lint workflow is journaled for a later resume
+    assert checkpoint_journal.get_stored_pages(lint_runs_url) == [lint_runs]
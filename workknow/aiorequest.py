@@ -0,0 +1,613 @@
+"""Use an asyncio client for the GitHub REST API as an alternative backend to the request module."""
+
+import asyncio
+import base64
+import collections
+import json
+import logging
+import queue
+import threading
+import time
+
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import aiohttp
+
+from rich.console import Console
+from rich.progress import Progress
+
+from workknow import budget
+from workknow import constants
+from workknow import metrics
+from workknow import profiler
+from workknow import request
+from workknow import retry
+from workknow import tokens
+
+# The functions in this module follow the same steps as those in the request module:
+#
+# --> request_with_caution retries a request that raised an exception
+# --> request_json_from_github_with_caution classifies the response and then retries
+#     those that are transient or rate limited, honoring the Retry-After header
+# --> iterate_pages_json_from_github_async downloads the first page, finds the last
+#     page from its links, and then downloads a window of the remaining pages at once
+#
+# The difference is that every request and every sleep (i.e., for an exponential
+# back-off or for a reset of the rate limit) awaits instead of blocking and thus a
+# single thread can keep as many page requests in flight as the page concurrency
+# allows. The budget of the rate limit, the pool of tokens, and the retry policy
+# are the same ones that the request module uses. Note that this client does not
+# use the response cache, which is written for the responses of requests.
+
+# the parts of a response that the client keeps after it read the body; note that
+# the links are in the same format as the links of a response from requests
+AsyncResponse = collections.namedtuple(
+    "AsyncResponse", ["status_code", "headers", "links", "text"]
+)
+
+
+def create_client_session(connection_limit: int) -> aiohttp.ClientSession:
+    """Create a client session whose connector keeps up to the limit of connections alive."""
+    # note that the client sends the same headers as the shared session of requests
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=connection_limit),
+        headers={
+            constants.github.User_Agent: constants.workknow.Name,
+            constants.session.Accept: constants.session.Accept_Github,
+        },
+    )
+
+
+def create_authorization_header(github_authentication) -> Dict[str, str]:
+    """Create the header for the basic authentication of a user name and a personal access token."""
+    credentials = constants.markers.Colon.join(github_authentication)
+    return {
+        constants.session.Authorization: constants.session.Basic
+        + base64.b64encode(credentials.encode(constants.cache.Encoding)).decode(
+            constants.cache.Encoding
+        )
+    }
+
+
+def convert_links(response_links) -> Dict[str, Dict[str, str]]:
+    """Convert the links of an aiohttp response to the format of the links of a requests response."""
+    return {
+        str(relation): {constants.github.Url: str(link[constants.github.Url])}
+        for relation, link in response_links.items()
+    }
+
+
+async def request_with_caution(
+    client: aiohttp.ClientSession,
+    github_api_url: str,
+    github_params: Dict[str, str],
+    github_authentication,
+    progress: Progress,
+    maximum_retries: int = constants.github.Maximum_Request_Retries,
+) -> Tuple[bool, int, float, Union[AsyncResponse, None]]:
+    """Request data from the GitHub API in a cautious fashion, checking for exceptions and waiting when needed."""
+    response = None
+    request_retries_count = 1
+    running_sleep_time_in_seconds: float = 0
+    first_exception = True
+    while response is None and request_retries_count <= maximum_retries:
+        # select the token for this attempt so that a retry after a rate
+        # limited response can use another token from the pool, if configured
+        (
+            request_authentication,
+            request_budget,
+        ) = request.select_github_authentication(github_authentication)
+        try:
+            start_time = time.perf_counter()
+            async with client.get(
+                github_api_url,
+                params=github_params,
+                headers=create_authorization_header(request_authentication),
+            ) as client_response:
+                response = AsyncResponse(
+                    client_response.status,
+                    client_response.headers,
+                    convert_links(client_response.links),
+                    await client_response.text(),
+                )
+            # note that the latency includes the time spent by the event loop on
+            # the other tasks while this response was being received
+            metrics.record_request(
+                github_api_url,
+                time.perf_counter() - start_time,
+                len(response.text.encode()),
+            )
+            # every response reports the rate limit in its headers and thus the
+            # budget of the token is always up-to-date without any further requests
+            request_budget.update_from_headers(response.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as request_exception:
+            if first_exception:
+                progress.console.print()
+                progress.console.print(
+                    f":grimacing_face: Unable to access GitHub API at {github_api_url} due to exception {request_exception}"
+                )
+                progress.console.print(
+                    f"{constants.markers.Tab}...Will attempt {maximum_retries} retries"
+                )
+                first_exception = False
+            retry.record_classification(constants.retry.Exception)
+            # perform a jittered exponential back-off without blocking the other requests
+            sleep_time_in_seconds = retry.add_jitter(
+                request.calculate_backoff_sleep_time(
+                    constants.github.Wait_In_Seconds, request_retries_count
+                )
+            )
+            progress.console.print(
+                f"{constants.markers.Tab}{constants.markers.Tab}...Waiting for {sleep_time_in_seconds:g} second(s)"
+            )
+            await asyncio.sleep(sleep_time_in_seconds)
+            metrics.record_retry(github_api_url, sleep_time_in_seconds)
+            running_sleep_time_in_seconds = (
+                running_sleep_time_in_seconds + sleep_time_in_seconds
+            )
+            request_retries_count = request_retries_count + 1
+        finally:
+            request.release_github_authentication(request_authentication)
+    return (
+        response is not None,
+        request_retries_count - 1,
+        running_sleep_time_in_seconds,
+        response,
+    )
+
+
+async def request_json_from_github_with_caution(
+    client: aiohttp.ClientSession,
+    github_api_url: str,
+    github_params: Dict[str, str],
+    github_authentication,
+    progress: Progress,
+    maximum_retries: int = constants.github.Maximum_Request_Retries,
+) -> Tuple[bool, int, float, Union[AsyncResponse, None]]:
+    """Request data from the GitHub API in a cautious fashion, checking error codes and waiting when needed."""
+    valid, request_retries_count, request_sleep_time, response = (
+        await request_with_caution(
+            client,
+            github_api_url,
+            github_params,
+            github_authentication,
+            progress,
+            maximum_retries,
+        )
+    )
+    if not valid:
+        return (valid, request_retries_count, request_sleep_time, None)
+    response_retries_count = 1
+    running_sleep_time_in_seconds: float = 0
+    current_response_class = retry.classify_response(
+        response.status_code, response.headers  # type: ignore
+    )
+    retry.record_classification(current_response_class)
+    # a permanent failure or a success does not enter the loop and, otherwise,
+    # keep retrying the transient and rate limited failures up to the maximum
+    if current_response_class != constants.retry.Success:
+        progress.console.print()
+        progress.console.print(
+            f":grimacing_face: Unable to access GitHub API at {github_api_url} due to error code {response.status_code}"  # type: ignore
+        )
+    while (
+        current_response_class
+        in (constants.retry.Transient, constants.retry.Rate_Limited)
+        and response_retries_count <= maximum_retries
+    ):
+        sleep_time_in_seconds = retry.calculate_retry_sleep_time(
+            current_response_class,
+            response.headers,  # type: ignore
+            request.calculate_backoff_sleep_time(
+                constants.github.Wait_In_Seconds, response_retries_count
+            ),
+        )
+        progress.console.print(
+            f"{constants.markers.Tab}{constants.markers.Tab}...Waiting for {sleep_time_in_seconds:g} second(s)"
+        )
+        await asyncio.sleep(sleep_time_in_seconds)
+        metrics.record_retry(github_api_url, sleep_time_in_seconds)
+        running_sleep_time_in_seconds = (
+            running_sleep_time_in_seconds + sleep_time_in_seconds
+        )
+        valid, _, _, response = await request_with_caution(
+            client,
+            github_api_url,
+            github_params,
+            github_authentication,
+            progress,
+            maximum_retries,
+        )
+        if not valid:
+            return (valid, response_retries_count, running_sleep_time_in_seconds, None)
+        current_response_class = retry.classify_response(
+            response.status_code, response.headers  # type: ignore
+        )
+        retry.record_classification(current_response_class)
+        response_retries_count = response_retries_count + 1
+    return (
+        current_response_class == constants.retry.Success,
+        response_retries_count - 1,
+        running_sleep_time_in_seconds,
+        response,
+    )
+
+
+def decode_response_json(github_api_url: str, response: AsyncResponse):
+    """Decode the JSON body of a response, recording the time spent for the repository of the URL."""
+    with metrics.measure(github_api_url, constants.metrics.Decode_Seconds):
+        return json.loads(response.text)
+
+
+async def wait_for_rate_limit_budget(
+    github_api_url: Union[str, None] = None
+) -> float:
+    """Wait, without blocking the other requests, for a reset if the rate limit budget is almost spent."""
+    console = Console()
+    token_pool = tokens.get_token_pool()
+    # the budget has never received any details from the headers and thus
+    # request them, without blocking the event loop, from the GitHub API
+    budget_known = (
+        token_pool.is_known()
+        if token_pool is not None
+        else budget.get_budget().is_known()
+    )
+    if not budget_known:
+        await asyncio.get_running_loop().run_in_executor(
+            None, request.get_rate_limit_details
+        )
+    rate_limit_dict = (
+        token_pool.to_dict()
+        if token_pool is not None
+        else budget.get_budget().to_dict()
+    )
+    if rate_limit_dict[constants.rate.Remaining] >= constants.rate.Threshold:
+        return 0
+    sleep_time_seconds = budget.calculate_reset_sleep_time(
+        rate_limit_dict[constants.rate.Reset]
+    )
+    console.print(
+        f":sleeping_face: Sleeping for {sleep_time_seconds} seconds while waiting for the GitHub API to reset the rate limits"
+    )
+    await asyncio.sleep(sleep_time_seconds)
+    # the other tasks keep running during the sleep and thus its length, not the
+    # time that elapsed, is the rate limit sleep of the repository of the URL
+    metrics.record_duration(
+        github_api_url, constants.metrics.Rate_Limit_Sleep_Seconds, sleep_time_seconds
+    )
+    return sleep_time_seconds
+
+
+async def request_page_json_from_github(
+    client: aiohttp.ClientSession,
+    github_api_url: str,
+    github_params: Dict[str, str],
+    page: int,
+    github_authentication,
+    progress: Progress,
+    console: Console,
+    maximum_retries: int,
+    page_semaphore: asyncio.Semaphore,
+) -> Tuple[bool, int, float, List[Dict[Any, Any]]]:
+    """Request a single page of workflow runs once the semaphore allows another request in flight."""
+    async with page_semaphore:
+        # each page needs its own parameters since the requests are in flight together
+        page_github_params = dict(github_params)
+        page_github_params[constants.github.Page] = str(page)
+        (
+            valid,
+            retry_count,
+            sleep_time,
+            response,
+        ) = await request_json_from_github_with_caution(
+            client,
+            github_api_url,
+            page_github_params,
+            github_authentication,
+            progress,
+            maximum_retries,
+        )
+        workflow_runs: List[Dict[Any, Any]] = []
+        if valid:
+            workflow_runs = request.get_workflow_runs(
+                decode_response_json(github_api_url, response), console  # type: ignore
+            )
+            sleep_time = sleep_time + await wait_for_rate_limit_budget(
+                github_api_url
+            )
+        return (valid, retry_count, sleep_time, workflow_runs)
+
+
+async def iterate_pages_json_from_github_async(
+    github_api_url: str,
+    console: Console,
+    maximum_retries=constants.github.Maximum_Request_Retries,
+    page_concurrency: int = constants.github.Page_Concurrency,
+    github_params_filter: Union[Dict[str, str], None] = None,
+    stored_pages: Union[List[List], None] = None,
+    page_callback: Union[Callable[[int, List], None], None] = None,
+    progress: Union[Progress, None] = None,
+    progress_label: str = constants.markers.Nothing,
+) -> AsyncIterator[Tuple[bool, int, float, List]]:
+    """Request the pages of workflow runs with an asyncio client, yielding each one in page order as it arrives."""
+    github_authentication = (
+        constants.github.User,
+        request.get_github_personal_access_token(),
+    )
+    if stored_pages is None:
+        stored_pages = []
+    first_page = len(stored_pages) + 1
+    github_params = request.create_github_params(github_params_filter, first_page)
+    page_concurrency = max(page_concurrency, 1)
+    shared_progress = progress is not None
+    async with create_client_session(page_concurrency) as client:
+        with request.use_progress(progress) as progress:
+            download_first_page = progress.add_task(
+                progress_label + "Initial Download", total=1
+            )
+            (
+                valid,
+                retry_count,
+                sleep_time,
+                response,
+            ) = await request_json_from_github_with_caution(
+                client,
+                github_api_url,
+                github_params,
+                github_authentication,
+                progress,
+                maximum_retries,
+            )
+            progress.advance(download_first_page)
+            if not valid:
+                yield (valid, retry_count, sleep_time, [])
+            else:
+                # the pages stored before an interruption come first, as in the request module
+                for stored_page in stored_pages:
+                    yield (True, 0, 0, stored_page)
+                first_workflow_runs = request.get_workflow_runs(
+                    decode_response_json(github_api_url, response), console  # type: ignore
+                )
+                if page_callback is not None:
+                    page_callback(first_page, first_workflow_runs)
+                sleep_time = sleep_time + await wait_for_rate_limit_budget(
+                    github_api_url
+                )
+                last_page_index = request.extract_last_page(response.links)  # type: ignore
+                yield (valid, retry_count, sleep_time, first_workflow_runs)
+                download_pages_task = progress.add_task(
+                    progress_label + "Complete Download",
+                    total=max(last_page_index - first_page, 0),
+                )
+                page_semaphore = asyncio.Semaphore(page_concurrency)
+
+                async def request_page(page: int):
+                    """Request a page and then record it."""
+                    page_result = await request_page_json_from_github(
+                        client,
+                        github_api_url,
+                        github_params,
+                        page,
+                        github_authentication,
+                        progress,  # type: ignore
+                        console,
+                        maximum_retries,
+                        page_semaphore,
+                    )
+                    if page_result[0] and page_callback is not None:
+                        page_callback(page, page_result[3])
+                    return page_result
+
+                # the index of the last page is known from the links of the first page
+                # and thus the following pages are requested together, as tasks whose
+                # requests in flight are bounded by the semaphore; only a window of
+                # pages ahead of the page that is yielded next are requested so that
+                # the pages held in memory stay bounded, exactly as in the request module
+                window_size = page_concurrency * constants.github.Page_Window_Factor
+                pending_tasks: Deque[asyncio.Future] = collections.deque()
+                next_page = first_page + 1
+                try:
+                    while pending_tasks or next_page <= last_page_index:
+                        while (
+                            next_page <= last_page_index
+                            and len(pending_tasks) < window_size
+                        ):
+                            pending_tasks.append(
+                                asyncio.ensure_future(request_page(next_page))
+                            )
+                            next_page = next_page + 1
+                        # wait for the oldest page so that the pages are yielded in order
+                        page_result = await pending_tasks.popleft()
+                        progress.update(download_pages_task, advance=1)
+                        yield page_result
+                        # a page that could not be downloaded makes the whole download
+                        # invalid and thus the pages after it are not requested
+                        if not page_result[0]:
+                            break
+                finally:
+                    # the caller stopped before the last page and thus the pages
+                    # that are still in flight are cancelled before the client closes
+                    for pending_task in pending_tasks:
+                        pending_task.cancel()
+                    await asyncio.gather(*pending_tasks, return_exceptions=True)
+                if shared_progress:
+                    progress.remove_task(download_pages_task)
+            if shared_progress:
+                progress.remove_task(download_first_page)
+
+
+async def request_json_from_github_async(
+    github_api_url: str,
+    console: Console,
+    maximum_retries=constants.github.Maximum_Request_Retries,
+    page_concurrency: int = constants.github.Page_Concurrency,
+    github_params_filter: Union[Dict[str, str], None] = None,
+    stored_pages: Union[List[List], None] = None,
+    page_callback: Union[Callable[[int, List], None], None] = None,
+    progress: Union[Progress, None] = None,
+    progress_label: str = constants.markers.Nothing,
+) -> Tuple[bool, int, float, List]:
+    """Request the JSON response from the GitHub API with an asyncio client, resuming after any stored pages."""
+    # note that this collects all of the pages in a list and thus a caller that can
+    # transform one page at a time should iterate through the WorkflowRunPages instead
+    valid = False
+    complete_retry_count = 0
+    complete_sleep_time: float = 0
+    json_responses = []
+    async for (
+        valid,
+        retry_count,
+        sleep_time,
+        workflow_runs,
+    ) in iterate_pages_json_from_github_async(
+        github_api_url,
+        console,
+        maximum_retries,
+        page_concurrency,
+        github_params_filter,
+        stored_pages,
+        page_callback,
+        progress,
+        progress_label,
+    ):
+        complete_retry_count = complete_retry_count + retry_count
+        complete_sleep_time = complete_sleep_time + sleep_time
+        if not valid:
+            break
+        json_responses.append(workflow_runs)
+    return (valid, complete_retry_count, complete_sleep_time, json_responses)
+
+
+@profiler.profile_stage(constants.profile.Request)
+def request_json_from_github(
+    github_api_url: str,
+    console: Console,
+    maximum_retries=constants.github.Maximum_Request_Retries,
+    page_concurrency: int = constants.github.Page_Concurrency,
+    github_params_filter: Union[Dict[str, str], None] = None,
+    stored_pages: Union[List[List], None] = None,
+    page_callback: Union[Callable[[int, List], None], None] = None,
+    progress: Union[Progress, None] = None,
+    progress_label: str = constants.markers.Nothing,
+) -> Tuple[bool, int, float, List]:
+    """Request the JSON response from the GitHub API with an asyncio client running in its own event loop."""
+    # note that this function has the same parameters as the function in the
+    # request module and thus the pipeline can call either one of the backends
+    logger = logging.getLogger(constants.logging.Rich)
+    logger.debug(f"Downloading {github_api_url} with the asyncio backend")
+    return asyncio.run(
+        request_json_from_github_async(
+            github_api_url,
+            console,
+            maximum_retries,
+            page_concurrency,
+            github_params_filter,
+            stored_pages,
+            page_callback,
+            progress,
+            progress_label,
+        )
+    )
+
+
+class WorkflowRunPages:
+    """The pages of workflow runs downloaded by the asyncio client, iterated like the pages of the request module."""
+
+    # note that the event loop of an instance runs in a background thread that puts
+    # each page in a queue with room for only a window of pages; this means that the
+    # pages ahead of the caller keep downloading while the caller transforms a page
+    # and that the pages held in memory stay bounded; the attributes are those of the
+    # WorkflowRunPages in the request module
+
+    def __init__(self, github_api_url: str, console: Console, *args, **kwargs):
+        """Describe the download of the pages without requesting any of them."""
+        self.github_api_url = github_api_url
+        self.console = console
+        self.download_args = args
+        self.download_kwargs = kwargs
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time: float = 0
+
+    def record_page_result(self, valid: bool, retry_count: int, sleep_time: float):
+        """Record the outcome of the request for a page of workflow runs."""
+        self.valid = valid
+        self.retry_count = self.retry_count + retry_count
+        self.sleep_time = self.sleep_time + sleep_time
+
+    async def put_page_results(
+        self, page_queue: queue.Queue, stop_event: threading.Event
+    ) -> None:
+        """Put the result of each page in the queue, waiting for room without stopping the downloads."""
+        page_results = iterate_pages_json_from_github_async(
+            self.github_api_url,
+            self.console,
+            *self.download_args,
+            **self.download_kwargs,
+        )
+        try:
+            async for page_result in page_results:
+                # the event loop keeps downloading the window of pages in flight while
+                # the result waits in another thread for room in the queue
+                await asyncio.to_thread(
+                    request.put_unless_stopped, page_queue, page_result, stop_event
+                )
+                if stop_event.is_set():
+                    break
+        finally:
+            # close the pages (e.g., when the caller stopped early) so that the
+            # requests in flight are cancelled and the client session is closed
+            await page_results.aclose()
+        request.put_unless_stopped(page_queue, request.END_OF_PAGES, stop_event)
+
+    def download_pages_into_queue(
+        self, page_queue: queue.Queue, stop_event: threading.Event
+    ) -> None:
+        """Run the event loop of the download in the background thread of the iteration."""
+        try:
+            asyncio.run(self.put_page_results(page_queue, stop_event))
+        # the error is raised again by the iterator of the queue, in the thread of the caller
+        except Exception as error:  # pylint: disable=broad-except
+            request.put_unless_stopped(page_queue, error, stop_event)
+
+    def __iter__(self) -> Iterator[List]:
+        """Request the pages of workflow runs from the GitHub API, yielding each one as it arrives."""
+        logger = logging.getLogger(constants.logging.Rich)
+        logger.debug(f"Downloading {self.github_api_url} with the asyncio backend")
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time = 0
+        stop_event = threading.Event()
+        page_queue: queue.Queue = queue.Queue(
+            maxsize=constants.github.Page_Window_Factor
+        )
+        download_thread = threading.Thread(
+            target=self.download_pages_into_queue,
+            args=(page_queue, stop_event),
+            daemon=True,
+        )
+        download_thread.start()
+        try:
+            for (
+                valid,
+                retry_count,
+                sleep_time,
+                workflow_runs,
+            ) in request.iterate_queued_pages(page_queue):
+                self.record_page_result(valid, retry_count, sleep_time)
+                if not valid:
+                    break
+                yield workflow_runs
+        finally:
+            # the caller stopped (e.g., because a page was not valid) and thus the
+            # background thread stops before it requests any more of the pages
+            stop_event.set()
+            download_thread.join()
@@ -0,0 +1,31 @@
+"""Manage the backends that request data from the GitHub API."""
+
+from enum import Enum
+
+import importlib.util
+
+import typer
+
+from workknow import constants
+
+
+class Backend(str, Enum):
+    """The predefined backends for requesting data from the GitHub API."""
+
+    SYNC = constants.backend.Sync
+    ASYNC = constants.backend.Async
+
+
+def check_backend(request_backend: Backend) -> str:
+    """Check that the package that a backend needs is installed, when the --backend option is parsed."""
+    # note that typer turns the value returned by the callback into the backend
+    # the asyncio backend is only imported when it is used and thus a missing
+    # aiohttp package is reported before any of the repositories is downloaded
+    if (
+        request_backend == Backend.ASYNC
+        and importlib.util.find_spec(constants.backend.Aiohttp) is None
+    ):
+        raise typer.BadParameter(
+            "The async backend needs the aiohttp package, which is not installed"
+        )
+    return request_backend.value
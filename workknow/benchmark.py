@@ -0,0 +1,437 @@
+"""Benchmark the throughput of the download command against the stand-in server."""
+
+from importlib import metadata
+from pathlib import Path
+
+import datetime
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import pandas
+import typer
+
+from rich.console import Console
+from rich.table import Table
+from typer.testing import CliRunner
+
+from workknow import backend
+from workknow import concatenate
+from workknow import constants
+from workknow import endpoint
+from workknow import files
+from workknow import main
+from workknow import produce
+from workknow import standin
+
+# The throughput benchmark starts the stand-in server in a background thread and
+# then runs the download command, exactly as a person would run it, for a number
+# of synthesized repositories. Since the stand-in server counts the pages that it
+# served, the benchmark reports the pages downloaded each second and the repositories
+# downloaded each minute, along with the failures that the server injected. Note
+# that no personal access token is needed for the stand-in server and thus a fake
+# token (and the UTC time zone) is used when the environment does not have one.
+#
+# The suite benchmark does not make any requests; instead, it synthesizes workflow
+# runs with the same schema as the GitHub API (i.e., with the same generator as the
+# stand-in server) and splits them into repositories. For each number of runs, it
+# measures the time and the peak memory of each of these stages:
+#
+# --> create_workflows_dataframe and create_commits_dataframe for each repository
+# --> create_dataframes_from_pages, which makes both DataFrames (and the counts) in
+#     a single pass, for each repository; its speedup is the time of the two
+#     separate stages divided by its time
+# --> combine_files_in_directory for the per-repository CSV files
+# --> save_dataframe_all for the combined workflows and commits DataFrames
+# --> create_results_zip_file for all of the CSV files
+#
+# Each stage is timed (taking the fastest of the repetitions) without tracemalloc,
+# since tracing the allocations slows down the stage, and then run once more with
+# tracemalloc to find the peak memory. The results are written to a JSON file so
+# that the results of two versions of WorkKnow can be compared. Note that the
+# synthesized runs of all of the repositories are in memory at the same time and
+# thus the largest sizes (e.g., 10^7 runs) need many gigabytes of memory.
+
+
+def create_repository_urls(repository_count: int) -> List[str]:
+    """Create the URLs of the synthesized repositories that the benchmark downloads."""
+    return [
+        f"https://github.com/{constants.benchmark.Organization}/{constants.benchmark.Repository_Prefix}{repository}"
+        for repository in range(repository_count)
+    ]
+
+
+def run_download(
+    api_url: str,
+    repository_urls: List[str],
+    download_arguments: List[str],
+) -> Dict[str, Union[int, float]]:
+    """Run the download command for the repositories, returning its exit code and its elapsed time."""
+    arguments = [constants.benchmark.Download_Command, "--api-url", api_url]
+    for repository_url in repository_urls:
+        arguments.extend(["--repo-urls", repository_url])
+    arguments.extend(download_arguments)
+    # the output of the download command is not shown so that
+    # the time spent in writing to the terminal is not measured
+    runner = CliRunner()
+    start_time = time.perf_counter()
+    result = runner.invoke(main.cli, arguments)
+    elapsed_time = time.perf_counter() - start_time
+    return {
+        constants.benchmark.Exit_Code: result.exit_code,
+        constants.benchmark.Elapsed_Seconds: elapsed_time,
+    }
+
+
+def calculate_throughput(
+    repository_count: int,
+    elapsed_time: float,
+    server_statistics: Dict[str, int],
+) -> Dict[str, Union[int, float]]:
+    """Calculate the pages downloaded each second and the repositories downloaded each minute."""
+    page_count = server_statistics.get(constants.standin.Pages, 0)
+    elapsed_time = max(elapsed_time, constants.benchmark.Minimum_Elapsed_Seconds)
+    return {
+        constants.benchmark.Repositories: repository_count,
+        constants.standin.Pages: page_count,
+        constants.standin.Requests: server_statistics.get(
+            constants.standin.Requests, 0
+        ),
+        constants.standin.Server_Errors: server_statistics.get(
+            constants.standin.Server_Errors, 0
+        ),
+        constants.standin.Rate_Limit_Errors: server_statistics.get(
+            constants.standin.Rate_Limit_Errors, 0
+        ),
+        constants.benchmark.Elapsed_Seconds: round(elapsed_time, 3),
+        constants.benchmark.Pages_Per_Second: round(page_count / elapsed_time, 2),
+        constants.benchmark.Repositories_Per_Minute: round(
+            repository_count * 60 / elapsed_time, 2
+        ),
+    }
+
+
+def display_throughput(
+    console: Console, throughput_dict: Dict[str, Union[int, float]]
+) -> None:
+    """Display the throughput of the download in a table."""
+    table = Table(title="Download Throughput")
+    table.add_column("Measure")
+    table.add_column("Value", justify="right")
+    for measure, value in throughput_dict.items():
+        table.add_row(measure, str(value))
+    console.print(table)
+
+
+# create a Typer object to support the command-line interface
+cli = typer.Typer()
+
+
+@cli.command()
+def throughput(
+    repository_count: int = typer.Option(constants.benchmark.Repository_Count),
+    run_count: int = typer.Option(constants.standin.Run_Count),
+    latency: float = typer.Option(constants.benchmark.Latency),
+    server_error_rate: float = typer.Option(0),
+    rate_limit_error_rate: float = typer.Option(0),
+    page_concurrency: int = typer.Option(constants.github.Page_Concurrency),
+    repository_concurrency: int = typer.Option(constants.github.Repository_Concurrency),
+    request_backend: backend.Backend = typer.Option(
+        backend.Backend.SYNC, "--backend", callback=backend.check_backend
+    ),
+    save: bool = typer.Option(False),
+):
+    """Measure the pages/sec and repos/min of the download command against the stand-in server."""
+    console = Console()
+    # the stand-in server does not check the token and thus any token works;
+    # note that the time zone is needed to display the wait for a rate limit reset
+    if not os.getenv(constants.environment.Github_Access_Token):
+        os.environ[constants.environment.Github_Access_Token] = (
+            constants.benchmark.Token
+        )
+    if not os.getenv(constants.environment.Timezone):
+        os.environ[constants.environment.Timezone] = constants.benchmark.Timezone
+    options = standin.StandInOptions(
+        run_count=run_count,
+        latency=latency,
+        server_error_rate=server_error_rate,
+        rate_limit_error_rate=rate_limit_error_rate,
+        rate_limit=constants.rate.Default_Limit,
+        seed=0,
+    )
+    download_arguments = [
+        "--page-concurrency",
+        str(page_concurrency),
+        "--repository-concurrency",
+        str(repository_concurrency),
+        "--backend",
+        request_backend.value,
+    ]
+    with standin.StandInServer(options) as stand_in_server:
+        console.print(
+            f":stopwatch: Downloading {repository_count} repositories of {run_count} runs from {stand_in_server.api_url}"
+        )
+        with tempfile.TemporaryDirectory() as results_dir:
+            if save:
+                download_arguments.extend(["--save", "--results-dir", results_dir])
+            download_result = run_download(
+                stand_in_server.api_url,
+                create_repository_urls(repository_count),
+                download_arguments,
+            )
+        server_statistics = stand_in_server.get_statistics()
+    # the download command configured the stand-in server as the GitHub API and
+    # thus the default is restored for anything else that runs in this process
+    endpoint.configure_api_url(constants.github.Api_Url)
+    if download_result[constants.benchmark.Exit_Code] != 0:
+        console.print(
+            f":grimacing_face: The download command failed with exit code {download_result[constants.benchmark.Exit_Code]}"
+        )
+        raise typer.Exit(code=1)
+    display_throughput(
+        console,
+        calculate_throughput(
+            repository_count,
+            download_result[constants.benchmark.Elapsed_Seconds],
+            server_statistics,
+        ),
+    )
+
+
+def create_synthetic_repositories(
+    run_count: int, runs_per_repository: int
+) -> Iterator[Tuple[str, str, List[List[Dict[str, Any]]]]]:
+    """Synthesize the pages of workflow runs of repositories that have run_count runs in total."""
+    per_page = int(constants.github.Per_Page_Maximum)
+    repository = 0
+    while run_count > 0:
+        repository_run_count = min(run_count, runs_per_repository)
+        repo = f"{constants.benchmark.Repository_Prefix}{repository}"
+        workflow_runs = [
+            standin.create_workflow_run(
+                constants.github.Api_Url,
+                constants.benchmark.Organization,
+                repo,
+                run_number,
+            )
+            for run_number in range(repository_run_count, 0, -1)
+        ]
+        # the runs are split into pages just like the responses of the GitHub API
+        yield (
+            constants.benchmark.Organization,
+            repo,
+            [
+                workflow_runs[start : start + per_page]
+                for start in range(0, len(workflow_runs), per_page)
+            ],
+        )
+        run_count = run_count - repository_run_count
+        repository = repository + 1
+
+
+def measure_stage(
+    stage: Callable[[], Any], repeat: int
+) -> Tuple[Any, Dict[str, Union[int, float]]]:
+    """Measure the fastest time and the peak memory of a stage, returning its result and measurements."""
+    elapsed_times = []
+    for _ in range(max(repeat, 1)):
+        start_time = time.perf_counter()
+        stage()
+        elapsed_times.append(time.perf_counter() - start_time)
+    # tracing the allocations slows down the stage and thus the
+    # peak memory is measured in a separate run of the stage
+    tracemalloc.start()
+    try:
+        result = stage()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (
+        result,
+        {
+            constants.benchmark.Seconds: round(min(elapsed_times), 6),
+            constants.benchmark.Peak_Memory_Bytes: peak_memory,
+        },
+    )
+
+
+def create_dataframes_for_repositories(
+    repositories: List[Tuple[str, str, List[List[Dict[str, Any]]]]],
+    create_dataframe: Callable[..., Any],
+) -> List[Any]:
+    """Create a DataFrame (or DataFrames) for each of the repositories with one of the functions in the produce module."""
+    return [
+        create_dataframe(
+            organization,
+            repo,
+            f"https://github.com/{organization}/{repo}",
+            produce.create_github_api_url(organization, repo),
+            pages,
+        )
+        for (organization, repo, pages) in repositories
+    ]
+
+
+def benchmark_run_count(
+    run_count: int, runs_per_repository: int, repeat: int
+) -> List[Dict[str, Union[str, int, float]]]:
+    """Benchmark each of the stages for a number of synthesized workflow runs."""
+    repositories = list(create_synthetic_repositories(run_count, runs_per_repository))
+    repository_count = len(repositories)
+    measurements = []
+
+    def record(stage_name: str, stage: Callable[[], Any]) -> Any:
+        result, stage_measurements = measure_stage(stage, repeat)
+        measurements.append(
+            {
+                constants.benchmark.Stage: stage_name,
+                constants.benchmark.Runs: run_count,
+                constants.benchmark.Repositories: repository_count,
+                **stage_measurements,
+            }
+        )
+        return result
+
+    workflows_dataframes = record(
+        constants.benchmark.Create_Workflows_Dataframe,
+        lambda: create_dataframes_for_repositories(
+            repositories, produce.create_workflows_dataframe
+        ),
+    )
+    commits_dataframes = record(
+        constants.benchmark.Create_Commits_Dataframe,
+        lambda: create_dataframes_for_repositories(
+            repositories, produce.create_commits_dataframe
+        ),
+    )
+    separate_seconds = sum(
+        measurement[constants.benchmark.Seconds]  # type: ignore
+        for measurement in measurements[-2:]
+    )
+    record(
+        constants.benchmark.Create_Dataframes_From_Pages,
+        lambda: create_dataframes_for_repositories(
+            repositories, produce.create_dataframes_from_pages
+        ),
+    )
+    measurements[-1][constants.benchmark.Speedup] = round(
+        separate_seconds
+        / max(
+            measurements[-1][constants.benchmark.Seconds],  # type: ignore
+            constants.benchmark.Minimum_Elapsed_Seconds,
+        ),
+        2,
+    )
+    # the synthesized runs are not needed once the DataFrames exist
+    repositories.clear()
+    with tempfile.TemporaryDirectory() as results_dir_name:
+        results_dir = Path(results_dir_name)
+        # the CSV files of the repositories are the input of the combine stage
+        for workflows_dataframe, commits_dataframe in zip(
+            workflows_dataframes, commits_dataframes
+        ):
+            for label, dataframe in [
+                (constants.filesystem.Workflows, workflows_dataframe),
+                (constants.filesystem.Commits, commits_dataframe),
+            ]:
+                files.save_dataframe(
+                    results_dir,
+                    dataframe[constants.workflow.Organization].iloc[0],
+                    dataframe[constants.workflow.Repo].iloc[0],
+                    label,
+                    dataframe,
+                )
+        _, combined_commits, combined_workflows = record(
+            constants.benchmark.Combine_Files_In_Directory,
+            lambda: concatenate.combine_files_in_directory(results_dir),
+        )
+        record(
+            constants.benchmark.Save_Dataframe_All,
+            lambda: (
+                files.save_dataframe_all(
+                    results_dir, constants.filesystem.Workflows, combined_workflows
+                ),
+                files.save_dataframe_all(
+                    results_dir, constants.filesystem.Commits, combined_commits
+                ),
+            ),
+        )
+        record(
+            constants.benchmark.Create_Results_Zip_File,
+            lambda: files.create_results_zip_file(
+                results_dir, files.create_results_zip_file_list(results_dir)
+            ),
+        )
+    return measurements
+
+
+def find_workknow_version() -> str:
+    """Find the installed version of WorkKnow, if it is installed."""
+    try:
+        return metadata.version(constants.workknow.Name)
+    except metadata.PackageNotFoundError:
+        return constants.benchmark.Unknown
+
+
+@cli.command()
+def suite(
+    run_counts: List[int] = typer.Option(
+        list(constants.benchmark.Run_Counts), "--runs"
+    ),
+    runs_per_repository: int = typer.Option(constants.benchmark.Runs_Per_Repository),
+    repeat: int = typer.Option(constants.benchmark.Repeat),
+    output: Path = typer.Option(Path(constants.benchmark.Output_File)),
+):
+    """Measure the time and peak memory of producing, combining, and saving synthesized workflow runs."""
+    console = Console()
+    measurements: List[Dict[str, Union[str, int, float]]] = []
+    for run_count in run_counts:
+        console.print(f":stopwatch: Benchmarking {run_count} synthesized workflow runs")
+        measurements.extend(benchmark_run_count(run_count, runs_per_repository, repeat))
+    # the results include the details of the environment so that results from
+    # two versions (or two machines) are only compared when that makes sense
+    benchmark_results = {
+        constants.benchmark.Version: find_workknow_version(),
+        constants.benchmark.Python: platform.python_version(),
+        constants.benchmark.Pandas: pandas.__version__,
+        constants.benchmark.Platform: platform.platform(),
+        constants.benchmark.Created_At: datetime.datetime.now(
+            datetime.timezone.utc
+        ).isoformat(),
+        constants.benchmark.Runs_Per_Repository_Key: runs_per_repository,
+        constants.benchmark.Repeat_Key: repeat,
+        constants.benchmark.Measurements: measurements,
+    }
+    output.write_text(json.dumps(benchmark_results, indent=2))
+    table = Table(title="Benchmark Suite")
+    for column in [
+        constants.benchmark.Stage,
+        constants.benchmark.Runs,
+        constants.benchmark.Seconds,
+        constants.benchmark.Peak_Memory_Bytes,
+        constants.benchmark.Speedup,
+    ]:
+        table.add_column(column)
+    for measurement in measurements:
+        table.add_row(
+            str(measurement[constants.benchmark.Stage]),
+            str(measurement[constants.benchmark.Runs]),
+            str(measurement[constants.benchmark.Seconds]),
+            str(measurement[constants.benchmark.Peak_Memory_Bytes]),
+            str(
+                measurement.get(constants.benchmark.Speedup, constants.markers.Nothing)
+            ),
+        )
+    console.print(table)
+    console.print(f":floppy_disk: Saved the benchmark results in {output}")
@@ -0,0 +1,126 @@
+"""Track the rate limit budget of the GitHub API from the headers of its responses."""
+
+import datetime
+import logging
+import threading
+
+from typing import Dict
+from typing import Mapping
+from typing import Union
+
+from workknow import constants
+
+# Reference:
+# https://docs.github.com/en/rest/overview/resources-in-the-rest-api#rate-limiting
+#
+# Every response from the GitHub API includes headers that describe the current
+# state of the rate limit for the person's personal access token:
+#
+# X-RateLimit-Limit: 5000
+# X-RateLimit-Remaining: 4987
+# X-RateLimit-Reset: 1628203133
+# X-RateLimit-Used: 13
+#
+# Tracking these headers means that WorkKnow can decide whether or not it must
+# wait for a reset without making an extra request to the /rate_limit endpoint.
+
+
+class RateLimitBudget:
+    """The remaining budget of requests that the GitHub API will accept before a reset."""
+
+    def __init__(self):
+        """Create a budget that does not yet know anything about the rate limit."""
+        self.lock = threading.Lock()
+        self.limit: Union[int, None] = None
+        self.remaining: Union[int, None] = None
+        self.reset: Union[int, None] = None
+        self.used: Union[int, None] = None
+
+    def is_known(self) -> bool:
+        """Determine whether or not the budget has received details about the rate limit."""
+        with self.lock:
+            return self.remaining is not None and self.reset is not None
+
+    def update(self, limit: int, remaining: int, reset: int, used: int) -> None:
+        """Update the budget with the details about the rate limit from a response."""
+        with self.lock:
+            # responses for requests that ran at the same time can arrive in any
+            # order and thus, for the same reset window, the budget only keeps the
+            # smallest number of remaining requests; a later reset time means that
+            # GitHub has started a new window and all of the details are replaced
+            if self.reset is None or reset > self.reset:
+                self.limit = limit
+                self.remaining = remaining
+                self.reset = reset
+                self.used = used
+            elif reset == self.reset:
+                self.limit = limit
+                self.remaining = min(remaining, self.remaining)  # type: ignore
+                self.used = max(used, self.used)  # type: ignore
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> bool:
+        """Update the budget from the rate limit headers, returning whether or not they were present."""
+        logger = logging.getLogger(constants.logging.Rich)
+        # some responses (e.g., those from a mocked server or an error page) do not
+        # have all of the rate limit headers and then the budget cannot be updated
+        if (
+            constants.rate.Header_Remaining not in headers
+            or constants.rate.Header_Reset not in headers
+        ):
+            return False
+        remaining = int(headers[constants.rate.Header_Remaining])
+        limit = int(headers.get(constants.rate.Header_Limit, remaining))
+        reset = int(headers[constants.rate.Header_Reset])
+        used = int(headers.get(constants.rate.Header_Used, limit - remaining))
+        self.update(limit, remaining, reset, used)
+        logger.debug(f"Rate limit budget: {remaining} of {limit} until {reset}")
+        return True
+
+    def update_from_dict(self, rate_limit_dict: Dict[str, int]) -> None:
+        """Update the budget from the core resource dictionary of the /rate_limit endpoint."""
+        remaining = rate_limit_dict[constants.rate.Remaining]
+        limit = rate_limit_dict.get(constants.rate.Limit, remaining)
+        used = rate_limit_dict.get(constants.rate.Used, limit - remaining)
+        self.update(limit, remaining, rate_limit_dict[constants.rate.Reset], used)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Create a dictionary of the budget in the same format as the /rate_limit endpoint."""
+        with self.lock:
+            limit = self.limit if self.limit is not None else 0
+            remaining = self.remaining if self.remaining is not None else 0
+            reset = self.reset if self.reset is not None else 0
+            used = self.used if self.used is not None else 0
+        # once the reset time has passed the GitHub API has restored the whole budget
+        current_time = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        if reset <= current_time:
+            remaining = limit
+            used = 0
+        return {
+            constants.rate.Limit: limit,
+            constants.rate.Remaining: remaining,
+            constants.rate.Reset: reset,
+            constants.rate.Used: used,
+        }
+
+
+def calculate_reset_sleep_time(reset: int) -> float:
+    """Calculate how long to sleep until GitHub resets the rate limit budget at the reset time."""
+    # the clocks of GitHub and of this computer may not agree and thus a few extra
+    # seconds are added so that the first request after the sleep is not rejected
+    current_time = datetime.datetime.now(datetime.timezone.utc).timestamp()
+    return max(reset - current_time, 0) + constants.rate.Extra_Seconds
+
+
+# the budget that is shared by all requests to the GitHub API
+_budget = RateLimitBudget()
+
+
+def get_budget() -> RateLimitBudget:
+    """Return the shared rate limit budget."""
+    return _budget
+
+
+def reset_budget() -> None:
+    """Forget everything about the rate limit so that it must be requested again."""
+    global _budget  # pylint: disable=global-statement
+    _budget = RateLimitBudget()
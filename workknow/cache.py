@@ -0,0 +1,297 @@
+"""Cache the responses of the GitHub API on disk and revalidate them with conditional requests."""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from pathlib import Path
+
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Tuple
+from typing import Union
+
+import requests
+
+from requests.structures import CaseInsensitiveDict
+
+from workknow import constants
+
+# Reference:
+# https://docs.github.com/en/rest/overview/resources-in-the-rest-api#conditional-requests
+#
+# Most responses from the GitHub API include an ETag header and many also include
+# a Last-Modified header. Sending these values back in the If-None-Match and the
+# If-Modified-Since headers makes a conditional request: when nothing changed the
+# GitHub API replies with 304 Not Modified, which does not count against the rate
+# limit, and the body of the response can be served from the cache on disk.
+#
+# The cache is a directory that contains:
+# --> one file for the body of each cached response, named by its key
+# --> an index file that records, in least recently used order, the URL, the
+#     headers, and the size of the body for each of the cached responses
+#
+# The key of a response comes from its URL, its parameters, and a hash of the token
+# that requested it, since the tokens of a pool may not see the same repositories.
+# Rewriting the whole index after each stored response would make a download
+# quadratic in the number of pages and thus the index is saved, by replacing it all
+# at once, after every interval of stored responses and when the download
+# finishes. If a download stops before that, the last bodies are not in the index
+# and they are requested again, as if they were never cached.
+
+# the headers that must be stored with the body of a response so that the cached
+# response can stand in for the original one; note that the rate limit headers
+# are never stored because they always come from the fresh (304) response
+CACHED_HEADERS = (
+    constants.cache.Content_Type,
+    constants.cache.Etag,
+    constants.cache.Last_Modified,
+    constants.cache.Link,
+)
+
+# the cache that is shared by all requests to the GitHub API, if configured
+_cache: Union["ResponseCache", None] = None
+
+
+class ResponseCache:
+    """A size-capped, least recently used cache of GitHub API responses stored on disk."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        maximum_size_in_bytes: int,
+        index_save_interval: int = constants.cache.Index_Save_Interval,
+    ):
+        """Open the cache in the provided directory, creating the directory when needed."""
+        self.cache_dir = cache_dir
+        self.maximum_size_in_bytes = maximum_size_in_bytes
+        self.index_save_interval = index_save_interval
+        self.lock = threading.Lock()
+        self.statistics: Dict[str, int] = collections.Counter()
+        self.unsaved_stores = 0
+        # the total size of the bodies is kept up to date as entries are stored and
+        # evicted so that storing a response never sums the sizes of all of the entries
+        self.total_size = 0
+        self.index: "collections.OrderedDict[str, Dict[str, Any]]" = (
+            collections.OrderedDict()
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.load_index()
+
+    def load_index(self) -> None:
+        """Load the index of the cache from the disk, ignoring a missing or damaged index."""
+        logger = logging.getLogger(constants.logging.Rich)
+        index_file = self.cache_dir / constants.cache.Index_File
+        if index_file.is_file():
+            try:
+                index_entries = json.loads(
+                    index_file.read_text(encoding=constants.cache.Encoding)
+                )
+                # the entries are stored in least recently used order
+                for key, entry in index_entries:
+                    if (
+                        self.cache_dir / (key + constants.cache.Body_Extension)
+                    ).is_file():
+                        self.index[key] = entry
+                        self.total_size += entry[constants.cache.Size]
+            except (ValueError, TypeError, KeyError):
+                logger.debug(f"Ignoring the damaged cache index in {index_file}")
+                self.index.clear()
+                self.total_size = 0
+
+    def save_index(self) -> None:
+        """Save the index of the cache to the disk, replacing the previous index all at once."""
+        self.unsaved_stores = 0
+        index_file = self.cache_dir / constants.cache.Index_File
+        temporary_index_file = index_file.with_suffix(".tmp")
+        temporary_index_file.write_text(
+            json.dumps(list(self.index.items())), encoding=constants.cache.Encoding
+        )
+        os.replace(str(temporary_index_file), str(index_file))
+
+    def flush(self) -> None:
+        """Save the index of the cache to the disk if a response was stored since it was last saved."""
+        with self.lock:
+            if self.unsaved_stores > 0:
+                self.save_index()
+
+    @staticmethod
+    def create_key(
+        github_api_url: str,
+        github_params: Mapping[str, str],
+        github_authentication: Union[Tuple[str, str], None] = None,
+    ) -> str:
+        """Create the key of a response from its URL, its parameters, and the hash of its token."""
+        key_source = json.dumps(
+            [
+                github_api_url,
+                sorted((str(k), str(v)) for k, v in github_params.items()),
+                create_token_hash(github_authentication),
+            ]
+        )
+        return hashlib.sha256(key_source.encode(constants.cache.Encoding)).hexdigest()
+
+    def get_conditional_headers(
+        self,
+        github_api_url: str,
+        github_params: Mapping[str, str],
+        github_authentication: Union[Tuple[str, str], None] = None,
+    ) -> Dict[str, str]:
+        """Create the headers for a conditional request if the response was cached."""
+        key = self.create_key(github_api_url, github_params, github_authentication)
+        conditional_headers = {}
+        with self.lock:
+            if key in self.index:
+                cached_headers = self.index[key][constants.cache.Headers]
+                if constants.cache.Etag in cached_headers:
+                    conditional_headers[constants.cache.If_None_Match] = cached_headers[
+                        constants.cache.Etag
+                    ]
+                if constants.cache.Last_Modified in cached_headers:
+                    conditional_headers[constants.cache.If_Modified_Since] = (
+                        cached_headers[constants.cache.Last_Modified]
+                    )
+        return conditional_headers
+
+    def resolve_response(
+        self,
+        github_api_url: str,
+        github_params: Mapping[str, str],
+        response: requests.Response,
+        github_authentication: Union[Tuple[str, str], None] = None,
+    ) -> requests.Response:
+        """Serve a 304 response from the cache or store a new successful response in it."""
+        key = self.create_key(github_api_url, github_params, github_authentication)
+        # the GitHub API reports that the cached response is still correct
+        if response.status_code == constants.retry.Not_Modified_Response:
+            cached_response = self.create_cached_response(key, response)
+            if cached_response is not None:
+                return cached_response
+            # the entry was removed after the conditional request was made and thus
+            # the 304 response is returned so that the caller can request it again
+            return response
+        if response.status_code == constants.github.Success_Response:
+            with self.lock:
+                self.statistics[constants.cache.Misses] += 1
+            # only those responses that can be revalidated are worth storing
+            if (
+                constants.cache.Etag in response.headers
+                or constants.cache.Last_Modified in response.headers
+            ):
+                self.store(key, github_api_url, response)
+        return response
+
+    def create_cached_response(
+        self, key: str, not_modified_response: requests.Response
+    ) -> Union[requests.Response, None]:
+        """Create a response out of the cached body and headers and the fresh headers of a 304 response."""
+        with self.lock:
+            if key not in self.index:
+                return None
+            body_file = self.cache_dir / (key + constants.cache.Body_Extension)
+            try:
+                body = body_file.read_bytes()
+            except OSError:
+                self.total_size -= self.index.pop(key)[constants.cache.Size]
+                return None
+            # this entry is now the most recently used one
+            self.index.move_to_end(key)
+            self.statistics[constants.cache.Hits] += 1
+            cached_headers = self.index[key][constants.cache.Headers]
+        cached_response = requests.Response()
+        cached_response.status_code = constants.github.Success_Response
+        cached_response._content = body  # pylint: disable=protected-access
+        cached_response.encoding = constants.cache.Encoding
+        cached_response.url = not_modified_response.url
+        cached_response.request = not_modified_response.request
+        # start with the fresh headers (e.g., the rate limit headers) and then add
+        # the cached headers (e.g., the pagination links) from the original response
+        cached_response.headers = CaseInsensitiveDict(not_modified_response.headers)
+        cached_response.headers.update(cached_headers)
+        return cached_response
+
+    def store(self, key: str, github_api_url: str, response: requests.Response) -> None:
+        """Store the body and the headers of a response and evict the least recently used ones."""
+        body = response.content
+        # a single body that is bigger than the whole cache would evict everything
+        if len(body) > self.maximum_size_in_bytes:
+            return
+        cached_headers = {
+            header: response.headers[header]
+            for header in CACHED_HEADERS
+            if header in response.headers
+        }
+        body_file = self.cache_dir / (key + constants.cache.Body_Extension)
+        with self.lock:
+            body_file.write_bytes(body)
+            # a response that replaces a cached one no longer counts the previous body
+            if key in self.index:
+                self.total_size -= self.index[key][constants.cache.Size]
+            self.total_size += len(body)
+            self.index[key] = {
+                constants.data.Url: github_api_url,
+                constants.cache.Headers: cached_headers,
+                constants.cache.Size: len(body),
+            }
+            self.index.move_to_end(key)
+            self.statistics[constants.cache.Stores] += 1
+            self.evict()
+            self.unsaved_stores += 1
+            if self.unsaved_stores >= self.index_save_interval:
+                self.save_index()
+
+    def evict(self) -> None:
+        """Evict the least recently used responses until the cache fits in its maximum size."""
+        while self.total_size > self.maximum_size_in_bytes and self.index:
+            evicted_key, evicted_entry = self.index.popitem(last=False)
+            evicted_body_file = self.cache_dir / (
+                evicted_key + constants.cache.Body_Extension
+            )
+            if evicted_body_file.is_file():
+                evicted_body_file.unlink()
+            self.total_size -= evicted_entry[constants.cache.Size]
+            self.statistics[constants.cache.Evictions] += 1
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Return the number of hits, misses, stores, and evictions and the size of the cache."""
+        with self.lock:
+            return {
+                constants.cache.Hits: self.statistics[constants.cache.Hits],
+                constants.cache.Misses: self.statistics[constants.cache.Misses],
+                constants.cache.Stores: self.statistics[constants.cache.Stores],
+                constants.cache.Evictions: self.statistics[constants.cache.Evictions],
+                constants.cache.Size: self.total_size,
+            }
+
+
+def create_token_hash(github_authentication: Union[Tuple[str, str], None]) -> str:
+    """Create the hash of the token in the authentication so that the token is never stored."""
+    if github_authentication is None:
+        return constants.markers.Nothing
+    return hashlib.sha256(
+        str(github_authentication[-1]).encode(constants.cache.Encoding)
+    ).hexdigest()
+
+
+def configure_cache(
+    cache_dir: Union[Path, None],
+    maximum_size_in_megabytes: int = constants.cache.Maximum_Size_Megabytes,
+) -> Union[ResponseCache, None]:
+    """Configure the shared response cache, which is disabled when there is no directory."""
+    global _cache  # pylint: disable=global-statement
+    # the index of the previous cache is saved before it is replaced
+    if _cache is not None:
+        _cache.flush()
+    _cache = None
+    if cache_dir is not None:
+        _cache = ResponseCache(cache_dir, maximum_size_in_megabytes * 1024 * 1024)
+    return _cache
+
+
+def get_cache() -> Union[ResponseCache, None]:
+    """Return the shared response cache or None when it is not configured."""
+    return _cache
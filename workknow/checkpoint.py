@@ -0,0 +1,209 @@
+"""Record a crash-safe journal of the downloaded pages and repositories so that a download can resume."""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+
+from pathlib import Path
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from rich.console import Console
+
+from workknow import constants
+from workknow import metrics
+
+# The checkpoint journal is a directory inside of the results directory that contains:
+#
+# --> repositories.jsonl: one line for each repository whose data was completely
+#     downloaded and saved, along with its count of workflow records
+# --> pages-<repository hash>-<hash>.jsonl: one line for each page of workflow runs
+#     that was downloaded for a listing of a repository that is not yet complete; the
+#     files of all of the listings of a repository (e.g., of each date range of a sharded
+#     download or of each workflow of a per-workflow download) are removed as soon as
+#     the repository is recorded as complete, so the journal never grows too large; note
+#     that the hash is of the URL and of the parameters that filter the workflow runs
+#     (e.g., the created>= parameter of an incremental download) and thus the pages of
+#     a download are never used to resume a download of other workflow runs
+#
+# Every line is flushed and synchronized to the disk before the download goes on and
+# thus the journal is up-to-date even if the process crashes or is killed. A line that
+# was only partially written at the time of a crash is ignored when reading the journal.
+
+
+class CheckpointJournal:
+    """A journal of the completed pages and repositories in a results directory."""
+
+    def __init__(self, results_dir: Path, resume: bool = False):
+        """Open the journal in the results directory, starting it over unless resuming."""
+        self.journal_dir = results_dir / constants.checkpoint.Directory
+        self.resume = resume
+        self.lock = threading.Lock()
+        # a download that does not resume must never use the pages and the
+        # repositories of an earlier download and thus the journal starts over
+        if not resume and self.journal_dir.is_dir():
+            shutil.rmtree(str(self.journal_dir))
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def create_repository_prefix(github_api_url: str) -> str:
+        """Create the start of the names of the files that store the pages of the listings of a repository."""
+        repository = metrics.find_repository(github_api_url)
+        return (
+            constants.checkpoint.Pages_Prefix
+            + hashlib.sha256(
+                repository.encode(constants.checkpoint.Encoding)
+            ).hexdigest()
+            + constants.filesystem.Dash
+        )
+
+    def create_pages_file(
+        self,
+        github_api_url: str,
+        github_params_filter: Union[Dict[str, str], None] = None,
+    ) -> Path:
+        """Create the path of the file that stores the downloaded pages of a listing with the filter parameters."""
+        journal_key = json.dumps(
+            [github_api_url, github_params_filter or {}], sort_keys=True
+        )
+        journal_hash = hashlib.sha256(
+            journal_key.encode(constants.checkpoint.Encoding)
+        ).hexdigest()
+        return self.journal_dir / (
+            self.create_repository_prefix(github_api_url)
+            + journal_hash
+            + constants.checkpoint.Journal_Extension
+        )
+
+    def append_line(self, journal_file: Path, entry: Dict[str, Any]) -> None:
+        """Append an entry to a journal file and make sure that it is on the disk."""
+        with self.lock:
+            with open(
+                str(journal_file), "a", encoding=constants.checkpoint.Encoding
+            ) as journal:
+                journal.write(json.dumps(entry) + constants.markers.Newline)
+                journal.flush()
+                os.fsync(journal.fileno())
+
+    @staticmethod
+    def read_lines(journal_file: Path) -> List[Dict[str, Any]]:
+        """Read all of the complete entries in a journal file."""
+        logger = logging.getLogger(constants.logging.Rich)
+        entries = []
+        if journal_file.is_file():
+            with open(
+                str(journal_file), encoding=constants.checkpoint.Encoding
+            ) as journal:
+                for line in journal:
+                    # the last line may be incomplete if the process crashed while
+                    # writing it and it is then the same as a page never downloaded
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        logger.debug(f"Ignoring an incomplete line in {journal_file}")
+        return entries
+
+    def record_page(
+        self,
+        github_api_url: str,
+        page: int,
+        workflow_runs: List[Dict[str, Any]],
+        github_params_filter: Union[Dict[str, str], None] = None,
+    ) -> None:
+        """Record that a page of workflow runs for a repository was downloaded."""
+        self.append_line(
+            self.create_pages_file(github_api_url, github_params_filter),
+            {
+                constants.checkpoint.Page: page,
+                constants.checkpoint.Workflow_Runs: workflow_runs,
+            },
+        )
+
+    def record_repository(
+        self,
+        repo_url: str,
+        github_api_url: str,
+        count_dictionary: Dict[str, Union[str, int]],
+    ) -> None:
+        """Record that a repository was completely downloaded and saved."""
+        self.append_line(
+            self.journal_dir / constants.checkpoint.Repositories_File,
+            {
+                constants.checkpoint.Repo_Url: repo_url,
+                constants.checkpoint.Count: count_dictionary,
+            },
+        )
+        # the pages of all of the listings of a complete repository are never needed again
+        with self.lock:
+            for pages_file in self.journal_dir.glob(
+                self.create_repository_prefix(github_api_url)
+                + constants.filesystem.Wildcard
+            ):
+                pages_file.unlink()
+
+    def get_completed_repositories(self) -> Dict[str, Dict[str, Union[str, int]]]:
+        """Return the count dictionaries of all of the completed repositories, keyed by URL."""
+        return {
+            entry[constants.checkpoint.Repo_Url]: entry[constants.checkpoint.Count]
+            for entry in self.read_lines(
+                self.journal_dir / constants.checkpoint.Repositories_File
+            )
+        }
+
+    def get_stored_pages(
+        self,
+        github_api_url: str,
+        github_params_filter: Union[Dict[str, str], None] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Return the workflow runs of the consecutive pages, starting at the first page, stored for a repository."""
+        stored_pages = {
+            entry[constants.checkpoint.Page]: entry[constants.checkpoint.Workflow_Runs]
+            for entry in self.read_lines(
+                self.create_pages_file(github_api_url, github_params_filter)
+            )
+        }
+        # pages downloaded by a pool of workers may have finished out of order and thus
+        # only the pages before the first missing page can be used to resume the download
+        consecutive_pages = []
+        page = 1
+        while page in stored_pages:
+            consecutive_pages.append(stored_pages[page])
+            page = page + 1
+        return consecutive_pages
+
+
+def open_listing(
+    checkpoint_journal: Union[CheckpointJournal, None],
+    github_api_url: str,
+    github_params_filter: Union[Dict[str, str], None] = None,
+) -> Tuple[List[List[Dict[str, Any]]], Union[Callable[[int, List], None], None]]:
+    """Return the stored pages of a listing and the callback that records each of its new pages, when there is a journal."""
+    if checkpoint_journal is None:
+        return ([], None)
+    return (
+        checkpoint_journal.get_stored_pages(github_api_url, github_params_filter),
+        functools.partial(
+            checkpoint_journal.record_page,
+            github_api_url,
+            github_params_filter=github_params_filter,
+        ),
+    )
+
+
+def display_stored_pages(console: Console, stored_page_count: int) -> None:
+    """Display the number of pages stored in the checkpoint journal that a download resumes after, if there are any."""
+    if stored_page_count == 0:
+        return
+    console.print(
+        f":fast-forward_button: Resuming after {stored_page_count} page(s) stored in the checkpoint journal"
+    )
+    console.print()
@@ -18,12 +18,16 @@ from rich.progress import TimeElapsedColumn
 
 from workknow import configure
 from workknow import constants
+from workknow import fileformat
+from workknow import profiler
+from workknow import schema
 
 
+@profiler.profile_stage(constants.profile.Concatenate)
 def combine_files_in_directory(
     csv_directory: Path,
 ) -> Tuple[pandas.DataFrame, pandas.DataFrame, pandas.DataFrame]:
-    """Combine all of the CSV files inside of a directory."""
+    """Combine all of the data files, in the format detected from their extension, inside of a directory."""
     logger = logging.getLogger(constants.logging.Rich)
     console = configure.setup_console()
     data_frame_list_commits: List[pandas.DataFrame] = []
@@ -32,7 +36,14 @@ def combine_files_in_directory(
     workflows_data_frame = None
     commits_data_frame = None
     counts_data_frame = None
-    # extract all of the commits-based CSV files
+    # the files of the repositories may have been saved in any format
+    file_format = fileformat.detect_format(csv_directory)
+    logger.debug(file_format)
+    # the memory of the DataFrames read from the files, before and
+    # after the schema gave their columns more compact types
+    commits_memory = [0, 0]
+    workflows_memory = [0, 0]
+    # extract all of the commits-based files
     with Progress(
         constants.progress.Task_Format,
         BarColumn(),
@@ -46,20 +57,27 @@ def combine_files_in_directory(
         "remaining",
     ) as progress:
         sorted_directory_glob = sorted(
-            csv_directory.glob(constants.filesystem.Csv_Commits_Glob)
+            csv_directory.glob(
+                fileformat.create_glob(constants.filesystem.Commits, file_format)
+            )
         )
         task = progress.add_task(
             "Combine Commit Data", total=len(sorted_directory_glob) + 1
         )
         for csv_file in sorted_directory_glob:
             logger.debug(csv_file)
-            csv_file_data_frame = pandas.read_csv(str(csv_file))
-            data_frame_list_commits.append(csv_file_data_frame)
+            csv_file_data_frame = fileformat.read_dataframe(csv_file)
+            typed_csv_file_data_frame = schema.apply_commits_schema(
+                csv_file_data_frame
+            )
+            commits_memory[0] += schema.calculate_memory(csv_file_data_frame)
+            commits_memory[1] += schema.calculate_memory(typed_csv_file_data_frame)
+            data_frame_list_commits.append(typed_csv_file_data_frame)
             progress.update(task, advance=1)
         commits_data_frame = combine_data_frames(data_frame_list_commits)
         progress.update(task, advance=1)
     logger.debug(len(data_frame_list_commits))
-    # extract all of the workflow-based CSV files
+    # extract all of the workflow-based files
     console.print()
     with Progress(
         constants.progress.Task_Format,
@@ -74,16 +92,22 @@ def combine_files_in_directory(
         "remaining",
     ) as progress:
         sorted_directory_glob = sorted(
-            csv_directory.glob(constants.filesystem.Csv_Workflows_Glob)
+            csv_directory.glob(
+                fileformat.create_glob(constants.filesystem.Workflows, file_format)
+            )
         )
         task = progress.add_task(
             "Combine Workflow Data", total=len(sorted_directory_glob) + 1
         )
-        for csv_file in sorted(
-            csv_directory.glob(constants.filesystem.Csv_Workflows_Glob)
-        ):
+        for csv_file in sorted_directory_glob:
             logger.debug(csv_file)
-            csv_file_data_frame = pandas.read_csv(str(csv_file))
+            csv_file_data_frame = fileformat.read_dataframe(csv_file)
+            typed_csv_file_data_frame = schema.apply_workflows_schema(
+                csv_file_data_frame
+            )
+            workflows_memory[0] += schema.calculate_memory(csv_file_data_frame)
+            workflows_memory[1] += schema.calculate_memory(typed_csv_file_data_frame)
+            csv_file_data_frame = typed_csv_file_data_frame
             workflow_count_dictionary = create_counts_dictionary(csv_file_data_frame)
             if len(workflow_count_dictionary) != 0:
                 data_frame_list_counts.append(workflow_count_dictionary)
@@ -94,6 +118,16 @@ def combine_files_in_directory(
         progress.update(task, advance=1)
     logger.debug(len(data_frame_list_workflows))
     console.print()
+    for label, (untyped_memory, typed_memory) in [
+        ("commits", commits_memory),
+        ("workflows", workflows_memory),
+    ]:
+        schema.log_memory(f"the {label} DataFrames", untyped_memory, typed_memory)
+        console.print(
+            f":floppy_disk: The {label} data uses {schema.format_megabytes(typed_memory)}"
+            f" instead of {schema.format_megabytes(untyped_memory)}"
+        )
+    console.print()
     return (
         counts_data_frame,
         commits_data_frame,
@@ -142,8 +176,10 @@ def extract_data(workflows_data_frame: pandas.DataFrame, attribute: str) -> str:
     return constants.markers.Empty
 
 
+@profiler.profile_stage(constants.profile.Concatenate)
 def combine_data_frames(data_frame_list: List[pandas.DataFrame]) -> pandas.DataFrame:
     """Combine all of the data frames in the list to a single data frame."""
     # concatenate together all of the data frames in the list into a
-    # single data frame, useful for summarization or saving to file system
-    return pandas.concat(data_frame_list)
+    # single data frame, useful for summarization or saving to file system;
+    # note that the columns with categories keep the category type
+    return schema.concatenate_dataframes(data_frame_list)
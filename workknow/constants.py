@@ -16,6 +16,98 @@ def create_constants(name, *args, **kwargs):
     return new_constants(*itertools.chain(args, kwargs.values()))
 
 
+# define the constants for the backends
+backend = create_constants(
+    "backend",
+    Aiohttp="aiohttp",
+    Async="async",
+    Sync="sync",
+)
+
+
+# define the constants for the benchmarks
+benchmark = create_constants(
+    "benchmark",
+    Combine_Files_In_Directory="combine_files_in_directory",
+    Create_Commits_Dataframe="create_commits_dataframe",
+    Create_Dataframes_From_Pages="create_dataframes_from_pages",
+    Create_Results_Zip_File="create_results_zip_file",
+    Create_Workflows_Dataframe="create_workflows_dataframe",
+    Created_At="created_at",
+    Download_Command="download",
+    Elapsed_Seconds="elapsed_seconds",
+    Exit_Code="exit_code",
+    Latency=0.005,
+    Measurements="measurements",
+    Minimum_Elapsed_Seconds=0.001,
+    Organization="benchmark",
+    Output_File="workknow-benchmark.json",
+    Pages_Per_Second="pages_per_second",
+    Pandas="pandas",
+    Peak_Memory_Bytes="peak_memory_bytes",
+    Platform="platform",
+    Python="python",
+    Repeat=1,
+    Repeat_Key="repeat",
+    Repositories="repositories",
+    Repositories_Per_Minute="repositories_per_minute",
+    Repository_Count=10,
+    Repository_Prefix="repository-",
+    Run_Counts=(10000, 100000),
+    Runs="runs",
+    Runs_Per_Repository=10000,
+    Runs_Per_Repository_Key="runs_per_repository",
+    Save_Dataframe_All="save_dataframe_all",
+    Seconds="seconds",
+    Speedup="speedup",
+    Stage="stage",
+    Timezone="UTC",
+    Token="stand-in-token",
+    Unknown="unknown",
+    Version="version",
+)
+
+
+# define the constants for the response cache
+cache = create_constants(
+    "cache",
+    Body_Extension=".json",
+    Content_Type="Content-Type",
+    Encoding="utf-8",
+    Etag="ETag",
+    Evictions="evictions",
+    Headers="headers",
+    Hits="hits",
+    If_Modified_Since="If-Modified-Since",
+    If_None_Match="If-None-Match",
+    Index_File="index.json",
+    Index_Save_Interval=100,
+    Last_Modified="Last-Modified",
+    Link="Link",
+    Maximum_Size_Megabytes=512,
+    Misses="misses",
+    Size="size",
+    Stores="stores",
+)
+
+
+# define the constants for the checkpoint journal
+checkpoint = create_constants(
+    "checkpoint",
+    Count="count",
+    Directory=".workknow-checkpoint",
+    Encoding="utf-8",
+    Github_Api_Url="github_api_url",
+    Journal_Extension=".jsonl",
+    Page="page",
+    Pages_Prefix="pages-",
+    Repo_Url="repo_url",
+    Repositories_File="repositories.jsonl",
+    Workflow_Runs="workflow_runs",
+    Workflows="workflows",
+)
+
+
 # define the constants for markers
 data = create_constants(
     "data",
@@ -27,10 +119,24 @@ data = create_constants(
 environment = create_constants(
     "environment",
     Github_Access_Token="PERSONAL_GITHUB_ACCESS_TOKEN",
+    Github_Api_Url="WORKKNOW_GITHUB_API_URL",
+    Github_Access_Tokens="PERSONAL_GITHUB_ACCESS_TOKENS",
     Timezone="LOCAL_TIMEZONE",
 )
 
 
+# define the constants for the formats of the data files
+fileformat = create_constants(
+    "fileformat",
+    Compression="zstd",
+    Csv="csv",
+    Extension_Separator=".",
+    Feather="feather",
+    Parquet="parquet",
+    Pyarrow="pyarrow",
+)
+
+
 # define the files constants
 files = create_constants(
     "files",
@@ -49,8 +155,10 @@ filesystem = create_constants(
     Csv_Commits_Glob="*-Commits.csv",
     Csv_Workflows_Glob="*-Workflows.csv",
     Dash="-",
+    Jobs="Jobs",
     Slash="/",
     Results="Results",
+    Steps="Steps",
     Wildcard="*",
     Workflows="Workflows",
     Zip_Extension=".zip",
@@ -61,7 +169,9 @@ filesystem = create_constants(
 github = create_constants(
     "github",
     Actions="actions/runs",
+    Actions_Workflows="actions/workflows",
     Api="api.github.com/repos/",
+    Api_Url="https://api.github.com",
     Https="https://",
     Last="last",
     Maximum_Length_All=3,
@@ -69,16 +179,34 @@ github = create_constants(
     Maximum_Request_Retries=10,
     Next="next",
     Page="page",
+    Page_Concurrency=1,
     Page_Start=2,
+    Page_Window_Factor=2,
     Per_Page="per_page",
     Per_Page_Maximum="100",
+    Queue_Poll_Seconds=0.1,
+    Repos="repos",
+    Repository_Concurrency=1,
+    Repository_Window_Factor=2,
+    Runs="runs",
     Separator="/",
     Success_Response=200,
     Url="url",
+    Url_Cache_Size=131072,
     User="User",
     User_Agent="User-Agent",
     Wait_In_Seconds=1,
     Workflow_Runs="workflow_runs",
+    Workflows="workflows",
+)
+
+
+# define the constants for the incremental download
+incremental = create_constants(
+    "incremental",
+    Created="created",
+    Greater_Than_Or_Equal=">=",
+    State_File=".workknow-incremental.json",
 )
 
 
@@ -90,6 +218,22 @@ github = create_constants(
 # ERROR
 # CRITICAL
 
+# define the constants for the jobs and the steps of workflow runs
+jobs = create_constants(
+    "jobs",
+    Completed="completed",
+    Completed_At="completed_at",
+    Job_Concurrency=4,
+    Job_Id="job_id",
+    Jobs="jobs",
+    Number="number",
+    Run_Id="run_id",
+    Runner_Name="runner_name",
+    Started_At="started_at",
+    Steps="steps",
+)
+
+
 # define the logging constants
 logging = create_constants(
     "logging",
@@ -103,9 +247,11 @@ logging = create_constants(
     Rich="Rich",
 )
 
+
 # define the constants for markers
 markers = create_constants(
     "markers",
+    Colon=":",
     Empty=b"",
     Indent="  ",
     Newline="\n",
@@ -116,6 +262,77 @@ markers = create_constants(
 )
 
 
+# define the constants for the metrics of each repository
+metrics = create_constants(
+    "metrics",
+    All="all",
+    Buckets="buckets",
+    Build_Seconds="build_seconds",
+    Bytes="bytes",
+    Combine="combine",
+    Command="command",
+    Count="count",
+    Count_Names=(
+        "requests",
+        "bytes",
+        "retries",
+        "sleep_seconds",
+        "rate_limit_sleep_seconds",
+        "decode_seconds",
+        "build_seconds",
+        "write_seconds",
+        "untyped_memory_bytes",
+        "typed_memory_bytes",
+    ),
+    Decode_Seconds="decode_seconds",
+    Download="download",
+    File_Prefix="workknow-metrics-",
+    Infinity="+Inf",
+    Json_Extension=".json",
+    Latency_Buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    Latency_Seconds="latency_seconds",
+    Prefix="workknow_",
+    Prom_Extension=".prom",
+    Rate_Limit_Sleep_Seconds="rate_limit_sleep_seconds",
+    Repositories="repositories",
+    Request_Latency_Seconds="request_latency_seconds",
+    Requests="requests",
+    Retries="retries",
+    Sleep_Seconds="sleep_seconds",
+    Sum="sum",
+    Temporary_Extension=".tmp",
+    Total_Suffix="_total",
+    Typed_Memory_Bytes="typed_memory_bytes",
+    Untyped_Memory_Bytes="untyped_memory_bytes",
+    Write_Seconds="write_seconds",
+)
+
+
+# define the constants for the plan of a download
+plan = create_constants(
+    "plan",
+    Planned_Url="planned_url",
+)
+
+
+# define the constants for the profiles of the stages
+profile = create_constants(
+    "profile",
+    Built_In_File="~",
+    Bytes_Per_Megabyte=1024 * 1024,
+    Concatenate="concatenate",
+    File_Prefix="workknow-profile-",
+    Files="files",
+    Produce="produce",
+    Release="release",
+    Request="request",
+    Snapshot_Extension=".tracemalloc",
+    Snapshot_Peak_Growth=1.25,
+    Stats_Extension=".prof",
+    Top_Count=5,
+)
+
+
 # define the constants for progress bars
 progress = create_constants(
     "progress",
@@ -128,21 +345,139 @@ progress = create_constants(
 )
 
 
+# define the constants for the projection of workflow runs
+projection = create_constants(
+    "projection",
+    Separator=".",
+)
+
+
 # define the constants for rate limiting
 rate = create_constants(
     "rate",
     Core="core",
+    Default_Limit=5000,
     Extra_Seconds=2,
+    Header_Limit="X-RateLimit-Limit",
+    Header_Remaining="X-RateLimit-Remaining",
+    Header_Reset="X-RateLimit-Reset",
+    Header_Used="X-RateLimit-Used",
     Limit="limit",
     Used="used",
     Remaining="remaining",
     Reset="reset",
     Resources="resources",
+    Rate_Limit="rate_limit",
     Rate_Limit_Url="https://api.github.com/rate_limit",
     Threshold=10,
 )
 
 
+# define the constants for the retry policy
+retry = create_constants(
+    "retry",
+    Exception="exception",
+    Forbidden_Response=403,
+    Jitter_Fraction=0.25,
+    Not_Modified_Response=304,
+    Permanent="permanent",
+    Permanent_Responses=(401, 404, 410, 422),
+    Rate_Limited="rate_limited",
+    Retry_After="Retry-After",
+    Server_Error_Minimum=500,
+    Success="success",
+    Too_Many_Requests_Response=429,
+    Transient="transient",
+)
+
+
+# define the constants for the typed schema of the DataFrames
+schema = create_constants(
+    "schema",
+    Author="author",
+    Bytes_Per_Megabyte=1024 * 1024,
+    Category="category",
+    Committer="committer",
+    Date_Format="%Y-%m-%dT%H:%M:%SZ",
+    Datetime="datetime64[ns, UTC]",
+    Email="email",
+    Integer="int64",
+    Message="message",
+    Name="name",
+    Nullable_Integer="Int64",
+    String="string",
+    Timestamp="timestamp",
+    Tree_Id="tree_id",
+)
+
+
+# define the constants for the sharded download
+shard = create_constants(
+    "shard",
+    Date_Format="%Y-%m-%dT%H:%M:%SZ",
+    Maximum_Results=1000,
+    Probe_Per_Page="1",
+    Range_Separator="..",
+    Shards=1,
+    Total_Count="total_count",
+)
+
+
+# define the constants for the shared HTTP session
+session = create_constants(
+    "session",
+    Accept="Accept",
+    Accept_Github="application/vnd.github.v3+json",
+    Authorization="Authorization",
+    Basic="Basic ",
+    Connection="Connection",
+    Connections="connections",
+    Keep_Alive="keep-alive",
+    Maximum_Adapter_Retries=0,
+    Pool_Connections=10,
+    Pool_Maxsize=10,
+    Prefix_Http="http://",
+    Prefix_Https="https://",
+    Requests="requests",
+    Reused="reused",
+)
+
+
+# define the constants for the stand-in server of the GitHub Actions API
+standin = create_constants(
+    "standin",
+    Content_Length="Content-Length",
+    Content_Type="application/json; charset=utf-8",
+    Encoding="utf-8",
+    Host="127.0.0.1",
+    Jobs_Route="jobs",
+    Pages="pages",
+    Per_Page_Default="30",
+    Port=8080,
+    Rate_Limit_Errors="rate_limit_errors",
+    Rate_Limit_Route="rate_limit",
+    Rate_Limit_Window=5,
+    Requests="requests",
+    Run_Count=1000,
+    Runs_Route="runs",
+    Server_Error_Response=502,
+    Server_Errors="server_errors",
+    Workflow_Id=1,
+    Workflows_Route="workflows",
+)
+
+
+# define the constants for the pool of tokens
+tokens = create_constants(
+    "tokens",
+    Mask="...",
+    Requests="requests",
+    Separator=",",
+    Token="token",
+    Visible_Characters=4,
+)
+
+
 # define the constants for workflow
 workflow = create_constants(
     "workflow",
@@ -164,6 +499,14 @@ workflow = create_constants(
 )
 
 
+# define the constants for the per-workflow download
+workflows = create_constants(
+    "workflows",
+    Path="path",
+    Workflow_Concurrency=4,
+)
+
+
 # define the constants for workknow
 workknow = create_constants(
     "workknow",
@@ -0,0 +1,51 @@
+"""Configure the base URL of the GitHub API that all of the requests use."""
+
+import logging
+import os
+
+from typing import Union
+
+from workknow import constants
+
+# By default, WorkKnow sends all of its requests to https://api.github.com. The base
+# URL can instead be configured (e.g., with the --api-url option of the download
+# command or with the WORKKNOW_GITHUB_API_URL environment variable) so that WorkKnow
+# requests the workflow runs from another server with the same API, like a GitHub
+# Enterprise Server or the local stand-in server in the standin module.
+
+# the base URL of the GitHub API that is shared by all requests
+_api_url = constants.github.Api_Url
+
+
+def configure_api_url(api_url: Union[str, None] = None) -> str:
+    """Configure the base URL of the GitHub API, falling back to the environment and then the default."""
+    global _api_url  # pylint: disable=global-statement
+    logger = logging.getLogger(constants.logging.Rich)
+    if not api_url:
+        api_url = os.getenv(
+            constants.environment.Github_Api_Url, default=constants.github.Api_Url
+        )
+    # note that the URLs are created by adding a separator to the base URL
+    _api_url = api_url.rstrip(constants.github.Separator)
+    logger.debug(f"Configured the GitHub API URL: {_api_url}")
+    return _api_url
+
+
+def get_api_url() -> str:
+    """Return the configured base URL of the GitHub API."""
+    return _api_url
+
+
+def create_repos_url() -> str:
+    """Create the URL under which the GitHub API provides the details of each repository."""
+    return (
+        _api_url
+        + constants.github.Separator
+        + constants.github.Repos
+        + constants.github.Separator
+    )
+
+
+def create_rate_limit_url() -> str:
+    """Create the URL at which the GitHub API provides the details of the rate limit."""
+    return _api_url + constants.github.Separator + constants.rate.Rate_Limit
@@ -0,0 +1,250 @@
+"""Write and read the data files in the CSV format or in a compressed columnar format."""
+
+from enum import Enum
+from pathlib import Path
+
+import importlib.util
+
+from typing import Any
+from typing import Dict
+from typing import Union
+
+import pandas
+import typer
+
+from workknow import constants
+from workknow import schema
+
+# The data of each repository and of all repositories is saved in one of the formats:
+#
+# --> csv: a text file that any tool can read, where the timestamps have the format
+#     of the GitHub API and the types of the columns must be found again when reading
+# --> parquet: a compressed columnar file that keeps the types of the columns (e.g.,
+#     the categories and the timestamps of the schema) and the index of the DataFrame
+# --> feather: a compressed columnar file that keeps the types of the columns and that
+#     is the fastest to write and read, but that cannot store the index of a DataFrame
+#
+# Both of the columnar formats need the pyarrow package, which is installed with the
+# parquet extra (i.e., workknow[parquet]) and checked when the --format option is
+# parsed so that a command does not fail after it downloaded the data. The extension of a
+# file reveals its format and thus the files of a directory are read in their format.
+#
+# The files for all of the repositories are written by appending the DataFrame of each
+# repository as soon as it is finished, so that the DataFrames of all of the repositories
+# never have to be in memory at the same time. Every file has all of the columns that a
+# DataFrame can have, with the types of the schema, and thus each DataFrame is given
+# those columns and types before it is appended, including the DataFrames of the CSV
+# files that are read without any types when a download resumes. Since a Feather file
+# can only have one dictionary for each column, the categories of a Feather file are
+# stored as their values, which the schema turns into categories again when it is read.
+
+
+class FileFormat(str, Enum):
+    """The predefined formats of the data files."""
+
+    CSV = constants.fileformat.Csv
+    PARQUET = constants.fileformat.Parquet
+    FEATHER = constants.fileformat.Feather
+
+
+def check_format(file_format: FileFormat) -> str:
+    """Check that the package that a format needs is installed, when the --format option is parsed."""
+    # note that typer turns the value returned by the callback into the format
+    if (
+        file_format != FileFormat.CSV
+        and importlib.util.find_spec(constants.fileformat.Pyarrow) is None
+    ):
+        raise typer.BadParameter(
+            f"The {file_format.value} format needs the pyarrow package, which is installed"
+            " with the parquet extra (i.e., workknow[parquet])"
+        )
+    return file_format.value
+
+
+# the format in which the data files of a command are saved
+_file_format = FileFormat.CSV
+
+
+def configure_format(file_format: FileFormat) -> FileFormat:
+    """Configure the format in which the data files are saved."""
+    global _file_format  # pylint: disable=global-statement
+    _file_format = FileFormat(file_format)
+    return _file_format
+
+
+def get_format() -> FileFormat:
+    """Return the format in which the data files are saved."""
+    return _file_format
+
+
+def create_extension(file_format: Union[FileFormat, None] = None) -> str:
+    """Create the extension of the files in a format, which is the configured format by default."""
+    if file_format is None:
+        file_format = _file_format
+    return constants.fileformat.Extension_Separator + file_format.value
+
+
+def create_glob(label: str, file_format: Union[FileFormat, None] = None) -> str:
+    """Create the pattern that matches the files of each repository with a label in a format."""
+    return (
+        constants.filesystem.Wildcard
+        + constants.filesystem.Dash
+        + label
+        + create_extension(file_format)
+    )
+
+
+def find_format(file_path: Path) -> FileFormat:
+    """Find the format of a file from its extension, which is the CSV format when it is not known."""
+    for file_format in FileFormat:
+        if file_path.suffix == create_extension(file_format):
+            return file_format
+    return FileFormat.CSV
+
+
+def detect_format(directory: Path) -> FileFormat:
+    """Detect the format of the files of the repositories in a directory, which is the CSV format when there are none."""
+    for file_format in FileFormat:
+        if any(
+            directory.glob(create_glob(constants.filesystem.Workflows, file_format))
+        ):
+            return file_format
+    return FileFormat.CSV
+
+
+def write_dataframe(
+    dataframe: pandas.DataFrame,
+    file_path: Path,
+    file_format: Union[FileFormat, None] = None,
+) -> None:
+    """Write a DataFrame to a file in a format, which is the configured format by default."""
+    if file_format is None:
+        file_format = _file_format
+    if file_format == FileFormat.PARQUET:
+        dataframe.to_parquet(
+            str(file_path), compression=constants.fileformat.Compression
+        )
+    elif file_format == FileFormat.FEATHER:
+        # a feather file only stores the columns and thus the index is dropped
+        dataframe.reset_index(drop=True).to_feather(
+            str(file_path), compression=constants.fileformat.Compression
+        )
+    else:
+        # the timestamps are saved in the format of the GitHub API
+        dataframe.to_csv(str(file_path), date_format=constants.schema.Date_Format)
+
+
+def read_dataframe(
+    file_path: Path, index_col: Union[int, None] = None
+) -> pandas.DataFrame:
+    """Read a DataFrame from a file in the format of its extension, using a column of a CSV file as the index."""
+    file_format = find_format(file_path)
+    if file_format == FileFormat.PARQUET:
+        return pandas.read_parquet(str(file_path))
+    if file_format == FileFormat.FEATHER:
+        return pandas.read_feather(str(file_path))
+    return pandas.read_csv(str(file_path), index_col=index_col)
+
+
+def create_append_schema(arrow_schema: Any, keep_dictionaries: bool) -> Any:
+    """Create the schema of a columnar file that the DataFrames of all repositories can be appended to."""
+    import pyarrow  # pylint: disable=import-outside-toplevel
+
+    append_fields = []
+    for field in arrow_schema:
+        field_type = field.type
+        if pyarrow.types.is_dictionary(field_type):
+            field_type = field_type.value_type
+        # a column with only missing values does not have a type and thus
+        # it is assumed to be a column of strings, like most of the columns
+        if pyarrow.types.is_null(field_type):
+            field_type = pyarrow.large_string()
+        # a Parquet file keeps the categories, with codes that are large
+        # enough for the categories of any of the DataFrames appended later
+        if keep_dictionaries and pyarrow.types.is_dictionary(field.type):
+            field_type = pyarrow.dictionary(pyarrow.int32(), field_type)
+        append_fields.append(field.with_type(field_type))
+    return pyarrow.schema(append_fields, metadata=arrow_schema.metadata)
+
+
+class DataFrameAppender:
+    """A file in a format that DataFrames are appended to, with the columns and the types of a schema."""
+
+    def __init__(
+        self,
+        file_path: Path,
+        column_types: Dict[str, str],
+        file_format: Union[FileFormat, None] = None,
+    ):
+        """Create an appender that has not yet opened its file."""
+        self.file_path = file_path
+        self.column_types = column_types
+        self.file_format = file_format if file_format is not None else _file_format
+        self.arrow_schema: Any = None
+        self.writer: Any = None
+        self.append_count = 0
+
+    def open(self) -> None:
+        """Open the file with the columns (and, for a columnar file, the types) of the schema."""
+        if self.file_format == FileFormat.CSV:
+            # the header of the CSV file is written with the first DataFrame
+            self.writer = open(  # pylint: disable=consider-using-with
+                self.file_path, "w", newline=constants.markers.Nothing
+            )
+            return
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        from pyarrow import ipc  # pylint: disable=import-outside-toplevel
+        from pyarrow import parquet  # pylint: disable=import-outside-toplevel
+
+        self.arrow_schema = create_append_schema(
+            pyarrow.Schema.from_pandas(
+                schema.conform_dataframe(pandas.DataFrame(), self.column_types),
+                preserve_index=False,
+            ),
+            self.file_format == FileFormat.PARQUET,
+        )
+        if self.file_format == FileFormat.PARQUET:
+            self.writer = parquet.ParquetWriter(
+                str(self.file_path),
+                self.arrow_schema,
+                compression=constants.fileformat.Compression,
+            )
+        else:
+            self.writer = ipc.new_file(
+                str(self.file_path),
+                self.arrow_schema,
+                options=ipc.IpcWriteOptions(
+                    compression=constants.fileformat.Compression
+                ),
+            )
+
+    def append(self, dataframe: pandas.DataFrame) -> None:
+        """Append the rows of a DataFrame to the file, opening it for the first DataFrame."""
+        # note that a column with values that is not in the schema stops the append
+        # instead of being dropped, since the file would not have all of the data
+        dataframe = schema.conform_dataframe(dataframe, self.column_types)
+        if self.writer is None:
+            self.open()
+        if self.file_format == FileFormat.CSV:
+            # note that the index is written, as when saving a complete DataFrame
+            dataframe.to_csv(
+                self.writer,
+                header=self.append_count == 0,
+                date_format=constants.schema.Date_Format,
+            )
+        else:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+
+            self.writer.write_table(
+                pyarrow.Table.from_pandas(
+                    dataframe, schema=self.arrow_schema, preserve_index=False
+                )
+            )
+        self.append_count += 1
+
+    def close(self) -> None:
+        """Close the file, which only has the columns of the schema when nothing was appended to it."""
+        if self.append_count == 0:
+            self.append(pandas.DataFrame())
+        self.writer.close()
+        self.writer = None
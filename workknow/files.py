@@ -5,12 +5,24 @@ import zipfile
 
 from pathlib import Path
 
+from typing import Dict
 from typing import List
+from typing import Union
 
 import pandas
 
 from workknow import configure
 from workknow import constants
+from workknow import fileformat
+from workknow import metrics
+from workknow import profiler
+from workknow import schema
+
+# the function that creates the columns (and their types) of each file for all data sets
+ALL_COLUMN_TYPES = {
+    constants.filesystem.Workflows: schema.create_workflows_column_types,
+    constants.filesystem.Commits: schema.create_commits_column_types,
+}
 
 
 def read_csv_file(csv_data_file: Path) -> pandas.DataFrame:
@@ -73,22 +85,14 @@ def confirm_valid_directory(directory: Path) -> bool:
     return False
 
 
-def save_dataframe_all(
-    results_dir: Path,
-    label: str,
-    repo_data: pandas.DataFrame,
-) -> None:
-    """Save the provided DataFrame in a file in the results_dir with a label for all data sets."""
-    # create the complete file path, making all parent directories
-    # if needed and not failing if the directory already exists
-    create_directory(results_dir)
-    results_dir.mkdir(parents=True, exist_ok=True)
+def create_all_file_path(results_dir: Path, label: str) -> Path:
+    """Create the path of the file with a label for all data sets in the results_dir."""
     # create the directory given the provided input details
     file_name = (
         constants.filesystem.All
         + constants.filesystem.Dash
         + label
-        + constants.filesystem.Csv_Extension
+        + fileformat.create_extension()
     )
     # log the name of the file and the results directory
     logger = logging.getLogger(constants.logging.Rich)
@@ -99,24 +103,71 @@ def save_dataframe_all(
     # --> the full name of the file storing the data
     complete_file_path = results_dir / file_name
     # resolve the complete file path to get its absolute name
-    resolved_complete_file_path = complete_file_path.resolve()
-    # convert the pathlib Path object to a string and then use
-    # Pandas to save the file to the textualized path as a CSV file
-    repo_data.to_csv(str(resolved_complete_file_path))
+    return complete_file_path.resolve()
 
 
-def save_dataframe(
+@profiler.profile_stage(constants.profile.Files)
+def save_dataframe_all(
     results_dir: Path,
-    organization: str,
-    repository: str,
     label: str,
     repo_data: pandas.DataFrame,
 ) -> None:
-    """Save the provided DataFrame in a file connected to organization and repo in the results_dir."""
+    """Save the provided DataFrame in a file in the results_dir with a label for all data sets."""
     # create the complete file path, making all parent directories
     # if needed and not failing if the directory already exists
     create_directory(results_dir)
     results_dir.mkdir(parents=True, exist_ok=True)
+    resolved_complete_file_path = create_all_file_path(results_dir, label)
+    # save the file to the path in the configured format (e.g., as a CSV file);
+    # note that the data of all repositories is not about one repository
+    with metrics.measure(None, constants.metrics.Write_Seconds):
+        fileformat.write_dataframe(repo_data, resolved_complete_file_path)
+
+
+class AllDataFramesWriter:
+    """The files for all data sets that the DataFrames of each repository are appended to."""
+
+    def __init__(self, results_dir: Union[Path, None]):
+        """Create a writer for the results_dir, which does not write anything when it is None."""
+        self.results_dir = results_dir
+        self.appenders: Dict[str, fileformat.DataFrameAppender] = {}
+
+    def get_appender(self, label: str) -> fileformat.DataFrameAppender:
+        """Return the appender of the file with a label, creating the results_dir when needed."""
+        if label not in self.appenders:
+            create_directory(self.results_dir)  # type: ignore
+            self.results_dir.mkdir(parents=True, exist_ok=True)  # type: ignore
+            self.appenders[label] = fileformat.DataFrameAppender(
+                create_all_file_path(self.results_dir, label),  # type: ignore
+                ALL_COLUMN_TYPES[label](),
+            )
+        return self.appenders[label]
+
+    @profiler.profile_stage(constants.profile.Files)
+    def append(self, label: str, repo_data: pandas.DataFrame) -> None:
+        """Append the provided DataFrame of a repository to the file with a label for all data sets."""
+        if self.results_dir is None:
+            return
+        # note that the data of all repositories is not about one repository
+        with metrics.measure(None, constants.metrics.Write_Seconds):
+            self.get_appender(label).append(repo_data)
+
+    @profiler.profile_stage(constants.profile.Files)
+    def close(self, label: str) -> None:
+        """Finish the file with a label for all data sets, which is empty when nothing was appended to it."""
+        if self.results_dir is None:
+            return
+        with metrics.measure(None, constants.metrics.Write_Seconds):
+            self.get_appender(label).close()
+
+
+def create_repository_file_path(
+    results_dir: Path,
+    organization: str,
+    repository: str,
+    label: str,
+) -> Path:
+    """Create the path of the file connected to organization and repo in the results_dir."""
     # create the directory given the provided input details
     file_name = (
         organization
@@ -124,7 +175,7 @@ def save_dataframe(
         + repository
         + constants.filesystem.Dash
         + label
-        + constants.filesystem.Csv_Extension
+        + fileformat.create_extension()
     )
     # log the name of the file and the results directory
     logger = logging.getLogger(constants.logging.Rich)
@@ -135,25 +186,71 @@ def save_dataframe(
     # --> the full name of the file storing the data
     complete_file_path = results_dir / file_name
     # resolve the complete file path to get its absolute name
-    resolved_complete_file_path = complete_file_path.resolve()
-    # convert the pathlib Path object to a string and then use
-    # Pandas to save the file to the textualized path as a CSV file
-    repo_data.to_csv(str(resolved_complete_file_path))
+    return complete_file_path.resolve()
+
+
+@profiler.profile_stage(constants.profile.Files)
+def save_dataframe(
+    results_dir: Path,
+    organization: str,
+    repository: str,
+    label: str,
+    repo_data: pandas.DataFrame,
+) -> None:
+    """Save the provided DataFrame in a file connected to organization and repo in the results_dir."""
+    # create the complete file path, making all parent directories
+    # if needed and not failing if the directory already exists
+    create_directory(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    resolved_complete_file_path = create_repository_file_path(
+        results_dir, organization, repository, label
+    )
+    # save the file to the path in the configured format (e.g., as a CSV file)
+    with metrics.measure(
+        metrics.create_repository_url(organization, repository),
+        constants.metrics.Write_Seconds,
+    ):
+        fileformat.write_dataframe(repo_data, resolved_complete_file_path)
+
+
+@profiler.profile_stage(constants.profile.Files)
+def read_dataframe(
+    results_dir: Path,
+    organization: str,
+    repository: str,
+    label: str,
+) -> pandas.DataFrame:
+    """Read the DataFrame saved in a file connected to organization and repo in the results_dir."""
+    resolved_complete_file_path = create_repository_file_path(
+        results_dir, organization, repository, label
+    )
+    # the file was never saved and thus there is no data about the repository
+    if not resolved_complete_file_path.is_file():
+        return pandas.DataFrame()
+    # note that the first column of a CSV file is the index written by save_dataframe
+    try:
+        return fileformat.read_dataframe(resolved_complete_file_path, index_col=0)
+    # the CSV file was empty and thus we must return an empty DataFrame
+    except pandas.errors.EmptyDataError:
+        return pandas.DataFrame()
 
 
 def create_results_zip_file_list(results_directory: Path) -> List[str]:
-    """Create a list of the .csv files in the provided results directory."""
-    results_files_generator = results_directory.glob("*.csv")
+    """Create a list of the data files, in the configured format, in the provided results directory."""
+    results_files_generator = results_directory.glob(
+        constants.filesystem.Wildcard + fileformat.create_extension()
+    )
     results_file_list = []
     for results_file in results_files_generator:
         results_file_list.append(str(results_file))
     return results_file_list
 
 
+@profiler.profile_stage(constants.profile.Files)
 def create_results_zip_file(
     results_directory: Path, results_file_list: List[str]
 ) -> None:
-    """Save a .zip file in the results directory of all the provided .csv files found in the results directory."""
+    """Save a .zip file in the results directory of all the provided data files found in the results directory."""
     # create a context for the .zip file in the variable results_zip_file
     with zipfile.ZipFile(
         str(results_directory)
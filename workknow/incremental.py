@@ -0,0 +1,179 @@
+"""Download only the workflow runs that are newer than those already saved for a repository."""
+
+import json
+import logging
+import os
+import threading
+
+from pathlib import Path
+
+from typing import Dict
+from typing import Tuple
+from typing import Union
+
+import pandas
+
+from workknow import constants
+from workknow import files
+from workknow import schema
+
+# Reference:
+# https://docs.github.com/en/rest/reference/actions#list-workflow-runs-for-a-repository
+#
+# The GitHub API can filter the workflow runs of a repository by the date and time
+# at which they were created, using a query parameter like created=>=2021-08-01T12:00:00Z.
+# An incremental download finds the newest run that was already saved for a repository
+# and then only requests the runs that were created at the same time or after it. The
+# small number of new runs are merged with the saved runs in the per-repository files.
+#
+# To avoid reading a (possibly very large) workflows file just to find its newest run,
+# the results directory also contains a small state file that records, for each of the
+# repositories, the creation time and the identifier of the newest saved workflow run.
+
+# the state file is shared by all of the repositories and thus the workers that
+# download repositories at the same time must not update it at the same time
+_state_lock = threading.Lock()
+
+
+def create_repository_key(organization: str, repo: str) -> str:
+    """Create the key for a repository in the incremental state file."""
+    return organization + constants.github.Separator + repo
+
+
+def read_state(results_dir: Path) -> Dict[str, Dict[str, Union[str, int]]]:
+    """Read the incremental state file in the results directory, if it exists."""
+    logger = logging.getLogger(constants.logging.Rich)
+    state_file = results_dir / constants.incremental.State_File
+    if state_file.is_file():
+        try:
+            return json.loads(state_file.read_text())
+        except ValueError:
+            logger.debug(f"Ignoring the damaged incremental state file {state_file}")
+    return {}
+
+
+def write_state(
+    results_dir: Path, state: Dict[str, Dict[str, Union[str, int]]]
+) -> None:
+    """Write the incremental state file in the results directory all at once."""
+    state_file = results_dir / constants.incremental.State_File
+    temporary_state_file = state_file.with_suffix(".tmp")
+    temporary_state_file.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(str(temporary_state_file), str(state_file))
+
+
+def find_newest_created_at(
+    results_dir: Path, organization: str, repo: str
+) -> Union[str, None]:
+    """Find the creation time of the newest workflow run saved for a repository."""
+    # the state file records the newest run without reading the workflows file
+    state = read_state(results_dir)
+    repository_key = create_repository_key(organization, repo)
+    if repository_key in state:
+        return str(state[repository_key][constants.workflow.Created_At])
+    # fall back to the workflows file, which exists for repositories that were
+    # downloaded before the incremental state file was used for the first time
+    workflows_dataframe = files.read_dataframe(
+        results_dir, organization, repo, constants.filesystem.Workflows
+    )
+    if (
+        len(workflows_dataframe) != 0
+        and constants.workflow.Created_At in workflows_dataframe.columns
+    ):
+        # the timestamps from the GitHub API are in ISO 8601 format in UTC
+        # and thus the newest one is also the largest one as a string; note
+        # that the timestamps of a columnar file are read as timestamps
+        return schema.format_datetime(
+            workflows_dataframe[constants.workflow.Created_At].max()
+        )
+    return None
+
+
+def create_created_filter(newest_created_at: Union[str, None]) -> Dict[str, str]:
+    """Create the parameters that only request the workflow runs created since the newest saved run."""
+    # there is no saved run and thus the entire history is needed
+    if newest_created_at is None:
+        return {}
+    # note that this uses >= instead of > so that no runs created in the same
+    # second as the newest saved run are missed; the duplicates are removed later
+    return {
+        constants.incremental.Created: constants.incremental.Greater_Than_Or_Equal
+        + newest_created_at
+    }
+
+
+def merge_with_saved_dataframes(
+    results_dir: Path,
+    organization: str,
+    repo: str,
+    new_workflows_dataframe: pandas.DataFrame,
+    new_commits_dataframe: pandas.DataFrame,
+) -> Tuple[pandas.DataFrame, pandas.DataFrame]:
+    """Merge the newly downloaded workflows and commits with the ones saved for the repository."""
+    saved_workflows_dataframe = files.read_dataframe(
+        results_dir, organization, repo, constants.filesystem.Workflows
+    )
+    saved_commits_dataframe = files.read_dataframe(
+        results_dir, organization, repo, constants.filesystem.Commits
+    )
+    # there were no new workflow runs and thus the saved data is already up-to-date
+    if len(new_workflows_dataframe) == 0:
+        return (saved_workflows_dataframe, saved_commits_dataframe)
+    # there is no saved data and thus the new data is the complete data
+    if len(saved_workflows_dataframe) == 0:
+        return (new_workflows_dataframe, new_commits_dataframe)
+    # the workflows and the commits are created from the same list of workflow runs
+    # and thus the rows of both correspond; this means that the saved runs that were
+    # downloaded again (i.e., those created in the same second as the newest saved run)
+    # can be removed from both of the saved DataFrames with the same mask of the workflow
+    # identifiers, keeping the newly downloaded rows since a run may have changed (e.g.,
+    # its status and conclusion once it finished) after it was saved
+    saved_runs_mask = (
+        ~saved_workflows_dataframe[constants.workflow.Id]
+        .isin(new_workflows_dataframe[constants.workflow.Id])
+        .to_numpy()
+    )
+    # the GitHub API lists the newest runs first and so do the merged DataFrames;
+    # note that the schema gives the saved DataFrames, read from the CSV files,
+    # the same types as the new DataFrames, which already have them when built
+    merged_workflows_dataframe = schema.concatenate_dataframes(
+        [
+            schema.apply_workflows_schema(new_workflows_dataframe),
+            schema.apply_workflows_schema(saved_workflows_dataframe[saved_runs_mask]),
+        ],
+        ignore_index=True,
+    )
+    merged_commits_dataframe = schema.concatenate_dataframes(
+        [
+            schema.apply_commits_schema(new_commits_dataframe),
+            schema.apply_commits_schema(saved_commits_dataframe[saved_runs_mask]),
+        ],
+        ignore_index=True,
+    )
+    return (merged_workflows_dataframe, merged_commits_dataframe)
+
+
+def update_state(
+    results_dir: Path,
+    organization: str,
+    repo: str,
+    workflows_dataframe: pandas.DataFrame,
+) -> None:
+    """Record the newest workflow run of the repository in the incremental state file."""
+    if (
+        len(workflows_dataframe) == 0
+        or constants.workflow.Created_At not in workflows_dataframe.columns
+    ):
+        return
+    newest_row = workflows_dataframe.loc[
+        workflows_dataframe[constants.workflow.Created_At].idxmax()
+    ]
+    with _state_lock:
+        state = read_state(results_dir)
+        state[create_repository_key(organization, repo)] = {
+            constants.workflow.Created_At: schema.format_datetime(
+                newest_row[constants.workflow.Created_At]
+            ),
+            constants.workflow.Id: int(newest_row[constants.workflow.Id]),
+        }
+        write_state(results_dir, state)
@@ -0,0 +1,259 @@
+"""Download the jobs and the steps of the workflow runs of a repository."""
+
+from concurrent import futures
+
+import logging
+
+from pathlib import Path
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+import pandas
+
+from rich.console import Console
+from rich.progress import Progress
+
+from workknow import constants
+from workknow import files
+from workknow import request
+
+# Reference:
+# https://docs.github.com/en/rest/reference/actions#list-jobs-for-a-workflow-run
+#
+# Each workflow run in the workflows DataFrame has a jobs_url that lists the jobs of
+# the run and, inside of each job, the steps of that job. The jobs stage of a download:
+#
+# --> finds the completed runs whose jobs are not yet in the saved Jobs file, since
+#     the jobs of a run that is still in progress might still change
+# --> requests the jobs of those runs with a pool of workers, each of which waits for
+#     the rate limit budget after each response and uses the response cache, if any
+# --> creates a DataFrame of the jobs and a DataFrame of the steps of those jobs
+# --> adds them to the saved Jobs and Steps DataFrames of the repository
+
+# the names of the fields in a job that are kept in the jobs DataFrame
+JOBS_SUBSET_KEY_NAMES = {
+    constants.jobs.Run_Id,
+    constants.workflow.Id,
+    constants.workflow.Name,
+    constants.workflow.Status,
+    constants.workflow.Conclusion,
+    constants.jobs.Started_At,
+    constants.jobs.Completed_At,
+    constants.jobs.Runner_Name,
+}
+
+# the names of the fields in a step that are kept in the steps DataFrame
+STEPS_SUBSET_KEY_NAMES = {
+    constants.jobs.Number,
+    constants.workflow.Name,
+    constants.workflow.Status,
+    constants.workflow.Conclusion,
+    constants.jobs.Started_At,
+    constants.jobs.Completed_At,
+}
+
+
+def request_jobs(
+    jobs_url: str,
+    github_authentication,
+    progress: Progress,
+    maximum_retries: int = constants.github.Maximum_Request_Retries,
+) -> Tuple[bool, int, float, List[Dict[str, Any]]]:
+    """Request all of the jobs of a workflow run, following the pages of the listing."""
+    jobs_list: List[Dict[str, Any]] = []
+    retry_count = 0
+    sleep_time: float = 0
+    page = 1
+    github_params = request.create_github_params(None, page)
+    while True:
+        (
+            valid,
+            request_retry_count,
+            request_sleep_time,
+            response,
+        ) = request.request_json_from_github_with_caution(
+            jobs_url, github_params, github_authentication, progress, maximum_retries
+        )
+        retry_count = retry_count + request_retry_count
+        sleep_time = sleep_time + request_sleep_time
+        if not valid:
+            return (False, retry_count, sleep_time, jobs_list)
+        # wait after each response when the rate limit budget is almost spent so
+        # that the many requests of the workers do not exhaust the budget; note that
+        # the headers of the response describe the budget without another request
+        sleep_time = sleep_time + request.wait_for_rate_limit_budget(response)
+        jobs_list.extend(
+            request.decode_response_json(response).get(constants.jobs.Jobs, [])  # type: ignore
+        )
+        if constants.github.Next not in response.links:  # type: ignore
+            return (True, retry_count, sleep_time, jobs_list)
+        # note that the parameters of the first page do not have a page number
+        page = page + 1
+        github_params[constants.github.Page] = str(page)
+
+
+def create_jobs_and_steps_lists(
+    organization: str, repo: str, jobs_list: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Create the rows of the jobs and the steps DataFrames from the jobs of a workflow run."""
+    jobs_rows = []
+    steps_rows = []
+    for job in jobs_list:
+        job_row = {
+            key: value for key, value in job.items() if key in JOBS_SUBSET_KEY_NAMES
+        }
+        job_row[constants.workflow.Organization] = organization
+        job_row[constants.workflow.Repo] = repo
+        jobs_rows.append(job_row)
+        # each step is connected to its job and run so that the steps of all of
+        # the repositories can be stored in the same DataFrame
+        for step in job.get(constants.jobs.Steps) or []:
+            step_row = {
+                key: value
+                for key, value in step.items()
+                if key in STEPS_SUBSET_KEY_NAMES
+            }
+            step_row[constants.jobs.Run_Id] = job.get(constants.jobs.Run_Id)
+            step_row[constants.jobs.Job_Id] = job.get(constants.workflow.Id)
+            step_row[constants.workflow.Organization] = organization
+            step_row[constants.workflow.Repo] = repo
+            steps_rows.append(step_row)
+    return (jobs_rows, steps_rows)
+
+
+def find_downloaded_run_ids(jobs_dataframe: pandas.DataFrame) -> Set[int]:
+    """Find the identifiers of the workflow runs whose jobs are in the jobs DataFrame."""
+    if jobs_dataframe.empty or constants.jobs.Run_Id not in jobs_dataframe.columns:
+        return set()
+    return set(jobs_dataframe[constants.jobs.Run_Id].dropna().astype(int))
+
+
+def find_runs_to_download(
+    workflows_dataframe: pandas.DataFrame, downloaded_run_ids: Set[int]
+) -> List[Tuple[int, str]]:
+    """Find the (identifier, jobs URL) of each completed workflow run whose jobs were not downloaded."""
+    if (
+        workflows_dataframe.empty
+        or constants.workflow.Jobs_Url not in workflows_dataframe.columns
+    ):
+        return []
+    runs_dataframe = workflows_dataframe
+    if constants.workflow.Status in runs_dataframe.columns:
+        runs_dataframe = runs_dataframe[
+            runs_dataframe[constants.workflow.Status] == constants.jobs.Completed
+        ]
+    return [
+        (int(run_id), jobs_url)
+        for run_id, jobs_url in zip(
+            runs_dataframe[constants.workflow.Id],
+            runs_dataframe[constants.workflow.Jobs_Url],
+        )
+        if int(run_id) not in downloaded_run_ids and isinstance(jobs_url, str)
+    ]
+
+
+def download_jobs(
+    console: Console,
+    results_dir: Union[Path, None],
+    organization: str,
+    repo: str,
+    workflows_dataframe: pandas.DataFrame,
+    job_concurrency: int = constants.jobs.Job_Concurrency,
+    progress: Union[Progress, None] = None,
+    maximum_retries: int = constants.github.Maximum_Request_Retries,
+) -> Tuple[bool, pandas.DataFrame, pandas.DataFrame]:
+    """Download the jobs and steps of the workflow runs that are not yet in the saved Jobs and Steps DataFrames."""
+    logger = logging.getLogger(constants.logging.Rich)
+    github_authentication = (
+        constants.github.User,
+        request.get_github_personal_access_token(),
+    )
+    # the jobs and steps saved by an earlier download are kept and the runs
+    # whose jobs are among them are not requested again
+    saved_jobs_dataframe = pandas.DataFrame()
+    saved_steps_dataframe = pandas.DataFrame()
+    if results_dir is not None:
+        saved_jobs_dataframe = files.read_dataframe(
+            results_dir, organization, repo, constants.filesystem.Jobs
+        )
+        saved_steps_dataframe = files.read_dataframe(
+            results_dir, organization, repo, constants.filesystem.Steps
+        )
+    runs_to_download = find_runs_to_download(
+        workflows_dataframe, find_downloaded_run_ids(saved_jobs_dataframe)
+    )
+    logger.debug(
+        f"Downloading the jobs of {len(runs_to_download)} workflow run(s) for {organization}/{repo}"
+    )
+    console.print(
+        f":construction_worker: Downloading the jobs of {len(runs_to_download)} workflow run(s) for {organization}/{repo}"
+    )
+    jobs_rows: List[Dict[str, Any]] = []
+    steps_rows: List[Dict[str, Any]] = []
+    valid = True
+    # the downloads of the jobs of all of the runs share a single progress display
+    with request.use_progress(progress) as jobs_progress:
+        download_jobs_task = jobs_progress.add_task(
+            f"{organization}/{repo} Jobs", total=len(runs_to_download)
+        )
+        with futures.ThreadPoolExecutor(
+            max_workers=max(job_concurrency, 1)
+        ) as executor:
+            # note that the jobs are kept in the order of the runs in the workflows
+            # DataFrame so that the saved files do not depend on the order of workers
+            jobs_futures = [
+                executor.submit(
+                    request_jobs,
+                    jobs_url,
+                    github_authentication,
+                    jobs_progress,
+                    maximum_retries,
+                )
+                for _, jobs_url in runs_to_download
+            ]
+            for jobs_future in jobs_futures:
+                jobs_valid, _, _, jobs_list = jobs_future.result()
+                jobs_progress.advance(download_jobs_task)
+                # the jobs of a run that could not be downloaded are left out so that
+                # the next download will request them again
+                if not jobs_valid:
+                    valid = False
+                    continue
+                run_jobs_rows, run_steps_rows = create_jobs_and_steps_lists(
+                    organization, repo, jobs_list
+                )
+                jobs_rows.extend(run_jobs_rows)
+                steps_rows.extend(run_steps_rows)
+        if progress is not None:
+            jobs_progress.remove_task(download_jobs_task)
+    jobs_dataframe = pandas.concat(
+        [saved_jobs_dataframe, pandas.DataFrame(jobs_rows)], ignore_index=True
+    )
+    steps_dataframe = pandas.concat(
+        [saved_steps_dataframe, pandas.DataFrame(steps_rows)], ignore_index=True
+    )
+    return (valid, jobs_dataframe, steps_dataframe)
+
+
+def save_jobs(
+    console: Console,
+    results_dir: Path,
+    organization: str,
+    repo: str,
+    jobs_dataframe: pandas.DataFrame,
+    steps_dataframe: pandas.DataFrame,
+) -> None:
+    """Save the jobs and the steps DataFrames of a repository in the results directory."""
+    console.print("\t... Saving the jobs data")
+    files.save_dataframe(
+        results_dir, organization, repo, constants.filesystem.Jobs, jobs_dataframe
+    )
+    console.print("\t... Saving the steps data")
+    files.save_dataframe(
+        results_dir, organization, repo, constants.filesystem.Steps, steps_dataframe
+    )
@@ -7,18 +7,30 @@ from typing import List
 import pandas
 import typer
 
-from rich.pretty import pprint
-
+from workknow import backend
+from workknow import cache
+from workknow import checkpoint
 from workknow import concatenate
 from workknow import configure
 from workknow import constants
 from workknow import debug
 from workknow import display
+from workknow import endpoint
 from workknow import environment
+from workknow import fileformat
 from workknow import files
+from workknow import metrics
+from workknow import pipeline
+from workknow import plan
+from workknow import profiler
 from workknow import produce
+from workknow import projection
 from workknow import release
 from workknow import request
+from workknow import retry
+from workknow import schema
+from workknow import session
+from workknow import tokens
 
 
 # create a Typer object to supper the command-line interface
@@ -31,9 +43,34 @@ def download(
     repos_csv_file: Path = typer.Option(None),
     results_dir: Path = typer.Option(None),
     env_file: Path = typer.Option(None),
+    api_url: str = typer.Option(None),
     combine: bool = typer.Option(False),
     peek: bool = typer.Option(False),
     save: bool = typer.Option(False),
+    pool_size: int = typer.Option(constants.session.Pool_Maxsize),
+    page_concurrency: int = typer.Option(constants.github.Page_Concurrency),
+    repository_concurrency: int = typer.Option(
+        constants.github.Repository_Concurrency
+    ),
+    retry_jitter: float = typer.Option(constants.retry.Jitter_Fraction),
+    cache_dir: Path = typer.Option(None),
+    cache_size: int = typer.Option(constants.cache.Maximum_Size_Megabytes),
+    incremental_download: bool = typer.Option(False, "--incremental"),
+    resume: bool = typer.Option(False),
+    extra_fields: List[str] = typer.Option([], "--extra-field"),
+    shards: int = typer.Option(constants.shard.Shards),
+    per_workflow: bool = typer.Option(False),
+    workflow_names: List[str] = typer.Option([], "--workflow"),
+    download_jobs: bool = typer.Option(False, "--jobs"),
+    job_concurrency: int = typer.Option(constants.jobs.Job_Concurrency),
+    metrics_dir: Path = typer.Option(None),
+    profile: bool = typer.Option(False),
+    request_backend: backend.Backend = typer.Option(
+        backend.Backend.SYNC, "--backend", callback=backend.check_backend
+    ),
+    file_format: fileformat.FileFormat = typer.Option(
+        fileformat.FileFormat.CSV, "--format", callback=fileformat.check_format
+    ),
     debug_level: debug.DebugLevel = debug.DebugLevel.ERROR,
 ):
     """Download the GitHub Action workflow history of repositories in URL list and CSV file."""
@@ -41,15 +78,94 @@ def download(
     console, logger = configure.setup(debug_level)
     # STEP: load the execution environment to support GitHub API access
     environment.load_environment(env_file, logger)
+    # STEP: configure the base URL of the GitHub API so that all of the requests
+    # can go to another server with the same API (e.g., the stand-in server)
+    endpoint.configure_api_url(api_url)
+    # STEP: configure the shared session so that every request to the GitHub API
+    # reuses kept-alive connections from a pool instead of a new connection;
+    # note that the pool must be able to hold a connection for each page worker
+    # of each of the workers that download repositories at the same time, where
+    # each repository has several workers for its date ranges, workflows, or jobs
+    repository_stream_concurrency = max(
+        shards,
+        (
+            constants.workflows.Workflow_Concurrency
+            if per_workflow or workflow_names
+            else 1
+        ),
+        job_concurrency if download_jobs else 1,
+    )
+    session.configure_session(
+        max(
+            pool_size,
+            page_concurrency
+            * max(repository_concurrency, 1)
+            * repository_stream_concurrency,
+        ),
+        (constants.github.User, request.get_github_personal_access_token()),
+    )
+    # STEP: configure the pool of personal access tokens so that the requests are
+    # spread across all of the tokens according to their remaining rate limit budgets
+    token_pool = tokens.configure_token_pool(tokens.read_tokens_from_environment())
+    # STEP: configure the schema of the fields kept from each workflow run so that
+    # the fields that are never used are dropped as soon as a page is decoded
+    projection.configure_schema(extra_fields)
+    # STEP: configure the retry policy so that workers that fail at the same time
+    # do not all retry at the same time after an exponential back-off
+    retry.configure_policy(retry_jitter)
+    # STEP: configure the response cache so that, when a cache directory is specified,
+    # requests for pages downloaded before are conditional and served from the cache
+    response_cache = cache.configure_cache(cache_dir, cache_size)
+    # STEP: configure the format of the saved data files (e.g., CSV or Parquet)
+    fileformat.configure_format(file_format)
+    # STEP: start the metrics of each repository so that they only describe this download
+    metrics.reset_metrics()
+    # STEP: profile the time and the memory of each stage, when requested
+    profiler.configure_profiler(profile)
     # display the messages about the tool
     display.display_tool_details(debug_level)
-    # create empty lists of the data frames
-    repository_urls_dataframes_workflows = []
-    repository_urls_dataframes_commits = []
+    # STEP: an incremental download merges the new workflow runs into the saved
+    # per-repository files and thus it only works when saving to a valid directory
+    if incremental_download and not (
+        save and files.confirm_valid_directory(results_dir)
+    ):
+        console.print()
+        console.print(
+            ":grimacing_face: An incremental download requires --save and a valid results directory"
+        )
+        console.print(
+            f"{constants.markers.Tab}...Downloading the complete workflow history instead"
+        )
+        incremental_download = False
+    # STEP: open the checkpoint journal when saving to a valid directory so that the
+    # download of each page and each repository is recorded as soon as it finishes;
+    # when resuming, the journal reveals the pages and repositories already completed
+    checkpoint_journal = None
+    completed_repositories = {}
+    if save and files.confirm_valid_directory(results_dir):
+        checkpoint_journal = checkpoint.CheckpointJournal(results_dir, resume)
+        if resume:
+            completed_repositories = checkpoint_journal.get_completed_repositories()
+            logger.debug(completed_repositories)
+    elif resume:
+        console.print()
+        console.print(
+            ":grimacing_face: Resuming a download requires --save and a valid results directory"
+        )
+    # create the writer that appends the workflows and commits DataFrames of each repository
+    # to the combined data files as soon as the repository is finished, so that the data of
+    # all of the repositories is never in memory at the same time; note that the writer
+    # does not write anything when the combined data files are not going to be saved
+    all_dataframes_writer = files.AllDataFramesWriter(
+        results_dir
+        if save and combine and files.confirm_valid_directory(results_dir)
+        else None
+    )
     # assume that the repos_csv_file was not specified and prove otherwise
     repos_csv_file_valid = False
     # STEP: get any rate limit details and stop using the program
-    # if it is in danger of being rate limited and not having data
+    # if it is in danger of being rate limited and not having data;
+    # this also starts the budget that the headers of each response update
     request.get_rate_limit_details()
     # STEP: read the CSV file and extract its data into a Pandas DataFrame
     # there is a valid CSV file of repository data
@@ -71,123 +187,97 @@ def download(
         repo_urls.extend(provided_url_list)
         # display debugging information about the data frames
         logger.debug(repo_urls)
+    # STEP: plan the download so that each repository is only downloaded once, even
+    # when its URL is listed more than once or written in different ways
+    download_plan = plan.create_download_plan(list(repo_urls))
+    plan.display_download_plan(console, download_plan)
+    repo_urls = download_plan.repo_urls
     repo_url_workflow_record_list = []
     # the user did, in fact, specify repositories for analysis
     if len(repo_urls) != 0:
         # display debugging information about the data frames
         logger.debug(repo_urls)
-        # iterate through all of the repo_urls provided on the command-line or in the CSV file
-        for repo_url in repo_urls:
-            # STEP: create the URL needed for accessing the repository's Action builds
-            organization, repo = produce.parse_github_url(repo_url)
+        # STEP: create the options that are the same for the download of each repository
+        download_options = pipeline.DownloadOptions(
+            results_dir=results_dir,
+            save=save,
+            peek=peek,
+            page_concurrency=page_concurrency,
+            incremental=incremental_download,
+            checkpoint_journal=checkpoint_journal,
+            backend=request_backend,
+            shards=shards,
+            per_workflow=per_workflow,
+            workflow_names=workflow_names,
+            jobs=download_jobs,
+            job_concurrency=job_concurrency,
+        )
+        # STEP: find the repositories that need a download; note that a resumed download
+        # does not download a repository again when it was completely saved before
+        repositories_to_download = pipeline.find_repositories_to_download(
+            repo_urls, completed_repositories
+        )
+        # STEP: download, transform, and (possibly) save the data of the repositories,
+        # using a bounded pool of workers when the repository concurrency is greater than one;
+        # note that the result of each repository is available as soon as it is finished
+        download_results = pipeline.iterate_download_results(
+            console, repositories_to_download, download_options, repository_concurrency
+        )
+        # iterate through all of the repo_urls provided on the command-line or in the CSV file,
+        # combining their data in this order so that the results do not depend on the order in
+        # which the workers finished the downloads of the repositories; the results are also
+        # in this order since the repositories to download were found in this order
+        for repo_url, (organization, repo) in zip(
+            repo_urls, produce.parse_github_urls(repo_urls)
+        ):
             if organization is not None and repo is not None:
-                github_api_url = produce.create_github_api_url(organization, repo)
-                console.print()
-                console.print(
-                    ":runner: Downloading the workflow history of the GitHub repository at:"
-                )
-                console.print(github_api_url, style="link " + github_api_url)
-                console.print()
-                # STEP: access the JSON file that contains the build history
-                (valid, _, _, json_responses) = request.request_json_from_github(
-                    github_api_url, console
-                )
+                # STEP: read the data of a repository that was already completely
+                # saved before a resumed download from the results directory
+                if repo_url in completed_repositories:
+                    console.print()
+                    console.print(
+                        f":fast-forward_button: Skipping {organization}/{repo} since it was already downloaded"
+                    )
+                    repo_url_workflow_record_list.append(
+                        completed_repositories[repo_url]
+                    )
+                    (
+                        workflows_dataframe,
+                        commits_dataframe,
+                    ) = pipeline.read_saved_repository(results_dir, organization, repo)
+                    all_dataframes_writer.append(
+                        constants.filesystem.Workflows, workflows_dataframe
+                    )
+                    all_dataframes_writer.append(
+                        constants.filesystem.Commits, commits_dataframe
+                    )
+                    continue
                 # the data returned from the API is valid; this means that either no difficulties
                 # were encountered or, alternatively, there were difficulties but a series of
                 # one or more retries allowed for the "waiting out" of the problem and the
                 # ultimate collection of valid data that can now be extracted and saved
+                (
+                    _,
+                    (
+                        valid,
+                        repo_url_workflow_record_dict,
+                        workflows_dataframe,
+                        commits_dataframe,
+                    ),
+                ) = next(download_results)
                 if valid:
-                    # STEP: collect data about the number of workflow records in the JSON responses
-                    repo_url_workflow_record_dict = (
-                        produce.create_workflow_record_count_dictionary(
-                            organization, repo, repo_url, github_api_url, json_responses
-                        )
-                    )
                     repo_url_workflow_record_list.append(repo_url_workflow_record_dict)
-                    # STEP: print some details about the completed download
-                    # --> display a peek into the downloaded data structure
-                    if peek:
-                        console.print()
-                        console.print(
-                            f":inbox_tray: Downloaded a total of {produce.count_individual_builds(json_responses)} records that each look like:\n"
-                        )
-                        # STEP: print debugging information in a summarized fashion
-                        pprint(
-                            json_responses,
-                            max_length=constants.github.Maximum_Length_All,
-                        )
-                        if produce.count_individual_builds(json_responses) != 0:
-                            console.print()
-                            console.print(
-                                ":lion_face: The first workflow record looks like:\n"
-                            )
-                            pprint(
-                                json_responses[0][0],
-                                max_length=constants.github.Maximum_Length_Record,
-                            )
-                            logger.debug(json_responses[0][0])
-                        console.print()
-                    # --> the program should not display a peek into the downloaded data structure
-                    else:
-                        console.print()
-                        console.print(
-                            f":inbox_tray: Downloaded a total of {produce.count_individual_builds(json_responses)} records\n"
-                        )
-                    # STEP: create the workflows DataFrame
-                    workflows_dataframe = produce.create_workflows_dataframe(
-                        organization, repo, repo_url, github_api_url, json_responses
-                    )
-                    repository_urls_dataframes_workflows.append(workflows_dataframe)
-                    # STEP: create the commit details DataFrame
-                    commits_dataframe = produce.create_commits_dataframe(
-                        organization, repo, repo_url, github_api_url, json_responses
+                    all_dataframes_writer.append(
+                        constants.filesystem.Workflows, workflows_dataframe
                     )
-                    repository_urls_dataframes_commits.append(commits_dataframe)
-                    # STEP: save the workflows DataFrame when saving is stipulated and
-                    # the results directory is valid for the user's file system
-                    # save the workflows DataFrame
-                    if save:
-                        # the directory is valid so attempt a save to file system
-                        if files.confirm_valid_directory(results_dir):
-                            console.print(
-                                f":sparkles: Saving data for {organization}/{repo} in the directory {str(results_dir).strip()}"
-                            )
-                            console.print("\t... Saving the workflows data")
-                            files.save_dataframe(
-                                results_dir,
-                                organization,
-                                repo,
-                                constants.filesystem.Workflows,
-                                workflows_dataframe,
-                            )
-                            # save the commits DataFrame
-                            console.print("\t... Saving the commits data")
-                            files.save_dataframe(
-                                results_dir,
-                                organization,
-                                repo,
-                                constants.filesystem.Commits,
-                                commits_dataframe,
-                            )
-                        else:
-                            # explain that the save could not work correctly due to invalid results directory
-                            console.print(
-                                f"Could not save workflow and commit data for {organization}/{repo} in the directory {str(results_dir).strip()}"
-                            )
-                            console.print()
-                    # before going on to the next GitHub repository, ensure that the program
-                    # is not about to be rate limited, which will cause a crash. If a rate
-                    # limit is imminent then sleep for the time remaining until GitHub resets.
-                    rate_limit_dict = request.get_rate_limit_details()
-                    request.get_rate_limit_wait_time_and_wait(rate_limit_dict)
-                else:
-                    console.print()
-                    # explain that the save could not work correctly due to invalid results directory
-                    console.print(
-                        f":grimacing_face: Could not download workflow and commit details for {organization}/{repo}"
+                    all_dataframes_writer.append(
+                        constants.filesystem.Commits, commits_dataframe
                     )
+        # finish the download of the repositories, closing the display of their progress
+        download_results.close()
+        plan.display_saved_requests(console, download_plan)
         # now that WorkKnow is finished with the processing of each of the individual repositories and
-        # they are stored in the currently in-memory DataFrames, save the required data to disk;
+        # their workflows and commits were appended to the combined files, save the required data to disk;
         # however, only save all of the results in the file system if the save parameter is specified
         if save:
             if files.confirm_valid_directory(results_dir):
@@ -197,14 +287,6 @@ def download(
                 console.print(
                     ":runner: Creating combined data sets across all repositories"
                 )
-                # combine all of the individual DataFrames for the workflow data
-                all_workflows_dataframe = pandas.concat(
-                    repository_urls_dataframes_workflows
-                )
-                # combine all of the individual DataFrames for the commit data
-                all_commits_dataframe = pandas.concat(
-                    repository_urls_dataframes_commits
-                )
                 # combine all of the dictionaries in the list to create DataFrame of workflow record data
                 all_workflow_record_counts_dataframe = pandas.DataFrame(
                     repo_url_workflow_record_list
@@ -220,6 +302,7 @@ def download(
                         produce.merge_repo_urls_with_count_data(
                             provided_urls_data_frame,
                             all_workflow_record_counts_dataframe,
+                            download_plan.url_mapping,
                         )
                     )
                 # there was no specification of a CSV file on the command line and thus there is
@@ -248,24 +331,16 @@ def download(
                 # data files that cannot be automatically uploaded to a GitHub repository due to the
                 # fact that they are going to be over 100 MB in size and thus require GitHub LFS
                 if combine:
-                    # save the all workflows DataFrame
+                    # finish the all workflows file that each repository was appended to
                     console.print(
                         f"{constants.markers.Tab}... Saving combined workflows data for all repositories"
                     )
-                    files.save_dataframe_all(
-                        results_dir,
-                        constants.filesystem.Workflows,
-                        all_workflows_dataframe,
-                    )
-                    # save the all commits DataFrame
+                    all_dataframes_writer.close(constants.filesystem.Workflows)
+                    # finish the all commits file that each repository was appended to
                     console.print(
                         f"{constants.markers.Tab}... Saving combined commits data for all repositories"
                     )
-                    files.save_dataframe_all(
-                        results_dir,
-                        constants.filesystem.Commits,
-                        all_commits_dataframe,
-                    )
+                    all_dataframes_writer.close(constants.filesystem.Commits)
                     # save a .zip file of all of the CSV files in the results directory
                     console.print()
                     console.print(
@@ -289,7 +364,55 @@ def download(
                     + ":sad_but_relieved_face: Exiting now!"
                 )
             console.print()
-            request.get_rate_limit_details()
+        # STEP: display the details about how often the shared session reused its connections
+        connection_reuse_details = session.get_connection_reuse_details()
+        logger.debug(connection_reuse_details)
+        console.print(
+            f":electric_plug: Sent {connection_reuse_details[constants.session.Requests]} requests to the GitHub API"
+            f" through {connection_reuse_details[constants.session.Connections]} connection(s),"
+            f" reusing a kept-alive connection {connection_reuse_details[constants.session.Reused]} time(s)"
+        )
+        # STEP: display the number of responses in each class of the retry policy
+        retry_counters = retry.get_retry_counters()
+        logger.debug(retry_counters)
+        console.print(
+            ":repeat: Classified the responses from the GitHub API as: "
+            + ", ".join(
+                f"{classification} {count}"
+                for classification, count in retry_counters.items()
+            )
+        )
+        # STEP: display the memory that the schema saved in the DataFrames of all repositories
+        metrics_registry = metrics.get_metrics()
+        console.print(
+            ":package: Applied the schema to the DataFrames, changing their memory from"
+            f" {schema.format_megabytes(int(metrics_registry.get_total(constants.metrics.Untyped_Memory_Bytes)))}"
+            f" to {schema.format_megabytes(int(metrics_registry.get_total(constants.metrics.Typed_Memory_Bytes)))}"
+        )
+        # STEP: save the index of the response cache, if it was configured, and
+        # display the effectiveness of the cache
+        if response_cache is not None:
+            response_cache.flush()
+            cache_statistics = response_cache.get_statistics()
+            logger.debug(cache_statistics)
+            console.print(
+                f":card_file_box: Served {cache_statistics[constants.cache.Hits]} response(s) from the cache"
+                f" and missed {cache_statistics[constants.cache.Misses]} time(s),"
+                f" evicting {cache_statistics[constants.cache.Evictions]} response(s)"
+            )
+        # STEP: display the number of requests that used each of the tokens in the pool
+        if token_pool is not None:
+            token_statistics = token_pool.get_statistics()
+            logger.debug(token_statistics)
+            for token_statistic in token_statistics:
+                console.print(
+                    f":key: Sent {token_statistic[constants.tokens.Requests]} request(s) with token {token_statistic[constants.tokens.Token]},"
+                    f" which has {token_statistic[constants.rate.Remaining]} of {token_statistic[constants.rate.Limit]} request(s) remaining"
+                )
+        # STEP: write the metrics of each repository, if a directory was specified
+        metrics.write_metrics(console, metrics_dir, constants.metrics.Download)
+        console.print()
+        session.close_session()
     # there were no valid repository URLs provided on the command-line so workflow analysis could not proceed
     else:
         console.print(
@@ -305,6 +428,8 @@ def download(
             + ":sad_but_relieved_face: Exiting now!"
         )
         console.print()
+    # STEP: save the profile of each stage next to the results, if profiling
+    profiler.finish_profiler(console, results_dir)
 
 
 @cli.command()
@@ -313,6 +438,7 @@ def upload(
     semver: str,
     results_dir: Path,
     env_file: Path = typer.Option(None),
+    profile: bool = typer.Option(False),
     debug_level: debug.DebugLevel = debug.DebugLevel.ERROR,
 ):
     """Upload to a GitHub release the data in the results directory."""
@@ -320,6 +446,8 @@ def upload(
     console, logger = configure.setup(debug_level)
     # STEP: load the execution environment to support GitHub API access
     environment.load_environment(env_file, logger)
+    # STEP: profile the time and the memory of each stage, when requested
+    profiler.configure_profiler(profile)
     # STEP: display the messages about the tool
     display.display_tool_details(debug_level)
     # extract the organization and the repository from the repository URL
@@ -343,6 +471,8 @@ def upload(
         console.print(
             f":grimacing_face: Unable to access GitHub repository at {repo_url}"
         )
+    # STEP: save the profile of each stage next to the results, if profiling
+    profiler.finish_profiler(console, results_dir)
 
 
 @cli.command()
@@ -351,6 +481,11 @@ def combine(
     results_dir: Path = typer.Option(None),
     env_file: Path = typer.Option(None),
     save: bool = typer.Option(False),
+    metrics_dir: Path = typer.Option(None),
+    profile: bool = typer.Option(False),
+    file_format: fileformat.FileFormat = typer.Option(
+        fileformat.FileFormat.CSV, "--format", callback=fileformat.check_format
+    ),
     debug_level: debug.DebugLevel = debug.DebugLevel.ERROR,
 ):
     """Combine the downloaded GitHub Action workflow and commit history for all projects in a specified directory."""
@@ -358,6 +493,13 @@ def combine(
     console, logger = configure.setup(debug_level)
     # STEP: load the execution environment to support GitHub API access
     environment.load_environment(env_file, logger)
+    # STEP: configure the format of the combined data files; note that the format
+    # of the files of the repositories is detected from their extension
+    fileformat.configure_format(file_format)
+    # STEP: start the metrics so that they only describe this combination
+    metrics.reset_metrics()
+    # STEP: profile the time and the memory of each stage, when requested
+    profiler.configure_profiler(profile)
     # STEP: display the messages about the tool
     display.display_tool_details(debug_level)
     # STEP: the directory is valid so attempt to load each file and summarize
@@ -370,11 +512,13 @@ def combine(
         )
         console.print()
         # summarize all of the files that are found in the CSV file directory
-        (
-            data_frame_counts,
-            data_frame_commits,
-            data_frame_workflows,
-        ) = concatenate.combine_files_in_directory(csv_dir)
+        # note that the combined data is not about a single repository
+        with metrics.measure(None, constants.metrics.Build_Seconds):
+            (
+                data_frame_counts,
+                data_frame_commits,
+                data_frame_workflows,
+            ) = concatenate.combine_files_in_directory(csv_dir)
         logger.debug(data_frame_counts)
         # save the combined data files to the disk in the results directory
         if save:
@@ -388,7 +532,7 @@ def combine(
                     f"{constants.markers.Tab}... Saving combined workflow count data for all repositories"
                 )
                 # save the Pandas DataFrame that contains the commits data;
-                # the name of the file is "All-Counts.csv"
+                # the name of the file is "All-Counts.csv" (for the CSV format)
                 files.save_dataframe_all(
                     results_dir,
                     constants.filesystem.Counts,
@@ -398,7 +542,7 @@ def combine(
                     f"{constants.markers.Tab}... Saving combined workflows data for all repositories"
                 )
                 # save the Pandas DataFrame that contains the workflow data;
-                # the name of the file is "All-Workflows.csv"
+                # the name of the file is "All-Workflows.csv" (for the CSV format)
                 files.save_dataframe_all(
                     results_dir,
                     constants.filesystem.Workflows,
@@ -408,21 +552,32 @@ def combine(
                     f"{constants.markers.Tab}... Saving combined commits data for all repositories"
                 )
                 # save the Pandas DataFrame that contains the workflow data;
-                # the name of the file is "All-Commits.csv"
+                # the name of the file is "All-Commits.csv" (for the CSV format)
                 files.save_dataframe_all(
                     results_dir,
                     constants.filesystem.Commits,
                     data_frame_commits,
                 )
                 console.print()
+        # STEP: write the metrics of the combination, if a directory was specified
+        metrics.write_metrics(console, metrics_dir, constants.metrics.Combine)
+    # STEP: save the profile of each stage next to the results, if profiling
+    profiler.finish_profiler(console, results_dir)
 
 
 @cli.command()
-def analyze(debug_level: debug.DebugLevel = debug.DebugLevel.ERROR):
+def analyze(
+    profile: bool = typer.Option(False),
+    debug_level: debug.DebugLevel = debug.DebugLevel.ERROR,
+):
     """Analyze already the downloaded data."""
     # setup the console and the logger instance
     console, _ = configure.setup(debug_level)
+    # STEP: profile the time and the memory of each stage, when requested
+    profiler.configure_profiler(profile)
     # STEP: display the messages about the tool
     display.display_tool_details(debug_level)
     console.print(":person_shrugging: Sorry, this feature does not yet exist.")
     console.print()
+    # STEP: save the profile of each stage in the current directory, if profiling
+    profiler.finish_profiler(console, None)
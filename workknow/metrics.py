@@ -0,0 +1,286 @@
+"""Record where the time of a command goes for each repository and report it as JSON and for Prometheus."""
+
+from contextlib import contextmanager
+from pathlib import Path
+
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Union
+
+from rich.console import Console
+
+from workknow import constants
+
+# The metrics of a command are recorded for each repository, which is found from the
+# URL of the GitHub API that a measurement is about so that the requests made by any
+# worker (e.g., a page worker, a shard, or an asyncio task) count for the correct
+# repository. The measurements that do not belong to a repository, like the request
+# to the /rate_limit endpoint or the combining of all of the files, are recorded
+# under the name "all". For each repository, the metrics are:
+#
+# --> requests: the number of responses received from the GitHub API
+# --> bytes: the number of bytes in the bodies of those responses
+# --> a histogram of the latency of the requests, in seconds
+# --> retries: the number of retries after a failed request or response
+# --> sleep_seconds: the time spent waiting before those retries
+# --> rate_limit_sleep_seconds: the time spent waiting for the rate limit budget
+# --> decode_seconds: the time spent decoding the JSON of the responses
+# --> build_seconds: the time spent building the DataFrames
+# --> write_seconds: the time spent writing the CSV files
+# --> untyped_memory_bytes: the memory of the DataFrames before the schema was applied
+# --> typed_memory_bytes: the memory of the DataFrames with the types of the schema
+#
+# At the end of a command, the metrics are written (when a directory is provided)
+# as a JSON file and as a Prometheus textfile for the node exporter's collector.
+
+# the pattern of a URL of the GitHub API that is about a single repository
+REPOSITORY_URL_PATTERN = re.compile(r"/repos/([^/?#]+)/([^/?#]+)")
+
+
+class RepositoryMetrics:
+    """The counts and the durations of the work done for a single repository."""
+
+    def __init__(self):
+        """Create the metrics of a repository for which nothing has happened yet."""
+        self.counts: Dict[str, float] = {
+            name: 0 for name in constants.metrics.Count_Names
+        }
+        self.latency_bucket_counts: List[int] = [
+            0 for _ in constants.metrics.Latency_Buckets
+        ]
+        self.latency_count = 0
+        self.latency_sum: float = 0
+
+    def record_latency(self, latency: float) -> None:
+        """Add the latency of a request to the histogram."""
+        # each bucket counts the requests with a latency that is at most its
+        # upper bound and thus only the first bucket that fits is incremented
+        # here while the cumulative counts are calculated for the report
+        bucket = bisect.bisect_left(constants.metrics.Latency_Buckets, latency)
+        if bucket < len(self.latency_bucket_counts):
+            self.latency_bucket_counts[bucket] += 1
+        self.latency_count += 1
+        self.latency_sum += latency
+
+    def to_dict(self) -> Dict[str, Union[float, Dict[str, Union[float, Dict]]]]:
+        """Create a dictionary of the metrics, with the cumulative buckets of the histogram."""
+        cumulative_bucket_counts = {}
+        cumulative_count = 0
+        for upper_bound, bucket_count in zip(
+            constants.metrics.Latency_Buckets, self.latency_bucket_counts
+        ):
+            cumulative_count += bucket_count
+            cumulative_bucket_counts[str(upper_bound)] = cumulative_count
+        cumulative_bucket_counts[constants.metrics.Infinity] = self.latency_count
+        metrics_dict: Dict[str, Union[float, Dict[str, Union[float, Dict]]]] = {
+            name: round(value, 6) for name, value in self.counts.items()
+        }
+        metrics_dict[constants.metrics.Latency_Seconds] = {
+            constants.metrics.Buckets: cumulative_bucket_counts,
+            constants.metrics.Count: self.latency_count,
+            constants.metrics.Sum: round(self.latency_sum, 6),
+        }
+        return metrics_dict
+
+
+class MetricsRegistry:
+    """The metrics of every repository that a command worked on."""
+
+    def __init__(self):
+        """Create a registry that does not have the metrics of any repository."""
+        self.lock = threading.Lock()
+        self.repositories: Dict[str, RepositoryMetrics] = {}
+
+    def get_repository_metrics(self, repository: str) -> RepositoryMetrics:
+        """Return the metrics of a repository, creating them when needed; the lock must be held."""
+        if repository not in self.repositories:
+            self.repositories[repository] = RepositoryMetrics()
+        return self.repositories[repository]
+
+    def add(self, github_api_url: Union[str, None], name: str, value: float) -> None:
+        """Add a value to one of the counts of the repository of the URL."""
+        repository = find_repository(github_api_url)
+        with self.lock:
+            self.get_repository_metrics(repository).counts[name] += value
+
+    def record_request(
+        self, github_api_url: Union[str, None], latency: float, size: int
+    ) -> None:
+        """Record a response, with its latency and size, for the repository of the URL."""
+        repository = find_repository(github_api_url)
+        with self.lock:
+            repository_metrics = self.get_repository_metrics(repository)
+            repository_metrics.counts[constants.metrics.Requests] += 1
+            repository_metrics.counts[constants.metrics.Bytes] += size
+            repository_metrics.record_latency(latency)
+
+    def get_total(self, name: str) -> float:
+        """Add up one of the counts of all of the repositories."""
+        with self.lock:
+            return sum(
+                repository_metrics.counts[name]
+                for repository_metrics in self.repositories.values()
+            )
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Create a dictionary of the metrics of each repository, in the order of their names."""
+        with self.lock:
+            return {
+                repository: self.repositories[repository].to_dict()
+                for repository in sorted(self.repositories)
+            }
+
+
+# the registry that is shared by all of the workers of a command
+_registry = MetricsRegistry()
+
+
+def find_repository(github_api_url: Union[str, None]) -> str:
+    """Find the organization/repository that a URL of the GitHub API is about, or "all" when it is not about one."""
+    url_match = REPOSITORY_URL_PATTERN.search(
+        github_api_url or constants.markers.Nothing
+    )
+    if url_match is None:
+        return constants.metrics.All
+    return url_match.group(1) + constants.github.Separator + url_match.group(2)
+
+
+def create_repository_url(organization: str, repo: str) -> str:
+    """Create the part of a URL of the GitHub API that identifies a repository."""
+    return (
+        constants.github.Separator
+        + constants.github.Repos
+        + constants.github.Separator
+        + organization
+        + constants.github.Separator
+        + repo
+    )
+
+
+def reset_metrics() -> MetricsRegistry:
+    """Start a new registry so that the metrics only describe the current command."""
+    global _registry  # pylint: disable=global-statement
+    _registry = MetricsRegistry()
+    return _registry
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the shared registry of metrics."""
+    return _registry
+
+
+def record_request(github_api_url: Union[str, None], latency: float, size: int) -> None:
+    """Record a response, with its latency and size, for the repository of the URL."""
+    _registry.record_request(github_api_url, latency, size)
+
+
+def record_retry(github_api_url: Union[str, None], sleep_time: float) -> None:
+    """Record a retry, and the time spent waiting before it, for the repository of the URL."""
+    _registry.add(github_api_url, constants.metrics.Retries, 1)
+    _registry.add(github_api_url, constants.metrics.Sleep_Seconds, sleep_time)
+
+
+def record_duration(
+    github_api_url: Union[str, None], name: str, duration: float
+) -> None:
+    """Add a duration that was measured elsewhere (e.g., by an asyncio task) for the repository of the URL."""
+    _registry.add(github_api_url, name, duration)
+
+
+def record_memory(
+    github_api_url: Union[str, None], untyped_memory: int, typed_memory: int
+) -> None:
+    """Record the memory of the DataFrames before and after the schema was applied for the repository of the URL."""
+    _registry.add(
+        github_api_url, constants.metrics.Untyped_Memory_Bytes, untyped_memory
+    )
+    _registry.add(github_api_url, constants.metrics.Typed_Memory_Bytes, typed_memory)
+
+
+@contextmanager
+def measure(github_api_url: Union[str, None], name: str) -> Iterator[None]:
+    """Measure the time spent in a block and add it to one of the durations of the repository of the URL."""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registry.add(github_api_url, name, time.perf_counter() - start_time)
+
+
+def escape_label_value(label_value: str) -> str:
+    """Escape the value of a Prometheus label."""
+    return label_value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def create_prometheus_text(metrics_dict: Dict[str, Dict]) -> str:
+    """Create the text exposition format of Prometheus for the metrics of each repository."""
+    lines = []
+    for name in constants.metrics.Count_Names:
+        metric_name = constants.metrics.Prefix + name + constants.metrics.Total_Suffix
+        lines.append(f"# TYPE {metric_name} counter")
+        for repository, repository_metrics in metrics_dict.items():
+            lines.append(
+                f'{metric_name}{{repository="{escape_label_value(repository)}"}} {repository_metrics[name]}'
+            )
+    metric_name = constants.metrics.Prefix + constants.metrics.Request_Latency_Seconds
+    lines.append(f"# TYPE {metric_name} histogram")
+    for repository, repository_metrics in metrics_dict.items():
+        label = f'repository="{escape_label_value(repository)}"'
+        latency_dict = repository_metrics[constants.metrics.Latency_Seconds]
+        for upper_bound, bucket_count in latency_dict[
+            constants.metrics.Buckets
+        ].items():
+            lines.append(
+                f'{metric_name}_bucket{{{label},le="{upper_bound}"}} {bucket_count}'
+            )
+        lines.append(
+            f"{metric_name}_sum{{{label}}} {latency_dict[constants.metrics.Sum]}"
+        )
+        lines.append(
+            f"{metric_name}_count{{{label}}} {latency_dict[constants.metrics.Count]}"
+        )
+    return constants.markers.Newline.join(lines) + constants.markers.Newline
+
+
+def write_metrics(
+    console: Console, metrics_dir: Union[Path, None], command: str
+) -> Union[Path, None]:
+    """Write the metrics of a command as JSON and as a Prometheus textfile, returning the JSON file."""
+    logger = logging.getLogger(constants.logging.Rich)
+    if metrics_dir is None:
+        return None
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    metrics_dict = _registry.to_dict()
+    json_file = metrics_dir / (
+        constants.metrics.File_Prefix + command + constants.metrics.Json_Extension
+    )
+    json_file.write_text(
+        json.dumps(
+            {
+                constants.metrics.Command: command,
+                constants.metrics.Repositories: metrics_dict,
+            },
+            indent=2,
+        )
+    )
+    # the node exporter could read a partially written textfile and thus it is
+    # written under a temporary name and then renamed, which is an atomic change
+    prometheus_file = metrics_dir / (
+        constants.metrics.File_Prefix + command + constants.metrics.Prom_Extension
+    )
+    temporary_prometheus_file = prometheus_file.with_suffix(
+        constants.metrics.Temporary_Extension
+    )
+    temporary_prometheus_file.write_text(create_prometheus_text(metrics_dict))
+    temporary_prometheus_file.replace(prometheus_file)
+    logger.debug(f"Wrote the metrics of the {command} command to {metrics_dir}")
+    console.print(f":bar_chart: Saved the metrics of each repository in {metrics_dir}")
+    return json_file
@@ -0,0 +1,540 @@
+"""Download, transform, and save the workflow history of a single GitHub repository."""
+
+import collections
+import itertools
+import logging
+
+from concurrent import futures
+
+from pathlib import Path
+
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Generator
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+import pandas
+
+from rich.console import Console
+from rich.pretty import pprint
+from rich.progress import Progress
+
+from workknow import backend
+from workknow import checkpoint
+from workknow import constants
+from workknow import files
+from workknow import incremental
+from workknow import jobs
+from workknow import produce
+from workknow import request
+from workknow import shard
+from workknow import workflows
+
+# the options that the download command provides for each repository:
+# --> results_dir: the directory in which the results are saved
+# --> save: whether or not to save the data for each repository
+# --> peek: whether or not to display a peek into the downloaded data
+# --> page_concurrency: the number of workers that download the pages
+# --> incremental: whether or not to only download the newest workflow runs
+# --> checkpoint_journal: the journal that records pages and repositories (or None)
+# --> backend: the backend that requests the pages from the GitHub API
+# --> shards: the number of date ranges downloaded at the same time (or one for none)
+# --> per_workflow: whether or not to download the runs of each workflow at the same time
+# --> workflow_names: the names of the only workflows that are downloaded (or none for all)
+# --> jobs: whether or not to download the jobs and the steps of the workflow runs
+# --> job_concurrency: the number of workers that download the jobs of the workflow runs
+DownloadOptions = collections.namedtuple(
+    "DownloadOptions",
+    [
+        "results_dir",
+        "save",
+        "peek",
+        "page_concurrency",
+        "incremental",
+        "checkpoint_journal",
+        "backend",
+        "shards",
+        "per_workflow",
+        "workflow_names",
+        "jobs",
+        "job_concurrency",
+    ],
+)
+
+
+def keep_first_page(
+    workflow_run_pages: Iterable[List[Dict[Any, Any]]],
+    first_pages: List[List[Dict[Any, Any]]],
+) -> Iterator[List[Dict[Any, Any]]]:
+    """Yield each of the pages of workflow runs, keeping the first one in the provided list."""
+    for workflow_runs in workflow_run_pages:
+        if not first_pages:
+            first_pages.append(workflow_runs)
+        yield workflow_runs
+
+
+def skip_duplicate_workflow_runs(
+    workflow_run_pages: Iterable[List[Dict[Any, Any]]],
+) -> Iterator[List[Dict[Any, Any]]]:
+    """Yield each of the pages of workflow runs without the runs that were in an earlier page."""
+    # a download that resumes after the pages stored in the checkpoint journal requests
+    # the next pages by their number, but the workflow runs created since the download
+    # was interrupted move the older runs to later pages and thus a run can be on the
+    # last stored page and on the first downloaded page; note that only the identifiers
+    # of the runs, and not the runs themselves, are kept until the download is finished
+    seen_ids: Set[Any] = set()
+    for workflow_runs in workflow_run_pages:
+        unique_workflow_runs = []
+        for workflow_run in workflow_runs:
+            run_id = workflow_run.get(constants.workflow.Id)
+            if run_id is None or run_id not in seen_ids:
+                unique_workflow_runs.append(workflow_run)
+                seen_ids.add(run_id)
+        yield unique_workflow_runs
+
+
+def display_downloaded_records(
+    console: Console,
+    record_count: int,
+    first_pages: List[List[Dict[Any, Any]]],
+    peek: bool,
+) -> None:
+    """Display the number of downloaded records and, when requested, a peek into the first page of them."""
+    logger = logging.getLogger(constants.logging.Rich)
+    # --> display a peek into the downloaded data structure
+    if peek:
+        console.print()
+        console.print(
+            f":inbox_tray: Downloaded a total of {record_count} records that each look like:\n"
+        )
+        # STEP: print debugging information in a summarized fashion
+        pprint(
+            first_pages,
+            max_length=constants.github.Maximum_Length_All,
+        )
+        if record_count != 0:
+            console.print()
+            console.print(":lion_face: The first workflow record looks like:\n")
+            pprint(
+                first_pages[0][0],
+                max_length=constants.github.Maximum_Length_Record,
+            )
+            logger.debug(first_pages[0][0])
+        console.print()
+    # --> the program should not display a peek into the downloaded data structure
+    else:
+        console.print()
+        console.print(f":inbox_tray: Downloaded a total of {record_count} records\n")
+
+
+def read_saved_repository(
+    results_dir: Path, organization: str, repo: str
+) -> Tuple[pandas.DataFrame, pandas.DataFrame]:
+    """Read the workflows and the commits DataFrames that were saved for a repository."""
+    workflows_dataframe = files.read_dataframe(
+        results_dir, organization, repo, constants.filesystem.Workflows
+    )
+    commits_dataframe = files.read_dataframe(
+        results_dir, organization, repo, constants.filesystem.Commits
+    )
+    return (workflows_dataframe, commits_dataframe)
+
+
+def save_repository(
+    console: Console,
+    results_dir: Path,
+    organization: str,
+    repo: str,
+    workflows_dataframe: pandas.DataFrame,
+    commits_dataframe: pandas.DataFrame,
+) -> bool:
+    """Save the workflows and the commits DataFrames of a repository in the results directory."""
+    # the directory is not valid and thus the save cannot work correctly
+    if not files.confirm_valid_directory(results_dir):
+        # explain that the save could not work correctly due to invalid results directory
+        console.print(
+            f"Could not save workflow and commit data for {organization}/{repo} in the directory {str(results_dir).strip()}"
+        )
+        console.print()
+        return False
+    # the directory is valid so attempt a save to file system
+    console.print(
+        f":sparkles: Saving data for {organization}/{repo} in the directory {str(results_dir).strip()}"
+    )
+    # save the workflows DataFrame
+    console.print("\t... Saving the workflows data")
+    files.save_dataframe(
+        results_dir,
+        organization,
+        repo,
+        constants.filesystem.Workflows,
+        workflows_dataframe,
+    )
+    # save the commits DataFrame
+    console.print("\t... Saving the commits data")
+    files.save_dataframe(
+        results_dir,
+        organization,
+        repo,
+        constants.filesystem.Commits,
+        commits_dataframe,
+    )
+    return True
+
+
+def download_repository_jobs(
+    console: Console,
+    organization: str,
+    repo: str,
+    workflows_dataframe: pandas.DataFrame,
+    download_options: DownloadOptions,
+    progress: Union[Progress, None] = None,
+) -> bool:
+    """Download the jobs and steps of the workflow runs of a repository and (possibly) save them."""
+    # the jobs that were saved before are only read, and their runs skipped,
+    # when the jobs of this download will also be saved in the results directory
+    save_jobs = download_options.save and files.confirm_valid_directory(
+        download_options.results_dir
+    )
+    (jobs_valid, jobs_dataframe, steps_dataframe) = jobs.download_jobs(
+        console,
+        download_options.results_dir if save_jobs else None,
+        organization,
+        repo,
+        workflows_dataframe,
+        download_options.job_concurrency,
+        progress,
+    )
+    if not jobs_valid:
+        console.print(
+            f":grimacing_face: Could not download the jobs of some workflow runs for {organization}/{repo}"
+        )
+    if save_jobs:
+        jobs.save_jobs(
+            console,
+            download_options.results_dir,
+            organization,
+            repo,
+            jobs_dataframe,
+            steps_dataframe,
+        )
+    return jobs_valid
+
+
+def download_repository(
+    console: Console,
+    repo_url: str,
+    organization: str,
+    repo: str,
+    download_options: DownloadOptions,
+    progress: Union[Progress, None] = None,
+) -> Tuple[
+    bool,
+    Union[Dict[str, Union[str, int]], None],
+    pandas.DataFrame,
+    pandas.DataFrame,
+]:
+    """Download the workflow history of a repository and create (and possibly save) its DataFrames."""
+    logger = logging.getLogger(constants.logging.Rich)
+    # STEP: create the URL needed for accessing the repository's Action builds
+    github_api_url = produce.create_github_api_url(organization, repo)
+    console.print()
+    console.print(
+        ":runner: Downloading the workflow history of the GitHub repository at:"
+    )
+    console.print(github_api_url, style="link " + github_api_url)
+    console.print()
+    # STEP: for an incremental download, only request the workflow runs that
+    # were created since the newest run saved in the results directory
+    github_params_filter = {}
+    if download_options.incremental:
+        github_params_filter = incremental.create_created_filter(
+            incremental.find_newest_created_at(
+                download_options.results_dir, organization, repo
+            )
+        )
+        logger.debug(github_params_filter)
+    # STEP: describe the download of the pages of the JSON file that contains the
+    # build history; note that the pages after the first one are downloaded by a
+    # pool of workers when the page concurrency is greater than one; note also that
+    # the pages of both of the backends have the same parameters and attributes
+    progress_label = (
+        constants.markers.Nothing
+        if progress is None
+        else f"{organization}/{repo}{constants.markers.Space}"
+    )
+    workflow_run_pages_class = request.WorkflowRunPages
+    if download_options.backend == backend.Backend.ASYNC:
+        # the asyncio backend is only imported when it is used since it needs aiohttp
+        from workknow import aiorequest  # pylint: disable=import-outside-toplevel
+
+        workflow_run_pages_class = aiorequest.WorkflowRunPages
+    # a per-workflow download lists the workflows of the repository and downloads the
+    # runs of each of them with their own pagination, which also makes it possible to
+    # only download the workflows with the selected names; a sharded download splits
+    # the history into date ranges that are each downloaded with their own pagination;
+    # note that an incremental download already filters by the date of creation and
+    # that the pages of each workflow and of each date range are downloaded with the
+    # backend and journaled as a listing of their own
+    if download_options.per_workflow or download_options.workflow_names:
+        workflow_run_pages = workflows.WorkflowRunPagesByWorkflow(
+            organization,
+            repo,
+            console,
+            download_options.workflow_names,
+            page_concurrency=download_options.page_concurrency,
+            github_params_filter=github_params_filter,
+            progress=progress,
+            progress_label=progress_label,
+            workflow_run_pages_class=workflow_run_pages_class,
+            checkpoint_journal=download_options.checkpoint_journal,
+        )
+    elif download_options.shards > 1 and not github_params_filter:
+        workflow_run_pages = shard.ShardedWorkflowRunPages(
+            github_api_url,
+            console,
+            download_options.shards,
+            page_concurrency=download_options.page_concurrency,
+            progress=progress,
+            progress_label=progress_label,
+            workflow_run_pages_class=workflow_run_pages_class,
+            checkpoint_journal=download_options.checkpoint_journal,
+        )
+    else:
+        # note that the pages recorded in the checkpoint journal are not downloaded
+        # again and that each newly downloaded page is recorded in the journal
+        stored_pages, page_callback = checkpoint.open_listing(
+            download_options.checkpoint_journal, github_api_url, github_params_filter
+        )
+        checkpoint.display_stored_pages(console, len(stored_pages))
+        workflow_run_pages = workflow_run_pages_class(
+            github_api_url,
+            console,
+            page_concurrency=download_options.page_concurrency,
+            github_params_filter=github_params_filter,
+            stored_pages=stored_pages,
+            page_callback=page_callback,
+            progress=progress,
+            progress_label=progress_label,
+        )
+    # STEP: create the count dictionary and the workflows and commits DataFrames
+    # while downloading the pages, letting each of the pages go once it is used;
+    # note that the first page is kept so that a peek into the data is possible and
+    # that a resumed download skips the runs that were already in a stored page
+    first_pages: List[List[Dict[Any, Any]]] = []
+    resumed = (
+        download_options.checkpoint_journal is not None
+        and download_options.checkpoint_journal.resume
+    )
+    (
+        repo_url_workflow_record_dict,
+        workflows_dataframe,
+        commits_dataframe,
+    ) = produce.create_dataframes_from_pages(
+        organization,
+        repo,
+        repo_url,
+        github_api_url,
+        keep_first_page(
+            skip_duplicate_workflow_runs(workflow_run_pages)
+            if resumed
+            else workflow_run_pages,
+            first_pages,
+        ),
+    )
+    # the data returned from the API is not valid even after retries and thus
+    # there is nothing to extract and save for this repository
+    if not workflow_run_pages.valid:
+        console.print()
+        console.print(
+            f":grimacing_face: Could not download workflow and commit details for {organization}/{repo}"
+        )
+        return (False, None, pandas.DataFrame(), pandas.DataFrame())
+    # STEP: print some details about the completed download
+    display_downloaded_records(
+        console,
+        repo_url_workflow_record_dict[constants.workflow.Workflow_Build_Count],  # type: ignore
+        first_pages,
+        download_options.peek,
+    )
+    # STEP: merge the new workflow runs with those saved before, making
+    # sure that the count reflects the complete workflow history
+    if download_options.incremental:
+        (
+            workflows_dataframe,
+            commits_dataframe,
+        ) = incremental.merge_with_saved_dataframes(
+            download_options.results_dir,
+            organization,
+            repo,
+            workflows_dataframe,
+            commits_dataframe,
+        )
+        repo_url_workflow_record_dict[constants.workflow.Workflow_Build_Count] = len(
+            workflows_dataframe
+        )
+    # STEP: save the workflows DataFrame when saving is stipulated and
+    # the results directory is valid for the user's file system
+    if download_options.save and save_repository(
+        console,
+        download_options.results_dir,
+        organization,
+        repo,
+        workflows_dataframe,
+        commits_dataframe,
+    ):
+        # record the newest saved workflow run for the next incremental download
+        incremental.update_state(
+            download_options.results_dir, organization, repo, workflows_dataframe
+        )
+        # record that the repository is complete so that a resumed
+        # download does not need to download it again
+        if download_options.checkpoint_journal is not None:
+            download_options.checkpoint_journal.record_repository(
+                repo_url,
+                github_api_url,
+                repo_url_workflow_record_dict,
+            )
+    # STEP: download the jobs and the steps of each of the workflow runs, when
+    # requested, which needs a request for each run instead of for each page
+    if download_options.jobs:
+        download_repository_jobs(
+            console,
+            organization,
+            repo,
+            workflows_dataframe,
+            download_options,
+            progress,
+        )
+    # before going on to the next GitHub repository, ensure that the program
+    # is not about to be rate limited, which will cause a crash. If a rate
+    # limit is imminent then sleep for the time remaining until GitHub resets.
+    # Note that the budget is up-to-date from the headers of the responses.
+    request.wait_for_rate_limit_budget()
+    return (
+        True,
+        repo_url_workflow_record_dict,
+        workflows_dataframe,
+        commits_dataframe,
+    )
+
+
+def find_repositories_to_download(
+    repo_urls: List[str], completed_repositories: Dict[str, Dict[str, Union[str, int]]]
+) -> List[Tuple[str, str, str]]:
+    """Find the (URL, organization, repository) of each valid repository that was not already completed."""
+    repositories_to_download = []
+    for repo_url, (organization, repo) in zip(
+        repo_urls, produce.parse_github_urls(repo_urls)
+    ):
+        if (
+            organization is not None
+            and repo is not None
+            and repo_url not in completed_repositories
+        ):
+            repositories_to_download.append((repo_url, organization, repo))
+    return repositories_to_download
+
+
+def iterate_download_results(
+    console: Console,
+    repositories: List[Tuple[str, str, str]],
+    download_options: DownloadOptions,
+    repository_concurrency: int = constants.github.Repository_Concurrency,
+) -> Generator[
+    Tuple[
+        str,
+        Tuple[
+            bool,
+            Union[Dict[str, Union[str, int]], None],
+            pandas.DataFrame,
+            pandas.DataFrame,
+        ],
+    ],
+    None,
+    None,
+]:
+    """Download the repositories, given as (URL, organization, repository), yielding the (URL, result) of each one in order."""
+    # the repositories are downloaded one at a time and each of the downloads
+    # creates its own progress display, exactly as it did before the pool existed
+    if repository_concurrency <= 1:
+        for repo_url, organization, repo in repositories:
+            yield (
+                repo_url,
+                download_repository(
+                    console, repo_url, organization, repo, download_options
+                ),
+            )
+        return
+    # the workers share the connection pool of the shared session and the rate limit
+    # budget (or the pool of tokens) and thus they only differ in their repositories;
+    # since rich only shows one live display at a time, all of the workers add their
+    # tasks to a single progress display that also counts the finished repositories
+    with request.create_progress() as progress:
+        download_repositories_task = progress.add_task(
+            "Repositories", total=len(repositories)
+        )
+        with futures.ThreadPoolExecutor(max_workers=repository_concurrency) as executor:
+            # the results are yielded in the order of the repositories so that they do
+            # not depend on the order in which the workers finished; only a window of
+            # repositories is downloaded ahead of the next one to yield so that the
+            # results that are waiting to be yielded do not grow with the repositories
+            repositories_iterator = iter(repositories)
+            pending_futures: Deque[Tuple[str, futures.Future]] = collections.deque()
+
+            def submit_repositories(count: int) -> None:
+                for repo_url, organization, repo in itertools.islice(
+                    repositories_iterator, count
+                ):
+                    repository_future = executor.submit(
+                        download_repository,
+                        progress.console,
+                        repo_url,
+                        organization,
+                        repo,
+                        download_options,
+                        progress,
+                    )
+                    repository_future.add_done_callback(
+                        lambda _: progress.advance(download_repositories_task)
+                    )
+                    pending_futures.append((repo_url, repository_future))
+
+            submit_repositories(
+                repository_concurrency * constants.github.Repository_Window_Factor
+            )
+            while pending_futures:
+                repo_url, repository_future = pending_futures.popleft()
+                download_result = repository_future.result()
+                submit_repositories(1)
+                yield (repo_url, download_result)
+
+
+def download_repositories(
+    console: Console,
+    repositories: List[Tuple[str, str, str]],
+    download_options: DownloadOptions,
+    repository_concurrency: int = constants.github.Repository_Concurrency,
+) -> Dict[
+    str,
+    Tuple[
+        bool,
+        Union[Dict[str, Union[str, int]], None],
+        pandas.DataFrame,
+        pandas.DataFrame,
+    ],
+]:
+    """Download the repositories, given as (URL, organization, repository), with a bounded pool of workers."""
+    # note that the results are keyed by the URL of the repository so that the
+    # caller can combine them in the same order as a download of one at a time
+    return dict(
+        iterate_download_results(
+            console, repositories, download_options, repository_concurrency
+        )
+    )
@@ -0,0 +1,106 @@
+"""Plan the download so that each repository is only downloaded once."""
+
+import collections
+import logging
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from rich.console import Console
+
+from workknow import constants
+from workknow import metrics
+from workknow import produce
+
+# The URLs of the repositories come from the command-line and from the CSV file and
+# thus the same repository may be listed more than once, possibly written in another
+# way (e.g., with a .git suffix, a trailing slash, or with a different case, which
+# GitHub ignores). Since each repository listed again would be downloaded again,
+# spending the rate limit budget, the plan of a download has:
+#
+# --> repo_urls: the first URL of each distinct repository, in the order of the list
+# --> url_mapping: the URL (in repo_urls) that was planned for each valid URL of the list
+# --> duplicate_urls: the URLs that were removed since their repository was planned
+#
+# The url_mapping makes it possible to join the counts of each downloaded repository
+# with every row of the CSV file, including the rows of the URLs that were removed.
+DownloadPlan = collections.namedtuple(
+    "DownloadPlan",
+    [
+        "repo_urls",
+        "url_mapping",
+        "duplicate_urls",
+    ],
+)
+
+
+def create_repository_key(organization: str, repo: str) -> Tuple[str, str]:
+    """Create the key of a repository that is the same for each way of writing it."""
+    return (organization.lower(), repo.lower())
+
+
+def create_download_plan(repo_urls: List[str]) -> DownloadPlan:
+    """Plan the download of each distinct repository in the list of URLs, removing those that are not valid."""
+    logger = logging.getLogger(constants.logging.Rich)
+    planned_urls: Dict[Tuple[str, str], str] = {}
+    url_mapping: Dict[str, str] = {}
+    duplicate_urls: List[str] = []
+    for repo_url, (organization, repo) in zip(
+        repo_urls, produce.parse_github_urls(repo_urls)
+    ):
+        # the URLs that are not valid are not downloaded, as before there was a plan
+        if organization is None or repo is None:
+            continue
+        repository_key = create_repository_key(organization, repo)
+        if repository_key in planned_urls:
+            duplicate_urls.append(repo_url)
+        else:
+            planned_urls[repository_key] = repo_url
+        url_mapping[repo_url] = planned_urls[repository_key]
+    logger.debug(f"Removed the duplicate URLs {duplicate_urls}")
+    return DownloadPlan(
+        repo_urls=list(planned_urls.values()),
+        url_mapping=url_mapping,
+        duplicate_urls=duplicate_urls,
+    )
+
+
+def display_download_plan(console: Console, download_plan: DownloadPlan) -> None:
+    """Display the number of duplicate URLs that will not be downloaded, if there are any."""
+    if not download_plan.duplicate_urls:
+        return
+    console.print()
+    console.print(
+        f":scissors: Planned the download of {len(download_plan.repo_urls)} repositories,"
+        f" removing {len(download_plan.duplicate_urls)} duplicate URL(s)"
+    )
+
+
+def count_saved_requests(download_plan: DownloadPlan) -> int:
+    """Count the requests that the duplicate URLs would have made if they were downloaded again."""
+    metrics_dict = metrics.get_metrics().to_dict()
+    saved_requests = 0
+    for duplicate_url in download_plan.duplicate_urls:
+        # the requests were recorded for the repository of the planned URL
+        organization, repo = produce.parse_github_url(
+            download_plan.url_mapping[duplicate_url]
+        )
+        repository = metrics.find_repository(
+            metrics.create_repository_url(organization, repo)  # type: ignore
+        )
+        saved_requests += int(
+            metrics_dict.get(repository, {}).get(constants.metrics.Requests, 0)
+        )
+    return saved_requests
+
+
+def display_saved_requests(console: Console, download_plan: DownloadPlan) -> None:
+    """Display the number of requests to the GitHub API that the plan saved, if there were duplicates."""
+    if not download_plan.duplicate_urls:
+        return
+    console.print()
+    console.print(
+        f":moneybag: Removing the duplicate URL(s) saved {count_saved_requests(download_plan)}"
+        " request(s) to the GitHub API"
+    )
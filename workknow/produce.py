@@ -1,9 +1,13 @@
 """Create content from containers and strings."""
 
+import functools
 import logging
+import re
+import time
 
 from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Set
 from typing import Tuple
@@ -14,14 +18,37 @@ from giturlparse import parse  # type: ignore
 import pandas
 
 from workknow import constants
+from workknow import endpoint
+from workknow import metrics
+from workknow import profiler
+from workknow import projection
+from workknow import schema
 
+# the value of a column that a row does not have, as in a DataFrame created from rows
+MISSING_VALUE = float("nan")
 
+# the pattern of a URL of a GitHub repository, like https://github.com/gkapfham/meSMSage,
+# with an optional .git suffix and trailing slash; note that URLs with other forms, like
+# those that use SSH or that have a path after the repository, are parsed by giturlparse
+# and that every URL that the pattern matches is parsed in the same way by giturlparse
+GITHUB_URL_PATTERN = re.compile(
+    r"^https://github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+?)(?:\.git)?/?$"
+)
+
+
+@functools.lru_cache(maxsize=constants.github.Url_Cache_Size)
 def parse_github_url(github_url: str) -> Tuple[Union[str, None], Union[str, None]]:
-    """Parse a GitHub URL using the giturlparse package returning names of organization and repository."""
+    """Parse a GitHub URL, using giturlparse for its less common forms, returning names of organization and repository."""
+    # the most common form of a URL (e.g., https://github.com/gkapfham/meSMSage)
+    # is parsed with a regular expression that gives the same names as giturlparse
+    if isinstance(github_url, str):
+        url_match = GITHUB_URL_PATTERN.match(github_url)
+        if url_match is not None:
+            return (url_match.group(1), url_match.group(2))
+    # parse the github_url with giturlparse since it has a less common form
+    github_url_parse = parse(github_url)
     # the provided github_url is valid and can be parsed
-    if parse(github_url).valid:
-        # parse the parse-able github_url
-        github_url_parse = parse(github_url)
+    if github_url_parse.valid:
         # extract the owner (i.e., organization) and repo fields
         # and return them both in a tuple
         organization = github_url_parse.owner  # type: ignore
@@ -31,14 +58,26 @@ def parse_github_url(github_url: str) -> Tuple[Union[str, None], Union[str, None
     return (None, None)
 
 
+def parse_github_urls(
+    github_urls: List[str],
+) -> List[Tuple[Union[str, None], Union[str, None]]]:
+    """Parse all of the GitHub URLs in a list, returning the organization and repository of each one."""
+    # a long list of repositories often has the same URL more than once and
+    # thus each distinct URL is only parsed once, in the order of the list
+    parsed_urls = {
+        github_url: parse_github_url(github_url)
+        for github_url in dict.fromkeys(github_urls)
+    }
+    return [parsed_urls[github_url] for github_url in github_urls]
+
+
 def create_github_api_url(organization: str, repo: str) -> str:
     """Create a valid GitHub API URL out of the organization and repo name."""
     # Example:
     # https://api.github.com/repos/gkapfham/meSMSage/actions/runs
     logger = logging.getLogger(constants.logging.Rich)
     github_api_url = (
-        constants.github.Https
-        + constants.github.Api
+        endpoint.create_repos_url()
         + organization
         + constants.github.Separator
         + repo
@@ -49,6 +88,35 @@ def create_github_api_url(organization: str, repo: str) -> str:
     return github_api_url
 
 
+def create_github_workflows_url(organization: str, repo: str) -> str:
+    """Create a valid GitHub API URL that lists the workflows of a repository."""
+    # Example:
+    # https://api.github.com/repos/gkapfham/meSMSage/actions/workflows
+    return (
+        endpoint.create_repos_url()
+        + organization
+        + constants.github.Separator
+        + repo
+        + constants.github.Separator
+        + constants.github.Actions_Workflows
+    )
+
+
+def create_github_workflow_runs_url(
+    organization: str, repo: str, workflow_id: int
+) -> str:
+    """Create a valid GitHub API URL that lists the runs of a single workflow of a repository."""
+    # Example:
+    # https://api.github.com/repos/gkapfham/meSMSage/actions/workflows/161335/runs
+    return (
+        create_github_workflows_url(organization, repo)
+        + constants.github.Separator
+        + str(workflow_id)
+        + constants.github.Separator
+        + constants.github.Runs
+    )
+
+
 def count_individual_builds(json_responses: List[Dict[Any, Any]]) -> int:
     """Count the number of lists inside of the nested list."""
     running_build_total = 0
@@ -101,6 +169,7 @@ def create_subsetted_list_dict(
     return total_workflow_list
 
 
+@profiler.profile_stage(constants.profile.Produce)
 def create_workflows_dataframe(
     organization: str,
     repo: str,
@@ -109,32 +178,21 @@ def create_workflows_dataframe(
     workflows_dictionary_list: List[Dict[Any, Any]],
 ) -> pandas.DataFrame:
     """Create a DataFrame of all of the relevant workflow data."""
-    # create a tuple of the key names that we want to retain from
-    # those keys that are inside of all those in a dictionary (row) of data
-    subset_key_names = {
-        constants.workflow.Id,
-        constants.workflow.Name,
-        constants.workflow.Head_Sha,
-        constants.workflow.Created_At,
-        constants.workflow.Updated_At,
-        constants.workflow.Event,
-        constants.workflow.Status,
-        constants.workflow.Conclusion,
-        constants.workflow.Jobs_Url,
-        constants.workflow.Actions_Url,
-    }
+    # use the key names that we want to retain from those keys
+    # that are inside of all those in a dictionary (row) of data
     total_workflow_list = create_subsetted_list_dict(
         organization,
         repo,
         repo_url,
         github_api_url,
-        subset_key_names,
+        projection.get_workflows_key_names(),
         workflows_dictionary_list,
     )
     total_workflow_dataframe = pandas.DataFrame(total_workflow_list)
-    return total_workflow_dataframe
+    return schema.apply_workflows_schema(total_workflow_dataframe)
 
 
+@profiler.profile_stage(constants.profile.Produce)
 def create_commits_dataframe(
     organization: str,
     repo: str,
@@ -143,19 +201,15 @@ def create_commits_dataframe(
     workflows_dictionary_list: List[Dict[Any, Any]],
 ) -> pandas.DataFrame:
     """Create a DataFrame of all the relevant commit message data."""
-    # create a tuple of the key names that we want to retain from
-    # those keys that are inside of all those in a dictionary (row) of data
-    subset_key_names = {
-        constants.workflow.Head_Commit,
-    }
     # print(workflows_dictionary_list)
-    # create a subsetted list given the key names
+    # create a subsetted list given the key names that we want to retain from
+    # those keys that are inside of all those in a dictionary (row) of data
     commits_list = create_subsetted_list_dict(
         organization,
         repo,
         repo_url,
         github_api_url,
-        subset_key_names,
+        projection.COMMITS_SUBSET_KEY_NAMES,
         workflows_dictionary_list,
     )
     # Since the commits list of dictionaries contains dictionaries that are
@@ -165,7 +219,7 @@ def create_commits_dataframe(
     total_commits_dataframe = pandas.json_normalize(
         commits_list, sep=constants.markers.Underscore
     )
-    return total_commits_dataframe
+    return schema.apply_commits_schema(total_commits_dataframe)
 
 
 def create_workflow_record_count_dictionary(
@@ -176,10 +230,26 @@ def create_workflow_record_count_dictionary(
     workflows_dictionary_list: List[Dict[Any, Any]],
 ) -> Dict[str, Union[str, int]]:
     """Create a dictionary of all the counts of records returned for a GitHub project's workflows."""
+    # count the individual builds for a given GitHub repository's workflows
+    return create_count_dictionary(
+        organization,
+        repo,
+        repo_url,
+        github_api_url,
+        count_individual_builds(workflows_dictionary_list),
+    )
+
+
+def create_count_dictionary(
+    organization: str,
+    repo: str,
+    repo_url: str,
+    github_api_url: str,
+    workflows_count_for_repo: int,
+) -> Dict[str, Union[str, int]]:
+    """Create a dictionary of the count of workflow records along with the meta-data of the GitHub project."""
     # create the empty dictionary that will store the relevant meta-data and the record count
     workflow_count_dictionary: Dict[str, Union[str, int]] = {}
-    # count the individual builds for a given GitHub repository's workflows
-    workflows_count_for_repo = count_individual_builds(workflows_dictionary_list)
     # store all of the meta-data about this project:
     # --> GitHub organization name
     # --> GitHub repository name
@@ -196,6 +266,206 @@ def create_workflow_record_count_dictionary(
     return workflow_count_dictionary
 
 
+class ColumnarTable:
+    """The columns of a DataFrame that is filled one page of rows at a time."""
+
+    def __init__(self, constant_columns: Dict[str, Any]):
+        """Create a table without rows that has a column with the same value in every row for each constant."""
+        self.constant_columns = constant_columns
+        self.columns: Dict[str, List[Any]] = {}
+        # the columns are in the order in which they first appear in a row, which is
+        # the same order as for a DataFrame created from a list of dictionaries
+        self.column_names: Dict[str, None] = {}
+        self.row_count = 0
+
+    def add_column_names(
+        self, row: Dict[str, Any], key_names: Union[Set[str], None]
+    ) -> None:
+        """Add the names of the columns in a row that were not in any of the earlier rows."""
+        for name in row:
+            if (
+                key_names is None or name in key_names
+            ) and name not in self.column_names:
+                self.column_names[name] = None
+
+    def add_rows(
+        self, rows: List[Dict[str, Any]], key_names: Union[Set[str], None] = None
+    ) -> None:
+        """Add the fields of the rows (only those with one of the key names, if any) filling each column at once."""
+        if len(rows) == 0:
+            return
+        # the constant columns come after the fields of the first row unless that
+        # row already gave them a position (which is kept, like in a dictionary)
+        if self.row_count == 0:
+            self.add_column_names(rows[0], key_names)
+            for name in self.constant_columns:
+                self.column_names.setdefault(name)
+        # the rows of a page almost always have the same fields and thus the
+        # fields of a row are only checked when they differ from the previous row
+        previous_row_keys = None
+        for row in rows:
+            row_keys = row.keys()
+            if row_keys != previous_row_keys:
+                self.add_column_names(row, key_names)
+                previous_row_keys = row_keys
+        for name in self.column_names:
+            if name in self.constant_columns:
+                continue
+            column = self.columns.get(name)
+            if column is None:
+                column = [MISSING_VALUE] * self.row_count
+                self.columns[name] = column
+            column.extend([row.get(name, MISSING_VALUE) for row in rows])
+        self.row_count = self.row_count + len(rows)
+
+    def create_dataframe(self) -> pandas.DataFrame:
+        """Create a DataFrame from the columns."""
+        if self.row_count == 0:
+            return pandas.DataFrame()
+        return pandas.DataFrame(
+            {
+                name: (
+                    [self.constant_columns[name]] * self.row_count
+                    if name in self.constant_columns
+                    else self.columns[name]
+                )
+                for name in self.column_names
+            }
+        )
+
+
+def flatten_dictionary(
+    flat_dictionary: Dict[str, Any], prefix: str, nested_dictionary: Dict[str, Any]
+) -> None:
+    """Add the values of a nested dictionary to a flat one, under their path of names like pandas.json_normalize."""
+    # the prefix of the names is only created once for all of the values
+    name_prefix = prefix + constants.markers.Underscore
+    for key, value in nested_dictionary.items():
+        if isinstance(value, dict):
+            flatten_dictionary(flat_dictionary, name_prefix + key, value)
+        else:
+            flat_dictionary[name_prefix + key] = value
+
+
+class DataFramesBuilder:
+    """Build the count dictionary and the workflows and commits DataFrames in a single pass over the workflow runs."""
+
+    def __init__(
+        self, organization: str, repo: str, repo_url: str, github_api_url: str
+    ):
+        """Create a builder for the workflow runs of a repository."""
+        self.organization = organization
+        self.repo = repo
+        self.repo_url = repo_url
+        self.github_api_url = github_api_url
+        self.workflows_key_names = projection.get_workflows_key_names()
+        # to ensure that the data set is self contained, each row includes the
+        # organization name, repository name, full repository URL, and the API URL;
+        # since these are the same in every row, they are only made into columns once
+        self.repository_columns = {
+            constants.workflow.Organization: organization,
+            constants.workflow.Repo: repo,
+            constants.workflow.Repo_Url: repo_url,
+            constants.workflow.Actions_Url: github_api_url,
+        }
+        self.workflows_table = ColumnarTable(self.repository_columns)
+        self.commits_table = ColumnarTable(self.repository_columns)
+
+    def create_commit_row(self, workflow_run: Dict[Any, Any]) -> Dict[str, Any]:
+        """Create the flattened fields of the commit of a workflow run, in the order of pandas.json_normalize."""
+        commit_row: Dict[str, Any] = {}
+        nested_fields = []
+        for key in projection.COMMITS_SUBSET_KEY_NAMES:
+            if key in workflow_run:
+                value = workflow_run[key]
+                if isinstance(value, dict):
+                    nested_fields.append((key, value))
+                else:
+                    commit_row[key] = value
+        # the repository columns come after the fields that are not nested and before
+        # the nested ones; note that only their position is needed since they are constant
+        commit_row.update(dict.fromkeys(self.repository_columns))
+        for key, value in nested_fields:
+            flatten_dictionary(commit_row, key, value)
+        return commit_row
+
+    def add_workflow_runs(self, workflow_runs: List[Dict[Any, Any]]) -> None:
+        """Add the fields of the workflow runs to the columns of both of the DataFrames."""
+        self.workflows_table.add_rows(workflow_runs, self.workflows_key_names)
+        commit_rows = [
+            self.create_commit_row(workflow_run) for workflow_run in workflow_runs
+        ]
+        self.commits_table.add_rows(commit_rows)
+
+    def create_outputs(
+        self,
+    ) -> Tuple[Dict[str, Union[str, int]], pandas.DataFrame, pandas.DataFrame]:
+        """Create the count dictionary and the workflows and commits DataFrames, with the types of the schema."""
+        workflows_dataframe = self.workflows_table.create_dataframe()
+        commits_dataframe = self.commits_table.create_dataframe()
+        typed_workflows_dataframe = schema.apply_workflows_schema(workflows_dataframe)
+        typed_commits_dataframe = schema.apply_commits_schema(commits_dataframe)
+        # the change made by the schema is recorded in the metrics of the repository
+        # so that the download can display the memory that the schema saved
+        untyped_memory = sum(
+            schema.calculate_memory(dataframe)
+            for dataframe in (workflows_dataframe, commits_dataframe)
+        )
+        typed_memory = sum(
+            schema.calculate_memory(dataframe)
+            for dataframe in (typed_workflows_dataframe, typed_commits_dataframe)
+        )
+        metrics.record_memory(self.github_api_url, untyped_memory, typed_memory)
+        schema.log_memory(
+            f"the DataFrames of {self.organization}/{self.repo}",
+            untyped_memory,
+            typed_memory,
+        )
+        return (
+            create_count_dictionary(
+                self.organization,
+                self.repo,
+                self.repo_url,
+                self.github_api_url,
+                self.workflows_table.row_count,
+            ),
+            typed_workflows_dataframe,
+            typed_commits_dataframe,
+        )
+
+
+@profiler.profile_stage(constants.profile.Produce)
+def create_dataframes_from_pages(
+    organization: str,
+    repo: str,
+    repo_url: str,
+    github_api_url: str,
+    workflow_run_pages: Iterable[List[Dict[Any, Any]]],
+) -> Tuple[Dict[str, Union[str, int]], pandas.DataFrame, pandas.DataFrame]:
+    """Create the count dictionary and the workflows and commits DataFrames, consuming one page at a time."""
+    # the pages can come from a generator that downloads each page only when it is
+    # needed and thus this function only keeps the columns of each page; this means
+    # that the complete workflow runs (which contain, for instance, nested objects
+    # for the repository) of no more than a single page are in memory at the same time;
+    # note that the outputs are the same as those of create_workflows_dataframe,
+    # create_commits_dataframe, and create_workflow_record_count_dictionary, but
+    # they are made in a single pass that does not create a dictionary for each row
+    dataframes_builder = DataFramesBuilder(organization, repo, repo_url, github_api_url)
+    # the pages may be downloaded while they are iterated and thus only the time
+    # spent on the columns and the DataFrames counts as the time to build them
+    build_seconds: float = 0
+    for workflow_runs in workflow_run_pages:
+        start_time = time.perf_counter()
+        dataframes_builder.add_workflow_runs(workflow_runs)
+        build_seconds = build_seconds + time.perf_counter() - start_time
+    with metrics.measure(github_api_url, constants.metrics.Build_Seconds):
+        outputs = dataframes_builder.create_outputs()
+    metrics.record_duration(
+        github_api_url, constants.metrics.Build_Seconds, build_seconds
+    )
+    return outputs
+
+
 def extract_repo_urls_list(repos_dataframe: pandas.DataFrame) -> List[Union[str, Any]]:
     """Extract a list of urls from the provided Pandas DataFrame."""
     # create an empty list of URLs to return if the DataFrame of repositories
@@ -211,12 +481,42 @@ def extract_repo_urls_list(repos_dataframe: pandas.DataFrame) -> List[Union[str,
     return list(url_column_list)
 
 
+def expand_count_data(
+    count_dataframe: pandas.DataFrame, url_mapping: Dict[str, str]
+) -> pandas.DataFrame:
+    """Create a row of counts for each URL that was mapped to the URL of a downloaded repository."""
+    if constants.workflow.Repo_Url not in count_dataframe.columns:
+        return count_dataframe
+    mapping_dataframe = pandas.DataFrame(
+        {
+            constants.workflow.Repo_Url: list(url_mapping.keys()),
+            constants.plan.Planned_Url: list(url_mapping.values()),
+        }
+    )
+    # each row of counts is joined with every URL that was mapped to its URL,
+    # keeping the rows in the order of the URLs and the columns in their order
+    expanded_count_dataframe = pandas.merge(
+        mapping_dataframe,
+        count_dataframe.rename(
+            columns={constants.workflow.Repo_Url: constants.plan.Planned_Url}
+        ),
+        on=[constants.plan.Planned_Url],
+    )
+    return expanded_count_dataframe[count_dataframe.columns]
+
+
 def merge_repo_urls_with_count_data(
-    repos_dataframe: pandas.DataFrame, count_dataframe: pandas.DataFrame
+    repos_dataframe: pandas.DataFrame,
+    count_dataframe: pandas.DataFrame,
+    url_mapping: Union[Dict[str, str], None] = None,
 ) -> pandas.DataFrame:
     """Combine two data frames to produce a new data frame of all relevant data."""
     # logger = logging.getLogger(constants.logging.Rich)
     repos_dataframe.rename(columns={"url": "repo_url"}, inplace=True)
+    # the repositories listed more than once were only downloaded once and thus
+    # the counts are repeated for each of the URLs so that every row is joined
+    if url_mapping is not None:
+        count_dataframe = expand_count_data(count_dataframe, url_mapping)
     # pandas.set_option('display.max_columns', None)
     # print("original data frame")
     # pprint(repos_dataframe)
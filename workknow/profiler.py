@@ -0,0 +1,314 @@
+"""Profile the time and the memory of each stage of a command."""
+
+from contextlib import contextmanager
+from pathlib import Path
+
+import cProfile
+import functools
+import logging
+import pstats
+import threading
+import tracemalloc
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from rich.console import Console
+
+from workknow import constants
+
+# With the --profile option, each command records a cProfile profile and the peak of
+# the traced memory for each of the stages of the pipeline:
+#
+# --> request: the requests to the GitHub API and the retries and waits around them
+# --> produce: the creation of the rows and the DataFrames from the workflow runs
+# --> files: the reading and writing of the CSV files and of the .zip file
+# --> concatenate: the combination of the files of all of the repositories
+# --> release: the upload of the data to a GitHub release
+#
+# The stages are nested (e.g., the first page of a download is requested while the
+# produce stage consumes the pages) and thus each thread has a stack of stages where
+# only the innermost stage is profiled, making the time of each stage exclusive.
+# Since the traced memory is shared by all threads, the peak of the traced memory is
+# measured for every stage that is running, in any thread, before it is reset for a
+# stage that starts. This means that the peak of a stage that runs at the same time as
+# other stages (e.g., with --repository-concurrency) includes their memory and is an
+# upper bound. Before Python 3.9, tracemalloc cannot reset its peak and thus a stage
+# only has the peak of the traced memory when that peak rose while the stage was
+# running and, otherwise, the highest traced memory that was measured during the
+# stage (e.g., at its start and at its end). Since a tracemalloc snapshot is large and
+# slow to take, a stage only takes a new one when its peak grew by a margin above the
+# peak of its last snapshot. At the end of the command, the profile and the snapshot
+# (taken at the end of a run of the stage that reached such a peak) of each stage are
+# saved next to the results and a short summary of the most expensive functions is shown.
+
+
+def create_function_label(function: Tuple[str, int, str]) -> str:
+    """Create a short label of a (file, line, function) from a profile, without the directories of the file."""
+    file_name, line, function_name = function
+    # the built-in functions do not have a file and are already labelled by pstats
+    if file_name == constants.profile.Built_In_File:
+        return pstats.func_std_string(function)
+    return f"{Path(file_name).name}:{line}({function_name})"
+
+
+class StageFrame:
+    """A stage that is running in a thread, with its profile and memory measurements."""
+
+    def __init__(self, name: str):
+        """Start the measurements of a stage with the current traced memory."""
+        self.name = name
+        self.stage_profile: Union[cProfile.Profile, None] = cProfile.Profile()
+        self.start_memory, self.start_peak = tracemalloc.get_traced_memory()
+        self.peak_memory = self.start_memory
+
+    def measure_peak(self, traced_memory: int, peak_memory: int) -> None:
+        """Measure the peak of the stage from the current and the peak traced memory."""
+        # the peak of the traced memory was only reached while the stage was
+        # running if it rose above the peak that was traced when it started
+        if peak_memory > self.start_peak:
+            self.peak_memory = max(self.peak_memory, peak_memory)
+        else:
+            self.peak_memory = max(self.peak_memory, traced_memory)
+
+    def enable(self) -> None:
+        """Start or resume the profile of the stage."""
+        if self.stage_profile is None:
+            return
+        # the profilers of newer versions of Python cannot run in two threads at the
+        # same time and thus a stage that overlaps with another one only has its memory
+        try:
+            self.stage_profile.enable()
+        except ValueError:
+            self.stage_profile = None
+
+    def disable(self) -> None:
+        """Pause the profile of the stage."""
+        if self.stage_profile is not None:
+            self.stage_profile.disable()
+
+
+class StageProfiler:
+    """The profiles and the memory peaks of all of the stages of a command."""
+
+    def __init__(
+        self,
+        started_tracing: bool,
+        snapshot_peak_growth: float = constants.profile.Snapshot_Peak_Growth,
+    ):
+        """Create a profiler that has not yet measured any stage."""
+        # the memory was already traced (e.g., by a benchmark) and thus the
+        # profiler must not stop tracing it once the command is finished
+        self.started_tracing = started_tracing
+        self.snapshot_peak_growth = snapshot_peak_growth
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stage_stats: Dict[str, pstats.Stats] = {}
+        self.stage_calls: Dict[str, int] = {}
+        self.stage_peaks: Dict[str, int] = {}
+        self.stage_snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self.snapshot_peaks: Dict[str, int] = {}
+        # the stages that are running in all of the threads
+        self.running_frames: List[StageFrame] = []
+
+    def get_stack(self) -> List[StageFrame]:
+        """Return the stack of the stages that are running in the current thread."""
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def measure_peaks(self) -> None:
+        """Measure the peak of every running stage and then reset the peak of the traced memory."""
+        traced_memory, peak_memory = tracemalloc.get_traced_memory()
+        for stage_frame in self.running_frames:
+            stage_frame.measure_peak(traced_memory, peak_memory)
+        # only Python 3.9 and later versions can reset the peak of the traced memory
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+            for stage_frame in self.running_frames:
+                stage_frame.start_peak = traced_memory
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile a stage, pausing the stage that it is nested in."""
+        stack = self.get_stack()
+        if stack:
+            stack[-1].disable()
+        # the peak of the traced memory is shared by all of the threads and thus it is
+        # measured for the running stages before it is reset for the new stage
+        with self.lock:
+            self.measure_peaks()
+            stage_frame = StageFrame(name)
+            self.running_frames.append(stage_frame)
+        stack.append(stage_frame)
+        stage_frame.enable()
+        try:
+            yield
+        finally:
+            stage_frame.disable()
+            stack.pop()
+            with self.lock:
+                self.measure_peaks()
+                self.running_frames.remove(stage_frame)
+            self.record(stage_frame)
+            if stack:
+                stack[-1].enable()
+
+    def record(self, stage_frame: StageFrame) -> None:
+        """Add the measurements of a finished stage to those of the other runs of the stage."""
+        name = stage_frame.name
+        peak_bytes = stage_frame.peak_memory - stage_frame.start_memory
+        with self.lock:
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+            if stage_frame.stage_profile is not None:
+                if name in self.stage_stats:
+                    self.stage_stats[name].add(stage_frame.stage_profile)
+                else:
+                    self.stage_stats[name] = pstats.Stats(stage_frame.stage_profile)
+            self.stage_peaks[name] = max(peak_bytes, self.stage_peaks.get(name, -1))
+            # only a snapshot at a peak that grew by a margin above the peak of the
+            # last snapshot replaces it since the snapshots are large and slow to
+            # take; note that it has the memory still held at the end of the stage
+            take_snapshot = (
+                name not in self.snapshot_peaks
+                or peak_bytes > self.snapshot_peaks[name] * self.snapshot_peak_growth
+            )
+            if take_snapshot:
+                self.snapshot_peaks[name] = peak_bytes
+        # the snapshot is taken without the lock so that the stages in the other
+        # threads can start and finish while it walks through the traced memory
+        if take_snapshot:
+            snapshot = tracemalloc.take_snapshot()
+            with self.lock:
+                # a run of the stage in another thread may have reached a higher peak
+                if self.snapshot_peaks[name] == peak_bytes:
+                    self.stage_snapshots[name] = snapshot
+
+    def find_top_functions(
+        self, name: str, top_count: int = constants.profile.Top_Count
+    ) -> List[Tuple[str, int, float]]:
+        """Find the (function, calls, cumulative seconds) of the most expensive functions of a stage."""
+        if name not in self.stage_stats:
+            return []
+        # each entry of the statistics has the form:
+        # (file, line, function): (primitive calls, calls, total time, cumulative time, callers)
+        stats_dict = self.stage_stats[name].stats  # type: ignore
+        top_entries = sorted(
+            stats_dict.items(), key=lambda entry: entry[1][3], reverse=True
+        )[:top_count]
+        return [
+            (create_function_label(function), calls, cumulative_time)
+            for (function, (_, calls, _, cumulative_time, _)) in top_entries
+        ]
+
+    def save(self, profile_dir: Path) -> List[Path]:
+        """Save the profile and the tracemalloc snapshot of each stage in the directory."""
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        saved_files = []
+        for name, stats in self.stage_stats.items():
+            stats_file = profile_dir / (
+                constants.profile.File_Prefix + name + constants.profile.Stats_Extension
+            )
+            stats.dump_stats(str(stats_file))
+            saved_files.append(stats_file)
+        for name, snapshot in self.stage_snapshots.items():
+            snapshot_file = profile_dir / (
+                constants.profile.File_Prefix
+                + name
+                + constants.profile.Snapshot_Extension
+            )
+            snapshot.dump(str(snapshot_file))
+            saved_files.append(snapshot_file)
+        return saved_files
+
+
+# the profiler that is shared by all of the stages of a command, if it is enabled
+_profiler: Union[StageProfiler, None] = None
+
+
+def configure_profiler(profile: bool) -> Union[StageProfiler, None]:
+    """Configure the profiler of the stages, starting to trace the memory when profiling."""
+    global _profiler  # pylint: disable=global-statement
+    if not profile:
+        _profiler = None
+        return None
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _profiler = StageProfiler(started_tracing)
+    return _profiler
+
+
+def get_profiler() -> Union[StageProfiler, None]:
+    """Return the profiler of the stages, if profiling is enabled."""
+    return _profiler
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Profile a block as a stage of the command when profiling is enabled."""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name):
+        yield
+
+
+def profile_stage(name: str) -> Callable:
+    """Create a decorator that profiles each call of a function as a stage of the command."""
+
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def profile_function(*args, **kwargs) -> Any:
+            # the check happens for each call since profiling is configured by a
+            # command after all of the functions were decorated on import
+            if _profiler is None:
+                return function(*args, **kwargs)
+            with _profiler.stage(name):
+                return function(*args, **kwargs)
+
+        return profile_function
+
+    return decorate
+
+
+def finish_profiler(
+    console: Console, profile_dir: Union[Path, None]
+) -> Union[StageProfiler, None]:
+    """Save the profile of each stage next to the results, display a summary, and stop profiling."""
+    global _profiler  # pylint: disable=global-statement
+    logger = logging.getLogger(constants.logging.Rich)
+    stage_profiler = _profiler
+    if stage_profiler is None:
+        return None
+    _profiler = None
+    if stage_profiler.started_tracing:
+        tracemalloc.stop()
+    if profile_dir is None:
+        profile_dir = Path.cwd()
+    saved_files = stage_profiler.save(profile_dir)
+    logger.debug(saved_files)
+    console.print(
+        f":stopwatch: Saved {len(saved_files)} profile file(s) in {profile_dir}"
+    )
+    for name, calls in stage_profiler.stage_calls.items():
+        console.print(
+            f"{constants.markers.Tab}... Stage {name} ran {calls} time(s)"
+            f" with a peak of {stage_profiler.stage_peaks[name] / constants.profile.Bytes_Per_Megabyte:.2f} MB"
+        )
+        for (
+            function,
+            function_calls,
+            cumulative_time,
+        ) in stage_profiler.find_top_functions(name):
+            console.print(
+                f"{constants.markers.Tab}{constants.markers.Tab}{cumulative_time:.3f}s"
+                f" {function_calls} call(s) {function}"
+            )
+    console.print()
+    return stage_profiler
@@ -0,0 +1,114 @@
+"""Project the decoded workflow runs onto the fields that the DataFrames need."""
+
+import logging
+import threading
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Set
+
+from workknow import constants
+
+# Each workflow run returned by the GitHub API has about thirty fields, including
+# nested objects for the repository, the head repository, and the head commit, but
+# the workflows DataFrame only keeps about ten fields and the commits DataFrame only
+# keeps the head commit. As soon as a page of workflow runs is decoded, this module
+# projects each of the runs onto the fields in the schema so that the fields that
+# are never used are not held in memory (or in the checkpoint journal) any longer.
+#
+# The schema can be extended (e.g., with the --extra-field option of the download
+# command) by the name of a field of a workflow run or, alternatively, by a path of
+# names separated by a dot for a field inside of a nested object. A nested field is
+# kept under its path with underscores (e.g., head_repository.full_name is kept as
+# head_repository_full_name), which is the same name that pandas.json_normalize uses.
+
+# the names of the fields in a workflow run that are kept in the workflows DataFrame
+WORKFLOWS_SUBSET_KEY_NAMES = {
+    constants.workflow.Id,
+    constants.workflow.Name,
+    constants.workflow.Head_Sha,
+    constants.workflow.Created_At,
+    constants.workflow.Updated_At,
+    constants.workflow.Event,
+    constants.workflow.Status,
+    constants.workflow.Conclusion,
+    constants.workflow.Jobs_Url,
+    constants.workflow.Actions_Url,
+}
+
+# the names of the fields in a workflow run that are kept in the commits DataFrame
+COMMITS_SUBSET_KEY_NAMES = {
+    constants.workflow.Head_Commit,
+}
+
+# the extra fields, each one a list of the names in its path, added to the schema
+_extra_field_paths: List[List[str]] = []
+_extra_field_paths_lock = threading.Lock()
+
+
+def create_field_name(field_path: List[str]) -> str:
+    """Create the name under which a field is kept from the names in its path."""
+    return constants.markers.Underscore.join(field_path)
+
+
+def configure_schema(extra_fields: List[str]) -> None:
+    """Configure the extra fields that the schema keeps in addition to the ones that the DataFrames need."""
+    global _extra_field_paths  # pylint: disable=global-statement
+    logger = logging.getLogger(constants.logging.Rich)
+    with _extra_field_paths_lock:
+        _extra_field_paths = [
+            extra_field.strip().split(constants.projection.Separator)
+            for extra_field in extra_fields
+            if extra_field.strip()
+        ]
+    logger.debug(f"Configured the schema with the extra fields {extra_fields}")
+
+
+def get_workflows_key_names() -> Set[str]:
+    """Return the names of the fields that the workflows DataFrame keeps, including the extra fields."""
+    return WORKFLOWS_SUBSET_KEY_NAMES | {
+        create_field_name(field_path) for field_path in _extra_field_paths
+    }
+
+
+def get_projected_key_names() -> Set[str]:
+    """Return the names of the top-level fields of a workflow run that are kept whole."""
+    return (
+        WORKFLOWS_SUBSET_KEY_NAMES
+        | COMMITS_SUBSET_KEY_NAMES
+        | {field_path[0] for field_path in _extra_field_paths if len(field_path) == 1}
+    )
+
+
+def extract_field(workflow_run: Dict[str, Any], field_path: List[str]) -> Any:
+    """Extract the value of a possibly nested field from a workflow run, or None when it is missing."""
+    value: Any = workflow_run
+    for name in field_path:
+        if not isinstance(value, dict) or name not in value:
+            return None
+        value = value[name]
+    return value
+
+
+def project_workflow_runs(workflow_runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Project each of the decoded workflow runs onto the fields in the schema."""
+    projected_key_names = get_projected_key_names()
+    nested_field_paths = [
+        field_path for field_path in _extra_field_paths if len(field_path) > 1
+    ]
+    projected_workflow_runs = []
+    for workflow_run in workflow_runs:
+        projected_workflow_run = {
+            key: value
+            for key, value in workflow_run.items()
+            if key in projected_key_names
+        }
+        # the nested fields are kept under the names that they would have after
+        # flattening so that they become regular columns of the workflows DataFrame
+        for field_path in nested_field_paths:
+            projected_workflow_run[create_field_name(field_path)] = extract_field(
+                workflow_run, field_path
+            )
+        projected_workflow_runs.append(projected_workflow_run)
+    return projected_workflow_runs
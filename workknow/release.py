@@ -16,9 +16,11 @@ from github import InputGitAuthor
 
 from workknow import configure
 from workknow import constants
+from workknow import profiler
 from workknow import request
 
 
+@profiler.profile_stage(constants.profile.Release)
 def perform_github_upload(
     repo_url: str, organization: str, repository: str, semver: str, results_dir: Path
 ) -> None:
@@ -1,14 +1,26 @@
 """Use the GitHub REST API to access information about GitHub Action Workflows."""
 
+from concurrent import futures
+from contextlib import contextmanager
+from contextlib import nullcontext
 from urllib import parse
 
+import collections
 import datetime
 import logging
 import os
+import queue
 import sys
+import threading
 import time
 
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Deque
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Tuple
 from typing import Union
@@ -22,7 +34,16 @@ from rich.progress import TimeElapsedColumn
 import pytz
 import requests
 
+from workknow import budget
+from workknow import cache
 from workknow import constants
+from workknow import endpoint
+from workknow import metrics
+from workknow import profiler
+from workknow import projection
+from workknow import retry
+from workknow import session
+from workknow import tokens
 
 # Sample of the JSON file returned by the request:
 
@@ -56,13 +77,33 @@ def get_local_timezone() -> str:
     return local_timezone
 
 
+def decode_response_json(response: requests.Response):
+    """Decode the JSON body of a response, recording the time spent for the repository of its URL."""
+    with metrics.measure(response.url, constants.metrics.Decode_Seconds):
+        return response.json()
+
+
+def get_with_metrics(github_api_url: str, **kwargs) -> requests.Response:
+    """Request a URL with the shared session, recording the latency and size of the response."""
+    start_time = time.perf_counter()
+    response = session.get_session().get(github_api_url, **kwargs)
+    metrics.record_request(
+        github_api_url, time.perf_counter() - start_time, len(response.content)
+    )
+    return response
+
+
 def get_workflow_runs(json_responses, console):
     """Get the list of workflow run information for a JSON-derived dictionary."""
     # this dictionary has a key called "workflow_runs" that has as its value a
     # list of dictionaries, one for each run inside of GitHub Actions. This
     # will return the list so that it can be stored and analyzed.
+    # note that each of the runs is projected onto the fields in the schema as soon as
+    # the page is decoded so that the fields that are never used do not stay in memory
     if constants.github.Workflow_Runs in json_responses:
-        return json_responses[constants.github.Workflow_Runs]
+        return projection.project_workflow_runs(
+            json_responses[constants.github.Workflow_Runs]
+        )
     logger = logging.getLogger(constants.logging.Rich)
     logger.error(json_responses)
     # the workflow runs data is not available and this means that the GitHub REST
@@ -80,23 +121,64 @@ def get_workflow_runs(json_responses, console):
     sys.exit(1)
 
 
+def select_github_authentication(
+    github_authentication,
+) -> Tuple[Tuple[str, str], budget.RateLimitBudget]:
+    """Select the authentication and the budget for a request, rotating through the token pool when configured."""
+    # without a pool of tokens, all requests use the provided authentication
+    # and they all report their rate limit details to the shared budget
+    token_pool = tokens.get_token_pool()
+    if token_pool is None:
+        return (github_authentication, budget.get_budget())
+    # with a pool of tokens, the request uses the token that has the most available
+    # budget and it reports its rate limit details to the budget of that token
+    token = token_pool.select_token()
+    return ((constants.github.User, token), token_pool.get_budget(token))
+
+
+def release_github_authentication(request_authentication) -> None:
+    """Release the budget that a request reserved when its token was selected from the pool."""
+    token_pool = tokens.get_token_pool()
+    if token_pool is not None and request_authentication is not None:
+        token_pool.release_token(request_authentication[1])
+
+
+@profiler.profile_stage(constants.profile.Request)
 def get_rate_limit_details():
     """Request a JSON response from the GitHub API about rate limits."""
     # initialize the logging subsystem
     logger = logging.getLogger(constants.logging.Rich)
     # define the URL needed to access rate limiting data
-    github_api_url = constants.rate.Rate_Limit_Url
+    github_api_url = endpoint.create_rate_limit_url()
+    # with a pool of tokens, request the rate limit details for every one of
+    # the tokens since each of them has its own budget and reset time
+    token_pool = tokens.get_token_pool()
+    if token_pool is not None:
+        for token in token_pool.tokens:
+            response = get_with_metrics(
+                github_api_url, auth=(constants.github.User, token)
+            )
+            rate_limit_dict = response.json()[constants.rate.Resources][
+                constants.rate.Core
+            ]
+            token_pool.get_budget(token).update_from_dict(rate_limit_dict)
+        logger.debug(token_pool.get_statistics())
+        return token_pool.to_dict()
     # access the person's GitHub personal access token so that
     # the use of the tool is not rapidly rate limited
     github_authentication = (constants.github.User, get_github_personal_access_token())
-    # use requests to access the GitHub API with:
+    # use the shared session to access the GitHub API with:
     # --> provided GitHub URL that accesses a project's GitHub Actions log
     # --> the parameters that currently specify the page limit and will specify the page
     # --> the GitHub authentication information with the personal access token
-    response = requests.get(github_api_url, auth=github_authentication)
+    response = get_with_metrics(github_api_url, auth=github_authentication)
     response_json_dict = response.json()
     logger.debug(response_json_dict)
-    return response_json_dict[constants.rate.Resources][constants.rate.Core]
+    rate_limit_dict = response_json_dict[constants.rate.Resources][constants.rate.Core]
+    # record the details in the shared budget so that later decisions about
+    # waiting can be made without another request to the rate limit endpoint
+    budget.get_budget().update_from_dict(rate_limit_dict)
+    return rate_limit_dict
 
 
 def utc_to_time(naive, timezone):
@@ -130,7 +212,9 @@ def get_rate_limit_wait_time_and_wait(rate_limit_dict: Dict[str, int]) -> int:
     logger.debug(sleep_time_seconds)
     # the program is in danger of being rate limited, which will cause a crash, and
     # thus it is better to sleep for the remainder of the period until the reset
-    total_sleep_time_elapsed = sleep_time_seconds + constants.rate.Extra_Seconds
+    total_sleep_time_elapsed = budget.calculate_reset_sleep_time(
+        reset_time_in_utc_epoch_seconds
+    )
     if rate_limit_dict[constants.rate.Remaining] < constants.rate.Threshold:
         logger.debug(sleep_time_seconds)
         console.print(
@@ -141,6 +225,48 @@ def get_rate_limit_wait_time_and_wait(rate_limit_dict: Dict[str, int]) -> int:
     return total_sleep_time_elapsed
 
 
+def wait_for_rate_limit_budget(
+    response: Union[requests.Response, None] = None
+) -> int:
+    """Wait for a reset if the rate limit budget is almost spent, using the headers of the response when possible."""
+    # the time spent here, including any request to the /rate_limit endpoint, counts
+    # as rate limit sleep for the repository whose response is being checked
+    response_url = response.url if response is not None else None
+    with metrics.measure(response_url, constants.metrics.Rate_Limit_Sleep_Seconds):
+        return check_rate_limit_budget_and_wait(response)
+
+
+def check_rate_limit_budget_and_wait(
+    response: Union[requests.Response, None] = None
+) -> int:
+    """Wait for a reset if the rate limit budget of the tokens is almost spent."""
+    logger = logging.getLogger(constants.logging.Rich)
+    # with a pool of tokens, each response already updated the budget of the token
+    # that it used and thus the wait is only needed when every token is almost spent
+    token_pool = tokens.get_token_pool()
+    if token_pool is not None:
+        if not token_pool.is_known():
+            logger.debug("Requesting the rate limit details from the GitHub API")
+            get_rate_limit_details()
+        return get_rate_limit_wait_time_and_wait(token_pool.to_dict())
+    rate_limit_budget = budget.get_budget()
+    # the headers of the response describe the rate limit and thus there is no
+    # need to request these details from the GitHub API through another request
+    headers_available = False
+    if response is not None:
+        headers_available = rate_limit_budget.update_from_headers(response.headers)
+    # fall back to the /rate_limit endpoint when the budget has never received
+    # any details or when the most recent response did not have the headers
+    if not rate_limit_budget.is_known() or (
+        response is not None and not headers_available
+    ):
+        logger.debug("Requesting the rate limit details from the GitHub API")
+        get_rate_limit_details()
+    # check if the program is about to exceed GitHub's rate limit and then
+    # sleep the program until the reset time has elapsed
+    return get_rate_limit_wait_time_and_wait(rate_limit_budget.to_dict())
+
+
 def extract_last_page(response_links_dict: Dict[str, Dict[str, str]]) -> int:
     """Extract the number of the last page from the links provided by the GitHub API."""
     logger = logging.getLogger(constants.logging.Rich)
@@ -179,32 +305,74 @@ def request_with_caution(
     github_authentication,
     progress,
     maximum_retries: int = constants.github.Maximum_Request_Retries,
-) -> Tuple[bool, int, int, Union[None, requests.Response]]:
+) -> Tuple[bool, int, float, Union[None, requests.Response]]:
     """Request data from the GitHub API in a cautious fashion, checking for exceptions and waiting when needed."""
-    # use requests to access the GitHub API with:
+    # use the shared session to access the GitHub API with:
     # --> provided GitHub URL that accesses a project's GitHub Actions log
     # --> the parameters that currently specify the page limit and will specify the page
     # --> the GitHub authentication information with the personal access token
+    # note that the shared session keeps connections alive in a pool and thus
+    # all requests after the first one can avoid a new TLS handshake
     # assume that there is no valid response and extract one if possible
     response = None
     valid_response = False
     # keep track of the number of requests for diagnostic report back
     request_retries_count = 1
     # keep track of whether or not any sleeping took place during retries
-    running_sleep_time_in_seconds = 0
+    running_sleep_time_in_seconds: float = 0
     # the first sleep should be the default about of sleeping
-    sleep_time_in_seconds = constants.github.Wait_In_Seconds
+    sleep_time_in_seconds: float = constants.github.Wait_In_Seconds
     # allow a special diagnostic message to appear on first exception
     first_exception = True
+    # use the response cache, if it was configured, to make conditional requests
+    response_cache = cache.get_cache()
     # continue performing a retry as long as there is no valid response and
     # this process has not exceeded the value number of retries
     while not valid_response and request_retries_count <= maximum_retries:
+        # select the token for this attempt so that a retry after a rate
+        # limited response can use another token from the pool, if configured
+        (request_authentication, request_budget) = select_github_authentication(
+            github_authentication
+        )
         # attempt to extract a response which checking for an exception
         try:
-            response = requests.get(
-                github_api_url, params=github_params, auth=github_authentication
+            # when the response cache is configured and it contains an earlier response
+            # for this token then this is a conditional request that might return 304
+            conditional_headers = {}
+            if response_cache is not None:
+                conditional_headers = response_cache.get_conditional_headers(
+                    github_api_url, github_params, request_authentication
+                )
+            response = get_with_metrics(
+                github_api_url,
+                params=github_params,
+                auth=request_authentication,
+                headers=conditional_headers,
             )
-            # the response was valid because of the fact that the previous line
+            # every response reports the rate limit in its headers and thus the
+            # budget of the token is always up-to-date without any further requests
+            request_budget.update_from_headers(response.headers)
+            if response_cache is not None:
+                # serve a 304 response from the cache or store a new response
+                response = response_cache.resolve_response(
+                    github_api_url, github_params, response, request_authentication
+                )
+                # the cached response disappeared after the conditional request was
+                # made and thus the response must be requested again without conditions
+                if response.status_code == constants.retry.Not_Modified_Response:
+                    response = get_with_metrics(
+                        github_api_url,
+                        params=github_params,
+                        auth=request_authentication,
+                    )
+                    request_budget.update_from_headers(response.headers)
+                    response = response_cache.resolve_response(
+                        github_api_url,
+                        github_params,
+                        response,
+                        request_authentication,
+                    )
+            # the response was valid because of the fact that the previous lines
             # of code did not trigger an exception and jump to the except block
             valid_response = True
         except requests.exceptions.RequestException as request_exception:
@@ -222,22 +390,30 @@ def request_with_caution(
                 # if any follow-on exceptions occur then they will be, by definition,
                 # not the first exception and thus this diagnostic output is not needed
                 first_exception = False
-            # perform an exponential back-off calculation to determine how long to sleep
-            sleep_time_in_seconds = calculate_backoff_sleep_time(
-                constants.github.Wait_In_Seconds, request_retries_count
+            retry.record_classification(constants.retry.Exception)
+            # perform a jittered exponential back-off calculation to determine how long to sleep
+            sleep_time_in_seconds = retry.add_jitter(
+                calculate_backoff_sleep_time(
+                    constants.github.Wait_In_Seconds, request_retries_count
+                )
             )
             progress.console.print(
-                f"{constants.markers.Tab}{constants.markers.Tab}...Waiting for {sleep_time_in_seconds} second(s)"
+                f"{constants.markers.Tab}{constants.markers.Tab}...Waiting for {sleep_time_in_seconds:g} second(s)"
             )
-            # the sleep schedule for the default starting sleep is:
+            # the sleep schedule for the default starting sleep is (before jitter):
             # 1, 2, 4, 8, 16, 32, 64, 128, 256, [...] seconds
             time.sleep(sleep_time_in_seconds)
+            metrics.record_retry(github_api_url, sleep_time_in_seconds)
             # keep track of the total amount of time in sleeping for
             # diagnostic and testing purposes
             running_sleep_time_in_seconds = (
                 running_sleep_time_in_seconds + sleep_time_in_seconds
             )
             request_retries_count = request_retries_count + 1
+        finally:
+            # the response updated the budget of the token, if there was one, and
+            # thus the budget that the request reserved is no longer needed
+            release_github_authentication(request_authentication)
     # assume that the response is not valid and prove otherwise
     valid = False
     # if the response object is not None then it probably has data that was returned
@@ -249,21 +425,19 @@ def request_with_caution(
     return (valid, request_retries_count - 1, running_sleep_time_in_seconds, response)
 
 
+@profiler.profile_stage(constants.profile.Request)
 def request_json_from_github_with_caution(
     github_api_url: str,
     github_params,
     github_authentication,
     progress,
     maximum_retries: int = constants.github.Maximum_Request_Retries,
-) -> Tuple[bool, int, int, Union[requests.Response, None]]:
+) -> Tuple[bool, int, float, Union[requests.Response, None]]:
     """Request data from the GitHub API in a cautious fashion, checking error codes and waiting when needed."""
     # use requests to access the GitHub API with:
     # --> provided GitHub URL that accesses a project's GitHub Actions log
     # --> the parameters that currently specify the page limit and will specify the page
     # --> the GitHub authentication information with the personal access token
-    # response = requests.get(
-    #     github_api_url, params=github_params, auth=github_authentication
-    # )
     (valid, request_retries_count, request_sleep_time, response) = request_with_caution(
         github_api_url, github_params, github_authentication, progress, maximum_retries
     )
@@ -274,17 +448,34 @@ def request_json_from_github_with_caution(
     # so as to ensure that the number of retries goes to the maximum value
     response_retries_count = 1
     # extract the status_code from the response provided by the GitHub server;
-    # in my experience with using WorkKnow, these are two common status codes:
+    # in my experience with using WorkKnow, these are common status codes:
     # 200: everything worked and JSON response is available
+    # 404: the repository was deleted or renamed and will never be available
     # 502: error on the server and a error-message JSON contains no data
     current_response_status_code = response.status_code  # type: ignore
+    # classify the response so that only those failures that might go away
+    # are retried; for instance, a deleted repository should fail fast
+    current_response_class = retry.classify_response(
+        current_response_status_code, response.headers  # type: ignore
+    )
+    retry.record_classification(current_response_class)
     # indicate that an attempt at a retry has not yet happened
     attempted_retries = False
-    running_sleep_time_in_seconds = 0
+    running_sleep_time_in_seconds: float = 0
+    # the response code indicates a permanent failure and thus there is no reason
+    # to spend time waiting for a retry that will certainly not work correctly
+    if current_response_class == constants.retry.Permanent:
+        progress.console.print()
+        progress.console.print(
+            f":grimacing_face: Unable to access GitHub API at {github_api_url} due to error code {current_response_status_code}"
+        )
+        progress.console.print(
+            f"{constants.markers.Tab}...Will not retry since this is a permanent failure"
+        )
     # the response code indicates that there was no success for this
     # interaction with the GitHub API and thus we must retry in an
     # exponential back-off fashion up to a maximum number of retries
-    if response.status_code != constants.github.Success_Response:  # type: ignore
+    elif current_response_class != constants.retry.Success:
         progress.console.print()
         progress.console.print(
             f":grimacing_face: Unable to access GitHub API at {github_api_url} due to error code {current_response_status_code}"
@@ -298,23 +489,29 @@ def request_json_from_github_with_caution(
         )
         # keep retrying as long as:
         # --> the loop has not retried the maximum number of times
-        # --> the status code from the GitHub server is not a success response
-        sleep_time_in_seconds = constants.github.Wait_In_Seconds
+        # --> the response from the GitHub server is a failure that may go away
         while (
-            current_response_status_code != constants.github.Success_Response
+            current_response_class
+            in (constants.retry.Transient, constants.retry.Rate_Limited)
             and response_retries_count <= maximum_retries
         ):
-            # perform an exponential back-off calculation to determine how long to sleep
-            sleep_time_in_seconds = calculate_backoff_sleep_time(
-                constants.github.Wait_In_Seconds, response_retries_count
+            # determine how long to sleep, honoring the Retry-After header when
+            # it is available and otherwise performing a jittered exponential back-off
+            sleep_time_in_seconds = retry.calculate_retry_sleep_time(
+                current_response_class,
+                response.headers,  # type: ignore
+                calculate_backoff_sleep_time(
+                    constants.github.Wait_In_Seconds, response_retries_count
+                ),
             )
             # sleep for the calculated period of time
             progress.console.print(
-                f"{constants.markers.Tab}{constants.markers.Tab}...Waiting for {sleep_time_in_seconds} second(s)"
+                f"{constants.markers.Tab}{constants.markers.Tab}...Waiting for {sleep_time_in_seconds:g} second(s)"
             )
-            # the sleep schedule for the default starting sleep is:
+            # the sleep schedule for the default starting sleep is (before jitter):
             # 1, 2, 4, 8, 16, 32, 64, 128, 256, [...] seconds
             time.sleep(sleep_time_in_seconds)
+            metrics.record_retry(github_api_url, sleep_time_in_seconds)
             # keep track of the total amount of time in sleeping for
             # diagnostic and testing purposes
             running_sleep_time_in_seconds = (
@@ -323,9 +520,6 @@ def request_json_from_github_with_caution(
             progress.console.print(
                 f"{constants.markers.Tab}{constants.markers.Tab}...Attempt {response_retries_count} to access GitHub API at {github_api_url}"
             )
-            # response = requests.get(
-            #     github_api_url, params=github_params, auth=github_authentication
-            # )
             (
                 valid,
                 request_retries_count,
@@ -340,14 +534,18 @@ def request_json_from_github_with_caution(
             )
             if not valid:
                 return (valid, request_retries_count, request_sleep_time, None)
-            # extract the current response code for check in next iteration of loop
+            # extract and classify the current response code for check in next iteration of loop
             current_response_status_code = response.status_code  # type: ignore
+            current_response_class = retry.classify_response(
+                current_response_status_code, response.headers  # type: ignore
+            )
+            retry.record_classification(current_response_class)
             # indicate that another retry has taken place
             response_retries_count = response_retries_count + 1
     # since the loop will terminate as soon as there is a successful response code,
     # the last response code is the one that can be checked for a successful response
     # when the return code is not indicative of success, then the returned data is not valid
-    if current_response_status_code != constants.github.Success_Response:
+    if current_response_class != constants.retry.Success:
         valid = False
     # the response code is success and thus the returned data is valid
     else:
@@ -363,17 +561,106 @@ def request_json_from_github_with_caution(
     return (valid, response_retries_count - 1, running_sleep_time_in_seconds, response)
 
 
-def request_json_from_github(
+def request_page_json_from_github(
     github_api_url: str,
+    github_params: Dict[str, str],
+    page: int,
+    github_authentication,
+    progress,
     console: Console,
-    maximum_retries=constants.github.Maximum_Request_Retries,
-) -> Tuple[bool, int, int, List]:
-    """Request the JSON response from the GitHub API."""
-    # initialize the logging subsystem
+    maximum_retries: int = constants.github.Maximum_Request_Retries,
+    page_callback: Union[Callable[[int, List], None], None] = None,
+) -> Tuple[bool, int, float, List]:
+    """Request a single page of workflow runs from the GitHub API."""
     logger = logging.getLogger(constants.logging.Rich)
-    # access the person's GitHub personal access token so that
-    # the use of the tool is not rapidly rate limited
-    github_authentication = (constants.github.User, get_github_personal_access_token())
+    # make a copy of the parameters so that the requests for different pages,
+    # which may be running at the same time, never share the "page" variable
+    page_github_params = dict(github_params)
+    page_github_params[constants.github.Page] = str(page)
+    # request the page, using the cautious approach
+    (
+        valid,
+        page_retry_count,
+        page_sleep_time,
+        response,
+    ) = request_json_from_github_with_caution(
+        github_api_url,
+        page_github_params,
+        github_authentication,
+        progress,
+        maximum_retries,
+    )
+    workflow_runs = []
+    if valid:
+        logger.debug(response.headers)  # type: ignore
+        # extract the specific workflow runs list for this page
+        workflow_runs = get_workflow_runs(decode_response_json(response), console)  # type: ignore
+        # report the downloaded page (e.g., so that it can be recorded in a journal)
+        if page_callback is not None:
+            page_callback(page, workflow_runs)
+        # check if the program is about to exceed GitHub's rate limit and then
+        # sleep the program until the reset time has elapsed
+        wait_for_rate_limit_budget(response)
+    return (valid, page_retry_count, page_sleep_time, workflow_runs)
+
+
+def iterate_pages_json_from_github_concurrently(
+    github_api_url: str,
+    github_params: Dict[str, str],
+    first_page: int,
+    last_page: int,
+    github_authentication,
+    progress,
+    download_pages_task,
+    console: Console,
+    page_concurrency: int,
+    maximum_retries: int = constants.github.Maximum_Request_Retries,
+    page_callback: Union[Callable[[int, List], None], None] = None,
+) -> Iterator[Tuple[bool, int, float, List]]:
+    """Request the pages from first_page to last_page with a bounded pool of workers, yielding them in page order."""
+    # the pages are requested by at most page_concurrency workers at the same time;
+    # since the links provided by the GitHub API for the first page reveal the index
+    # of the last page, there is no need to follow the "next" link from page to page
+    # note that only a window of pages ahead of the page that is yielded next are
+    # requested so that the workers stay busy while the number of pages that are
+    # held in memory stays bounded, no matter how many pages the repository has
+    window_size = page_concurrency * constants.github.Page_Window_Factor
+    pending_futures: Deque[futures.Future] = collections.deque()
+    with futures.ThreadPoolExecutor(max_workers=page_concurrency) as executor:
+        next_page = first_page
+        try:
+            while pending_futures or next_page <= last_page:
+                while next_page <= last_page and len(pending_futures) < window_size:
+                    pending_futures.append(
+                        executor.submit(
+                            request_page_json_from_github,
+                            github_api_url,
+                            github_params,
+                            next_page,
+                            github_authentication,
+                            progress,
+                            console,
+                            maximum_retries,
+                            page_callback,
+                        )
+                    )
+                    next_page = next_page + 1
+                # wait for the oldest page so that the pages are yielded in the same
+                # order as the one that would come from requesting one page after another
+                page_result = pending_futures.popleft().result()
+                progress.update(download_pages_task, advance=1)
+                yield page_result
+        finally:
+            # the caller stopped before the last page (e.g., because a page was not
+            # valid) and thus the pages that did not start yet are never requested
+            for pending_future in pending_futures:
+                pending_future.cancel()
+
+
+def create_github_params(
+    github_params_filter: Union[Dict[str, str], None], first_page: int
+) -> Dict[str, str]:
+    """Create the parameters for the request of the first page of workflow runs."""
     # configure the headers sent by requests to the GitHub API:
     # --> the user agent is the name of the registered OAuth application
     # --> request the maximum of number of entries per page
@@ -381,15 +668,28 @@ def request_json_from_github(
         constants.github.User_Agent: constants.workknow.Name,
         constants.github.Per_Page: constants.github.Per_Page_Maximum,
     }
-    initial_retry_count = 0
-    initial_sleep_time = 0
-    complete_retry_count = 0
-    complete_sleep_time = 0
-    # use a progress bar to designate the requesting of JSON data from
-    # the GitHub API; this will be divided into two phases:
-    # --> Phase 1: Initial download of the first page
-    # --> Phase 2: Download of all remaining pages by following links
-    with Progress(
+    # add the parameters that filter the workflow runs (e.g., only those runs that
+    # were created after a date) so that they are used for the request of every page
+    if github_params_filter is not None:
+        github_params.update(github_params_filter)
+    if first_page > 1:
+        github_params[constants.github.Page] = str(first_page)
+    return github_params
+
+
+def use_progress(progress: Union[Progress, None]) -> ContextManager[Progress]:
+    """Use the progress display that is shared by several downloads or, when there is none, create one."""
+    # note that a progress display shared by several downloads (e.g., those of
+    # repositories downloaded at the same time) is used without starting another
+    # one, since rich can only show a single live display at once
+    if progress is not None:
+        return nullcontext(progress)
+    return create_progress()
+
+
+def create_progress() -> Progress:
+    """Create a progress display for the download of workflow runs from the GitHub API."""
+    return Progress(
         constants.progress.Task_Format,
         BarColumn(),
         constants.progress.Percentage_Format,
@@ -400,79 +700,314 @@ def request_json_from_github(
         "•",
         TimeRemainingColumn(),
         "remaining",
-    ) as progress:
-        # perform the download of the first page, using the cautious approach
-        download_first_page = progress.add_task("Initial Download", total=1)
-        (
-            valid,
-            initial_retry_count,
-            initial_sleep_time,
-            response,
-        ) = request_json_from_github_with_caution(
-            github_api_url,
-            github_params,
-            github_authentication,
-            progress,
-            maximum_retries,
+    )
+
+
+class WorkflowRunPages:
+    """The pages of workflow runs for a repository, each requested from the GitHub API only when it is needed."""
+
+    # Iterating through an instance of this class yields each page of workflow runs as
+    # soon as it arrives, starting with the pages that were stored before an interruption;
+    # this means that the caller can transform a page and then let it go before the next
+    # page arrives instead of holding the complete history of a repository in memory.
+    # When the iteration is finished, the following attributes describe the download:
+    # --> valid: whether or not every page was downloaded correctly
+    # --> retry_count: the number of retries needed to download the pages
+    # --> sleep_time: the number of seconds spent sleeping between the retries
+
+    def __init__(
+        self,
+        github_api_url: str,
+        console: Console,
+        maximum_retries=constants.github.Maximum_Request_Retries,
+        page_concurrency: int = constants.github.Page_Concurrency,
+        github_params_filter: Union[Dict[str, str], None] = None,
+        stored_pages: Union[List[List], None] = None,
+        page_callback: Union[Callable[[int, List], None], None] = None,
+        progress: Union[Progress, None] = None,
+        progress_label: str = constants.markers.Nothing,
+    ):
+        """Describe the download of the pages without requesting any of them."""
+        self.github_api_url = github_api_url
+        self.console = console
+        self.maximum_retries = maximum_retries
+        self.page_concurrency = page_concurrency
+        self.github_params_filter = github_params_filter
+        self.stored_pages = stored_pages if stored_pages is not None else []
+        self.page_callback = page_callback
+        self.progress = progress
+        self.progress_label = progress_label
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time: float = 0
+
+    def record_page_result(self, valid: bool, retry_count: int, sleep_time: float):
+        """Record the outcome of the request for a page of workflow runs."""
+        self.valid = valid
+        self.retry_count = self.retry_count + retry_count
+        self.sleep_time = self.sleep_time + sleep_time
+
+    def __iter__(self) -> Iterator[List]:
+        """Request the pages of workflow runs from the GitHub API, yielding each one as it arrives."""
+        # initialize the logging subsystem
+        logger = logging.getLogger(constants.logging.Rich)
+        # access the person's GitHub personal access token so that
+        # the use of the tool is not rapidly rate limited
+        github_authentication = (
+            constants.github.User,
+            get_github_personal_access_token(),
         )
-        # since the goal is to only download a single page, advance the progress bar
-        # for this task, thereby signalling completion of this stage
-        progress.advance(download_first_page)
-        # create an empty list that can store all of the JSON responses for workflow runs
-        json_responses = []
-        # the response from the GitHub API was valid, which means that it either returned
-        # correctly the first time or, alternatively, waiting in an exponential back-off
-        # fashion ultimately resulted in the download completing with success
-        if valid:
-            # extract the JSON document (it is a dict) and then extract from that the workflow runs list;
-            # finally, append the list of workflow runs to the running list of response details
-            json_responses.append(get_workflow_runs(response.json(), console))  # type: ignore
-            logger.debug(response.headers)  # type: ignore
-            # pagination in GitHub Actions is 1-indexed (i.e., the first index is 1)
-            # and thus the next page that we will need to extract (if needed) is 2
-            page = constants.github.Page_Start
-            # check if the program is about to exceed GitHub's rate limit and then
-            # sleep the program until the reset time has elapsed
-            rate_limit_dict = get_rate_limit_details()
-            get_rate_limit_wait_time_and_wait(rate_limit_dict)
-            # extract the index of the last page in order to support progress bar creation
-            last_page_index = extract_last_page(response.links)  # type: ignore
-            # continue to extract data from the pages as long as the "next" field is evident
-            download_pages_task = progress.add_task(
-                "Complete Download", total=last_page_index - 1
+        # the pages that were stored (e.g., in a checkpoint journal) before an interruption
+        # are not downloaded again and thus the download starts at the following page
+        first_page = len(self.stored_pages) + 1
+        github_params = create_github_params(self.github_params_filter, first_page)
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time = 0
+        # use a progress bar to designate the requesting of JSON data from
+        # the GitHub API; this will be divided into two phases:
+        # --> Phase 1: Initial download of the first page
+        # --> Phase 2: Download of all remaining pages by following links
+        shared_progress = self.progress is not None
+        with use_progress(self.progress) as progress:
+            # perform the download of the first page, using the cautious approach
+            download_first_page = progress.add_task(
+                self.progress_label + "Initial Download", total=1
             )
-            # there is another page and thus WorkKnow should iterate and download it
-            while constants.github.Next in response.links.keys():  # type: ignore
-                # update the "page" variable in the URL to go to the next page
-                # otherwise, make sure to use all of the same parameters as the first request
-                github_params[constants.github.Page] = str(page)
-                # request all of the remaining pages, using the cautious approach
-                (
-                    valid,
-                    complete_retry_count,
-                    complete_sleep_time,
-                    response,
-                ) = request_json_from_github_with_caution(
-                    github_api_url, github_params, github_authentication, progress
-                )
+            (
+                valid,
+                retry_count,
+                sleep_time,
+                response,
+            ) = request_json_from_github_with_caution(
+                self.github_api_url,
+                github_params,
+                github_authentication,
+                progress,
+                self.maximum_retries,
+            )
+            self.record_page_result(valid, retry_count, sleep_time)
+            # since the goal is to only download a single page, advance the progress bar
+            # for this task, thereby signalling completion of this stage
+            progress.advance(download_first_page)
+            # the response from the GitHub API was valid, which means that it either returned
+            # correctly the first time or, alternatively, waiting in an exponential back-off
+            # fashion ultimately resulted in the download completing with success
+            if valid:
+                # start with the pages that were stored before an interruption
+                yield from self.stored_pages
+                # extract the JSON document (it is a dict) and then extract from that the
+                # workflow runs list; finally, yield the list of workflow runs to the caller
+                first_workflow_runs = get_workflow_runs(decode_response_json(response), self.console)  # type: ignore
+                if self.page_callback is not None:
+                    self.page_callback(first_page, first_workflow_runs)
                 logger.debug(response.headers)  # type: ignore
-                # the response from the GitHub API was valid, which means that it either returned
-                # correctly the first time or, alternatively, waiting in an exponential back-off
-                # fashion ultimately resulted in the download completing with success
-                if valid:
-                    # again extract the specific workflow runs list and append it to running response details
-                    json_responses.append(get_workflow_runs(response.json(), console))  # type: ignore
-                    # go to the next page in the pagination results list
-                    page = page + 1
-                    # check if the program is about to exceed GitHub's rate limit and then
-                    # sleep the program until the reset time has elapsed
-                    rate_limit_dict = get_rate_limit_details()
-                    get_rate_limit_wait_time_and_wait(rate_limit_dict)
-                    progress.update(download_pages_task, advance=1)
+                # pagination in GitHub Actions is 1-indexed (i.e., the first index is 1)
+                # and thus the next page that we will need to extract (if needed) is 2
+                # unless the download resumed after some stored pages
+                page = first_page + 1
+                # check if the program is about to exceed GitHub's rate limit and then
+                # sleep the program until the reset time has elapsed; note that this uses
+                # the rate limit headers of the response instead of another request
+                wait_for_rate_limit_budget(response)
+                # extract the index of the last page in order to support progress bar creation
+                last_page_index = extract_last_page(response.links)  # type: ignore
+                yield first_workflow_runs
+                # continue to extract data from the pages as long as the "next" field is evident
+                download_pages_task = progress.add_task(
+                    self.progress_label + "Complete Download",
+                    total=max(last_page_index - first_page, 0),
+                )
+                # the pages after the first one can be downloaded by a bounded pool of workers
+                # because the index of the last page is known from the links of the first page
+                if self.page_concurrency > 1 and last_page_index >= page:
+                    for (
+                        page_valid,
+                        page_retry_count,
+                        page_sleep_time,
+                        workflow_runs,
+                    ) in iterate_pages_json_from_github_concurrently(
+                        self.github_api_url,
+                        github_params,
+                        page,
+                        last_page_index,
+                        github_authentication,
+                        progress,
+                        download_pages_task,
+                        self.console,
+                        self.page_concurrency,
+                        self.maximum_retries,
+                        self.page_callback,
+                    ):
+                        self.record_page_result(
+                            page_valid, page_retry_count, page_sleep_time
+                        )
+                        if not page_valid:
+                            break
+                        yield workflow_runs
+                # there is another page and thus WorkKnow should iterate and download it
+                else:
+                    while (
+                        self.valid
+                        and constants.github.Next in response.links.keys()  # type: ignore
+                    ):
+                        # update the "page" variable in the URL to go to the next page
+                        # otherwise, make sure to use all of the same parameters as the first request
+                        github_params[constants.github.Page] = str(page)
+                        # request all of the remaining pages, using the cautious approach
+                        (
+                            valid,
+                            retry_count,
+                            sleep_time,
+                            response,
+                        ) = request_json_from_github_with_caution(
+                            self.github_api_url,
+                            github_params,
+                            github_authentication,
+                            progress,
+                        )
+                        self.record_page_result(valid, retry_count, sleep_time)
+                        logger.debug(response.headers)  # type: ignore
+                        # the response from the GitHub API was valid, which means that it either returned
+                        # correctly the first time or, alternatively, waiting in an exponential back-off
+                        # fashion ultimately resulted in the download completing with success
+                        if valid:
+                            # again extract the specific workflow runs list and yield it to the caller
+                            workflow_runs = get_workflow_runs(decode_response_json(response), self.console)  # type: ignore
+                            if self.page_callback is not None:
+                                self.page_callback(page, workflow_runs)
+                            # go to the next page in the pagination results list
+                            page = page + 1
+                            # check if the program is about to exceed GitHub's rate limit and then
+                            # sleep the program until the reset time has elapsed
+                            wait_for_rate_limit_budget(response)
+                            progress.update(download_pages_task, advance=1)
+                            yield workflow_runs
+                # the finished tasks of one repository would crowd a shared progress display
+                if shared_progress:
+                    progress.remove_task(download_pages_task)
+            if shared_progress:
+                progress.remove_task(download_first_page)
+
+
+# the marker that a worker puts in the queue of a listing once all of its pages are in it
+END_OF_PAGES = object()
+
+
+def put_unless_stopped(
+    page_queue: queue.Queue, item: Any, stop_event: threading.Event
+) -> None:
+    """Put an item in a queue once it has room, unless the pages are no longer needed."""
+    while not stop_event.is_set():
+        try:
+            page_queue.put(item, timeout=constants.github.Queue_Poll_Seconds)
+            return
+        except queue.Full:
+            continue
+
+
+def download_pages_into_queue(
+    workflow_run_pages: Iterable[List],
+    page_queue: queue.Queue,
+    request_semaphore: threading.Semaphore,
+    stop_event: threading.Event,
+) -> None:
+    """Put each of the pages of a listing in its queue, requesting a page only when the semaphore allows it."""
+    pages_iterator = iter(workflow_run_pages)
+    try:
+        while not stop_event.is_set():
+            # note that the semaphore is not held while the worker waits for room in the
+            # queue and thus the workers of the other listings can request their pages
+            with request_semaphore:
+                workflow_runs = next(pages_iterator, END_OF_PAGES)
+            put_unless_stopped(page_queue, workflow_runs, stop_event)
+            if workflow_runs is END_OF_PAGES:
+                return
+    # the error is raised again by the iterator of the queue, in the thread of the caller
+    except Exception as error:  # pylint: disable=broad-except
+        put_unless_stopped(page_queue, error, stop_event)
+    finally:
+        # stop the download of a listing whose pages are no longer needed
+        getattr(pages_iterator, "close", lambda: None)()
+
+
+def iterate_queued_pages(page_queue: queue.Queue) -> Iterator[List]:
+    """Yield each of the pages of a listing from its queue as soon as it was downloaded."""
+    while True:
+        workflow_runs = page_queue.get()
+        if workflow_runs is END_OF_PAGES:
+            return
+        if isinstance(workflow_runs, Exception):
+            raise workflow_runs
+        yield workflow_runs
+
+
+@contextmanager
+def stream_pages_concurrently(
+    all_workflow_run_pages: List[Iterable[List]], concurrency: int
+) -> Iterator[List[Iterator[List]]]:
+    """Download the pages of several listings at the same time, giving an iterator of the pages of each listing."""
+    # each listing (e.g., each date range of a sharded download or each workflow of a
+    # per-workflow download) is iterated by its own worker that puts its pages in a
+    # queue with room for only a window of pages; this means that the caller gets each
+    # page as soon as it is downloaded, in the order of its listing, and that the pages
+    # held in memory stay bounded while at most concurrency listings request a page
+    stop_event = threading.Event()
+    request_semaphore = threading.Semaphore(max(concurrency, 1))
+    page_queues: List[queue.Queue] = [
+        queue.Queue(maxsize=constants.github.Page_Window_Factor)
+        for _ in all_workflow_run_pages
+    ]
+    workers = [
+        threading.Thread(
+            target=download_pages_into_queue,
+            args=(workflow_run_pages, page_queue, request_semaphore, stop_event),
+            daemon=True,
+        )
+        for workflow_run_pages, page_queue in zip(all_workflow_run_pages, page_queues)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        yield [iterate_queued_pages(page_queue) for page_queue in page_queues]
+    finally:
+        # the caller stopped (e.g., because a listing was not valid) and thus
+        # the workers stop before they request any more of the pages
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+
+def request_json_from_github(
+    github_api_url: str,
+    console: Console,
+    maximum_retries=constants.github.Maximum_Request_Retries,
+    page_concurrency: int = constants.github.Page_Concurrency,
+    github_params_filter: Union[Dict[str, str], None] = None,
+    stored_pages: Union[List[List], None] = None,
+    page_callback: Union[Callable[[int, List], None], None] = None,
+    progress: Union[Progress, None] = None,
+    progress_label: str = constants.markers.Nothing,
+) -> Tuple[bool, int, float, List]:
+    """Request the JSON response from the GitHub API, resuming after any stored pages."""
+    # note that this collects all of the pages in a list and thus a caller that can
+    # transform one page at a time should iterate through the WorkflowRunPages instead
+    workflow_run_pages = WorkflowRunPages(
+        github_api_url,
+        console,
+        maximum_retries,
+        page_concurrency,
+        github_params_filter,
+        stored_pages,
+        page_callback,
+        progress,
+        progress_label,
+    )
+    json_responses = list(workflow_run_pages)
     # return the list of workflow runs dictionaries
     return (
-        valid,
-        initial_retry_count + complete_retry_count,
-        initial_sleep_time + complete_sleep_time,
+        workflow_run_pages.valid,
+        workflow_run_pages.retry_count,
+        workflow_run_pages.sleep_time,
         json_responses,
     )
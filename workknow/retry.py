@@ -0,0 +1,155 @@
+"""Classify the responses of the GitHub API and decide how to retry failed requests."""
+
+import collections
+import datetime
+import logging
+import random
+import threading
+
+from email import utils
+
+from typing import Dict
+from typing import Mapping
+from typing import Union
+
+from workknow import budget
+from workknow import constants
+from workknow import tokens
+
+# Reference:
+# https://docs.github.com/en/rest/overview/resources-in-the-rest-api#secondary-rate-limits
+#
+# The responses from the GitHub API fall into the following classes:
+#
+# success: the request worked and the JSON response is available (e.g., 200)
+# permanent: the request will never work and should not be retried (e.g.,
+#   404 for a deleted or renamed repository or 401 for a bad token)
+# transient: the server had a problem that may go away (e.g., 502)
+# rate_limited: the primary or secondary rate limit was exceeded (e.g., 429
+#   or a 403 that has a Retry-After header or no remaining requests)
+# exception: the request raised an exception before there was a response
+#
+# Only the transient and rate_limited classes are worth a retry, and for
+# them the policy honors the Retry-After header that GitHub may provide.
+# Both the request module and the aiorequest module use this policy and
+# thus they only differ in whether they block or await during the sleep.
+
+# the fraction of the exponential back-off time that can be randomly added
+# to the sleep time so that workers that failed together do not retry together
+_jitter_fraction = constants.retry.Jitter_Fraction
+
+# the number of responses observed in each of the classes
+_retry_counters: Dict[str, int] = collections.Counter()
+_retry_counters_lock = threading.Lock()
+
+
+def configure_policy(jitter_fraction: float = constants.retry.Jitter_Fraction) -> None:
+    """Configure the fraction of random jitter added to each exponential back-off."""
+    global _jitter_fraction  # pylint: disable=global-statement
+    _jitter_fraction = jitter_fraction
+
+
+def classify_response(status_code: int, headers: Mapping[str, str]) -> str:
+    """Classify a response from the GitHub API based on its status code and headers."""
+    if status_code in (
+        constants.github.Success_Response,
+        constants.retry.Not_Modified_Response,
+    ):
+        return constants.retry.Success
+    if status_code == constants.retry.Too_Many_Requests_Response:
+        return constants.retry.Rate_Limited
+    # GitHub signals both the primary and the secondary rate limits with a 403;
+    # these are distinguished from the permanent "forbidden" response because
+    # they either have a Retry-After header or report no remaining requests
+    if status_code == constants.retry.Forbidden_Response:
+        if (
+            constants.retry.Retry_After in headers
+            or headers.get(constants.rate.Header_Remaining) == "0"
+        ):
+            return constants.retry.Rate_Limited
+        return constants.retry.Permanent
+    if status_code in constants.retry.Permanent_Responses:
+        return constants.retry.Permanent
+    # all other responses, including all of the server errors, may work after
+    # waiting and thus they are considered to be transient failures
+    return constants.retry.Transient
+
+
+def extract_retry_after(headers: Mapping[str, str]) -> Union[float, None]:
+    """Extract the number of seconds to wait from the Retry-After header, if it is available."""
+    if constants.retry.Retry_After not in headers:
+        return None
+    retry_after = headers[constants.retry.Retry_After]
+    # the Retry-After header is either a number of seconds or an HTTP date
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        try:
+            retry_after_datetime = utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        current_time = datetime.datetime.now(datetime.timezone.utc)
+        return max((retry_after_datetime - current_time).total_seconds(), 0)
+
+
+def add_jitter(sleep_time_in_seconds: float) -> float:
+    """Add a random amount of jitter to the provided sleep time."""
+    return sleep_time_in_seconds + random.uniform(
+        0, _jitter_fraction * sleep_time_in_seconds
+    )
+
+
+def calculate_retry_sleep_time(
+    classification: str, headers: Mapping[str, str], backoff_sleep_time: float
+) -> float:
+    """Calculate how long to sleep before retrying a request that failed in the provided class."""
+    logger = logging.getLogger(constants.logging.Rich)
+    # the GitHub API said exactly how long to wait and thus there is no need to guess
+    retry_after = extract_retry_after(headers)
+    if retry_after is not None:
+        logger.debug(f"Honoring Retry-After of {retry_after} second(s)")
+        return retry_after
+    if (
+        classification == constants.retry.Rate_Limited
+        and headers.get(constants.rate.Header_Remaining) == "0"
+    ):
+        # the token ran out of requests but another token in the pool still has a
+        # budget and thus the retry can use it right away instead of waiting for the
+        # reset; note that a secondary rate limit (i.e., a Retry-After) was honored
+        token_pool = tokens.get_token_pool()
+        if token_pool is not None and token_pool.has_available_token():
+            return 0
+        # the primary rate limit was exceeded and thus it is only worth retrying after
+        # the time at which GitHub will reset the budget of requests for this token
+        if constants.rate.Header_Reset in headers:
+            return budget.calculate_reset_sleep_time(
+                int(headers[constants.rate.Header_Reset])
+            )
+    return add_jitter(backoff_sleep_time)
+
+
+def record_classification(classification: str) -> None:
+    """Count a response (or an exception) in the provided class."""
+    with _retry_counters_lock:
+        _retry_counters[classification] = _retry_counters[classification] + 1
+
+
+def get_retry_counters() -> Dict[str, int]:
+    """Return the number of responses that were observed in each of the classes."""
+    with _retry_counters_lock:
+        return {
+            classification: _retry_counters[classification]
+            for classification in (
+                constants.retry.Success,
+                constants.retry.Permanent,
+                constants.retry.Transient,
+                constants.retry.Rate_Limited,
+                constants.retry.Exception,
+            )
+        }
+
+
+def reset_retry_counters() -> None:
+    """Reset the number of responses observed in each of the classes to zero."""
+    with _retry_counters_lock:
+        _retry_counters.clear()
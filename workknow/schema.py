@@ -0,0 +1,240 @@
+"""Give the columns of the workflows and commits DataFrames compact types."""
+
+import logging
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pandas
+
+from pandas.api.types import union_categoricals
+
+from workknow import constants
+from workknow import projection
+
+# Without a schema, every column of the workflows and commits DataFrames is a column
+# of Python objects and thus each row holds its own copy of strings, like the name of
+# the organization, that are the same in (almost) every row. The schema gives:
+#
+# --> the columns of strings with few distinct values (e.g., the repository, the
+#     event, and the status) the category type, which stores each string only once
+# --> the timestamps the datetime64[ns, UTC] type
+# --> the identifier of a workflow run the int64 type (or Int64 when it is missing)
+#
+# The schema is applied when the DataFrames are built from the workflow runs and when
+# the CSV files are loaded to be combined. Note that DataFrames with categories only
+# keep them when they are concatenated if they have the same categories, which is why
+# concatenate_dataframes first makes the categories of each column the same. The CSV
+# files still have the timestamps in the format of the GitHub API. The files for all
+# of the repositories have every column that the DataFrames can have, with the types
+# of the schema (or the string type), and thus each DataFrame is conformed to them.
+
+# the types of the columns in the workflows DataFrame
+WORKFLOWS_COLUMN_TYPES = {
+    constants.workflow.Id: constants.schema.Integer,
+    constants.workflow.Name: constants.schema.Category,
+    constants.workflow.Created_At: constants.schema.Datetime,
+    constants.workflow.Updated_At: constants.schema.Datetime,
+    constants.workflow.Event: constants.schema.Category,
+    constants.workflow.Status: constants.schema.Category,
+    constants.workflow.Conclusion: constants.schema.Category,
+    constants.workflow.Organization: constants.schema.Category,
+    constants.workflow.Repo: constants.schema.Category,
+    constants.workflow.Repo_Url: constants.schema.Category,
+    constants.workflow.Actions_Url: constants.schema.Category,
+}
+
+# the types of the columns in the commits DataFrame, where the fields of the
+# head commit are flattened into columns like head_commit_timestamp
+COMMITS_COLUMN_TYPES = {
+    projection.create_field_name(
+        [constants.workflow.Head_Commit, constants.schema.Timestamp]
+    ): constants.schema.Datetime,
+    **{
+        projection.create_field_name(
+            [constants.workflow.Head_Commit, person, detail]
+        ): constants.schema.Category
+        for person in [constants.schema.Author, constants.schema.Committer]
+        for detail in [constants.schema.Name, constants.schema.Email]
+    },
+    constants.workflow.Organization: constants.schema.Category,
+    constants.workflow.Repo: constants.schema.Category,
+    constants.workflow.Repo_Url: constants.schema.Category,
+    constants.workflow.Actions_Url: constants.schema.Category,
+}
+
+
+# the paths of the fields of the head commit of a workflow run, each one the name of a
+# column in the commits DataFrame once the head commit is flattened
+HEAD_COMMIT_FIELD_PATHS = [
+    [constants.workflow.Head_Commit, constants.workflow.Id],
+    [constants.workflow.Head_Commit, constants.schema.Tree_Id],
+    [constants.workflow.Head_Commit, constants.schema.Message],
+    [constants.workflow.Head_Commit, constants.schema.Timestamp],
+    *[
+        [constants.workflow.Head_Commit, person, detail]
+        for person in [constants.schema.Author, constants.schema.Committer]
+        for detail in [constants.schema.Name, constants.schema.Email]
+    ],
+]
+
+# the columns that describe the repository in every row of both of the DataFrames
+REPOSITORY_COLUMN_NAMES = [
+    constants.workflow.Organization,
+    constants.workflow.Repo,
+    constants.workflow.Repo_Url,
+    constants.workflow.Actions_Url,
+]
+
+
+def convert_column(column: pandas.Series, column_type: str) -> pandas.Series:
+    """Convert a column to one of the types in the schema."""
+    if column_type == constants.schema.Datetime:
+        # a value that is not a timestamp becomes missing instead of stopping the
+        # download; note that the timestamps have the format of the GitHub API, in
+        # which they are also saved, and that newer versions of pandas pick the
+        # resolution from the values and thus the resolution is given explicitly
+        return pandas.to_datetime(
+            column, utc=True, format=constants.schema.Date_Format, errors="coerce"
+        ).astype(constants.schema.Datetime)
+    if column_type == constants.schema.Integer:
+        if column.isna().any():
+            return column.astype(constants.schema.Nullable_Integer)
+        return column.astype(constants.schema.Integer)
+    if column_type == constants.schema.String:
+        return column.astype(constants.schema.String)
+    return column.astype(constants.schema.Category)
+
+
+def apply_schema(
+    dataframe: pandas.DataFrame, column_types: Dict[str, str]
+) -> pandas.DataFrame:
+    """Convert each of the columns of a DataFrame that are in the schema to its type."""
+    converted_columns = {
+        name: convert_column(dataframe[name], column_type)
+        for name, column_type in column_types.items()
+        if name in dataframe.columns and dataframe[name].dtype != column_type
+    }
+    if not converted_columns:
+        return dataframe
+    # note that assign creates a new DataFrame, leaving the columns in their order
+    return dataframe.assign(**converted_columns)
+
+
+def apply_workflows_schema(workflows_dataframe: pandas.DataFrame) -> pandas.DataFrame:
+    """Convert the columns of a workflows DataFrame to the types in the schema."""
+    return apply_schema(workflows_dataframe, WORKFLOWS_COLUMN_TYPES)
+
+
+def apply_commits_schema(commits_dataframe: pandas.DataFrame) -> pandas.DataFrame:
+    """Convert the columns of a commits DataFrame to the types in the schema."""
+    return apply_schema(commits_dataframe, COMMITS_COLUMN_TYPES)
+
+
+def create_workflows_column_types() -> Dict[str, str]:
+    """Create the type of every column that a workflows DataFrame can have, including the extra fields."""
+    column_names = sorted(
+        projection.get_workflows_key_names() - set(REPOSITORY_COLUMN_NAMES)
+    )
+    return {
+        name: WORKFLOWS_COLUMN_TYPES.get(name, constants.schema.String)
+        for name in column_names + REPOSITORY_COLUMN_NAMES
+    }
+
+
+def create_commits_column_types() -> Dict[str, str]:
+    """Create the type of every column that a commits DataFrame can have."""
+    column_names = [
+        projection.create_field_name(field_path)
+        for field_path in HEAD_COMMIT_FIELD_PATHS
+    ]
+    return {
+        name: COMMITS_COLUMN_TYPES.get(name, constants.schema.String)
+        for name in column_names + REPOSITORY_COLUMN_NAMES
+    }
+
+
+def conform_dataframe(
+    dataframe: pandas.DataFrame, column_types: Dict[str, str]
+) -> pandas.DataFrame:
+    """Give a DataFrame exactly the columns of a schema, each one with its type, without dropping any data."""
+    # a column that is not in the schema can only be left out when it does not have
+    # any values (e.g., the head_commit column of the runs without a head commit)
+    unknown_columns = [
+        name
+        for name in dataframe.columns
+        if name not in column_types and dataframe[name].notna().any()
+    ]
+    if unknown_columns:
+        raise ValueError(f"The columns {unknown_columns} are not in the schema")
+    # each missing column starts without a type (and not as a column of floats, like
+    # those added by reindex) so that it has the type of the schema once converted
+    missing_columns = {
+        name: None for name in column_types if name not in dataframe.columns
+    }
+    return apply_schema(
+        dataframe.assign(**missing_columns)[list(column_types)], column_types
+    )
+
+
+def concatenate_dataframes(
+    dataframes: List[pandas.DataFrame], **kwargs: Any
+) -> pandas.DataFrame:
+    """Concatenate DataFrames, keeping the category type of the columns that have it in every DataFrame."""
+    if len(dataframes) == 0:
+        return pandas.concat(dataframes, **kwargs)
+    category_columns = [
+        name
+        for name in dataframes[0].columns
+        if all(
+            name in dataframe.columns
+            and isinstance(dataframe[name].dtype, pandas.CategoricalDtype)
+            for dataframe in dataframes
+        )
+    ]
+    # each of the DataFrames gets the categories of all of them, which is cheap
+    # since only the categories, and not the codes of the rows, are combined
+    categories_by_name = {
+        name: union_categoricals(
+            [dataframe[name] for dataframe in dataframes], ignore_order=True
+        ).categories
+        for name in category_columns
+    }
+    return pandas.concat(
+        [
+            dataframe.assign(
+                **{
+                    name: dataframe[name].cat.set_categories(categories)
+                    for name, categories in categories_by_name.items()
+                }
+            )
+            for dataframe in dataframes
+        ],
+        **kwargs,
+    )
+
+
+def calculate_memory(dataframe: pandas.DataFrame) -> int:
+    """Calculate the number of bytes that a DataFrame uses, including the strings in it."""
+    return int(dataframe.memory_usage(deep=True).sum())
+
+
+def format_megabytes(size_in_bytes: int) -> str:
+    """Format a number of bytes as megabytes."""
+    return f"{size_in_bytes / constants.schema.Bytes_Per_Megabyte:.2f} MB"
+
+
+def format_datetime(value: Any) -> str:
+    """Format a timestamp in the format of the GitHub API, leaving any other value as a string."""
+    if isinstance(value, pandas.Timestamp):
+        return value.strftime(constants.schema.Date_Format)
+    return str(value)
+
+
+def log_memory(label: str, untyped_memory: int, typed_memory: int) -> None:
+    """Log the memory of a DataFrame before and after the schema was applied."""
+    logger = logging.getLogger(constants.logging.Rich)
+    logger.debug(
+        f"The schema changed the memory of {label} from {format_megabytes(untyped_memory)} to {format_megabytes(typed_memory)}"
+    )
@@ -0,0 +1,175 @@
+"""Manage a shared, connection-pooled HTTP session for accessing the GitHub API."""
+
+import logging
+import threading
+
+from typing import Dict
+from typing import Tuple
+from typing import Union
+
+from urllib import parse
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from workknow import constants
+
+# Reference:
+# https://requests.readthedocs.io/en/latest/user/advanced/#session-objects
+#
+# A requests.Session keeps the TCP (and TLS) connections to a host alive
+# inside of a urllib3 connection pool, which means that downloading many
+# pages of workflow runs from api.github.com only pays for the handshake
+# once per connection instead of once per page. The session defined in
+# this module is shared by every request that WorkKnow makes to the API.
+
+# the shared session and its adapter; these are created on first use
+# or, alternatively, when configure_session is called by the program
+_session: Union[requests.Session, None] = None
+_adapter: Union["CountingHTTPAdapter", None] = None
+_session_lock = threading.Lock()
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """A transport adapter that remembers the connection pools that it sends requests through."""
+
+    # note that the pool manager keeps the connection pools in a bounded container
+    # and thus this adapter holds on to them so that it can later report how many
+    # connections each of the pools had to open for the requests that it carried
+
+    def __init__(self, *args, **kwargs):
+        """Create the adapter with an empty record of connection pools."""
+        # note that these attributes must exist before calling the constructor
+        # of the superclass because it will initialize the pool manager
+        self.connection_pools: Dict[str, object] = {}
+        self.sent_request_count = 0
+        self.counting_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def record_connection_pool(self, url: str, connection_pool):
+        """Record the connection pool that will carry a request to the provided URL."""
+        pool_key = parse.urlsplit(url).netloc
+        with self.counting_lock:
+            self.connection_pools[pool_key] = connection_pool
+        return connection_pool
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send the request through a pooled connection and count it."""
+        with self.counting_lock:
+            self.sent_request_count = self.sent_request_count + 1
+        return super().send(request, **kwargs)
+
+    def get_connection(self, url, proxies=None):
+        """Return the connection pool for a URL in versions of requests before 2.32."""
+        return self.record_connection_pool(
+            url, super().get_connection(url, proxies)  # type: ignore
+        )
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        """Return the connection pool for a request in versions of requests since 2.32."""
+        return self.record_connection_pool(
+            request.url,
+            super().get_connection_with_tls_context(  # type: ignore
+                request, verify, proxies, cert
+            ),
+        )
+
+
+def create_session(
+    pool_connections: int = constants.session.Pool_Connections,
+    pool_maxsize: int = constants.session.Pool_Maxsize,
+    github_authentication: Union[Tuple[str, str], None] = None,
+) -> Tuple[requests.Session, CountingHTTPAdapter]:
+    """Create a session with a connection pool, keep-alive, and default authentication and headers."""
+    session = requests.Session()
+    # create an adapter that will store up to pool_connections pools (i.e., one for
+    # each host) each holding up to pool_maxsize connections that are kept alive;
+    # note that the adapter does not retry since WorkKnow has its own retry procedure
+    adapter = CountingHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=constants.session.Maximum_Adapter_Retries,
+    )
+    session.mount(constants.session.Prefix_Https, adapter)
+    session.mount(constants.session.Prefix_Http, adapter)
+    # configure the headers that are sent with every request to the GitHub API:
+    # --> the user agent is the name of the registered OAuth application
+    # --> the accepted media type is the version three of the REST API
+    # --> the connection should be kept alive so that it is reused
+    session.headers.update(
+        {
+            constants.github.User_Agent: constants.workknow.Name,
+            constants.session.Accept: constants.session.Accept_Github,
+            constants.session.Connection: constants.session.Keep_Alive,
+        }
+    )
+    # use the provided authentication by default; note that any request
+    # can still override this by explicitly providing its own authentication
+    if github_authentication is not None:
+        session.auth = github_authentication
+    return (session, adapter)
+
+
+def configure_session(
+    pool_size: int = constants.session.Pool_Maxsize,
+    github_authentication: Union[Tuple[str, str], None] = None,
+) -> requests.Session:
+    """Configure the shared session that every request to the GitHub API will use."""
+    global _session  # pylint: disable=global-statement
+    global _adapter  # pylint: disable=global-statement
+    logger = logging.getLogger(constants.logging.Rich)
+    with _session_lock:
+        # close down any previously configured session so that its
+        # connections are released before creating the new session
+        if _session is not None:
+            _session.close()
+        _session, _adapter = create_session(
+            constants.session.Pool_Connections, pool_size, github_authentication
+        )
+    logger.debug(f"Configured shared session with connection pool size {pool_size}")
+    return _session
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it with the default configuration if needed."""
+    global _session  # pylint: disable=global-statement
+    global _adapter  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is None:
+            _session, _adapter = create_session()
+        return _session
+
+
+def close_session() -> None:
+    """Close the shared session and release all of its pooled connections."""
+    global _session  # pylint: disable=global-statement
+    global _adapter  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _adapter = None
+
+
+def get_connection_reuse_details() -> Dict[str, int]:
+    """Report the number of requests, opened connections, and reused connections of the shared session."""
+    # the urllib3 connection pools count both the number of requests that went
+    # through them and the number of new connections that they had to open;
+    # every request that did not need a new connection reused a kept-alive one
+    sent_requests = 0
+    pooled_requests = 0
+    opened_connections = 0
+    if _adapter is not None:
+        with _adapter.counting_lock:
+            sent_requests = _adapter.sent_request_count
+            for connection_pool in _adapter.connection_pools.values():
+                pooled_requests = pooled_requests + connection_pool.num_requests  # type: ignore
+                opened_connections = (
+                    opened_connections + connection_pool.num_connections  # type: ignore
+                )
+    return {
+        constants.session.Requests: sent_requests,
+        constants.session.Connections: opened_connections,
+        constants.session.Reused: max(pooled_requests - opened_connections, 0),
+    }
@@ -0,0 +1,311 @@
+"""Split the workflow history of a repository into date ranges that are downloaded at the same time."""
+
+import datetime
+import logging
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from rich.console import Console
+from rich.progress import Progress
+
+from workknow import checkpoint
+from workknow import constants
+from workknow import request
+
+# Reference:
+# https://docs.github.com/en/rest/reference/actions#list-workflow-runs-for-a-repository
+# https://docs.github.com/en/search-github/getting-started-with-searching-on-github/understanding-the-search-syntax#query-for-dates
+#
+# The listing of the workflow runs for a very active repository has many pages that
+# are, by default, downloaded one after another. A sharded download instead:
+#
+# --> requests a single run from the first and the last page of the listing to find
+#     the total count of runs and the creation times of the newest and the oldest run
+# --> splits the time between the oldest and the newest run into date ranges that
+#     are each requested with a filter like created=2021-08-01T00:00:00Z..2021-08-15T23:59:59Z
+# --> splits a date range again while the GitHub API reports that it has more runs than
+#     the 1,000 results that a filtered listing returns, since the rest would be missing
+# --> downloads the date ranges at the same time, each with its own pagination
+# --> yields the runs of the date ranges from the newest to the oldest, which is the
+#     same order as the listing without a filter, removing any run already yielded;
+#     each page is yielded as soon as it and the pages before it are downloaded
+# --> checks that the number of runs matches the total count reported by the first page
+
+
+def parse_created_at(created_at: str) -> datetime.datetime:
+    """Parse the creation time of a workflow run, which is in ISO 8601 format in UTC."""
+    return datetime.datetime.strptime(created_at, constants.shard.Date_Format).replace(
+        tzinfo=datetime.timezone.utc
+    )
+
+
+def format_created_at(created_at: datetime.datetime) -> str:
+    """Format a creation time in the same way as the GitHub API."""
+    return created_at.strftime(constants.shard.Date_Format)
+
+
+def create_created_range_filter(
+    start: datetime.datetime, end: datetime.datetime
+) -> Dict[str, str]:
+    """Create the parameters that only request the workflow runs created in a date range."""
+    return {
+        constants.incremental.Created: format_created_at(start)
+        + constants.shard.Range_Separator
+        + format_created_at(end)
+    }
+
+
+def split_date_range(
+    start: datetime.datetime, end: datetime.datetime, shard_count: int
+) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    """Split a date range, whose ends are both included, into at most shard_count ranges that do not overlap."""
+    one_second = datetime.timedelta(seconds=1)
+    total_seconds = int((end - start).total_seconds())
+    # the GitHub API filters by the second and thus a range cannot be split further
+    shard_count = max(min(shard_count, total_seconds + 1), 1)
+    boundaries = [
+        start + datetime.timedelta(seconds=(total_seconds * shard) // shard_count)
+        for shard in range(shard_count)
+    ]
+    return [
+        (boundaries[shard], boundaries[shard + 1] - one_second)
+        for shard in range(shard_count - 1)
+    ] + [(boundaries[-1], end)]
+
+
+def probe_workflow_runs(
+    github_api_url: str,
+    github_params: Dict[str, str],
+    page: int,
+    github_authentication,
+    progress: Progress,
+    maximum_retries: int,
+) -> Tuple[bool, int, Union[str, None]]:
+    """Request a single workflow run to find the total count and the creation time of the run on the page."""
+    probe_github_params = dict(github_params)
+    probe_github_params[constants.github.Per_Page] = constants.shard.Probe_Per_Page
+    probe_github_params[constants.github.Page] = str(page)
+    valid, _, _, response = request.request_json_from_github_with_caution(
+        github_api_url,
+        probe_github_params,
+        github_authentication,
+        progress,
+        maximum_retries,
+    )
+    if not valid:
+        return (False, 0, None)
+    response_json = response.json()  # type: ignore
+    workflow_runs = response_json.get(constants.github.Workflow_Runs, [])
+    created_at = None
+    if workflow_runs:
+        created_at = workflow_runs[0].get(constants.workflow.Created_At)
+    return (True, int(response_json.get(constants.shard.Total_Count, 0)), created_at)
+
+
+def plan_date_ranges(
+    github_api_url: str,
+    github_params: Dict[str, str],
+    oldest_created_at: datetime.datetime,
+    newest_created_at: datetime.datetime,
+    shard_count: int,
+    github_authentication,
+    progress: Progress,
+    maximum_retries: int,
+) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    """Plan the date ranges, from the newest to the oldest, that each have no more runs than a filtered listing returns."""
+    logger = logging.getLogger(constants.logging.Rich)
+    unplanned_date_ranges = split_date_range(
+        oldest_created_at, newest_created_at, shard_count
+    )
+    planned_date_ranges = []
+    while unplanned_date_ranges:
+        start, end = unplanned_date_ranges.pop(0)
+        range_github_params = dict(github_params)
+        range_github_params.update(create_created_range_filter(start, end))
+        valid, range_count, _ = probe_workflow_runs(
+            github_api_url,
+            range_github_params,
+            1,
+            github_authentication,
+            progress,
+            maximum_retries,
+        )
+        # the date range has too many runs for a single filtered listing and thus it
+        # must be split again, as long as it is longer than a single second
+        if valid and range_count > constants.shard.Maximum_Results and start < end:
+            logger.debug(
+                f"Splitting the date range {start} to {end} of {range_count} runs"
+            )
+            unplanned_date_ranges[0:0] = split_date_range(start, end, 2)
+        else:
+            planned_date_ranges.append((start, end))
+    # the listing without a filter starts with the newest run and so do the ranges
+    return list(reversed(planned_date_ranges))
+
+
+class ShardedWorkflowRunPages:
+    """The pages of workflow runs for a repository, downloaded in date ranges at the same time."""
+
+    # Iterating through an instance of this class yields the pages of workflow runs in
+    # the same order as the listing without a filter, starting with the pages of the
+    # newest date range as soon as each one of them is downloaded. The attributes valid,
+    # retry_count, and sleep_time are the same as those of request.WorkflowRunPages
+    # while total_count and unique_count are the number of runs that the first page
+    # reported and the number of runs that the date ranges yielded, respectively.
+    # The date ranges are downloaded with the pages of the backend (i.e., the
+    # workflow_run_pages_class) and, with a checkpoint journal, each of them
+    # resumes after its own stored pages and records each of its new pages.
+
+    def __init__(
+        self,
+        github_api_url: str,
+        console: Console,
+        shard_count: int,
+        maximum_retries=constants.github.Maximum_Request_Retries,
+        page_concurrency: int = constants.github.Page_Concurrency,
+        github_params_filter: Union[Dict[str, str], None] = None,
+        progress: Union[Progress, None] = None,
+        progress_label: str = constants.markers.Nothing,
+        workflow_run_pages_class: Callable[..., Any] = request.WorkflowRunPages,
+        checkpoint_journal: Union[checkpoint.CheckpointJournal, None] = None,
+    ):
+        """Describe the sharded download of the pages without requesting any of them."""
+        self.github_api_url = github_api_url
+        self.console = console
+        self.shard_count = shard_count
+        self.maximum_retries = maximum_retries
+        self.page_concurrency = page_concurrency
+        self.github_params_filter = github_params_filter
+        self.progress = progress
+        self.progress_label = progress_label
+        self.workflow_run_pages_class = workflow_run_pages_class
+        self.checkpoint_journal = checkpoint_journal
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time: float = 0
+        self.total_count = 0
+        self.unique_count = 0
+
+    def find_date_ranges(
+        self, github_authentication, progress: Progress
+    ) -> Union[List[Tuple[datetime.datetime, datetime.datetime]], None]:
+        """Find the date ranges of the sharded download, or None when the probes were not valid."""
+        github_params = request.create_github_params(self.github_params_filter, 1)
+        # the listing starts with the newest run and ends with the oldest run and thus,
+        # with a single run on each page, the last page is the same as the total count
+        valid, self.total_count, newest_created_at = probe_workflow_runs(
+            self.github_api_url,
+            github_params,
+            1,
+            github_authentication,
+            progress,
+            self.maximum_retries,
+        )
+        if not valid or self.total_count == 0:
+            return None if not valid else []
+        valid, _, oldest_created_at = probe_workflow_runs(
+            self.github_api_url,
+            github_params,
+            self.total_count,
+            github_authentication,
+            progress,
+            self.maximum_retries,
+        )
+        if not valid or newest_created_at is None or oldest_created_at is None:
+            return None
+        return plan_date_ranges(
+            self.github_api_url,
+            github_params,
+            parse_created_at(oldest_created_at),
+            parse_created_at(newest_created_at),
+            self.shard_count,
+            github_authentication,
+            progress,
+            self.maximum_retries,
+        )
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        """Download the date ranges at the same time, yielding their pages from the newest to the oldest."""
+        github_authentication = (
+            constants.github.User,
+            request.get_github_personal_access_token(),
+        )
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time = 0
+        self.unique_count = 0
+        # the downloads of all of the date ranges share a single progress display
+        with request.use_progress(self.progress) as progress:
+            date_ranges = self.find_date_ranges(github_authentication, progress)
+            if date_ranges is None:
+                return
+            shard_workflow_run_pages = []
+            stored_page_count = 0
+            for start, end in date_ranges:
+                shard_github_params_filter = dict(self.github_params_filter or {})
+                shard_github_params_filter.update(
+                    create_created_range_filter(start, end)
+                )
+                stored_pages, page_callback = checkpoint.open_listing(
+                    self.checkpoint_journal,
+                    self.github_api_url,
+                    shard_github_params_filter,
+                )
+                stored_page_count = stored_page_count + len(stored_pages)
+                shard_workflow_run_pages.append(
+                    self.workflow_run_pages_class(
+                        self.github_api_url,
+                        progress.console,
+                        self.maximum_retries,
+                        self.page_concurrency,
+                        shard_github_params_filter,
+                        stored_pages=stored_pages,
+                        page_callback=page_callback,
+                        progress=progress,
+                        progress_label=f"{self.progress_label}{format_created_at(start)}{constants.markers.Space}",
+                    )
+                )
+            checkpoint.display_stored_pages(progress.console, stored_page_count)
+            # the date ranges that are next to each other share no runs but a run
+            # may move between pages while the ranges are downloaded and thus only
+            # the runs with identifiers that were not yet yielded are yielded
+            yielded_ids: Set[int] = set()
+            with request.stream_pages_concurrently(
+                shard_workflow_run_pages, self.shard_count
+            ) as shard_pages_iterators:
+                for workflow_run_pages, pages_iterator in zip(
+                    shard_workflow_run_pages, shard_pages_iterators
+                ):
+                    for workflow_runs in pages_iterator:
+                        unique_workflow_runs = [
+                            workflow_run
+                            for workflow_run in workflow_runs
+                            if workflow_run.get(constants.workflow.Id)
+                            not in yielded_ids
+                        ]
+                        yielded_ids.update(
+                            workflow_run.get(constants.workflow.Id)
+                            for workflow_run in unique_workflow_runs
+                        )
+                        self.unique_count = self.unique_count + len(
+                            unique_workflow_runs
+                        )
+                        yield unique_workflow_runs
+                    self.retry_count = self.retry_count + workflow_run_pages.retry_count
+                    self.sleep_time = self.sleep_time + workflow_run_pages.sleep_time
+                    if not workflow_run_pages.valid:
+                        return
+        self.valid = True
+        # runs that were created (or deleted) during the download change the count
+        # and thus a difference is reported instead of making the download invalid
+        if self.unique_count != self.total_count:
+            self.console.print(
+                f":warning: Downloaded {self.unique_count} unique workflow runs but the GitHub API reported {self.total_count}"
+            )
@@ -0,0 +1,566 @@
+"""Serve a local stand-in for the GitHub Actions API that synthesizes workflow runs."""
+
+from http import server
+from urllib import parse
+
+import collections
+import datetime
+import json
+import random
+import re
+import threading
+import time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import typer
+
+from rich.console import Console
+
+from workknow import constants
+
+# The stand-in server answers the same requests as the GitHub Actions API, without
+# any network access or rate limit of the real API, so that the throughput of a
+# download can be measured offline at any scale. For each repository it synthesizes
+# the same number of workflow runs and it answers these requests:
+#
+# GET /rate_limit
+# GET /repos/{organization}/{repo}/actions/runs
+# GET /repos/{organization}/{repo}/actions/workflows
+# GET /repos/{organization}/{repo}/actions/workflows/{workflow_id}/runs
+# GET /repos/{organization}/{repo}/actions/runs/{run_id}/jobs
+#
+# Like the GitHub API, each listing supports the per_page and page parameters and
+# the created filter and it has a Link header with the next and last pages, while
+# every response has the X-RateLimit-* headers of a budget that resets after a few
+# seconds. To exercise the error handling of WorkKnow, each response can be delayed
+# by a latency and it can fail with a 502 error or a rate limited 403 error.
+#
+# Note that WorkKnow uses the stand-in server when its --api-url option (or the
+# WORKKNOW_GITHUB_API_URL environment variable) is the URL of the server.
+
+# the options that describe the synthesized workflow runs and injected failures:
+# --> run_count: the number of workflow runs of each repository
+# --> latency: the number of seconds that each response is delayed
+# --> server_error_rate: the fraction of responses that fail with a 502 error
+# --> rate_limit_error_rate: the fraction of responses that fail with a rate limited 403
+# --> rate_limit: the number of requests in each rate limit window
+# --> seed: the seed of the random choice of the failed responses
+StandInOptions = collections.namedtuple(
+    "StandInOptions",
+    [
+        "run_count",
+        "latency",
+        "server_error_rate",
+        "rate_limit_error_rate",
+        "rate_limit",
+        "seed",
+    ],
+)
+
+# the routes of the stand-in server, each one a pattern of the path and a name
+ROUTES = [
+    (re.compile(r"^/rate_limit$"), constants.standin.Rate_Limit_Route),
+    (
+        re.compile(r"^/repos/([^/]+)/([^/]+)/actions/runs$"),
+        constants.standin.Runs_Route,
+    ),
+    (
+        re.compile(r"^/repos/([^/]+)/([^/]+)/actions/workflows$"),
+        constants.standin.Workflows_Route,
+    ),
+    (
+        re.compile(r"^/repos/([^/]+)/([^/]+)/actions/workflows/\d+/runs$"),
+        constants.standin.Runs_Route,
+    ),
+    (
+        re.compile(r"^/repos/([^/]+)/([^/]+)/actions/runs/(\d+)/jobs$"),
+        constants.standin.Jobs_Route,
+    ),
+]
+
+# the creation time of the oldest synthesized workflow run of each repository
+OLDEST_CREATED_AT = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def create_default_options() -> StandInOptions:
+    """Create the options of a stand-in server without any latency or failures."""
+    return StandInOptions(
+        run_count=constants.standin.Run_Count,
+        latency=0,
+        server_error_rate=0,
+        rate_limit_error_rate=0,
+        rate_limit=constants.rate.Default_Limit,
+        seed=0,
+    )
+
+
+def format_time(moment: datetime.datetime) -> str:
+    """Format a moment in the same way as the GitHub API."""
+    return moment.strftime(constants.shard.Date_Format)
+
+
+def create_workflow_run(
+    api_url: str, organization: str, repo: str, run_number: int
+) -> Dict[str, Any]:
+    """Synthesize a workflow run with the same fields and nested objects as the GitHub API."""
+    created_at = OLDEST_CREATED_AT + datetime.timedelta(minutes=run_number)
+    head_sha = f"{run_number:040x}"
+    run_url = f"{api_url}/repos/{organization}/{repo}/actions/runs/{run_number}"
+    author = {"name": "WorkKnow", "email": "workknow@example.com"}
+    return {
+        "id": run_number,
+        "name": "Build",
+        "node_id": f"WFR_{run_number}",
+        "head_branch": "main",
+        "head_sha": head_sha,
+        "run_number": run_number,
+        "event": "push",
+        "status": "completed",
+        "conclusion": "success" if run_number % 10 else "failure",
+        "workflow_id": constants.standin.Workflow_Id,
+        "url": run_url,
+        "html_url": f"https://github.com/{organization}/{repo}/actions/runs/{run_number}",
+        "created_at": format_time(created_at),
+        "updated_at": format_time(created_at + datetime.timedelta(minutes=5)),
+        "jobs_url": run_url + "/jobs",
+        "logs_url": run_url + "/logs",
+        "artifacts_url": run_url + "/artifacts",
+        "cancel_url": run_url + "/cancel",
+        "rerun_url": run_url + "/rerun",
+        "head_commit": {
+            "id": head_sha,
+            "tree_id": head_sha,
+            "message": f"Commit {run_number} of {organization}/{repo}",
+            "timestamp": format_time(created_at),
+            "author": author,
+            "committer": author,
+        },
+        "repository": {
+            "id": 1,
+            "name": repo,
+            "full_name": f"{organization}/{repo}",
+            "owner": {"login": organization, "id": 1},
+            "private": False,
+        },
+        "head_repository": {
+            "id": 1,
+            "name": repo,
+            "full_name": f"{organization}/{repo}",
+            "owner": {"login": organization, "id": 1},
+            "private": False,
+        },
+    }
+
+
+def create_job(run_url: str, run_id: int) -> Dict[str, Any]:
+    """Synthesize the job of a workflow run with the same fields as the GitHub API."""
+    started_at = OLDEST_CREATED_AT + datetime.timedelta(minutes=run_id)
+    steps = [
+        {
+            "name": name,
+            "status": "completed",
+            "conclusion": "success",
+            "number": number,
+            "started_at": format_time(started_at + datetime.timedelta(minutes=number)),
+            "completed_at": format_time(
+                started_at + datetime.timedelta(minutes=number + 1)
+            ),
+        }
+        for number, name in enumerate(["Checkout", "Install", "Test"], start=1)
+    ]
+    return {
+        "id": run_id,
+        "run_id": run_id,
+        "run_url": run_url,
+        "name": "build",
+        "status": "completed",
+        "conclusion": "success",
+        "started_at": format_time(started_at),
+        "completed_at": format_time(started_at + datetime.timedelta(minutes=4)),
+        "runner_name": "GitHub Actions 1",
+        "steps": steps,
+    }
+
+
+def match_any_time(created_at: str) -> bool:  # pylint: disable=unused-argument
+    """Match every creation time, as does a filter without a bound on that side."""
+    return True
+
+
+def create_created_bounds(
+    created_filter: str,
+) -> Tuple[Callable[[str], bool], Callable[[str], bool]]:
+    """Split a filter like A..B or >=A into a check that a time is not before it and a check that it is not after it."""
+    # note that the times have the same format and thus they compare as strings
+    if constants.shard.Range_Separator in created_filter:
+        start, end = created_filter.split(constants.shard.Range_Separator, 1)
+        return (
+            lambda created_at: created_at >= start,
+            lambda created_at: created_at <= end,
+        )
+    value = created_filter.lstrip("<>=")
+    if created_filter.startswith(">="):
+        return (lambda created_at: created_at >= value, match_any_time)
+    if created_filter.startswith("<="):
+        return (match_any_time, lambda created_at: created_at <= value)
+    if created_filter.startswith(">"):
+        return (lambda created_at: created_at > value, match_any_time)
+    if created_filter.startswith("<"):
+        return (match_any_time, lambda created_at: created_at < value)
+    # a filter without an operator matches the times that start with it (e.g., a date)
+    prefix_length = len(created_filter)
+    return (
+        lambda created_at: created_at[:prefix_length] >= created_filter,
+        lambda created_at: created_at[:prefix_length] <= created_filter,
+    )
+
+
+def find_first_run_number(run_count: int, condition: Callable[[str], bool]) -> int:
+    """Find the oldest run whose creation time meets a condition that stays met for the newer runs."""
+    low, high = 1, run_count + 1
+    while low < high:
+        middle = (low + high) // 2
+        if condition(
+            format_time(OLDEST_CREATED_AT + datetime.timedelta(minutes=middle))
+        ):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def find_created_run_numbers(run_count: int, created_filter: Union[str, None]) -> range:
+    """Find the numbers of the runs, newest first, whose creation times match a filter like A..B or >=A."""
+    # the runs are numbered from the oldest one and their creation times grow with
+    # their numbers, so the matching runs are consecutive and bounded by two searches
+    if not created_filter:
+        return range(run_count, 0, -1)
+    is_not_before, is_not_after = create_created_bounds(created_filter)
+    first_run_number = find_first_run_number(run_count, is_not_before)
+    after_run_number = find_first_run_number(
+        run_count, lambda created_at: not is_not_after(created_at)
+    )
+    return range(after_run_number - 1, first_run_number - 1, -1)
+
+
+class StandInState:
+    """The rate limit budget, the random failures, and the counts of requests of a stand-in server."""
+
+    def __init__(self, options: StandInOptions):
+        """Create the state of a stand-in server that has a full rate limit budget."""
+        self.options = options
+        self.lock = threading.Lock()
+        self.random = random.Random(options.seed)
+        self.remaining = options.rate_limit
+        self.reset = int(time.time()) + constants.standin.Rate_Limit_Window
+        self.counts: Dict[str, int] = collections.Counter()
+
+    def spend_request(self) -> Tuple[Dict[str, str], Union[int, None]]:
+        """Spend a request from the budget, returning the rate limit headers and the status of any injected failure."""
+        with self.lock:
+            current_time = int(time.time())
+            # the budget is restored after each window, like the hourly window of GitHub
+            if current_time >= self.reset:
+                self.remaining = self.options.rate_limit
+                self.reset = current_time + constants.standin.Rate_Limit_Window
+            self.remaining = max(self.remaining - 1, 0)
+            self.counts[constants.standin.Requests] += 1
+            headers = {
+                constants.rate.Header_Limit: str(self.options.rate_limit),
+                constants.rate.Header_Remaining: str(self.remaining),
+                constants.rate.Header_Reset: str(self.reset),
+                constants.rate.Header_Used: str(
+                    self.options.rate_limit - self.remaining
+                ),
+            }
+            failure_choice = self.random.random()
+        if failure_choice < self.options.server_error_rate:
+            return (headers, constants.standin.Server_Error_Response)
+        if (
+            failure_choice
+            < self.options.server_error_rate + self.options.rate_limit_error_rate
+        ):
+            return (headers, constants.retry.Forbidden_Response)
+        return (headers, None)
+
+    def count(self, name: str) -> None:
+        """Count a response of a kind (e.g., a page of workflow runs)."""
+        with self.lock:
+            self.counts[name] += 1
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Return the counts of the requests and of each kind of response."""
+        with self.lock:
+            return dict(self.counts)
+
+
+class StandInRequestHandler(server.BaseHTTPRequestHandler):
+    """Answer a request to the stand-in server like the GitHub Actions API."""
+
+    # note that the handler uses keep-alive connections, just like the GitHub API,
+    # so that the reuse of connections by the shared session is also measured
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Do not log each request, which would slow down the server."""
+
+    def send_json(
+        self,
+        status_code: int,
+        body: Any,
+        headers: Union[Dict[str, str], None] = None,
+    ) -> None:
+        """Send a JSON response with the status code and headers."""
+        encoded_body = json.dumps(body).encode(constants.standin.Encoding)
+        self.send_response(status_code)
+        self.send_header(constants.cache.Content_Type, constants.standin.Content_Type)
+        self.send_header(constants.standin.Content_Length, str(len(encoded_body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request after the latency, possibly with an injected failure."""
+        state: StandInState = self.server.state  # type: ignore
+        api_url = self.server.api_url  # type: ignore
+        split_url = parse.urlsplit(self.path)
+        query = dict(parse.parse_qsl(split_url.query))
+        if state.options.latency > 0:
+            time.sleep(state.options.latency)
+        headers, failure_status_code = state.spend_request()
+        if failure_status_code == constants.retry.Forbidden_Response:
+            state.count(constants.standin.Rate_Limit_Errors)
+            headers[constants.rate.Header_Remaining] = "0"
+            headers[constants.retry.Retry_After] = "1"
+            self.send_json(
+                failure_status_code,
+                {"message": "You have exceeded a secondary rate limit."},
+                headers,
+            )
+            return
+        if failure_status_code is not None:
+            state.count(constants.standin.Server_Errors)
+            self.send_json(failure_status_code, {"message": "Server Error"}, headers)
+            return
+        for pattern, route in ROUTES:
+            route_match = pattern.match(split_url.path)
+            if route_match is None:
+                continue
+            if route == constants.standin.Rate_Limit_Route:
+                rate_limit_dict = {
+                    constants.rate.Limit: state.options.rate_limit,
+                    constants.rate.Remaining: int(
+                        headers[constants.rate.Header_Remaining]
+                    ),
+                    constants.rate.Reset: int(headers[constants.rate.Header_Reset]),
+                }
+                self.send_json(
+                    constants.github.Success_Response,
+                    {
+                        constants.rate.Resources: {
+                            constants.rate.Core: rate_limit_dict
+                        },
+                        "rate": rate_limit_dict,
+                    },
+                    headers,
+                )
+            elif route == constants.standin.Runs_Route:
+                self.send_runs(
+                    api_url, split_url.path, query, route_match.groups(), headers
+                )
+            elif route == constants.standin.Workflows_Route:
+                self.send_workflows(query, route_match.groups(), headers)
+            else:
+                state.count(constants.standin.Jobs_Route)
+                organization, repo, run_id = route_match.groups()
+                run_url = f"{api_url}/repos/{organization}/{repo}/actions/runs/{run_id}"
+                self.send_json(
+                    constants.github.Success_Response,
+                    {"total_count": 1, "jobs": [create_job(run_url, int(run_id))]},
+                    headers,
+                )
+            return
+        self.send_json(404, {"message": "Not Found"}, headers)
+
+    def send_runs(
+        self,
+        api_url: str,
+        path: str,
+        query: Dict[str, str],
+        route_groups: Tuple[str, ...],
+        headers: Dict[str, str],
+    ) -> None:
+        """Send a page of the synthesized workflow runs of a repository, newest first."""
+        state: StandInState = self.server.state  # type: ignore
+        organization, repo = route_groups[:2]
+        created_filter = query.get(constants.incremental.Created)
+        # the runs are numbered from the oldest one and thus the newest one is
+        # the last one, which is also the run that the listing starts with; note
+        # that a page slices the range of the matching runs instead of listing them
+        run_numbers = find_created_run_numbers(state.options.run_count, created_filter)
+        page_run_numbers, page_headers = self.paginate(
+            api_url, path, query, run_numbers
+        )
+        state.count(constants.standin.Pages)
+        headers.update(page_headers)
+        self.send_json(
+            constants.github.Success_Response,
+            {
+                constants.shard.Total_Count: len(run_numbers),
+                constants.github.Workflow_Runs: [
+                    create_workflow_run(api_url, organization, repo, run_number)
+                    for run_number in page_run_numbers
+                ],
+            },
+            headers,
+        )
+
+    def send_workflows(
+        self,
+        query: Dict[str, str],
+        route_groups: Tuple[str, ...],
+        headers: Dict[str, str],
+    ) -> None:
+        """Send the listing of the single synthesized workflow of a repository."""
+        organization, repo = route_groups[:2]
+        self.send_json(
+            constants.github.Success_Response,
+            {
+                constants.shard.Total_Count: 1,
+                constants.github.Workflows: [
+                    {
+                        "id": constants.standin.Workflow_Id,
+                        "name": "Build",
+                        "path": ".github/workflows/build.yml",
+                        "state": "active",
+                        "html_url": f"https://github.com/{organization}/{repo}/actions",
+                    }
+                ],
+            },
+            headers,
+        )
+
+    def paginate(
+        self,
+        api_url: str,
+        path: str,
+        query: Dict[str, str],
+        items: Sequence[int],
+    ) -> Tuple[Sequence[int], Dict[str, str]]:
+        """Select the items on the requested page and create the Link header of the other pages."""
+        per_page = int(
+            query.get(constants.github.Per_Page, constants.standin.Per_Page_Default)
+        )
+        page = int(query.get(constants.github.Page, "1"))
+        last_page = max((len(items) + per_page - 1) // per_page, 1)
+        headers = {}
+        if page < last_page:
+            links = []
+            for page_number, relation in [
+                (page + 1, constants.github.Next),
+                (last_page, constants.github.Last),
+            ]:
+                link_query = dict(query)
+                link_query[constants.github.Page] = str(page_number)
+                links.append(
+                    f'<{api_url}{path}?{parse.urlencode(link_query)}>; rel="{relation}"'
+                )
+            headers[constants.cache.Link] = ", ".join(links)
+        return (items[(page - 1) * per_page : page * per_page], headers)
+
+
+class StandInServer:
+    """A stand-in server for the GitHub Actions API that runs in a background thread."""
+
+    def __init__(
+        self,
+        options: Union[StandInOptions, None] = None,
+        host: str = constants.standin.Host,
+        port: int = 0,
+    ):
+        """Create the stand-in server, binding to a free port when the port is zero."""
+        self.options = options if options is not None else create_default_options()
+        self.http_server = server.ThreadingHTTPServer(
+            (host, port), StandInRequestHandler
+        )
+        self.http_server.daemon_threads = True
+        bound_host, bound_port = self.http_server.server_address[:2]
+        self.api_url = f"http://{bound_host}:{bound_port}"
+        self.http_server.state = StandInState(self.options)  # type: ignore
+        self.http_server.api_url = self.api_url  # type: ignore
+        self.thread: Union[threading.Thread, None] = None
+
+    def start(self) -> "StandInServer":
+        """Start answering requests in a background thread."""
+        self.thread = threading.Thread(
+            target=self.http_server.serve_forever, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop answering requests and close the socket of the server."""
+        self.http_server.shutdown()
+        self.http_server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Return the counts of the requests and of each kind of response."""
+        return self.http_server.state.get_statistics()  # type: ignore
+
+    def __enter__(self) -> "StandInServer":
+        """Start the server when entering a with statement."""
+        return self.start()
+
+    def __exit__(self, *exception_details) -> None:
+        """Stop the server when leaving a with statement."""
+        self.stop()
+
+
+# create a Typer object to support the command-line interface
+cli = typer.Typer()
+
+
+@cli.command()
+def serve(
+    host: str = typer.Option(constants.standin.Host),
+    port: int = typer.Option(constants.standin.Port),
+    run_count: int = typer.Option(constants.standin.Run_Count),
+    latency: float = typer.Option(0),
+    server_error_rate: float = typer.Option(0),
+    rate_limit_error_rate: float = typer.Option(0),
+    rate_limit: int = typer.Option(constants.rate.Default_Limit),
+    seed: int = typer.Option(0),
+):
+    """Serve the stand-in for the GitHub Actions API until interrupted."""
+    console = Console()
+    stand_in_server = StandInServer(
+        StandInOptions(
+            run_count=run_count,
+            latency=latency,
+            server_error_rate=server_error_rate,
+            rate_limit_error_rate=rate_limit_error_rate,
+            rate_limit=rate_limit,
+            seed=seed,
+        ),
+        host,
+        port,
+    )
+    console.print(
+        f":rocket: Serving the stand-in GitHub Actions API at {stand_in_server.api_url}"
+    )
+    console.print(
+        f"{constants.markers.Tab}...Download with --api-url {stand_in_server.api_url}"
+    )
+    try:
+        stand_in_server.http_server.serve_forever()
+    except KeyboardInterrupt:
+        stand_in_server.http_server.server_close()
@@ -0,0 +1,184 @@
+"""Spread the requests to the GitHub API across a pool of personal access tokens."""
+
+import collections
+import logging
+import os
+import threading
+
+from typing import Dict
+from typing import List
+from typing import Union
+
+from workknow import budget
+from workknow import constants
+
+# Reference:
+# https://docs.github.com/en/rest/overview/resources-in-the-rest-api#rate-limiting
+#
+# The GitHub API gives each personal access token its own budget of requests that it
+# restores at its own reset time. When a person provides several tokens (i.e., a comma
+# separated list in the PERSONAL_GITHUB_ACCESS_TOKENS environment variable) the pool
+# in this module selects the token for every request with this policy:
+#
+# --> prefer the token with the most available requests, breaking ties in favor of
+#     the token that has sent the fewest requests so that the tokens are used evenly
+# --> when every token is almost out of requests, select the one that resets first
+#
+# The available requests of a token are its remaining requests minus the requests
+# that were selected to use it and that are still waiting for their responses. Since
+# the workers select their tokens at the same time, reserving a request when its
+# token is selected (and releasing it once the response updated the budget) means
+# that the concurrent requests are spread across the tokens instead of all of them
+# using the token that had the most remaining requests before any of them finished.
+#
+# Each token has its own rate limit budget that is updated from the headers of the
+# responses to the requests that used it; the shared budget in the budget module is
+# then only used when there is no pool (e.g., in a test that does not configure one).
+
+# the pool that is shared by all requests to the GitHub API, if configured
+_token_pool: Union["TokenPool", None] = None
+
+
+class TokenPool:
+    """A pool of personal access tokens that each have their own rate limit budget."""
+
+    def __init__(self, tokens: List[str]):
+        """Create a pool of the provided tokens, none of which has a known budget."""
+        self.tokens = list(tokens)
+        self.lock = threading.Lock()
+        self.budgets: Dict[str, budget.RateLimitBudget] = {
+            token: budget.RateLimitBudget() for token in self.tokens
+        }
+        self.request_counts: Dict[str, int] = collections.Counter()
+        self.reserved_counts: Dict[str, int] = collections.Counter()
+
+    def is_known(self) -> bool:
+        """Determine whether or not the budget of every token in the pool is known."""
+        return all(token_budget.is_known() for token_budget in self.budgets.values())
+
+    def get_budget(self, token: str) -> budget.RateLimitBudget:
+        """Return the rate limit budget of a token in the pool."""
+        return self.budgets[token]
+
+    def get_remaining(self, token: str) -> int:
+        """Return the remaining requests for a token, assuming a full budget when it is unknown."""
+        if not self.budgets[token].is_known():
+            return constants.rate.Default_Limit
+        return self.budgets[token].to_dict()[constants.rate.Remaining]
+
+    def get_available(self, token: str) -> int:
+        """Return the remaining requests for a token that are not reserved by the requests in flight."""
+        return self.get_remaining(token) - self.reserved_counts[token]
+
+    def find_best_token(self) -> str:
+        """Find the token that the next request should use."""
+        available_tokens = [
+            token
+            for token in self.tokens
+            if self.get_available(token) >= constants.rate.Threshold
+        ]
+        # at least one token can still make requests and thus pick the one with the
+        # most available requests, preferring the least used one when there is a tie
+        if available_tokens:
+            return max(
+                available_tokens,
+                key=lambda token: (
+                    self.get_available(token),
+                    -self.request_counts[token],
+                ),
+            )
+        # every token is almost out of requests and thus the next request
+        # should use the token whose budget GitHub restores the soonest
+        return min(
+            self.tokens,
+            key=lambda token: self.budgets[token].to_dict()[constants.rate.Reset],
+        )
+
+    def has_available_token(self) -> bool:
+        """Determine whether or not any token in the pool can make requests without waiting."""
+        return any(
+            self.get_remaining(token) >= constants.rate.Threshold
+            for token in self.tokens
+        )
+
+    def select_token(self) -> str:
+        """Select the token for the next request, counting the request and reserving its budget."""
+        with self.lock:
+            token = self.find_best_token()
+            self.request_counts[token] = self.request_counts[token] + 1
+            self.reserved_counts[token] = self.reserved_counts[token] + 1
+        return token
+
+    def release_token(self, token: str) -> None:
+        """Release the budget that a request reserved once its response updated the budget of the token."""
+        with self.lock:
+            if self.reserved_counts[token] > 0:
+                self.reserved_counts[token] = self.reserved_counts[token] - 1
+
+    def to_dict(self) -> Dict[str, int]:
+        """Create a rate limit dictionary for the token that the next request will use."""
+        with self.lock:
+            return self.budgets[self.find_best_token()].to_dict()
+
+    def get_statistics(self) -> List[Dict[str, Union[str, int]]]:
+        """Return the number of requests and the remaining budget for each of the tokens."""
+        statistics = []
+        with self.lock:
+            for token in self.tokens:
+                rate_limit_dict = self.budgets[token].to_dict()
+                statistics.append(
+                    {
+                        constants.tokens.Token: mask_token(token),
+                        constants.tokens.Requests: self.request_counts[token],
+                        constants.rate.Remaining: rate_limit_dict[
+                            constants.rate.Remaining
+                        ],
+                        constants.rate.Limit: rate_limit_dict[constants.rate.Limit],
+                    }
+                )
+        return statistics
+
+
+def mask_token(token: str) -> str:
+    """Hide all but the last characters of a token so that it is safe to display."""
+    return (
+        constants.tokens.Mask + token[-constants.tokens.Visible_Characters :]
+        if len(token) > constants.tokens.Visible_Characters
+        else constants.tokens.Mask
+    )
+
+
+def read_tokens_from_environment() -> List[str]:
+    """Read the personal access tokens from the environment without any duplicates."""
+    # note that the single token is still supported so that the
+    # environment of an existing installation of WorkKnow still works
+    tokens_source = os.getenv(
+        constants.environment.Github_Access_Tokens, default=constants.markers.Nothing
+    ).split(constants.tokens.Separator) + [
+        os.getenv(
+            constants.environment.Github_Access_Token,
+            default=constants.markers.Nothing,
+        )
+    ]
+    tokens = []
+    for token in tokens_source:
+        token = token.strip()
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def configure_token_pool(tokens: List[str]) -> Union[TokenPool, None]:
+    """Configure the shared token pool, which is disabled when there are no tokens."""
+    global _token_pool  # pylint: disable=global-statement
+    logger = logging.getLogger(constants.logging.Rich)
+    _token_pool = None
+    if tokens:
+        _token_pool = TokenPool(tokens)
+        logger.debug(f"Configured a pool of {len(tokens)} personal access token(s)")
+    return _token_pool
+
+
+def get_token_pool() -> Union[TokenPool, None]:
+    """Return the shared token pool or None when it is not configured."""
+    return _token_pool
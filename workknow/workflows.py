@@ -0,0 +1,229 @@
+"""Download the runs of each of the workflows of a repository at the same time."""
+
+import heapq
+import logging
+import posixpath
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from rich.console import Console
+from rich.progress import Progress
+
+from workknow import checkpoint
+from workknow import constants
+from workknow import produce
+from workknow import request
+
+# Reference:
+# https://docs.github.com/en/rest/reference/actions#list-repository-workflows
+# https://docs.github.com/en/rest/reference/actions#list-workflow-runs
+#
+# The listing of the workflow runs of a repository is a single stream of pages
+# that are, by default, requested one after another. A per-workflow download instead:
+#
+# --> lists the workflows of the repository, following the pages of the listing
+# --> keeps only the workflows with a name (or the file name of the path) that was
+#     selected, keeping all of the workflows when no name was selected
+# --> downloads the runs of each of the workflows at the same time, each with its
+#     own pagination of the /actions/workflows/{id}/runs listing
+# --> merges the runs of the workflows, from the newest to the oldest, so that the
+#     runs are in the same order as in the listing of the runs of the repository,
+#     while their pages are downloaded
+
+# the number of workflow runs in each of the merged pages that are yielded
+MERGED_PAGE_SIZE = int(constants.github.Per_Page_Maximum)
+
+
+def list_workflows(
+    github_workflows_url: str,
+    github_authentication,
+    progress: Progress,
+    maximum_retries: int,
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """List all of the workflows of a repository, following the pages of the listing."""
+    workflows_list: List[Dict[str, Any]] = []
+    page = 1
+    github_params = request.create_github_params(None, page)
+    while True:
+        valid, _, _, response = request.request_json_from_github_with_caution(
+            github_workflows_url,
+            github_params,
+            github_authentication,
+            progress,
+            maximum_retries,
+        )
+        if not valid:
+            return (False, workflows_list)
+        workflows_list.extend(
+            response.json().get(constants.github.Workflows, [])  # type: ignore
+        )
+        if constants.github.Next not in response.links:  # type: ignore
+            return (True, workflows_list)
+        # note that the parameters of the first page do not have a page number
+        page = page + 1
+        github_params[constants.github.Page] = str(page)
+
+
+def select_workflows(
+    workflows_list: List[Dict[str, Any]], workflow_names: List[str]
+) -> List[Dict[str, Any]]:
+    """Select the workflows with one of the names, or all of the workflows when there are no names."""
+    if not workflow_names:
+        return workflows_list
+    # a workflow is selected by the name in its file (e.g., "Build") or
+    # by the name of its file in the .github/workflows directory (e.g., "build.yml")
+    return [
+        workflow
+        for workflow in workflows_list
+        if workflow.get(constants.workflow.Name) in workflow_names
+        or posixpath.basename(workflow.get(constants.workflows.Path, ""))
+        in workflow_names
+    ]
+
+
+def order_workflow_run(workflow_run: Dict[str, Any]) -> Tuple[str, int]:
+    """Create the key that orders the workflow runs in the same way as the listing of a repository."""
+    return (
+        workflow_run.get(constants.workflow.Created_At) or constants.markers.Nothing,
+        workflow_run.get(constants.workflow.Id) or 0,
+    )
+
+
+class WorkflowRunPagesByWorkflow:
+    """The pages of workflow runs for a repository, downloaded for each of its workflows at the same time."""
+
+    # Iterating through an instance of this class yields the merged pages of workflow
+    # runs while the selected workflows are downloaded. The attributes valid,
+    # retry_count, and sleep_time are the same as those of request.WorkflowRunPages
+    # while workflow_count is the number of the workflows that were downloaded.
+    # The workflows are downloaded with the pages of the backend (i.e., the
+    # workflow_run_pages_class) and, with a checkpoint journal, each of them
+    # resumes after its own stored pages and records each of its new pages.
+
+    def __init__(
+        self,
+        organization: str,
+        repo: str,
+        console: Console,
+        workflow_names: Union[List[str], None] = None,
+        maximum_retries=constants.github.Maximum_Request_Retries,
+        page_concurrency: int = constants.github.Page_Concurrency,
+        workflow_concurrency: int = constants.workflows.Workflow_Concurrency,
+        github_params_filter: Union[Dict[str, str], None] = None,
+        progress: Union[Progress, None] = None,
+        progress_label: str = constants.markers.Nothing,
+        workflow_run_pages_class: Callable[..., Any] = request.WorkflowRunPages,
+        checkpoint_journal: Union[checkpoint.CheckpointJournal, None] = None,
+    ):
+        """Describe the download of the workflows' pages without requesting any of them."""
+        self.organization = organization
+        self.repo = repo
+        self.console = console
+        self.workflow_names = list(workflow_names or [])
+        self.maximum_retries = maximum_retries
+        self.page_concurrency = page_concurrency
+        self.workflow_concurrency = workflow_concurrency
+        self.github_params_filter = github_params_filter
+        self.progress = progress
+        self.progress_label = progress_label
+        self.workflow_run_pages_class = workflow_run_pages_class
+        self.checkpoint_journal = checkpoint_journal
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time: float = 0
+        self.workflow_count = 0
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        """Download the runs of the workflows at the same time, yielding merged pages from the newest run."""
+        logger = logging.getLogger(constants.logging.Rich)
+        github_authentication = (
+            constants.github.User,
+            request.get_github_personal_access_token(),
+        )
+        self.valid = False
+        self.retry_count = 0
+        self.sleep_time = 0
+        # the downloads of all of the workflows share a single progress display
+        with request.use_progress(self.progress) as progress:
+            valid, workflows_list = list_workflows(
+                produce.create_github_workflows_url(self.organization, self.repo),
+                github_authentication,
+                progress,
+                self.maximum_retries,
+            )
+            if not valid:
+                return
+            selected_workflows = select_workflows(workflows_list, self.workflow_names)
+            self.workflow_count = len(selected_workflows)
+            logger.debug(
+                f"Selected {self.workflow_count} of {len(workflows_list)} workflow(s) for {self.organization}/{self.repo}"
+            )
+            all_workflow_run_pages = []
+            stored_page_count = 0
+            for workflow in selected_workflows:
+                github_workflow_runs_url = produce.create_github_workflow_runs_url(
+                    self.organization,
+                    self.repo,
+                    workflow[constants.workflow.Id],
+                )
+                stored_pages, page_callback = checkpoint.open_listing(
+                    self.checkpoint_journal,
+                    github_workflow_runs_url,
+                    self.github_params_filter,
+                )
+                stored_page_count = stored_page_count + len(stored_pages)
+                all_workflow_run_pages.append(
+                    self.workflow_run_pages_class(
+                        github_workflow_runs_url,
+                        progress.console,
+                        self.maximum_retries,
+                        self.page_concurrency,
+                        self.github_params_filter,
+                        stored_pages=stored_pages,
+                        page_callback=page_callback,
+                        progress=progress,
+                        progress_label=f"{self.progress_label}{workflow.get(constants.workflow.Name)}{constants.markers.Space}",
+                    )
+                )
+            checkpoint.display_stored_pages(progress.console, stored_page_count)
+            # the runs of each workflow start with the newest one and thus merging them
+            # keeps the same order as the listing of all of the runs of the repository;
+            # note that the merge only needs the next run of each of the workflows and
+            # thus a merged page is yielded as soon as the runs before it are downloaded
+            with request.stream_pages_concurrently(
+                all_workflow_run_pages, self.workflow_concurrency
+            ) as workflow_pages_iterators:
+                merged_workflow_runs = []
+                for workflow_run in heapq.merge(
+                    *[
+                        (
+                            workflow_run
+                            for workflow_runs in pages_iterator
+                            for workflow_run in workflow_runs
+                        )
+                        for pages_iterator in workflow_pages_iterators
+                    ],
+                    key=order_workflow_run,
+                    reverse=True,
+                ):
+                    merged_workflow_runs.append(workflow_run)
+                    if len(merged_workflow_runs) == MERGED_PAGE_SIZE:
+                        yield merged_workflow_runs
+                        merged_workflow_runs = []
+                if merged_workflow_runs:
+                    yield merged_workflow_runs
+        for workflow_run_pages in all_workflow_run_pages:
+            self.retry_count = self.retry_count + workflow_run_pages.retry_count
+            self.sleep_time = self.sleep_time + workflow_run_pages.sleep_time
+        # a workflow that could not be downloaded makes the whole download invalid
+        if not all(
+            workflow_run_pages.valid for workflow_run_pages in all_workflow_run_pages
+        ):
+            return
+        self.valid = True